@@ -0,0 +1,103 @@
+"""Add asset status materialized view and latest-record indexes
+
+Revision ID: add_asset_status_summary
+Revises: add_row_orientation
+Create Date: 2026-10-18
+
+NOTE: The view body mirrors services.asset_analytics_service._asset_status_select.
+It is only read when ASSET_STATUS_MATVIEW=true; the indexes help the live query too.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_asset_status_summary'
+down_revision: str = 'add_row_orientation'
+branch_labels = None
+depends_on = None
+
+
+ASSET_STATUS_VIEW_SQL = """
+CREATE MATERIALIZED VIEW asset_status_summary AS
+SELECT
+    a.id AS asset_id,
+    a.company_id,
+    a.name,
+    a.category,
+    a.asset_type,
+    COALESCE(a.requires_calibration, false) AS requires_calibration,
+    lc.calibration_date AS last_calibration_date,
+    CAST(CASE
+        WHEN COALESCE(a.requires_calibration, false) = false THEN NULL
+        ELSE COALESCE(lc.next_due_date, lc.calibration_date + a.calibration_interval_days)
+    END AS DATE) AS calibration_due_date,
+    lm.completed_date AS last_maintenance_date,
+    om.next_scheduled AS next_scheduled_maintenance,
+    CAST(LEAST(om.next_scheduled, lm.next_due_date, lm.completed_date + a.maintenance_interval_days) AS DATE)
+        AS maintenance_due_date,
+    COALESCE(om.open_count, 0) AS open_maintenance_count,
+    LEAST(a.wof_due, a.registration_expiry, a.insurance_expiry) AS compliance_due_date,
+    a.current_stock,
+    a.minimum_stock,
+    a.unit_of_measure,
+    CASE
+        WHEN a.asset_type != 'consumable' THEN 'not_applicable'
+        WHEN COALESCE(a.current_stock, 0) <= 0 THEN 'out_of_stock'
+        WHEN a.minimum_stock IS NOT NULL AND a.current_stock <= a.minimum_stock THEN 'low_stock'
+        WHEN a.maximum_stock IS NOT NULL AND a.current_stock >= a.maximum_stock THEN 'overstocked'
+        ELSE 'adequate'
+    END AS stock_status
+FROM assets a
+LEFT JOIN (
+    SELECT DISTINCT ON (asset_id) asset_id, calibration_date, next_due_date
+    FROM asset_calibrations
+    ORDER BY asset_id, calibration_date DESC, id DESC
+) lc ON lc.asset_id = a.id
+LEFT JOIN (
+    SELECT DISTINCT ON (asset_id) asset_id, completed_date, next_due_date
+    FROM asset_maintenance
+    WHERE status = 'completed'
+    ORDER BY asset_id, completed_date DESC NULLS LAST, id DESC
+) lm ON lm.asset_id = a.id
+LEFT JOIN (
+    SELECT asset_id, MIN(scheduled_date) AS next_scheduled, COUNT(*) AS open_count
+    FROM asset_maintenance
+    WHERE status IN ('scheduled', 'in_progress')
+    GROUP BY asset_id
+) om ON om.asset_id = a.id
+WHERE a.is_active = true
+"""
+
+
+def upgrade():
+    # Latest-record lookups for DISTINCT ON
+    op.create_index(
+        'ix_asset_calibrations_asset_latest', 'asset_calibrations',
+        ['asset_id', sa.text('calibration_date DESC'), sa.text('id DESC')]
+    )
+    op.create_index(
+        'ix_asset_maintenance_asset_status', 'asset_maintenance',
+        ['asset_id', 'status', 'scheduled_date']
+    )
+    op.create_index(
+        'ix_stock_movements_asset_date', 'stock_movements',
+        ['asset_id', 'movement_date']
+    )
+    op.create_index(
+        'ix_assets_company_active', 'assets',
+        ['company_id', 'asset_type'],
+        postgresql_where=sa.text('is_active = true')
+    )
+    
+    op.execute(ASSET_STATUS_VIEW_SQL)
+    # Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index('uq_asset_status_summary_asset', 'asset_status_summary', ['asset_id'], unique=True)
+    op.create_index('ix_asset_status_summary_company', 'asset_status_summary', ['company_id'])
+
+
+def downgrade():
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS asset_status_summary")
+    op.drop_index('ix_assets_company_active', table_name='assets')
+    op.drop_index('ix_stock_movements_asset_date', table_name='stock_movements')
+    op.drop_index('ix_asset_maintenance_asset_status', table_name='asset_maintenance')
+    op.drop_index('ix_asset_calibrations_asset_latest', table_name='asset_calibrations')
@@ -0,0 +1,38 @@
+"""Add signed verification checkpoints for provenance chains
+
+Revision ID: add_blockchain_checkpoints
+Revises: add_outbound_emails
+Create Date: 2026-10-18
+
+Written by services.chain_verification every BLOCKCHAIN_CHECKPOINT_INTERVAL
+nodes so chain verification resumes from the latest checkpoint.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_blockchain_checkpoints'
+down_revision: str = 'add_outbound_emails'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'blockchain_checkpoints',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('chain_id', sa.Integer(), sa.ForeignKey('blockchain_chains.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('sequence_number', sa.Integer(), nullable=False),
+        sa.Column('node_hash', sa.String(), nullable=False),
+        sa.Column('rolling_digest', sa.String(), nullable=False),
+        sa.Column('node_count', sa.Integer(), nullable=False),
+        sa.Column('signature', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint('chain_id', 'sequence_number', name='uq_blockchain_checkpoint_chain_sequence'),
+    )
+    op.create_index('ix_blockchain_checkpoints_id', 'blockchain_checkpoints', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_blockchain_checkpoints_id', table_name='blockchain_checkpoints')
+    op.drop_table('blockchain_checkpoints')
@@ -0,0 +1,93 @@
+"""Add October 1 adjusted GDD to climate_zone_daily
+
+Revision ID: add_climate_zone_season_gdd
+Revises: add_file_blobs
+Create Date: 2026-10-18
+
+climate_zone_season_gdd holds the September 30 GDD offsets per zone and
+vintage; gdd_cumulative_oct1 / gdd_baseline_oct1 are maintained from them by
+services.zone_season_gdd. Existing rows are backfilled here with the same SQL
+as ZoneSeasonGdd.refresh(), so the realtime climate endpoints don't return
+nulls until the next aggregation run. `python scripts/zone_aggregation.py
+--refresh-gdd` recomputes them on demand.
+
+idx_climate_zone_daily_vintage gains the date column so season series are a
+single ordered index range scan.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_climate_zone_season_gdd'
+down_revision: str = 'add_file_blobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'climate_zone_season_gdd',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('zone_id', sa.Integer(), sa.ForeignKey('climate_zones.id'), nullable=False),
+        sa.Column('vintage_year', sa.Integer(), nullable=False),
+        sa.Column('offset_date', sa.Date(), nullable=True),
+        sa.Column('actual_gdd_offset', sa.Numeric(8, 2), nullable=False, server_default='0'),
+        sa.Column('baseline_gdd_offset', sa.Numeric(8, 2), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint('zone_id', 'vintage_year', name='uq_climate_zone_season_gdd'),
+    )
+
+    op.add_column('climate_zone_daily', sa.Column('gdd_cumulative_oct1', sa.Numeric(8, 2), nullable=True))
+    op.add_column('climate_zone_daily', sa.Column('gdd_baseline_oct1', sa.Numeric(8, 2), nullable=True))
+
+    op.drop_index('idx_climate_zone_daily_vintage', table_name='climate_zone_daily')
+    op.create_index('idx_climate_zone_daily_vintage', 'climate_zone_daily', ['zone_id', 'vintage_year', 'date'])
+
+    # Backfill: September 30 offsets per zone and vintage, then the adjusted columns
+    op.execute('''
+        INSERT INTO climate_zone_season_gdd
+            (zone_id, vintage_year, offset_date, actual_gdd_offset, baseline_gdd_offset, updated_at)
+        SELECT s.zone_id, s.vintage_year, sept30.date,
+               COALESCE(sept30.gdd_cumulative, 0), COALESCE(b.gdd_base0_cumulative_avg, 0), now()
+        FROM (SELECT DISTINCT zone_id, vintage_year FROM climate_zone_daily) s
+        LEFT JOIN LATERAL (
+            SELECT d.date, d.gdd_cumulative FROM climate_zone_daily d
+            WHERE d.zone_id = s.zone_id AND d.vintage_year = s.vintage_year
+              AND d.date <= make_date(s.vintage_year - 1, 9, 30)
+              AND d.gdd_cumulative IS NOT NULL
+            ORDER BY d.date DESC
+            LIMIT 1
+        ) sept30 ON TRUE
+        LEFT JOIN climate_zone_daily_baseline b
+            ON b.zone_id = s.zone_id AND b.day_of_vintage = 92
+    ''')
+
+    op.execute('''
+        UPDATE climate_zone_daily d SET
+            gdd_cumulative_oct1 = CASE
+                WHEN d.date < make_date(d.vintage_year - 1, 10, 1) THEN 0
+                ELSE GREATEST(COALESCE(d.gdd_cumulative, 0) - o.actual_gdd_offset, 0)
+            END,
+            gdd_baseline_oct1 = (
+                SELECT CASE
+                    WHEN b.gdd_base0_cumulative_avg IS NULL THEN NULL
+                    WHEN d.date < make_date(d.vintage_year - 1, 10, 1) THEN 0
+                    ELSE GREATEST(b.gdd_base0_cumulative_avg - o.baseline_gdd_offset, 0)
+                END
+                FROM climate_zone_daily_baseline b
+                WHERE b.zone_id = d.zone_id
+                  AND b.day_of_vintage = (d.date - make_date(d.vintage_year - 1, 7, 1)) + 1
+            )
+        FROM climate_zone_season_gdd o
+        WHERE o.zone_id = d.zone_id AND o.vintage_year = d.vintage_year
+    ''')
+
+
+def downgrade() -> None:
+    op.drop_index('idx_climate_zone_daily_vintage', table_name='climate_zone_daily')
+    op.create_index('idx_climate_zone_daily_vintage', 'climate_zone_daily', ['zone_id', 'vintage_year'])
+
+    op.drop_column('climate_zone_daily', 'gdd_baseline_oct1')
+    op.drop_column('climate_zone_daily', 'gdd_cumulative_oct1')
+
+    op.drop_table('climate_zone_season_gdd')
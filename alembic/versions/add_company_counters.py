@@ -0,0 +1,44 @@
+"""Add company_counters for dashboard stats
+
+Revision ID: add_company_counters
+Revises: add_risk_recurrence_and_due_items
+Create Date: 2026-10-18
+
+One row of dashboard counts per company, maintained by
+services.company_counters in the transaction that writes the counted rows.
+Rows are created on first read; run
+`python scripts/reconcile_company_counters.py` after upgrading to fill them
+all up front, and nightly to correct writes made outside the ORM.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_company_counters'
+down_revision: str = 'add_risk_recurrence_and_due_items'
+branch_labels = None
+depends_on = None
+
+COUNT_COLUMNS = (
+    'block_count', 'observation_run_count', 'open_task_count', 'user_count',
+    'asset_count', 'physical_asset_count', 'consumable_asset_count',
+    'training_module_count', 'published_training_module_count', 'training_record_count',
+    'active_training_record_count', 'completed_training_record_count', 'training_scored_count',
+    'visitor_count'
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'company_counters',
+        sa.Column('company_id', sa.Integer(), sa.ForeignKey('companies.id', ondelete='CASCADE'), primary_key=True),
+        *[sa.Column(name, sa.Integer(), server_default='0', nullable=False) for name in COUNT_COLUMNS],
+        sa.Column('training_score_total', sa.Numeric(14, 2), server_default='0', nullable=False),
+        sa.Column('storage_bytes', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+        sa.Column('reconciled_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('company_counters')
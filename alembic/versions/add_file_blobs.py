@@ -0,0 +1,47 @@
+"""Add content-addressed file blobs
+
+Revision ID: add_file_blobs
+Revises: add_observation_spot_metrics
+Create Date: 2026-10-18
+
+file_blobs holds one stored copy per company and SHA-256 with a reference
+count (services.file_storage). Existing files keep their own file_path and
+have no blob.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_file_blobs'
+down_revision: str = 'add_observation_spot_metrics'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'file_blobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('company_id', sa.Integer(), sa.ForeignKey('companies.id'), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('storage_path', sa.String(length=500), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint('company_id', 'sha256', name='uq_file_blobs_company_sha256'),
+    )
+    op.create_index('ix_file_blobs_id', 'file_blobs', ['id'])
+
+    op.add_column('files', sa.Column('blob_id', sa.Integer(), sa.ForeignKey('file_blobs.id'), nullable=True))
+    op.add_column('files', sa.Column('content_sha256', sa.String(length=64), nullable=True))
+    op.create_index('ix_files_blob_id', 'files', ['blob_id'])
+    op.create_index('ix_files_content_sha256', 'files', ['content_sha256'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_files_content_sha256', table_name='files')
+    op.drop_index('ix_files_blob_id', table_name='files')
+    op.drop_column('files', 'content_sha256')
+    op.drop_column('files', 'blob_id')
+    op.drop_index('ix_file_blobs_id', table_name='file_blobs')
+    op.drop_table('file_blobs')
@@ -0,0 +1,34 @@
+"""Add observation run list and stats indexes
+
+Revision ID: add_observation_run_list_indexes
+Revises: add_blockchain_checkpoints
+Create Date: 2026-10-18
+
+ix_observation_runs_company_created matches RUN_LIST_KEYS in
+services.observation_run_query_service so keyset pages are index range scans;
+ix_observation_runs_company_block_start serves the block / date window filters.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_observation_run_list_indexes'
+down_revision: str = 'add_blockchain_checkpoints'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_observation_runs_company_created "
+        "ON observation_runs (company_id, created_at DESC, id DESC)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_observation_runs_company_block_start "
+        "ON observation_runs (company_id, block_id, observed_at_start)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_observation_runs_company_block_start")
+    op.execute("DROP INDEX IF EXISTS ix_observation_runs_company_created")
@@ -0,0 +1,47 @@
+"""Add observation spot metrics fact table
+
+Revision ID: add_observation_spot_metrics
+Revises: add_observation_run_list_indexes
+Create Date: 2026-10-18
+
+Typed per-spot values extracted from observation_spots.data_json at run
+completion (services.observation_analytics). Existing completed runs are
+filled by POST /api/observation-analytics/rebuild.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_observation_spot_metrics'
+down_revision: str = 'add_observation_run_list_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'observation_spot_metrics',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('company_id', sa.Integer(), sa.ForeignKey('companies.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('run_id', sa.Integer(), sa.ForeignKey('observation_runs.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('spot_id', sa.Integer(), sa.ForeignKey('observation_spots.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('template_id', sa.Integer(), sa.ForeignKey('observation_templates.id'), nullable=False),
+        sa.Column('block_id', sa.Integer(), sa.ForeignKey('vineyard_blocks.id', ondelete='CASCADE'), nullable=True),
+        sa.Column('observed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('metric', sa.String(length=100), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('value_num', sa.Float(), nullable=True),
+        sa.Column('value_text', sa.String(length=255), nullable=True),
+    )
+    op.create_index('ix_observation_spot_metrics_company_metric_time', 'observation_spot_metrics',
+                    ['company_id', 'template_id', 'metric', 'observed_at'])
+    op.create_index('ix_observation_spot_metrics_block_metric_time', 'observation_spot_metrics',
+                    ['block_id', 'metric', 'observed_at'])
+    op.create_index('ix_observation_spot_metrics_run', 'observation_spot_metrics', ['run_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_observation_spot_metrics_run', table_name='observation_spot_metrics')
+    op.drop_index('ix_observation_spot_metrics_block_metric_time', table_name='observation_spot_metrics')
+    op.drop_index('ix_observation_spot_metrics_company_metric_time', table_name='observation_spot_metrics')
+    op.drop_table('observation_spot_metrics')
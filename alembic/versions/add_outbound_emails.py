@@ -0,0 +1,45 @@
+"""Add outbound email queue
+
+Revision ID: add_outbound_emails
+Revises: add_task_list_indexes
+Create Date: 2026-10-18
+
+Backs services.mail_queue: EmailService.send_email writes here and the
+background worker delivers due rows in batches.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_outbound_emails'
+down_revision: str = 'add_task_list_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'outbound_emails',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('to_email', sa.String(length=255), nullable=False),
+        sa.Column('reply_to', sa.String(length=255), nullable=True),
+        sa.Column('subject', sa.String(length=500), nullable=False),
+        sa.Column('html_content', sa.Text(), nullable=False),
+        sa.Column('text_content', sa.Text(), nullable=True),
+        sa.Column('template', sa.String(length=100), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_outbound_emails_id', 'outbound_emails', ['id'])
+    op.create_index('ix_outbound_emails_status_next_attempt', 'outbound_emails', ['status', 'next_attempt_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbound_emails_status_next_attempt', table_name='outbound_emails')
+    op.drop_index('ix_outbound_emails_id', table_name='outbound_emails')
+    op.drop_table('outbound_emails')
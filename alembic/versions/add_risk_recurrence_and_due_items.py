@@ -0,0 +1,127 @@
+"""Add recurrence rules for risk actions and the due_items index
+
+Revision ID: add_risk_recurrence_and_due_items
+Revises: add_weather_data_issues
+Create Date: 2026-10-18
+
+Recurring risk actions get an RRULE (existing every-N-days actions are
+converted to FREQ=DAILY;INTERVAL=N) and generated instances record which
+occurrence they are, unique per parent. Existing instances are re-parented
+on their series root and take their target start as their occurrence;
+generation resumes after the latest of them. Downgrade does not restore the
+old instance-to-instance parent links. The scheduler (services.risk_schedule)
+creates upcoming instances in bulk and maintains due_items; run
+`python scripts/run_risk_schedule.py` once after upgrading to fill it.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_risk_recurrence_and_due_items'
+down_revision: str = 'add_weather_data_issues'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('risk_actions', sa.Column('recurrence_rule', sa.Text(), nullable=True))
+    op.add_column('risk_actions', sa.Column('recurrence_generated_until', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('risk_actions', sa.Column('occurrence_date', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_risk_actions_parent_action_id', 'risk_actions', ['parent_action_id'])
+    op.create_index(
+        'uq_risk_actions_parent_occurrence', 'risk_actions', ['parent_action_id', 'occurrence_date'],
+        unique=True, postgresql_where=sa.text('occurrence_date IS NOT NULL')
+    )
+    op.create_index(
+        'ix_risk_actions_recurring_roots', 'risk_actions', ['id'],
+        postgresql_where=sa.text('is_recurring AND parent_action_id IS NULL')
+    )
+
+    op.execute("""
+        UPDATE risk_actions
+        SET recurrence_rule = 'FREQ=DAILY;INTERVAL=' || recurrence_frequency_days
+        WHERE is_recurring AND parent_action_id IS NULL
+          AND recurrence_rule IS NULL AND recurrence_frequency_days > 0
+    """)
+
+    # Instances created before rules: the old generator parented each new
+    # instance on the one before it, so re-parent every recurring descendant
+    # on its series root...
+    op.execute("""
+        WITH RECURSIVE series AS (
+            SELECT id, id AS root_id
+            FROM risk_actions
+            WHERE is_recurring AND parent_action_id IS NULL
+            UNION ALL
+            SELECT child.id, series.root_id
+            FROM risk_actions child
+            JOIN series ON child.parent_action_id = series.id
+            WHERE child.is_recurring
+        )
+        UPDATE risk_actions
+        SET parent_action_id = series.root_id
+        FROM series
+        WHERE risk_actions.id = series.id
+          AND series.id <> series.root_id
+          AND risk_actions.parent_action_id <> series.root_id
+    """)
+    # ...record their start as their occurrence (the first instance per date
+    # when several share one)...
+    op.execute("""
+        UPDATE risk_actions
+        SET occurrence_date = ranked.target_start_date
+        FROM (
+            SELECT child.id, child.target_start_date,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY child.parent_action_id, child.target_start_date ORDER BY child.id
+                   ) AS n
+            FROM risk_actions child
+            JOIN risk_actions root ON root.id = child.parent_action_id
+            WHERE root.is_recurring AND root.parent_action_id IS NULL
+              AND child.is_recurring AND child.occurrence_date IS NULL
+              AND child.target_start_date IS NOT NULL
+        ) ranked
+        WHERE risk_actions.id = ranked.id AND ranked.n = 1
+    """)
+    # ...and start each series' generation after its latest existing instance,
+    # so already-scheduled work isn't generated again
+    op.execute("""
+        UPDATE risk_actions
+        SET recurrence_generated_until = latest.occurrence_date
+        FROM (
+            SELECT parent_action_id, MAX(occurrence_date) AS occurrence_date
+            FROM risk_actions
+            WHERE occurrence_date IS NOT NULL
+            GROUP BY parent_action_id
+        ) latest
+        WHERE risk_actions.id = latest.parent_action_id
+    """)
+
+    op.create_table(
+        'due_items',
+        sa.Column('id', sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column('company_id', sa.Integer(), sa.ForeignKey('companies.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('item_type', sa.String(30), nullable=False),
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(255), nullable=True),
+        sa.Column('due_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('assigned_to', sa.Integer(), sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('priority', sa.String(20), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+        sa.UniqueConstraint('item_type', 'item_id', name='uq_due_items_item'),
+    )
+    op.create_index('ix_due_items_company_due', 'due_items', ['company_id', 'due_at'])
+    op.create_index('ix_due_items_assigned_due', 'due_items', ['assigned_to', 'due_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_due_items_assigned_due', table_name='due_items')
+    op.drop_index('ix_due_items_company_due', table_name='due_items')
+    op.drop_table('due_items')
+
+    op.drop_index('ix_risk_actions_recurring_roots', table_name='risk_actions')
+    op.drop_index('uq_risk_actions_parent_occurrence', table_name='risk_actions')
+    op.drop_index('ix_risk_actions_parent_action_id', table_name='risk_actions')
+    op.drop_column('risk_actions', 'occurrence_date')
+    op.drop_column('risk_actions', 'recurrence_generated_until')
+    op.drop_column('risk_actions', 'recurrence_rule')
@@ -0,0 +1,30 @@
+"""Add row_orientation to vineyard_blocks for generated row layouts
+
+Revision ID: add_row_orientation
+Revises: add_hourly_climate
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_row_orientation'
+down_revision: str = 'add_hourly_climate'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Row bearing in degrees clockwise from true north (0-180)
+    op.add_column('vineyard_blocks', sa.Column('row_orientation', sa.Float(), nullable=True))
+    
+    # Row listings and layout replacement always filter by block
+    op.create_index(
+        'ix_vineyard_rows_block_id', 'vineyard_rows',
+        ['block_id'], if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_index('ix_vineyard_rows_block_id', table_name='vineyard_rows', if_exists=True)
+    op.drop_column('vineyard_blocks', 'row_orientation')
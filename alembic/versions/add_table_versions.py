@@ -0,0 +1,56 @@
+"""Add table_versions change counters for vineyard_blocks
+
+Revision ID: add_table_versions
+Revises: add_climate_zone_season_gdd
+Create Date: 2026-10-18
+
+A statement-level trigger bumps table_versions.version for vineyard_blocks on
+every INSERT / UPDATE / DELETE / TRUNCATE, whatever wrote it (API, scripts or
+psql). The API's in-process block index (services.block_index) polls the
+counter and reloads when it changes.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_table_versions'
+down_revision: str = 'add_climate_zone_season_gdd'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'table_versions',
+        sa.Column('table_name', sa.String(63), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+    op.execute('''
+        CREATE OR REPLACE FUNCTION bump_table_version()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO table_versions (table_name, version, updated_at)
+            VALUES (TG_TABLE_NAME, 1, now())
+            ON CONFLICT (table_name) DO UPDATE
+                SET version = table_versions.version + 1, updated_at = now();
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    ''')
+
+    op.execute('''
+        CREATE TRIGGER trigger_vineyard_blocks_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON vineyard_blocks
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION bump_table_version();
+    ''')
+
+    op.execute("INSERT INTO table_versions (table_name, version) VALUES ('vineyard_blocks', 1)")
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS trigger_vineyard_blocks_version ON vineyard_blocks')
+    op.execute('DROP FUNCTION IF EXISTS bump_table_version()')
+    op.drop_table('table_versions')
@@ -0,0 +1,58 @@
+"""Add task list ordering and trigram search indexes
+
+Revision ID: add_task_list_indexes
+Revises: add_visitor_search_indexes
+Create Date: 2026-10-18
+
+ix_tasks_company_list_order matches TASK_LIST_KEYS in services.task_query_service
+(the COALESCE sentinel must stay the same) so keyset pages are index range scans.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_task_list_indexes'
+down_revision: str = 'add_visitor_search_indexes'
+branch_labels = None
+depends_on = None
+
+
+TRGM_COLUMNS = ['title', 'task_number', 'description']
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_company_list_order ON tasks ("
+        "company_id, "
+        "COALESCE(scheduled_start_date, DATE '0001-01-01'), "
+        "priority DESC, "
+        "created_at DESC, "
+        "id DESC)"
+    )
+
+    for column in TRGM_COLUMNS:
+        op.create_index(
+            f'ix_tasks_{column}_trgm',
+            'tasks',
+            [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+            if_not_exists=True
+        )
+
+    # EXISTS lookups for assignee filters / my-tasks
+    op.create_index(
+        'ix_task_assignments_user_task',
+        'task_assignments',
+        ['user_id', 'task_id'],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_assignments_user_task', table_name='task_assignments', if_exists=True)
+    for column in TRGM_COLUMNS:
+        op.drop_index(f'ix_tasks_{column}_trgm', table_name='tasks', if_exists=True)
+    op.drop_index('ix_tasks_company_list_order', table_name='tasks', if_exists=True)
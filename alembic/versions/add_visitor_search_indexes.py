@@ -0,0 +1,57 @@
+"""Add trigram search and visit aggregate indexes for visitors
+
+Revision ID: add_visitor_search_indexes
+Revises: add_asset_status_summary
+Create Date: 2026-10-18
+
+The GIN gin_trgm_ops indexes let the '%term%' ILIKE search on visitors use an
+index instead of scanning every row, and back similarity() ranking in /search.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_visitor_search_indexes'
+down_revision: str = 'add_asset_status_summary'
+branch_labels = None
+depends_on = None
+
+
+TRGM_COLUMNS = ['first_name', 'last_name', 'email', 'company_representing']
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for column in TRGM_COLUMNS:
+        op.create_index(
+            f'ix_visitors_{column}_trgm',
+            'visitors',
+            [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+            if_not_exists=True
+        )
+
+    # Keyset ordering for the visitor list
+    op.create_index(
+        'ix_visitors_company_name',
+        'visitors',
+        ['company_id', 'last_name', 'first_name', 'id'],
+        if_not_exists=True
+    )
+
+    # Per-visitor visit count / last visit aggregation
+    op.create_index(
+        'ix_visitor_visits_company_visitor_date',
+        'visitor_visits',
+        ['company_id', 'visitor_id', 'visit_date'],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_visitor_visits_company_visitor_date', table_name='visitor_visits', if_exists=True)
+    op.drop_index('ix_visitors_company_name', table_name='visitors', if_exists=True)
+    for column in TRGM_COLUMNS:
+        op.drop_index(f'ix_visitors_{column}_trgm', table_name='visitors', if_exists=True)
@@ -0,0 +1,50 @@
+"""Add weather_data_issues for ingestion QC
+
+Revision ID: add_weather_data_issues
+Revises: add_table_versions
+Create Date: 2026-10-18
+
+Ingestion now quality-checks each batch (services.weather_qc) and records
+flagged runs here. Existing data can be checked with
+`python scripts/weather_qc.py --days N`.
+
+ECAN rows were written with quality 'good'; aggregation only reads 'GOOD',
+so they are normalised here.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_weather_data_issues'
+down_revision: str = 'add_table_versions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'weather_data_issues',
+        sa.Column('issue_id', sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column('station_id', sa.Integer(), nullable=False),
+        sa.Column('variable', sa.String(50), nullable=False),
+        sa.Column('issue_type', sa.String(30), nullable=False),
+        sa.Column('quality', sa.String(20), nullable=False),
+        sa.Column('start_time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('end_time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('points', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('value', sa.Numeric(10, 4), nullable=True),
+        sa.Column('details', sa.String(), nullable=True),
+        sa.Column('detected_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+    )
+    op.create_index('idx_weather_data_issues_start', 'weather_data_issues', ['start_time'])
+    op.create_index('idx_weather_data_issues_station_start', 'weather_data_issues', ['station_id', 'start_time'])
+    op.create_index('idx_weather_data_issues_series', 'weather_data_issues', ['station_id', 'variable', 'start_time'])
+
+    op.execute("UPDATE weather_data SET quality = 'GOOD' WHERE quality = 'good'")
+
+
+def downgrade() -> None:
+    op.drop_index('idx_weather_data_issues_series', table_name='weather_data_issues')
+    op.drop_index('idx_weather_data_issues_station_start', table_name='weather_data_issues')
+    op.drop_index('idx_weather_data_issues_start', table_name='weather_data_issues')
+    op.drop_table('weather_data_issues')
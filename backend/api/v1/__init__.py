@@ -1,4 +1,2 @@
 # app/api/v1/__init__.py
-from api.v1 import auth, blocks, admin, invitations
-
-__all__ = ["auth", "blocks", "admin", "invitations"]
\ No newline at end of file
+# Routers are imported by main.py (see ROUTERS there), only for the enabled groups
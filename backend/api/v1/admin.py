@@ -17,6 +17,7 @@ from schemas.company import Company as CompanySchema
 from schemas.user import User as UserSchema
 from core.email_templates import send_welcome_email
 from services.email_service import UnifiedEmailService
+from core.email_utils import send_admin_welcome_email
 
 router = APIRouter()
 
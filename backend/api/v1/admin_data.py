@@ -4,10 +4,9 @@ from sqlalchemy import func, desc, distinct, and_, or_
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, timezone
 from typing import Optional, List
-from decimal import Decimal
 
 from db.session import get_db
-from db.models.weather import WeatherStation, WeatherData, IngestionLog
+from db.models.weather import WeatherStation, WeatherData, WeatherDataIssue, IngestionLog
 from db.models.climate import ClimateZone, ClimateHistoryMonthly, ClimateBaselineMonthly, ClimateProjection
 from db.models.public_user import PublicUser
 from core.admin_security import require_admin
@@ -29,13 +28,6 @@ router = APIRouter(prefix="/data", tags=["Admin - Data Quality"])
 # CONSTANTS
 # =============================================================================
 
-# Thresholds for data quality checks
-TEMP_MIN_VALID = -20.0   # Celsius - below this is suspicious
-TEMP_MAX_VALID = 50.0    # Celsius - above this is suspicious
-RAIN_MAX_VALID = 200.0   # mm per hour - above this is suspicious
-HUMIDITY_MIN = 0.0
-HUMIDITY_MAX = 100.0
-
 # Gap detection threshold (hours without data = gap)
 GAP_THRESHOLD_HOURS = 6
 
@@ -86,50 +78,19 @@ def detect_gaps(
     return gaps
 
 
-def check_value_quality(variable: str, value: Decimal) -> Optional[dict]:
-    """Check if a value is within valid ranges."""
-    
-    value_float = float(value) if value else None
-    if value_float is None:
-        return None
-    
-    issues = []
-    
-    # Temperature checks
-    if variable in ['temp', 'temp_mean', 'temp_min', 'temp_max', 'tmean', 'tmin', 'tmax']:
-        if value_float < TEMP_MIN_VALID:
-            return {
-                "issue_type": "impossible_value",
-                "details": f"Temperature {value_float}°C below minimum valid ({TEMP_MIN_VALID}°C)"
-            }
-        if value_float > TEMP_MAX_VALID:
-            return {
-                "issue_type": "impossible_value",
-                "details": f"Temperature {value_float}°C above maximum valid ({TEMP_MAX_VALID}°C)"
-            }
-    
-    # Rainfall checks
-    if variable in ['rain', 'rainfall', 'precipitation']:
-        if value_float < 0:
-            return {
-                "issue_type": "impossible_value",
-                "details": f"Negative rainfall value: {value_float}mm"
-            }
-        if value_float > RAIN_MAX_VALID:
-            return {
-                "issue_type": "outlier",
-                "details": f"Rainfall {value_float}mm unusually high (>{RAIN_MAX_VALID}mm)"
-            }
-    
-    # Humidity checks
-    if variable in ['humidity', 'rh', 'relative_humidity']:
-        if value_float < HUMIDITY_MIN or value_float > HUMIDITY_MAX:
-            return {
-                "issue_type": "impossible_value",
-                "details": f"Humidity {value_float}% outside valid range (0-100%)"
-            }
-    
-    return None
+def issue_to_schema(issue: WeatherDataIssue, station_code: Optional[str]) -> DataQualityIssue:
+    return DataQualityIssue(
+        station_id=issue.station_id,
+        station_code=station_code or "unknown",
+        timestamp=issue.start_time,
+        end_timestamp=issue.end_time,
+        points=issue.points,
+        variable=issue.variable,
+        value=issue.value,
+        quality=issue.quality,
+        issue_type=issue.issue_type,
+        details=issue.details or "",
+    )
 
 
 # =============================================================================
@@ -137,7 +98,7 @@ def check_value_quality(variable: str, value: Decimal) -> Optional[dict]:
 # =============================================================================
 
 @router.get("/overview", response_model=DataOverviewResponse)
-async def get_data_overview(
+def get_data_overview(
     db: Session = Depends(get_db),
     admin: PublicUser = Depends(require_admin)
 ):
@@ -266,32 +227,14 @@ async def get_data_overview(
     recent_gaps = recent_gaps[:10]  # Limit total
     
     # Recent quality issues (last 7 days, limit 10)
-    recent_issues = []
-    
-    # Sample recent data for quality checks
-    recent_data = db.query(WeatherData).filter(
-        WeatherData.timestamp >= week_ago
-    ).order_by(desc(WeatherData.timestamp)).limit(1000).all()
-    
-    for record in recent_data:
-        issue = check_value_quality(record.variable, record.value)
-        if issue:
-            station = db.query(WeatherStation).filter(
-                WeatherStation.station_id == record.station_id
-            ).first()
-            
-            recent_issues.append(DataQualityIssue(
-                station_id=record.station_id,
-                station_code=station.station_code if station else "unknown",
-                timestamp=record.timestamp,
-                variable=record.variable,
-                value=record.value,
-                issue_type=issue["issue_type"],
-                details=issue["details"],
-            ))
-            
-            if len(recent_issues) >= 10:
-                break
+    # Flagged at ingestion by services.weather_qc
+    recent_rows = db.query(WeatherDataIssue, WeatherStation.station_code).outerjoin(
+        WeatherStation, WeatherStation.station_id == WeatherDataIssue.station_id
+    ).filter(
+        WeatherDataIssue.start_time >= week_ago
+    ).order_by(desc(WeatherDataIssue.start_time)).limit(10).all()
+    
+    recent_issues = [issue_to_schema(issue, station_code) for issue, station_code in recent_rows]
     
     return DataOverviewResponse(
         weather=weather_overview,
@@ -302,7 +245,7 @@ async def get_data_overview(
 
 
 @router.get("/gaps", response_model=DataGapsResponse)
-async def get_data_gaps(
+def get_data_gaps(
     days: int = Query(7, ge=1, le=30),
     station_id: Optional[int] = Query(None),
     min_gap_hours: float = Query(GAP_THRESHOLD_HOURS, ge=1),
@@ -359,7 +302,7 @@ async def get_data_gaps(
 
 
 @router.get("/quality-issues", response_model=DataQualityResponse)
-async def get_quality_issues(
+def get_quality_issues(
     days: int = Query(7, ge=1, le=30),
     station_id: Optional[int] = Query(None),
     issue_type: Optional[str] = Query(None),
@@ -368,71 +311,44 @@ async def get_quality_issues(
     admin: PublicUser = Depends(require_admin)
 ):
     """
-    Find data quality issues (outliers, impossible values).
+    Data quality issues flagged at ingestion (services.weather_qc): impossible
+    values, outliers, spikes, rate-of-change jumps and flat lines. Each issue is
+    a run of consecutive flagged readings; counts cover every issue in the window.
     """
     now = datetime.now(timezone.utc)
     start_time = now - timedelta(days=days)
     
-    query = db.query(WeatherData).filter(
-        WeatherData.timestamp >= start_time
-    )
-    
+    filters = [WeatherDataIssue.start_time >= start_time]
     if station_id:
-        query = query.filter(WeatherData.station_id == station_id)
-    
-    # Get data to check (sample if large dataset)
-    records = query.order_by(desc(WeatherData.timestamp)).limit(10000).all()
-    
-    issues = []
-    by_type = {}
-    by_station = {}
+        filters.append(WeatherDataIssue.station_id == station_id)
+    if issue_type:
+        filters.append(WeatherDataIssue.issue_type == issue_type)
     
-    # Get station info for display
-    station_ids = list(set(r.station_id for r in records))
-    stations = db.query(WeatherStation).filter(
-        WeatherStation.station_id.in_(station_ids)
-    ).all()
-    station_map = {s.station_id: s.station_code for s in stations}
+    rows = db.query(WeatherDataIssue, WeatherStation.station_code).outerjoin(
+        WeatherStation, WeatherStation.station_id == WeatherDataIssue.station_id
+    ).filter(*filters).order_by(desc(WeatherDataIssue.start_time)).limit(limit).all()
     
-    for record in records:
-        issue = check_value_quality(record.variable, record.value)
-        
-        if issue:
-            # Filter by issue type if specified
-            if issue_type and issue["issue_type"] != issue_type:
-                continue
-            
-            station_code = station_map.get(record.station_id, "unknown")
-            
-            issues.append(DataQualityIssue(
-                station_id=record.station_id,
-                station_code=station_code,
-                timestamp=record.timestamp,
-                variable=record.variable,
-                value=record.value,
-                issue_type=issue["issue_type"],
-                details=issue["details"],
-            ))
-            
-            # Count by type
-            by_type[issue["issue_type"]] = by_type.get(issue["issue_type"], 0) + 1
-            
-            # Count by station
-            by_station[station_code] = by_station.get(station_code, 0) + 1
-            
-            if len(issues) >= limit:
-                break
+    by_type = dict(
+        db.query(WeatherDataIssue.issue_type, func.count()).filter(*filters)
+        .group_by(WeatherDataIssue.issue_type).all()
+    )
+    by_station = {
+        station_code or "unknown": count
+        for station_code, count in db.query(WeatherStation.station_code, func.count()).select_from(WeatherDataIssue).outerjoin(
+            WeatherStation, WeatherStation.station_id == WeatherDataIssue.station_id
+        ).filter(*filters).group_by(WeatherStation.station_code).all()
+    }
     
     return DataQualityResponse(
-        issues=issues,
-        total_issues=len(issues),
+        issues=[issue_to_schema(issue, station_code) for issue, station_code in rows],
+        total_issues=sum(by_type.values()),
         by_type=by_type,
         by_station=by_station,
     )
 
 
 @router.get("/coverage")
-async def get_temporal_coverage(
+def get_temporal_coverage(
     station_id: Optional[int] = Query(None),
     data_source: Optional[str] = Query(None),
     db: Session = Depends(get_db),
@@ -499,7 +415,7 @@ async def get_temporal_coverage(
 
 
 @router.get("/climate/status")
-async def get_climate_data_status(
+def get_climate_data_status(
     db: Session = Depends(get_db),
     admin: PublicUser = Depends(require_admin)
 ):
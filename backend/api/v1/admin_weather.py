@@ -281,7 +281,7 @@ def get_station_variables(db: Session, station_id: int) -> List[str]:
 # =============================================================================
 
 @router.get("/stations/stats", response_model=StationStatsResponse)
-async def get_station_stats(
+def get_station_stats(
     db: Session = Depends(get_db),
     admin: PublicUser = Depends(require_admin)
 ):
@@ -292,11 +292,26 @@ async def get_station_stats(
     day_ago = now - timedelta(hours=24)
     week_ago = now - timedelta(days=7)
     
-    # Total counts
-    total = db.query(func.count(WeatherStation.station_id)).scalar() or 0
-    active = db.query(func.count(WeatherStation.station_id)).filter(
-        WeatherStation.is_active == True
-    ).scalar() or 0
+    # Station counts by active flag, source and region in one grouped query
+    station_counts = db.query(
+        WeatherStation.is_active,
+        WeatherStation.data_source,
+        WeatherStation.region,
+        func.count(WeatherStation.station_id)
+    ).group_by(WeatherStation.is_active, WeatherStation.data_source, WeatherStation.region).all()
+    
+    total = 0
+    active = 0
+    by_source = {}
+    by_region = {}
+    for is_active, data_source, region, count in station_counts:
+        total += count
+        if not is_active:
+            continue
+        active += count
+        by_source[data_source] = by_source.get(data_source, 0) + count
+        region = region or 'unspecified'
+        by_region[region] = by_region.get(region, 0) + count
     
     # Get all active stations and calculate health
     stations = db.query(WeatherStation).filter(WeatherStation.is_active == True).all()
@@ -314,30 +329,15 @@ async def get_station_stats(
         else:
             offline += 1
     
-    # By source
-    source_counts = db.query(
-        WeatherStation.data_source,
-        func.count(WeatherStation.station_id)
-    ).filter(WeatherStation.is_active == True).group_by(WeatherStation.data_source).all()
-    
-    by_source = {s[0]: s[1] for s in source_counts}
-    
-    # By region
-    region_counts = db.query(
-        WeatherStation.region,
-        func.count(WeatherStation.station_id)
-    ).filter(WeatherStation.is_active == True).group_by(WeatherStation.region).all()
-    
-    by_region = {r[0] or 'unspecified': r[1] for r in region_counts}
-    
-    # Record counts (distinct timestamps, not total records)
-    total_records = db.query(func.count(distinct(WeatherData.timestamp))).scalar() or 0
-    records_24h = db.query(func.count(distinct(WeatherData.timestamp))).filter(
-        WeatherData.timestamp >= day_ago
-    ).scalar() or 0
-    records_7d = db.query(func.count(distinct(WeatherData.timestamp))).filter(
-        WeatherData.timestamp >= week_ago
-    ).scalar() or 0
+    # Record counts (distinct timestamps, not total records) in one pass
+    records = db.query(
+        func.count(distinct(WeatherData.timestamp)).label("total"),
+        func.count(distinct(WeatherData.timestamp)).filter(WeatherData.timestamp >= day_ago).label("last_24h"),
+        func.count(distinct(WeatherData.timestamp)).filter(WeatherData.timestamp >= week_ago).label("last_7d")
+    ).one()
+    total_records = records.total or 0
+    records_24h = records.last_24h or 0
+    records_7d = records.last_7d or 0
     
     return StationStatsResponse(
         total_stations=total,
@@ -355,7 +355,7 @@ async def get_station_stats(
 
 
 @router.get("/stations", response_model=StationListResponse)
-async def list_stations(
+def list_stations(
     data_source: Optional[str] = Query(None),
     region: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
@@ -406,7 +406,7 @@ async def list_stations(
             variables_available=variables,
         ))
     
-    stats = await get_station_stats(db=db, admin=admin)
+    stats = get_station_stats(db=db, admin=admin)
     
     return StationListResponse(
         stations=station_items,
@@ -416,7 +416,7 @@ async def list_stations(
 
 
 @router.get("/stations/{station_id}", response_model=StationDetailResponse)
-async def get_station_detail(
+def get_station_detail(
     station_id: int,
     db: Session = Depends(get_db),
     admin: PublicUser = Depends(require_admin)
@@ -494,7 +494,7 @@ async def get_station_detail(
 
 
 @router.get("/stations/{station_id}/health", response_model=StationHealthMetrics)
-async def get_station_health(
+def get_station_health(
     station_id: int,
     db: Session = Depends(get_db),
     admin: PublicUser = Depends(require_admin)
@@ -513,7 +513,7 @@ async def get_station_health(
 
 
 @router.get("/ingestion/logs", response_model=IngestionLogsResponse)
-async def get_ingestion_logs(
+def get_ingestion_logs(
     page: int = Query(1, ge=1),
     page_size: int = Query(25, ge=1, le=100),
     data_source: Optional[str] = Query(None),
@@ -577,7 +577,7 @@ async def get_ingestion_logs(
 
 
 @router.get("/ingestion/summary", response_model=IngestionSummaryResponse)
-async def get_ingestion_summary(
+def get_ingestion_summary(
     days: int = Query(7, ge=1, le=30),
     db: Session = Depends(get_db),
     admin: PublicUser = Depends(require_admin)
@@ -644,7 +644,7 @@ async def get_ingestion_summary(
 
 
 @router.delete("/ingestion/logs/cleanup")
-async def cleanup_old_logs(
+def cleanup_old_logs(
     days_to_keep: int = Query(INGESTION_LOG_RETENTION_DAYS, ge=7, le=90),
     db: Session = Depends(get_db),
     admin: PublicUser = Depends(require_admin)
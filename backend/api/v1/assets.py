@@ -13,9 +13,10 @@ from db.models.contractor import Contractor
 from db.models.company import Company
 from schemas.asset import (
     AssetCreate, AssetUpdate, AssetResponse, AssetSummary, AssetStats,
-    MaintenanceDue, CalibrationDue, ComplianceAlert, StockAlert, CertificationScheme
+    MaintenanceDue, CalibrationDue, ComplianceAlert, StockAlert, CertificationScheme, AssetStatus
 )
 from api.deps import get_current_user, get_current_contractor, get_current_user_or_contractor
+from services.asset_analytics_service import AssetAnalyticsService
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -162,89 +163,17 @@ def get_asset_stats(
     company_id = current_user.company_id
     logger.info(f"Getting asset stats for company {company_id}")
     
-    # Total assets
-    total_assets = db.query(func.count(Asset.id)).filter(
-        Asset.company_id == company_id,
-        Asset.is_active == True
-    ).scalar() or 0
-    
-    # Equipment vs consumables
-    equipment_count = db.query(func.count(Asset.id)).filter(
-        Asset.company_id == company_id,
-        Asset.asset_type == "physical",
-        Asset.is_active == True
-    ).scalar() or 0
-    
-    consumable_count = db.query(func.count(Asset.id)).filter(
-        Asset.company_id == company_id,
-        Asset.asset_type == "consumable",
-        Asset.is_active == True
-    ).scalar() or 0
-    
-    # Assets needing maintenance (simplified check)
-    today = date.today()
-    assets_needing_maintenance = db.query(func.count(func.distinct(AssetMaintenance.asset_id))).filter(
-        AssetMaintenance.company_id == company_id,
-        AssetMaintenance.scheduled_date.isnot(None),
-        AssetMaintenance.scheduled_date < today,  # Overdue
-        AssetMaintenance.status.in_(['scheduled', 'in_progress'])  # Not completed or cancelled
-    ).scalar() or 0
-    
-    # Assets needing calibration (overdue or due soon)
-    assets_requiring_calibration = db.query(Asset).filter(
-        Asset.company_id == company_id,
-        Asset.requires_calibration == True,
-        Asset.calibration_interval_days.isnot(None),
-        Asset.is_active == True
-    ).all()
-    
-    assets_needing_calibration = 0
-    for asset in assets_requiring_calibration:
-        # Get the most recent calibration for this asset
-        latest_calibration = db.query(AssetCalibration).filter(
-            AssetCalibration.asset_id == asset.id,
-            AssetCalibration.company_id == company_id
-        ).order_by(AssetCalibration.calibration_date.desc()).first()
-        
-        if latest_calibration:
-            # Calculate next due date based on last calibration + interval
-            next_due = latest_calibration.calibration_date + timedelta(days=asset.calibration_interval_days)
-            if next_due <= today:
-                assets_needing_calibration += 1
-        else:
-            # No calibration record exists - needs initial calibration
-            assets_needing_calibration += 1
-    
-    # Low stock consumables
-    low_stock_consumables = db.query(func.count(Asset.id)).filter(
-        Asset.company_id == company_id,
-        Asset.asset_type == "consumable",
-        Asset.current_stock <= Asset.minimum_stock,
-        Asset.is_active == True
-    ).scalar() or 0
-    
-    # Compliance alerts (WOF, registration, insurance due within 30 days)
-    today = date.today()
-    thirty_days_from_now = today + timedelta(days=30)
-    compliance_alerts = db.query(func.count(Asset.id)).filter(
-        Asset.company_id == company_id,
-        Asset.is_active == True,
-        or_(
-            and_(Asset.wof_due.isnot(None), Asset.wof_due <= thirty_days_from_now),
-            and_(Asset.registration_expiry.isnot(None), Asset.registration_expiry <= thirty_days_from_now),
-            and_(Asset.insurance_expiry.isnot(None), Asset.insurance_expiry <= thirty_days_from_now)
-        )
-    ).scalar() or 0
-    
-    return AssetStats(
-        total_assets=total_assets,
-        equipment_count=equipment_count,
-        consumable_count=consumable_count,
-        assets_needing_maintenance=assets_needing_maintenance,
-        assets_needing_calibration=assets_needing_calibration,
-        low_stock_consumables=low_stock_consumables,
-        compliance_alerts=compliance_alerts
-    )
+    stats = AssetAnalyticsService.get_stats(db, company_id)
+    return AssetStats(**stats)
+
+@router.get("/status", response_model=List[AssetStatus])
+def get_asset_status(
+    asset_type: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get next-due calibration/maintenance dates and stock status for every active asset"""
+    return AssetAnalyticsService.get_asset_statuses(db, current_user.company_id, asset_type)
 
 @router.get("/compliance-alerts", response_model=List[ComplianceAlert])
 def get_compliance_alerts(
@@ -253,64 +182,8 @@ def get_compliance_alerts(
     current_user: User = Depends(get_current_user)
 ):
     """Get compliance alerts (WOF, registration, insurance expiring soon)"""
-    company_id = current_user.company_id
-    today = date.today()
-    cutoff_date = today + timedelta(days=days_ahead)
-    
-    alerts = []
-    
-    # Query assets with upcoming expiries
-    assets = db.query(Asset).filter(
-        Asset.company_id == company_id,
-        Asset.is_active == True,
-        or_(
-            and_(Asset.wof_due.isnot(None), Asset.wof_due <= cutoff_date),
-            and_(Asset.registration_expiry.isnot(None), Asset.registration_expiry <= cutoff_date),
-            and_(Asset.insurance_expiry.isnot(None), Asset.insurance_expiry <= cutoff_date)
-        )
-    ).all()
-    
-    for asset in assets:
-        # Check WOF
-        if asset.wof_due and asset.wof_due <= cutoff_date:
-            days_until = (asset.wof_due - today).days
-            severity = "critical" if days_until <= 7 else "warning" if days_until <= 14 else "info"
-            alerts.append(ComplianceAlert(
-                asset_id=asset.id,
-                asset_name=asset.name,
-                alert_type="wof_due",
-                due_date=asset.wof_due,
-                days_until_due=days_until,
-                severity=severity
-            ))
-        
-        # Check registration
-        if asset.registration_expiry and asset.registration_expiry <= cutoff_date:
-            days_until = (asset.registration_expiry - today).days
-            severity = "critical" if days_until <= 7 else "warning" if days_until <= 14 else "info"
-            alerts.append(ComplianceAlert(
-                asset_id=asset.id,
-                asset_name=asset.name,
-                alert_type="registration_expiry",
-                due_date=asset.registration_expiry,
-                days_until_due=days_until,
-                severity=severity
-            ))
-        
-        # Check insurance
-        if asset.insurance_expiry and asset.insurance_expiry <= cutoff_date:
-            days_until = (asset.insurance_expiry - today).days
-            severity = "critical" if days_until <= 7 else "warning" if days_until <= 14 else "info"
-            alerts.append(ComplianceAlert(
-                asset_id=asset.id,
-                asset_name=asset.name,
-                alert_type="insurance_expiry",
-                due_date=asset.insurance_expiry,
-                days_until_due=days_until,
-                severity=severity
-            ))
-    
-    return sorted(alerts, key=lambda x: x.days_until_due)
+    alerts = AssetAnalyticsService.get_compliance_alerts(db, current_user.company_id, days_ahead)
+    return [ComplianceAlert(**alert) for alert in alerts]
 
 @router.get("/stock-alerts", response_model=List[StockAlert])
 def get_stock_alerts(
@@ -318,39 +191,8 @@ def get_stock_alerts(
     current_user: User = Depends(get_current_user)
 ):
     """Get stock level alerts for consumables"""
-    company_id = current_user.company_id
-    
-    # Query consumables with stock issues
-    consumables = db.query(Asset).filter(
-        Asset.company_id == company_id,
-        Asset.asset_type == "consumable",
-        Asset.is_active == True,
-        or_(
-            Asset.current_stock <= 0,
-            Asset.current_stock <= Asset.minimum_stock
-        )
-    ).all()
-    
-    alerts = []
-    for asset in consumables:
-        if asset.current_stock <= 0:
-            stock_status = "out_of_stock"
-        elif asset.minimum_stock and asset.current_stock <= asset.minimum_stock:
-            stock_status = "low_stock"
-        else:
-            stock_status = "adequate"
-        
-        if stock_status != "adequate":
-            alerts.append(StockAlert(
-                asset_id=asset.id,
-                asset_name=asset.name,
-                current_stock=asset.current_stock,
-                minimum_stock=asset.minimum_stock or 0,
-                unit_of_measure=asset.unit_of_measure or "units",
-                stock_status=stock_status
-            ))
-    
-    return alerts
+    alerts = AssetAnalyticsService.get_stock_alerts(db, current_user.company_id)
+    return [StockAlert(**alert) for alert in alerts]
 
 @router.get("/{asset_id}", response_model=AssetResponse)
 def get_asset(
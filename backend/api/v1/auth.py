@@ -27,6 +27,7 @@ from schemas.contractor import (
     Contractor as ContractorSchema
 )
 from services.email_service import UnifiedEmailService 
+from core.email_utils import send_verification_email, send_password_reset_email, send_contractor_verification_email
 from jose import JWTError
 
 router = APIRouter()
@@ -1,9 +1,11 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from api.deps import get_current_user
 from db.session import get_db
-from db.models.blockchain import BlockchainChain, FruitReceived
+from db.models.user import User
+from db.models.blockchain import BlockchainChain, BlockchainNode, FruitReceived
 from schemas.blockchain import (
     BlockchainChain as BlockchainChainSchema,
     ChainIntegrityResult,
@@ -30,12 +32,27 @@ def create_chain_for_block(
 @router.get("/chains/{chain_id}/verify", response_model=ChainIntegrityResult)
 def verify_chain_integrity(
     chain_id: int,
+    full: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Verify the integrity of a blockchain"""
-    result = BlockchainService.verify_chain_integrity(db, chain_id)
+    """Verify the integrity of a blockchain (incremental from the last checkpoint unless full=true)"""
+    result = BlockchainService.verify_chain_integrity(db, chain_id, full)
     return result
 
+@router.get("/companies/{company_id}/verify", response_model=List[ChainIntegrityResult])
+def verify_company_chains(
+    company_id: int,
+    full: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    """Verify every blockchain for a company in parallel"""
+    if current_user.role != "admin" and company_id != current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return BlockchainService.verify_company_chains(company_id, full)
+
 @router.get("/chains/by-block/{vineyard_block_id}", response_model=Optional[ChainSummary])
 def get_chain_by_block(
     vineyard_block_id: int,
@@ -52,6 +69,10 @@ def get_chain_by_block(
     
     # Get summary stats
     from sqlalchemy import func
+    node_count = db.query(func.count(BlockchainNode.id)).filter(
+        BlockchainNode.chain_id == chain.id
+    ).scalar() or 0
+    
     fruit_stats = db.query(
         func.count(FruitReceived.id),
         func.sum(FruitReceived.quantity_kg)
@@ -64,7 +85,7 @@ def get_chain_by_block(
         chain_id=chain.id,
         vineyard_block_id=chain.vineyard_block_id,
         chain_name=chain.chain_name,
-        node_count=len(chain.nodes),
+        node_count=node_count,
         genesis_hash=chain.genesis_hash,
         current_head_hash=chain.current_head_hash,
         fruit_received_count=fruit_count,
@@ -88,7 +109,7 @@ def get_provenance_trace(
         BlockchainNode.chain_id == chain.id
     ).order_by(BlockchainNode.sequence_number).all()
     
-    # Verify integrity
+    # Verify integrity - only nodes added since the last checkpoint are rehashed
     integrity_result = BlockchainService.verify_chain_integrity(db, chain.id)
     
     # Summarize key events
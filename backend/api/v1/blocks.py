@@ -12,15 +12,21 @@ from schemas.block import Block, BlockCreate, BlockUpdate
 import logging
 from datetime import datetime
 from services.blockchain_service import BlockchainService
-from pyproj import Geod
+from core.responses import ORJSONResponse, raw_json
 from sqlalchemy import func, cast
 from sqlalchemy.types import UserDefinedType
-GEOD = Geod(ellps="WGS84")
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+@lru_cache(maxsize=1)
+def get_geod():
+    """WGS84 geodesic calculator, created on first use (pyproj is slow to import)"""
+    from pyproj import Geod
+    return Geod(ellps="WGS84")
+
 class Geography(UserDefinedType):
     """Custom type for PostGIS Geography casting"""
     def get_col_spec(self):
@@ -30,7 +36,7 @@ def area_ha(geom) -> float:
     """Return area in hectares for a shapely Polygon/MultiPolygon (WGS84 lon/lat)."""
     if isinstance(geom, (Polygon, MultiPolygon)):
         # geometry_area_perimeter returns signed area in m^2 (negative for clockwise)
-        area_m2, _ = GEOD.geometry_area_perimeter(geom)
+        area_m2, _ = get_geod().geometry_area_perimeter(geom)
         return abs(area_m2) / 10_000.0
     return 0.0
 
@@ -43,39 +49,47 @@ def get_all_blocks_geojson(
     """
     Get all blocks as GeoJSON FeatureCollection for map display
     """
-    blocks = db.query(VineyardBlock).all()
+    # PostGIS renders each geometry; it's embedded in the response without re-parsing
+    rows = db.query(
+        VineyardBlock.id,
+        VineyardBlock.block_name,
+        VineyardBlock.variety,
+        VineyardBlock.area,
+        VineyardBlock.region,
+        VineyardBlock.winery,
+        VineyardBlock.organic,
+        VineyardBlock.planted_date,
+        VineyardBlock.company_id,
+        VineyardBlock.centroid_longitude,
+        VineyardBlock.centroid_latitude,
+        func.ST_AsGeoJSON(VineyardBlock.geometry).label("geometry_json")
+    ).filter(VineyardBlock.geometry.isnot(None)).all()
     
-    features = []
-    for block in blocks:
-        if block.geometry:
-            try:
-                shape = to_shape(block.geometry)
-                feature = {
-                    "type": "Feature",
-                    "geometry": mapping(shape),
-                    "properties": {
-                        "id": block.id,
-                        "block_name": block.block_name,
-                        "variety": block.variety,
-                        "area": block.area,
-                        "region": block.region,
-                        "winery": block.winery,
-                        "organic": block.organic,
-                        "planted_date": str(block.planted_date) if block.planted_date else None,
-                        "company_id": block.company_id,
-                        "centroid_longitude": block.centroid_longitude,
-                        "centroid_latitude": block.centroid_latitude
-                    }
-                }
-                features.append(feature)
-            except Exception as e:
-                logger.error(f"Error processing block {block.id} geometry: {e}")
-                continue
+    features = [
+        {
+            "type": "Feature",
+            "geometry": raw_json(row.geometry_json),
+            "properties": {
+                "id": row.id,
+                "block_name": row.block_name,
+                "variety": row.variety,
+                "area": row.area,
+                "region": row.region,
+                "winery": row.winery,
+                "organic": row.organic,
+                "planted_date": str(row.planted_date) if row.planted_date else None,
+                "company_id": row.company_id,
+                "centroid_longitude": row.centroid_longitude,
+                "centroid_latitude": row.centroid_latitude
+            }
+        }
+        for row in rows
+    ]
     
-    return {
+    return ORJSONResponse({
         "type": "FeatureCollection",
         "features": features
-    }
+    })
 
 @router.get("/company")
 def get_company_blocks(
@@ -1128,8 +1142,8 @@ def analyse_vineyard_clusters(
             if block.centroid_longitude and block.centroid_latitude and \
                other_block.centroid_longitude and other_block.centroid_latitude:
                 
-                # Use pyproj GEOD for accurate distance
-                _, _, distance_m = GEOD.inv(
+                # Geodesic distance (pyproj)
+                _, _, distance_m = get_geod().inv(
                     block.centroid_longitude, block.centroid_latitude,
                     other_block.centroid_longitude, other_block.centroid_latitude
                 )
@@ -5,26 +5,27 @@ Returns block metadata WITHOUT geometry to prevent scraping.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request, BackgroundTasks, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, timedelta
 from collections import defaultdict
 import logging
-import smtplib
 import json
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-import os
-from api.deps import get_db
+from db.session import get_async_db
+from core.email_utils import email_service, render_email_template
 from core.public_security import get_current_public_user
 from db.models.public_user import PublicUser
+from services.block_index import block_index, block_response
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["public-blocks"])
 
+# Equal to the per-minute rate limit, so a full batch is always admissible
+MAX_BATCH_POINTS = 30
+
 # ============================================================================
 # PYDANTIC SCHEMAS
 # ============================================================================
@@ -54,6 +55,21 @@ class BlockQueryResponse(BaseModel):
         from_attributes = True
 
 
+class BlockPoint(BaseModel):
+    lng: float = Field(..., ge=-180, le=180)
+    lat: float = Field(..., ge=-90, le=90)
+
+
+class BlockBatchQuery(BaseModel):
+    """Several points looked up at once (each point counts against the rate limit)"""
+    points: List[BlockPoint] = Field(..., min_length=1, max_length=MAX_BATCH_POINTS)
+
+
+class BlockBatchResponse(BaseModel):
+    """One entry per requested point, in order; null where no block contains it"""
+    results: List[Optional[BlockQueryResponse]]
+
+
 class ClickLog(BaseModel):
     """Log entry for click tracking"""
     user_id: int
@@ -179,9 +195,10 @@ class RateLimiter:
     def __init__(self):
         self.requests = defaultdict(list)  # {user_id: [timestamp, ...]}
     
-    def check_rate_limit(self, user_id: int, max_per_minute: int = 30, max_per_hour: int = 200):
+    def check_rate_limit(self, user_id: int, max_per_minute: int = 30, max_per_hour: int = 200, cost: int = 1):
         """
         Check if user has exceeded rate limits.
+        cost is the number of lookups this request makes (batch queries count each point).
         Returns (allowed: bool, retry_after: Optional[int])
         """
         now = datetime.now()
@@ -197,16 +214,16 @@ class RateLimiter:
         recent_minute = sum(1 for t in self.requests[user_id] if t > cutoff_minute)
         recent_hour = len(self.requests[user_id])
         
-        if recent_minute >= max_per_minute:
+        if recent_minute + cost > max_per_minute:
             retry_after = 60  # Wait 1 minute
             return False, retry_after
         
-        if recent_hour >= max_per_hour:
+        if recent_hour + cost > max_per_hour:
             retry_after = 3600  # Wait 1 hour
             return False, retry_after
         
         # Record this request
-        self.requests[user_id].append(now)
+        self.requests[user_id].extend([now] * cost)
         
         return True, None
 
@@ -345,71 +362,42 @@ WHERE id = {issue.block_id};
 """
 
 
-# Add this function for sending emails:
+ISSUE_REPORT_RECIPIENT = "insights@auxein.co.nz"
 
-async def send_issue_report_email(issue: IssueReport, user_email: str):
-    """
-    Send email notification about reported issue.
-    Uses environment variables for SMTP configuration.
-    """
-    
-    # Email configuration from environment
-    smtp_host = os.getenv("SMTP_HOST", "smtp.gmail.com")
-    smtp_port = int(os.getenv("SMTP_PORT", "587"))
-    smtp_user = os.getenv("SMTP_USER", "")
-    smtp_password = os.getenv("SMTP_PASSWORD", "")
-    from_email = os.getenv("FROM_EMAIL", smtp_user)
-    to_email = "insights@auxein.co.nz"
-    
-    if not smtp_user or not smtp_password:
-        logger.warning("SMTP credentials not configured. Email notification skipped.")
-        return
-    
-    # Generate SQL script
-    sql_script = generate_sql_update(issue)
-    
-    # Create email
-    msg = MIMEMultipart('alternative')
-    msg['Subject'] = f"Block Data Issue Report: {issue.block_name}"
-    msg['From'] = from_email
-    msg['To'] = to_email
-    msg['Reply-To'] = user_email
-    
-    # Email body
-    text_body = f"""
+ISSUE_REPORT_TEXT_TEMPLATE = """
 Block Data Issue Report
 
-Block ID: {issue.block_id}
-Block Name: {issue.block_name}
-Issue Type: {issue.issue_type.replace('_', ' ').title()}
-Description: {issue.description}
+Block ID: {{ issue.block_id }}
+Block Name: {{ issue.block_name }}
+Issue Type: {{ issue_type_label }}
+Description: {{ issue.description }}
 
-Reported By: {user_email}
-Reported At: {issue.reported_at}
+Reported By: {{ user_email }}
+Reported At: {{ issue.reported_at }}
 
 --- SQL UPDATE SCRIPT ---
-{sql_script}
+{{ sql_script }}
 ---
 
 You can copy the SQL script above and run it in pgAdmin or your SQL client after verifying the correction.
 
-To reply to the user, use: {user_email}
+To reply to the user, use: {{ user_email }}
 """
-    
-    html_body = f"""
+
+ISSUE_REPORT_HTML_TEMPLATE = """
 <!DOCTYPE html>
 <html>
 <head>
     <style>
-        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }}
-        .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-        .header {{ background: #22c55e; color: white; padding: 20px; border-radius: 8px 8px 0 0; }}
-        .content {{ background: #f9fafb; padding: 20px; border-radius: 0 0 8px 8px; }}
-        .field {{ margin-bottom: 15px; }}
-        .label {{ font-weight: 600; color: #6b7280; font-size: 12px; text-transform: uppercase; }}
-        .value {{ color: #1f2937; font-size: 15px; margin-top: 4px; }}
-        .sql-script {{ background: #1f2937; color: #f0fdf4; padding: 20px; border-radius: 6px; font-family: 'Courier New', monospace; font-size: 13px; overflow-x: auto; margin: 20px 0; }}
-        .footer {{ margin-top: 20px; padding-top: 20px; border-top: 1px solid #e5e7eb; font-size: 13px; color: #6b7280; }}
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: #22c55e; color: white; padding: 20px; border-radius: 8px 8px 0 0; }
+        .content { background: #f9fafb; padding: 20px; border-radius: 0 0 8px 8px; }
+        .field { margin-bottom: 15px; }
+        .label { font-weight: 600; color: #6b7280; font-size: 12px; text-transform: uppercase; }
+        .value { color: #1f2937; font-size: 15px; margin-top: 4px; }
+        .sql-script { background: #1f2937; color: #f0fdf4; padding: 20px; border-radius: 6px; font-family: 'Courier New', monospace; font-size: 13px; overflow-x: auto; margin: 20px 0; }
+        .footer { margin-top: 20px; padding-top: 20px; border-top: 1px solid #e5e7eb; font-size: 13px; color: #6b7280; }
     </style>
 </head>
 <body>
@@ -420,60 +408,66 @@ To reply to the user, use: {user_email}
         <div class="content">
             <div class="field">
                 <div class="label">Block ID</div>
-                <div class="value">{issue.block_id}</div>
+                <div class="value">{{ issue.block_id }}</div>
             </div>
             <div class="field">
                 <div class="label">Block Name</div>
-                <div class="value">{issue.block_name}</div>
+                <div class="value">{{ issue.block_name }}</div>
             </div>
             <div class="field">
                 <div class="label">Issue Type</div>
-                <div class="value">{issue.issue_type.replace('_', ' ').title()}</div>
+                <div class="value">{{ issue_type_label }}</div>
             </div>
             <div class="field">
                 <div class="label">Description</div>
-                <div class="value">{issue.description}</div>
+                <div class="value">{{ issue.description }}</div>
             </div>
             <div class="field">
                 <div class="label">Reported By</div>
-                <div class="value">{user_email}</div>
+                <div class="value">{{ user_email }}</div>
             </div>
             <div class="field">
                 <div class="label">Reported At</div>
-                <div class="value">{issue.reported_at}</div>
+                <div class="value">{{ issue.reported_at }}</div>
             </div>
             
             <h3>SQL Update Script</h3>
             <p>Copy and paste this script into pgAdmin or your SQL client:</p>
-            <div class="sql-script">{sql_script}</div>
+            <div class="sql-script">{{ sql_script }}</div>
             
             <div class="footer">
-                <p>You can reply directly to <strong>{user_email}</strong> to follow up on this report.</p>
+                <p>You can reply directly to <strong>{{ user_email }}</strong> to follow up on this report.</p>
             </div>
         </div>
     </div>
 </body>
 </html>
 """
+
+
+def send_issue_report_email(issue: IssueReport, user_email: str):
+    """
+    Queue an email notification about a reported issue.
+    Delivery happens in the mail queue worker, so this returns without touching SMTP.
+    """
+    context = {
+        "issue": issue,
+        "issue_type_label": issue.issue_type.replace('_', ' ').title(),
+        "user_email": user_email,
+        "sql_script": generate_sql_update(issue),
+    }
     
-    # Attach both plain text and HTML versions
-    part1 = MIMEText(text_body, 'plain')
-    part2 = MIMEText(html_body, 'html')
-    msg.attach(part1)
-    msg.attach(part2)
-    
-    # Send email
-    try:
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            server.starttls()
-            server.login(smtp_user, smtp_password)
-            server.send_message(msg)
-        
-        logger.info(f"Issue report email sent successfully for block {issue.block_id}")
+    queued = email_service.send_email(
+        to_email=ISSUE_REPORT_RECIPIENT,
+        subject=f"Block Data Issue Report: {issue.block_name}",
+        html_content=render_email_template(ISSUE_REPORT_HTML_TEMPLATE, **context),
+        text_content=render_email_template(ISSUE_REPORT_TEXT_TEMPLATE, autoescape=False, **context),
+        reply_to=user_email,
+        template="issue_report"
+    )
     
-    except Exception as e:
-        logger.error(f"Failed to send issue report email: {str(e)}")
-        # Don't raise - email failure shouldn't block the API response
+    if queued:
+        logger.info(f"Issue report email queued for block {issue.block_id}")
 
 
 
@@ -482,34 +476,30 @@ To reply to the user, use: {user_email}
 # API ENDPOINTS
 # ============================================================================
 
-@router.get("/query", response_model=BlockQueryResponse)
-async def query_block_at_point(
-    lng: float = Query(..., description="Longitude (e.g., 172.1234)", ge=-180, le=180),
-    lat: float = Query(..., description="Latitude (e.g., -41.5678)", ge=-90, le=90),
-    current_user: PublicUser = Depends(get_current_public_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Find which vineyard block contains the clicked point.
-    
-    Security features:
-    - Authentication required (JWT token)
-    - Rate limited (30/min, 200/hour)
-    - Grid scanning detection
-    - NO GEOMETRY returned (prevents scraping)
-    - Click tracking for monitoring
-    
-    Returns:
-    - Block metadata if point is inside a block
-    - 404 if point is outside all blocks
-    - 429 if rate limit exceeded
-    - 403 if suspicious activity detected
-    """
-    
+BLOCK_QUERY_COLUMNS = """
+    id,
+    block_name,
+    variety,
+    area,
+    region,
+    gi,
+    planted_date,
+    elevation,
+    winery,
+    organic,
+    biodynamic,
+    regenerative,
+    swnz,
+    EXTRACT(YEAR FROM AGE(COALESCE(removed_date, CURRENT_DATE), planted_date))::INTEGER as age_years
+"""
+
+
+def enforce_query_limits(current_user: PublicUser, cost: int = 1):
+    """Rate limit and grid-scan checks shared by the single and batch point queries"""
     # ========================================================================
     # SECURITY: Rate Limiting
     # ========================================================================
-    allowed, retry_after = rate_limiter.check_rate_limit(current_user.id)
+    allowed, retry_after = rate_limiter.check_rate_limit(current_user.id, cost=cost)
     
     if not allowed:
         logger.warning(f"Rate limit exceeded for user {current_user.id} ({current_user.email})")
@@ -528,62 +518,123 @@ async def query_block_at_point(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Suspicious activity detected. Your account has been flagged for review."
         )
-    
-    # ========================================================================
-    # QUERY: Point-in-Polygon (PostGIS)
-    # ========================================================================
-    try:
-        # Use PostGIS ST_Contains to find block containing this point
-        # ST_Contains is indexed and very fast (microseconds)
-        query = text("""
-            SELECT 
-                id,
-                block_name,
-                variety,
-                area,
-                region,
-                gi,
-                planted_date,
-                elevation,
-                winery,
-                organic,
-                biodynamic,
-                regenerative,
-                swnz,
-                EXTRACT(YEAR FROM AGE(COALESCE(removed_date, CURRENT_DATE), planted_date))::INTEGER as age_years
+
+
+async def find_block_at_point(db: AsyncSession, lng: float, lat: float) -> Optional[dict]:
+    """In-memory index when loaded, otherwise PostGIS ST_Contains"""
+    if block_index.ready:
+        block = block_index.lookup(lng, lat)
+        return block_response(block) if block else None
+
+    query = text(f"""
+        SELECT {BLOCK_QUERY_COLUMNS}
+        FROM vineyard_blocks
+        WHERE 
+            geometry IS NOT NULL
+            AND ST_Contains(
+                geometry, 
+                ST_SetSRID(ST_Point(:lng, :lat), 4326)
+            )
+        ORDER BY id
+        LIMIT 1
+    """)
+    result = (await db.execute(query, {"lng": lng, "lat": lat})).fetchone()
+    if result is None:
+        return None
+
+    block_data = dict(result._mapping)
+    if block_data.get('planted_date'):
+        block_data['planted_date'] = block_data['planted_date'].isoformat()
+    return block_data
+
+
+async def find_blocks_at_points(db: AsyncSession, points: List[BlockPoint]) -> List[Optional[dict]]:
+    """find_block_at_point for many points; the fallback is one LATERAL query"""
+    if block_index.ready:
+        return [
+            block_response(block) if block else None
+            for block in block_index.lookup_many([(p.lng, p.lat) for p in points])
+        ]
+
+    query = text(f"""
+        SELECT p.idx, b.*
+        FROM unnest(CAST(:lngs AS float8[]), CAST(:lats AS float8[])) WITH ORDINALITY AS p(lng, lat, idx)
+        CROSS JOIN LATERAL (
+            SELECT {BLOCK_QUERY_COLUMNS}
             FROM vineyard_blocks
             WHERE 
                 geometry IS NOT NULL
                 AND ST_Contains(
                     geometry, 
-                    ST_SetSRID(ST_Point(:lng, :lat), 4326)
+                    ST_SetSRID(ST_Point(p.lng, p.lat), 4326)
                 )
+            ORDER BY id
             LIMIT 1
-        """)
-        
-        result = db.execute(query, {"lng": lng, "lat": lat}).fetchone()
+        ) b
+    """)
+    rows = (await db.execute(query, {
+        "lngs": [p.lng for p in points],
+        "lats": [p.lat for p in points]
+    })).fetchall()
+
+    results: List[Optional[dict]] = [None] * len(points)
+    for row in rows:
+        block_data = dict(row._mapping)
+        idx = block_data.pop('idx')
+        if block_data.get('planted_date'):
+            block_data['planted_date'] = block_data['planted_date'].isoformat()
+        results[idx - 1] = block_data
+    return results
+
+
+@router.get("/query", response_model=BlockQueryResponse)
+async def query_block_at_point(
+    lng: float = Query(..., description="Longitude (e.g., 172.1234)", ge=-180, le=180),
+    lat: float = Query(..., description="Latitude (e.g., -41.5678)", ge=-90, le=90),
+    current_user: PublicUser = Depends(get_current_public_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Find which vineyard block contains the clicked point.
+    
+    Security features:
+    - Authentication required (JWT token)
+    - Rate limited (30/min, 200/hour)
+    - Grid scanning detection
+    - NO GEOMETRY returned (prevents scraping)
+    - Click tracking for monitoring
+    
+    Lookups are answered from the in-process block index (services.block_index),
+    falling back to PostGIS until it has loaded.
+    
+    Returns:
+    - Block metadata if point is inside a block
+    - 404 if point is outside all blocks
+    - 429 if rate limit exceeded
+    - 403 if suspicious activity detected
+    """
+    enforce_query_limits(current_user)
+    
+    # ========================================================================
+    # QUERY: Point-in-Polygon
+    # ========================================================================
+    try:
+        block_data = await find_block_at_point(db, lng, lat)
         
         # Track this click
         click_tracker.add_click(
             user_id=current_user.id,
             lng=lng,
             lat=lat,
-            found_block=result is not None
+            found_block=block_data is not None
         )
         
-        if result is None:
+        if block_data is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No vineyard block found at this location"
             )
         
-        # Convert Row to dict
-        block_data = dict(result._mapping)
-        
-        # Format date as string if present
-        if block_data.get('planted_date'):
-            block_data['planted_date'] = block_data['planted_date'].isoformat()
-        
         logger.info(
             f"User {current_user.id} queried block {block_data['id']} "
             f"({block_data.get('block_name', 'Unnamed')}) at ({lng:.4f}, {lat:.4f})"
@@ -601,10 +652,55 @@ async def query_block_at_point(
         )
 
 
+@router.post("/query/batch", response_model=BlockBatchResponse)
+async def query_blocks_at_points(
+    batch: BlockBatchQuery,
+    current_user: PublicUser = Depends(get_current_public_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Look up the blocks containing several points in one request
+    (e.g. buffered hover positions from the map).
+    
+    Same protections as /query: every point counts against the rate limit
+    and is recorded for grid scanning detection.
+    """
+    enforce_query_limits(current_user, cost=len(batch.points))
+    
+    try:
+        results = await find_blocks_at_points(db, batch.points)
+        
+        for point, block_data in zip(batch.points, results):
+            click_tracker.add_click(
+                user_id=current_user.id,
+                lng=point.lng,
+                lat=point.lat,
+                found_block=block_data is not None
+            )
+        
+        logger.info(
+            f"User {current_user.id} batch-queried {len(batch.points)} points, "
+            f"{sum(1 for r in results if r is not None)} in blocks"
+        )
+        
+        return BlockBatchResponse(
+            results=[BlockQueryResponse(**r) if r is not None else None for r in results]
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error batch querying blocks: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error querying vineyard blocks"
+        )
+
+
 @router.get("/stats")
 async def get_public_stats(
     current_user: PublicUser = Depends(get_current_public_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get public statistics about vineyard blocks (no sensitive data).
@@ -624,7 +720,7 @@ async def get_public_stats(
             WHERE geometry IS NOT NULL
         """)
         
-        result = db.execute(query).fetchone()
+        result = (await db.execute(query)).fetchone()
         
         return {
             "total_blocks": result.total_blocks,
@@ -649,7 +745,7 @@ async def get_public_stats(
 @router.get("/regions")
 async def get_regions(
     current_user: PublicUser = Depends(get_current_public_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get list of wine regions with bounding boxes for map navigation.
@@ -672,7 +768,7 @@ async def get_regions(
             ORDER BY total_area_ha DESC
         """)
         
-        results = db.execute(query).fetchall()
+        results = (await db.execute(query)).fetchall()
         
         regions = []
         for row in results:
@@ -702,7 +798,7 @@ async def report_block_issue(
     issue: IssueReport,
     background_tasks: BackgroundTasks,
     current_user: PublicUser = Depends(get_current_public_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Report a data issue with a vineyard block.
@@ -736,7 +832,7 @@ async def report_block_issue(
     # Check if block exists
     try:
         query = text("SELECT id, block_name FROM vineyard_blocks WHERE id = :block_id")
-        result = db.execute(query, {"block_id": issue.block_id}).fetchone()
+        result = (await db.execute(query, {"block_id": issue.block_id})).fetchone()
         
         if not result:
             raise HTTPException(
@@ -774,7 +870,7 @@ async def report_block_issue(
 @router.get("/geojson")
 async def get_blocks_geojson(
     current_user: PublicUser = Depends(get_current_public_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all vineyard blocks as GeoJSON for map rendering.
@@ -815,7 +911,7 @@ async def get_blocks_geojson(
                 AND ST_IsValid(geometry)
         """)
         
-        results = db.execute(query).fetchall()
+        results = (await db.execute(query)).fetchall()
         
         # Build GeoJSON FeatureCollection
         features = []
@@ -857,7 +953,7 @@ async def get_blocks_geojson(
 async def get_block_by_id(
     block_id: int,
     current_user: PublicUser = Depends(get_current_public_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get details for a single vineyard block by ID.
@@ -901,7 +997,7 @@ async def get_block_by_id(
             WHERE id = :block_id
         """)
         
-        result = db.execute(query, {"block_id": block_id}).fetchone()
+        result = (await db.execute(query, {"block_id": block_id})).fetchone()
         
         if result is None:
             raise HTTPException(
@@ -16,6 +16,7 @@ from schemas.asset import (
     CalibrationCreate, CalibrationUpdate, CalibrationResponse, CalibrationDue
 )
 from api.deps import get_current_user, get_current_contractor, get_current_user_or_contractor
+from services.asset_analytics_service import AssetAnalyticsService
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -156,70 +157,22 @@ def get_calibrations_due(
 ):
     """Get calibrations that are due or coming due"""
     company_id = current_user.company_id
-    today = date.today()
-    future_date = today + timedelta(days=days_ahead)
-    
     logger.info(f"Getting calibrations due for company {company_id}")
     
-    # Get assets that require calibration
-    assets_requiring_calibration = db.query(Asset).filter(
-        Asset.company_id == company_id,
-        Asset.requires_calibration == True,
-        Asset.is_active == True
-    ).all()
-    
-    due_items = []
-    
-    for asset in assets_requiring_calibration:
-        # Get the most recent calibration for this asset
-        latest_calibration = db.query(AssetCalibration).filter(
-            AssetCalibration.asset_id == asset.id
-        ).order_by(desc(AssetCalibration.calibration_date)).first()
-        
-        due_date = None
-        last_calibration_date = None
-        days_overdue = None
-        
-        if latest_calibration:
-            last_calibration_date = latest_calibration.calibration_date
-            if latest_calibration.next_due_date:
-                due_date = latest_calibration.next_due_date
-        else:
-            # Never been calibrated - due immediately if asset requires it
-            due_date = today
-        
-        # If no due date but asset has calibration interval, calculate it
-        if not due_date and asset.calibration_interval_days:
-            if last_calibration_date:
-                due_date = last_calibration_date + timedelta(days=asset.calibration_interval_days)
-            else:
-                # Default to due now if never calibrated
-                due_date = today
-        
-        # Check if it's due within our window or overdue
-        if due_date:
-            if include_overdue and due_date <= future_date:
-                should_include = True
-            elif not include_overdue and today <= due_date <= future_date:
-                should_include = True
-            else:
-                should_include = False
-            
-            if should_include:
-                if due_date < today:
-                    days_overdue = (today - due_date).days
-                
-                due_items.append(CalibrationDue(
-                    asset_id=asset.id,
-                    asset_name=asset.name,
-                    calibration_type=asset.category,  # Use category as default calibration type
-                    last_calibration=last_calibration_date,
-                    due_date=due_date,
-                    days_overdue=days_overdue
-                ))
+    due_items = AssetAnalyticsService.get_calibrations_due(db, company_id, days_ahead, include_overdue)
     
     # Sort by due date (overdue first, then upcoming)
-    return sorted(due_items, key=lambda x: (x.due_date, x.days_overdue or 0))
+    return [
+        CalibrationDue(
+            asset_id=item["asset_id"],
+            asset_name=item["asset_name"],
+            calibration_type=item["category"],  # Use category as default calibration type
+            last_calibration=item["last_calibration_date"],
+            due_date=item["due_date"],
+            days_overdue=item["days_overdue"]
+        )
+        for item in due_items
+    ]
 
 @router.get("/{calibration_id}", response_model=CalibrationResponse)
 def get_calibration_record(
@@ -1,10 +1,9 @@
 # api/v1/climate.py
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, BackgroundTasks
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, and_, extract, desc
 from datetime import date, datetime, timedelta
-import pandas as pd
 import io
 import logging
 
@@ -19,6 +18,9 @@ from schemas.climate import (
 )
 from services.climate_calculations import ClimateCalculations
 
+if TYPE_CHECKING:
+    import pandas as pd  # Imported in the CSV handlers only - it adds ~0.5s to API startup
+
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
@@ -301,6 +303,8 @@ async def import_csv_climate_data(
     
     try:
         # Read CSV content
+        import pandas as pd
+
         content = await file.read()
         df = pd.read_csv(io.StringIO(content.decode('utf-8')))
         
@@ -331,8 +335,10 @@ async def import_csv_climate_data(
         logger.error(f"CSV import failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"CSV import failed: {str(e)}")
 
-def process_climate_csv(df: pd.DataFrame, block_id: int, db: Session):
+def process_climate_csv(df: "pd.DataFrame", block_id: int, db: Session):
     """Background task to process CSV data"""
+    import pandas as pd
+
     imported_count = 0
     skipped_count = 0
     errors = []
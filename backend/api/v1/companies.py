@@ -13,9 +13,7 @@ from schemas.company import (
 from api.deps import get_db, get_current_user, get_current_contractor, get_current_user_or_contractor
 from db.models.user import User
 from db.models.contractor import Contractor
-from db.models.block import VineyardBlock
-from db.models.observation_run import ObservationRun
-from db.models.task import Task, TaskStatus
+from services.company_counters import BYTES_PER_GB, CompanyCounterService
 
 import logging
 logger = logging.getLogger(__name__)
@@ -367,48 +365,10 @@ def get_current_company_stats(
     
     logger.info(f"Found company: {company.name} with subscription: {company.subscription.display_name}")
     
-    # --- Vineyard blocks ---
-    block_count = 0
-    try:
-        block_count = db.query(func.count(VineyardBlock.id)).filter(
-            VineyardBlock.company_id == company_id
-        ).scalar() or 0
-    except Exception as e:
-        logger.warning(f"Error counting blocks: {e}")
-    
-    # --- Observations (runs) ---
-    observation_count = 0
-    try:
-        observation_count = db.query(func.count(ObservationRun.id)).filter(
-            ObservationRun.company_id == company_id
-        ).scalar() or 0
-    except Exception as e:
-        logger.warning(f"Error counting observation runs: {e}")
-    
-    # --- Company users ---
-    company_users = []
-    company_user_ids = []
-    try:
-        company_users = db.query(User).filter(
-            User.company_id == company_id
-        ).all()
-        company_user_ids = [user.id for user in company_users]
-    except Exception as e:
-        logger.warning(f"Error getting company users: {e}")
-    
-    # --- Tasks (open/in-progress for this company) ---
-    task_count = 0
-    try:
-        task_count = db.query(func.count(Task.id)).filter(
-            Task.company_id == company_id,
-            Task.status != TaskStatus.completed,
-            Task.status != TaskStatus.cancelled
-        ).scalar() or 0
-    except Exception as e:
-        logger.warning(f"Error counting tasks: {e}")
-    
-    # Team members
-    user_count = len(company_users)
+    # Blocks, observation runs, open tasks, team members and storage: one row
+    counters = CompanyCounterService.get(db, company_id)
+    user_count = counters.user_count
+    storage_used_gb = round(counters.storage_bytes / BYTES_PER_GB, 3)
     
     # Subscription limits
     subscription = company.subscription
@@ -422,7 +382,11 @@ def get_current_company_stats(
     except Exception as e:
         logger.warning(f"Error calculating user usage percentage: {e}")
     
-    storage_usage_percent = 0.0  # TODO: Calculate actual storage usage
+    storage_usage_percent = 0.0
+    try:
+        storage_usage_percent = subscription.get_usage_percentage(storage_used_gb, 'max_storage_gb')
+    except Exception as e:
+        logger.warning(f"Error calculating storage usage percentage: {e}")
     
     # Enabled features
     enabled_features = []
@@ -433,11 +397,12 @@ def get_current_company_stats(
     
     result = {
         # Core stats
-        "block_count": block_count,
-        "observation_count": observation_count,
-        "task_count": task_count,
+        "block_count": counters.block_count,
+        "observation_count": counters.observation_run_count,
+        "task_count": counters.open_task_count,
         "user_count": user_count,
-        "storage_used_gb": 0.0,  # TODO: Calculate actual storage usage
+        "asset_count": counters.asset_count,
+        "storage_used_gb": storage_used_gb,
         
         # Limits from subscription
         "max_users": max_users,
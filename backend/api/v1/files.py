@@ -3,8 +3,8 @@ import os
 import uuid
 import logging
 from typing import List, Optional, Union
-from datetime import date, datetime
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File as FastAPIFile, Form
+from datetime import datetime
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status, UploadFile, File as FastAPIFile, Form
 from fastapi.responses import FileResponse as FastAPIFileResponse
 from sqlalchemy.orm import Session
 from pathlib import Path
@@ -20,22 +20,27 @@ from schemas.file import (
     FileSummary, FileEntityType, FileCategory
 )
 from api.deps import get_current_user, get_current_contractor, get_current_user_or_contractor
+from services.file_storage import FileStorage, FileTooLargeError
+from services.image_derivatives import (
+    DEFAULT_SIZE, DERIVABLE_MIME_TYPES, DERIVATIVE_SIZES, FORMATS, ImageDerivatives,
+    bucket_size, derivative_cache, negotiate_format
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # Allowed file types and size limits
 ALLOWED_EXTENSIONS = {
-    'image': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'],
+    'image': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tif', '.tiff'],
     'document': ['.pdf', '.doc', '.docx', '.txt', '.rtf'],
     'spreadsheet': ['.xls', '.xlsx', '.csv'],
     'video': ['.mp4', '.avi', '.mov', '.wmv', '.flv'],
     'archive': ['.zip', '.rar', '.7z', '.tar']
 }
 
-MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+MAX_FILE_SIZE = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024  # Enforced while streaming to disk
 ALLOWED_MIME_TYPES = {
-    'image/jpeg', 'image/png', 'image/gif', 'image/bmp', 'image/webp',
+    'image/jpeg', 'image/png', 'image/gif', 'image/bmp', 'image/webp', 'image/tiff',
     'application/pdf', 'application/msword', 
     'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
     'text/plain', 'text/rtf',
@@ -47,8 +52,8 @@ ALLOWED_MIME_TYPES = {
 }
 
 def validate_file(file: UploadFile) -> None:
-    """Validate file type and size"""
-    if file.size > MAX_FILE_SIZE:
+    """Validate file type and declared size - the actual size is enforced while streaming"""
+    if file.size is not None and file.size > MAX_FILE_SIZE:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=f"File size {file.size} exceeds maximum allowed size of {MAX_FILE_SIZE} bytes"
@@ -74,28 +79,9 @@ def validate_file(file: UploadFile) -> None:
             detail=f"File extension {file_ext} is not allowed"
         )
 
-def create_upload_directory(company_id: int, entity_type: str) -> Path:
-    """Create upload directory structure"""
-    today = date.today()
-    upload_path = Path(settings.UPLOAD_DIR) / str(company_id) / entity_type / str(today.year) / f"{today.month:02d}"
-    upload_path.mkdir(parents=True, exist_ok=True)
-    return upload_path
-
-def save_uploaded_file(file: UploadFile, file_path: Path) -> None:
-    """Save uploaded file to disk"""
-    try:
-        with open(file_path, "wb") as buffer:
-            content = file.file.read()
-            buffer.write(content)
-    except Exception as e:
-        logger.error(f"Error saving file {file_path}: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to save file"
-        )
-
 @router.post("/upload", response_model=FileUploadResponse)
-async def upload_file(
+def upload_file(
+    background_tasks: BackgroundTasks,
     entity_type: FileEntityType = Form(...),
     entity_id: int = Form(...),
     file_category: FileCategory = Form(FileCategory.document),
@@ -104,7 +90,11 @@ async def upload_file(
     db: Session = Depends(get_db),
     current_user_or_contractor: Union[User, Contractor] = Depends(get_current_user_or_contractor)
 ):
-    """Upload a file and associate it with an entity"""
+    """
+    Upload a file and associate it with an entity.
+    The content is streamed to disk in chunks and stored once per company; an
+    identical upload only adds a reference to the existing copy.
+    """
     logger.info(f"File upload started: {file.filename} for {entity_type}:{entity_id}")
     
     # Validate file
@@ -131,7 +121,22 @@ async def upload_file(
     # You might want to add specific entity validation here
     
     try:
-        # Generate file ID and stored filename
+        blob = FileStorage.store_upload(db, company_id, file.file, MAX_FILE_SIZE)
+    except FileTooLargeError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error storing upload {file.filename}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to save file"
+        )
+    
+    try:
         file_id = str(uuid.uuid4())
         stored_filename = File.generate_stored_filename(
             entity_type=entity_type.value,
@@ -139,13 +144,6 @@ async def upload_file(
             original_filename=file.filename
         )
         
-        # Create upload directory
-        upload_dir = create_upload_directory(company_id, entity_type.value)
-        file_path = upload_dir / stored_filename
-        
-        # Save file to disk
-        save_uploaded_file(file, file_path)
-        
         # Create file record in database
         db_file = File(
             id=file_id,
@@ -154,9 +152,11 @@ async def upload_file(
             entity_id=entity_id,
             original_filename=file.filename,
             stored_filename=stored_filename,
-            file_path=str(file_path),
-            file_size=file.size,
+            file_path=blob.storage_path,
+            file_size=blob.size,
             mime_type=file.content_type,
+            blob_id=blob.id,
+            content_sha256=blob.sha256,
             file_category=file_category.value,
             description=description,
             uploaded_by=uploaded_by,
@@ -165,30 +165,27 @@ async def upload_file(
         
         db.add(db_file)
         db.commit()
-        db.refresh(db_file)
         
-        logger.info(f"File uploaded successfully: {file_id}")
-        
-        return FileUploadResponse(
-            file_id=file_id,
-            message="File uploaded successfully",
-            file_url=f"/api/v1/files/{file_id}",
-            download_url=f"/api/v1/files/{file_id}/download"
-        )
+        logger.info(f"File uploaded successfully: {file_id} ({blob.size} bytes, sha256 {blob.sha256[:12]})")
         
     except Exception as e:
         logger.error(f"File upload failed: {str(e)}")
-        # Clean up file if database operation failed
-        if 'file_path' in locals() and file_path.exists():
-            try:
-                file_path.unlink()
-            except:
-                pass
-        
+        # Rolling back also drops the blob reference taken above
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="File upload failed"
         )
+    
+    if file.content_type in DERIVABLE_MIME_TYPES:
+        background_tasks.add_task(ImageDerivatives.pregenerate, file_id, blob.storage_path)
+    
+    return FileUploadResponse(
+        file_id=file_id,
+        message="File uploaded successfully",
+        file_url=f"/api/v1/files/{file_id}",
+        download_url=f"/api/v1/files/{file_id}/download"
+    )
 
 @router.get("/", response_model=List[FileResponse])
 def list_files(
@@ -257,13 +254,12 @@ def get_file(
     
     return file
 
-@router.get("/{file_id}/download")
-def download_file(
+def _get_downloadable_file(
+    db: Session,
     file_id: str,
-    db: Session = Depends(get_db),
-    current_user_or_contractor: Union[User, Contractor] = Depends(get_current_user_or_contractor)
-):
-    """Download file by ID"""
+    current_user_or_contractor: Union[User, Contractor]
+) -> File:
+    """Active file the caller may download, with its content present on disk"""
     file = db.query(File).filter(File.id == file_id, File.is_active == True).first()
     
     if not file:
@@ -286,20 +282,110 @@ def download_file(
                 )
 
     # Check if file exists on disk
-    file_path = Path(file.file_path)
-    if not file_path.exists():
+    if not Path(file.file_path).exists():
         logger.error(f"File not found on disk: {file.file_path}")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found on disk"
         )
     
+    return file
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    # Weak comparison (RFC 9110 13.1.2): a W/ tag from a compressed response still matches
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in tags or if_none_match.strip() == "*"
+
+@router.get("/{file_id}/download")
+def download_file(
+    file_id: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user_or_contractor: Union[User, Contractor] = Depends(get_current_user_or_contractor)
+):
+    """
+    Download file by ID.
+    Supports Range requests (resumable / partial downloads); content-addressed
+    files carry their SHA-256 as a strong ETag, so If-Range and If-None-Match work
+    across servers.
+    """
+    file = _get_downloadable_file(db, file_id, current_user_or_contractor)
+    
+    headers = {"Accept-Ranges": "bytes"}
+    if file.content_sha256:
+        etag = f'"{file.content_sha256}"'
+        if _etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        headers["ETag"] = etag
+        headers["Cache-Control"] = "private, max-age=86400"
+    
     return FastAPIFileResponse(
-        path=file_path,
+        path=Path(file.file_path),
         filename=file.original_filename,
-        media_type=file.mime_type
+        media_type=file.mime_type,
+        headers=headers
     )
 
+@router.get("/{file_id}/image")
+def get_image_variant(
+    file_id: str,
+    request: Request,
+    w: int = Query(DEFAULT_SIZE, ge=1, description=f"Target width; rounded up to one of {DERIVATIVE_SIZES}"),
+    format: Optional[str] = Query(None, description="webp or jpeg; negotiated from Accept when omitted"),
+    db: Session = Depends(get_db),
+    current_user_or_contractor: Union[User, Contractor] = Depends(get_current_user_or_contractor)
+):
+    """
+    Resized WebP/JPEG variant of an image file for list and detail views.
+    Variants are cached on disk and never change for a file id, so clients and
+    proxies may keep them for a year.
+    """
+    if format is not None and format not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"format must be one of {', '.join(FORMATS)}"
+        )
+    
+    fmt = negotiate_format(format, request.headers.get("accept"))
+    size = bucket_size(w)
+    etag = f'"{file_id}-{size}.{fmt}"'
+    cache_headers = {"ETag": etag, "Cache-Control": "private, max-age=31536000, immutable"}
+    if format is None:
+        cache_headers["Vary"] = "Accept"
+    
+    file = _get_downloadable_file(db, file_id, current_user_or_contractor)
+    if file.mime_type not in DERIVABLE_MIME_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Image variants are only available for images"
+        )
+    
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    
+    variant = ImageDerivatives.get(file.id, Path(file.file_path), size, fmt)
+    if variant is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Could not create an image variant for this file"
+        )
+    
+    return FastAPIFileResponse(path=variant, media_type=FORMATS[fmt][1], headers=cache_headers)
+
+@router.get("/{file_id}/thumbnail")
+def get_file_thumbnail(
+    file_id: str,
+    request: Request,
+    size: int = Query(DEFAULT_SIZE, ge=1),
+    db: Session = Depends(get_db),
+    current_user_or_contractor: Union[User, Contractor] = Depends(get_current_user_or_contractor)
+):
+    """Square-bounded thumbnail; same as /image?w=size"""
+    return get_image_variant(file_id, request, size, None, db, current_user_or_contractor)
+
 @router.put("/{file_id}", response_model=FileResponse)
 def update_file(
     file_id: str,
@@ -360,9 +446,12 @@ def delete_file(
         )
     
     if permanent:
-        # Hard delete - remove from disk and database
+        # Hard delete - remove from database, and from disk once nothing references the content
         file_path = Path(file.file_path)
-        if file_path.exists():
+        derivative_cache.purge(file.id)
+        if file.blob_id:
+            FileStorage.release_blob(db, file.blob_id)
+        elif file_path.exists():
             try:
                 file_path.unlink()
                 logger.info(f"File deleted from disk: {file.file_path}")
@@ -10,12 +10,12 @@ payload size and prevent worker timeouts on complex GI boundaries.
 
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, text
-import json
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
-from db.session import get_db
+from utils.geojson import bbox_filter, feature_collection_query, geojson_response, parse_bbox
+from db.session import get_async_db
 from db.models.geographical_indication import GeographicalIndication
 from db.models.wine_region import WineRegion
 from api.v1.public_auth import get_current_public_user, PublicUser
@@ -68,6 +68,19 @@ class GIDetail(BaseModel):
         from_attributes = True
 
 
+# Attribute columns only - the boundary geometry is never needed outside /geojson
+LIST_COLUMNS = (
+    GeographicalIndication.id, GeographicalIndication.name, GeographicalIndication.slug,
+    GeographicalIndication.ip_number, GeographicalIndication.status, GeographicalIndication.bounds,
+    GeographicalIndication.color
+)
+DETAIL_COLUMNS = LIST_COLUMNS + (
+    GeographicalIndication.iponz_url, GeographicalIndication.registration_date,
+    GeographicalIndication.renewal_date, GeographicalIndication.notes, GeographicalIndication.region_id,
+    GeographicalIndication.created_at
+)
+
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
@@ -76,29 +89,29 @@ class GIDetail(BaseModel):
 async def list_gis(
     region_slug: Optional[str] = Query(None, description="Filter by parent region slug"),
     current_user: PublicUser = Depends(get_current_public_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get list of all Geographical Indications.
     Optionally filter by parent wine region.
     """
     try:
-        query = db.query(
-            GeographicalIndication,
+        query = select(
+            *LIST_COLUMNS,
             WineRegion.name.label('region_name')
         ).outerjoin(
             WineRegion, 
             GeographicalIndication.region_id == WineRegion.id
-        ).filter(
+        ).where(
             GeographicalIndication.is_active == True
         )
         
         # Filter by region if specified
         if region_slug:
-            query = query.filter(WineRegion.slug == region_slug)
+            query = query.where(WineRegion.slug == region_slug)
         
         query = query.order_by(GeographicalIndication.display_order)
-        results = query.all()
+        results = (await db.execute(query)).all()
         
         return [
             GIListItem(
@@ -107,11 +120,11 @@ async def list_gis(
                 slug=gi.slug,
                 ip_number=gi.ip_number,
                 status=gi.status,
-                region_name=region_name,
+                region_name=gi.region_name,
                 bounds=gi.bounds,
                 color=gi.color
             )
-            for gi, region_name in results
+            for gi in results
         ]
         
     except Exception as e:
@@ -131,94 +144,69 @@ async def get_gis_geojson(
         le=0.1, 
         description="Geometry simplification tolerance in degrees. 0.002 ≈ ~200m. Use 0 for full detail."
     ),
+    zoom: Optional[int] = Query(None, ge=0, le=24, description="Map zoom level - overrides simplify with the pixel size"),
+    bbox: Optional[str] = Query(None, description="Bounding box: west,south,east,north"),
     current_user: PublicUser = Depends(get_current_public_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all GIs as GeoJSON FeatureCollection for map layer.
     
-    Geometries are simplified server-side using PostGIS ST_SimplifyPreserveTopology
-    to reduce payload size and improve performance. Adjust 'simplify' parameter
-    for more/less detail:
+    The FeatureCollection is built by PostGIS and geometries are simplified
+    server-side using ST_SimplifyPreserveTopology to reduce payload size and
+    improve performance. Adjust 'simplify' parameter for more/less detail:
     - 0.001 = ~100m tolerance (more detail)
     - 0.002 = ~200m tolerance (default, good balance)
     - 0.005 = ~500m tolerance (faster, less detail)
     - 0 = full detail (may be slow for complex boundaries)
+    or pass the map's 'zoom' to simplify and round coordinates to its pixel size.
     """
     try:
-        # Build the geometry expression based on simplification
-        if simplify > 0:
-            geometry_expr = f"ST_AsGeoJSON(ST_SimplifyPreserveTopology(gi.geometry, :tolerance))"
-        else:
-            geometry_expr = "ST_AsGeoJSON(gi.geometry)"
-        
-        # Build the WHERE clause
-        where_clauses = ["gi.is_active = true", "gi.geometry IS NOT NULL"]
-        params = {"tolerance": simplify}
-        
+        bbox_values = parse_bbox(bbox)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid bbox format. Use: west,south,east,north"
+        )
+
+    try:
+        query = select(
+            GeographicalIndication.id,
+            GeographicalIndication.name,
+            GeographicalIndication.slug,
+            GeographicalIndication.ip_number,
+            GeographicalIndication.status,
+            GeographicalIndication.iponz_url,
+            WineRegion.name.label("region_name"),
+            func.coalesce(GeographicalIndication.color, "#8b5cf6").label("color"),
+            GeographicalIndication.display_order,
+            GeographicalIndication.geometry
+        ).outerjoin(
+            WineRegion, GeographicalIndication.region_id == WineRegion.id
+        ).where(
+            GeographicalIndication.is_active == True,
+            GeographicalIndication.geometry != None
+        )
+
         if region_slug:
-            where_clauses.append("wr.slug = :region_slug")
-            params["region_slug"] = region_slug
-        
-        where_sql = " AND ".join(where_clauses)
-        
-        query = text(f"""
-            SELECT 
-                gi.id,
-                gi.name,
-                gi.slug,
-                gi.ip_number,
-                gi.status,
-                gi.iponz_url,
-                gi.color,
-                gi.display_order,
-                wr.name as region_name,
-                {geometry_expr} as geometry_json
-            FROM geographical_indications gi
-            LEFT JOIN wine_regions wr ON gi.region_id = wr.id
-            WHERE {where_sql}
-            ORDER BY gi.display_order
-        """)
-        
-        results = db.execute(query, params).fetchall()
-        
-        features = []
-        for row in results:
-            # Parse the geometry JSON from PostGIS (already simplified)
-            geometry = None
-            if row.geometry_json:
-                try:
-                    geometry = json.loads(row.geometry_json)
-                except json.JSONDecodeError:
-                    logger.warning(f"Invalid geometry JSON for GI {row.slug}")
-                    continue
-            
-            if not geometry:
-                continue
-            
-            feature = {
-                "type": "Feature",
-                "id": row.id,
-                "geometry": geometry,
-                "properties": {
-                    "id": row.id,
-                    "name": row.name,
-                    "slug": row.slug,
-                    "ip_number": row.ip_number,
-                    "status": row.status,
-                    "iponz_url": row.iponz_url,
-                    "region_name": row.region_name,
-                    "color": row.color or "#8b5cf6"
-                }
-            }
-            features.append(feature)
+            query = query.where(WineRegion.slug == region_slug)
+        if bbox_values:
+            query = query.where(bbox_filter(GeographicalIndication.geometry, bbox_values))
+
+        rows = query.subquery()
+        collection = feature_collection_query(
+            rows,
+            properties=["id", "name", "slug", "ip_number", "status", "iponz_url", "region_name", "color"],
+            id_column="id",
+            zoom=zoom,
+            tolerance=None if zoom is not None else simplify,
+            order_by=["display_order"],
+        )
+        content = (await db.execute(collection)).scalar()
         
-        logger.info(f"Returned {len(features)} GIs with simplify={simplify}")
+        logger.info(f"Returned GIs GeoJSON ({len(content or '')} chars) with simplify={simplify} zoom={zoom}")
         
-        return {
-            "type": "FeatureCollection",
-            "features": features
-        }
+        return geojson_response(content)
         
     except Exception as e:
         logger.error(f"Error fetching GIs GeoJSON: {e}")
@@ -232,32 +220,32 @@ async def get_gis_geojson(
 async def get_gi_detail(
     slug: str,
     current_user: PublicUser = Depends(get_current_public_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get detailed information for a single Geographical Indication.
     Includes IPoNZ registration details.
     """
     try:
-        result = db.query(
-            GeographicalIndication,
-            WineRegion.name.label('region_name')
-        ).outerjoin(
-            WineRegion,
-            GeographicalIndication.region_id == WineRegion.id
-        ).filter(
-            GeographicalIndication.slug == slug,
-            GeographicalIndication.is_active == True
-        ).first()
+        gi = (await db.execute(
+            select(
+                *DETAIL_COLUMNS,
+                WineRegion.name.label('region_name')
+            ).outerjoin(
+                WineRegion,
+                GeographicalIndication.region_id == WineRegion.id
+            ).where(
+                GeographicalIndication.slug == slug,
+                GeographicalIndication.is_active == True
+            )
+        )).first()
         
-        if not result:
+        if not gi:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Geographical Indication '{slug}' not found"
             )
         
-        gi, region_name = result
-        
         return GIDetail(
             id=gi.id,
             name=gi.name,
@@ -269,7 +257,7 @@ async def get_gi_detail(
             renewal_date=gi.renewal_date,
             notes=gi.notes,
             region_id=gi.region_id,
-            region_name=region_name,
+            region_name=gi.region_name,
             bounds=gi.bounds,
             color=gi.color,
             created_at=gi.created_at
@@ -289,17 +277,19 @@ async def get_gi_detail(
 async def get_gi_bounds(
     slug: str,
     current_user: PublicUser = Depends(get_current_public_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get bounding box for a GI (for map fly-to).
     Returns: {min_lng, min_lat, max_lng, max_lat}
     """
     try:
-        gi = db.query(GeographicalIndication).filter(
-            GeographicalIndication.slug == slug,
-            GeographicalIndication.is_active == True
-        ).first()
+        gi = (await db.execute(
+            select(GeographicalIndication.bounds).where(
+                GeographicalIndication.slug == slug,
+                GeographicalIndication.is_active == True
+            )
+        )).first()
         
         if not gi:
             raise HTTPException(
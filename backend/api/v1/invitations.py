@@ -11,6 +11,7 @@ from db.models.company import Company
 from schemas.invitation import InvitationCreate, Invitation as InvitationSchema, InvitationAccept
 from api.deps import get_db, get_current_user
 from services.email_service import UnifiedEmailService
+from core.email_utils import send_invitation_email
 import logging
 logger = logging.getLogger(__name__)
 
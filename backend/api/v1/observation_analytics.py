@@ -0,0 +1,65 @@
+# api/v1/observation_analytics.py
+from typing import List, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from api.deps import get_db, get_current_user
+from db.models.user import User
+from schemas.observations import MetricBackfillOut, MetricTrendOut, ObservationMetricOut
+from services.observation_analytics import BUCKETS, ObservationAnalytics
+
+router = APIRouter(tags=["observation-analytics"])
+
+
+@router.get("/metrics", response_model=List[ObservationMetricOut])
+def list_observation_metrics(
+    template_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Metrics with recorded data for the company, per template"""
+    return ObservationAnalytics.list_metrics(
+        db, current_user.company_id, template_id=template_id, date_from=date_from, date_to=date_to
+    )
+
+
+@router.get("/trend", response_model=MetricTrendOut)
+def get_metric_season_trend(
+    metric: str,
+    season: str = Query(..., description="Vintage, e.g. 2025/26 (1 July to 30 June)"),
+    template_id: Optional[int] = None,
+    block_id: Optional[List[int]] = Query(None, description="Repeat to compare several blocks"),
+    bucket: str = Query("week", description=f"One of: {', '.join(BUCKETS)}"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Season trend of one template field across all completed runs, one series per
+    block and template: mean, spread, percentiles and incidence per time bucket,
+    or value shares for categorical fields.
+    """
+    try:
+        return ObservationAnalytics.season_trend(
+            db, current_user.company_id, metric, season,
+            template_id=template_id, block_ids=block_id, bucket=bucket
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/rebuild", response_model=MetricBackfillOut)
+def rebuild_observation_metrics(
+    rebuild: bool = Query(False, description="Re-extract runs that already have metrics"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Extract spot metrics for completed runs that predate the analytics table"""
+    if current_user.role not in ["admin", "manager"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins and managers can rebuild observation metrics"
+        )
+    return ObservationAnalytics.backfill_company(db, current_user.company_id, rebuild=rebuild)
@@ -3,7 +3,7 @@
 from __future__ import annotations
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import select, and_, func, cast, Integer
 
@@ -13,7 +13,7 @@ from api.deps import get_db, get_current_user
 from schemas.observations import (
     ObservationTemplateCreate, ObservationTemplateUpdate, ObservationTemplateOut,
     ObservationPlanCreate, ObservationPlanUpdate, ObservationPlanOut,
-    ObservationRunCreate, ObservationRunUpdate, ObservationRunOut,
+    ObservationRunCreate, ObservationRunUpdate, ObservationRunOut, ObservationRunStatsOut,
     ObservationSpotCreate, ObservationSpotUpdate, ObservationSpotOut,
     ObservationTaskLinkCreate, ObservationTaskLinkOut,
 )
@@ -22,6 +22,8 @@ from schemas.reference_items import (
     ReferenceItemOut, ReferenceItemImageOut, ReferenceItemImageCreate
 )
 
+from services.observation_analytics import ObservationAnalytics
+from services.observation_run_query_service import RUN_PAGE_SIZE, ObservationRunQueryService, RunStatusFilter
 from utils.observation_helpers import basic_confidence_summary
 from utils.el_scale import EL_PHASES
 
@@ -570,57 +572,61 @@ def check_run_conflicts(
     company_id: Optional[int] = Query(None)
 ):
     """Check for active runs that would conflict with starting a new run"""
-    q = select(ObservationRun).where(
-        ObservationRun.observed_at_end.is_(None),  # Only active runs
+    return ObservationRunQueryService.find_active_runs(
+        db, plan_id=plan_id, block_id=block_id, company_id=company_id
+    )
+
+@router.get("/observation-runs/stats", response_model=ObservationRunStatsOut)
+def get_run_stats(
+    company_id: int,
+    observed_from: Optional[datetime] = None,
+    observed_to: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+):
+    """Run counts and latest-run timestamps per block and per template"""
+    return ObservationRunQueryService.get_run_stats(
+        db, company_id, observed_from=observed_from, observed_to=observed_to
     )
-    
-    if company_id:
-        q = q.where(ObservationRun.company_id == company_id)
-    
-    if plan_id:
-        q = q.where(ObservationRun.plan_id == plan_id)
-        
-    if block_id:
-        q = q.where(ObservationRun.block_id == block_id)
-    
-    q = q.order_by(ObservationRun.created_at.desc())
-    
-    active_runs = db.execute(q).scalars().all()
-    
-    # Annotate with additional context
-    for r in active_runs:
-        r.plan_name = r.plan.name if r.plan else None
-        r.creator_name = r.creator.full_name if r.creator else None
-    
-    return active_runs
 
 @router.get("/observation-runs", response_model=List[ObservationRunOut])
 def list_runs(
+    response: Response,
     db: Session = Depends(get_db),
     company_id: Optional[int] = None,
     template_id: Optional[int] = None,
     plan_id: Optional[int] = None,
+    block_id: Optional[int] = None,
+    status: Optional[RunStatusFilter] = Query(None, description="not started, in progress, complete or active (not ended)"),
+    observed_from: Optional[datetime] = Query(None, description="Runs started at or after this time"),
+    observed_to: Optional[datetime] = Query(None, description="Runs started before this time"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; every run is returned when neither limit nor cursor is given"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
     ):
-    q = (select(ObservationRun)
-         .options(selectinload(ObservationRun.plan))
-         .options(selectinload(ObservationRun.creator))
-         .options(selectinload(ObservationRun.block))
-         )
-    if company_id: q = q.where(ObservationRun.company_id == company_id)
-    if template_id: q = q.where(ObservationRun.template_id == template_id)
-    if plan_id: q = q.where(ObservationRun.plan_id == plan_id)
-    q = q.order_by(ObservationRun.created_at.desc())
-    rows = db.execute(q).scalars().all()
-
-    # annotate plan_name, creator_name, and block_name for the Pydantic Out
-    for r in rows:
-        r.plan_name = r.plan.name if r.plan else None
-        # Join first_name and last_name for creator_name
-        if r.creator:
-            r.creator_name = f"{r.creator.first_name} {r.creator.last_name}".strip()
-        else:
-            r.creator_name = None
-        r.block_name = r.block.block_name if r.block else None
+    """
+    Runs newest first. With limit or cursor they come one page at a time (100
+    by default) and, when more runs exist, the cursor for the next page is
+    returned in the X-Next-Cursor header.
+    """
+    if cursor and limit is None:
+        limit = RUN_PAGE_SIZE
+    try:
+        rows, next_cursor = ObservationRunQueryService.list_runs(
+            db,
+            company_id=company_id,
+            template_id=template_id,
+            plan_id=plan_id,
+            block_id=block_id,
+            status=status,
+            observed_from=observed_from,
+            observed_to=observed_to,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return rows
 
 @router.get("/observation-runs/{run_id}", response_model=ObservationRunOut)
@@ -754,6 +760,7 @@ def add_spot(run_id: int, payload: ObservationSpotCreate, db: Session = Depends(
     db.add(spot)
     db.commit()
     db.refresh(spot)
+    ObservationAnalytics.refresh_if_completed(db, spot.run_id)
 
     # Return normalized shape (ensures 'values' exists on the wire)
     return spot
@@ -795,6 +802,7 @@ def update_spot(spot_id: int, payload: ObservationSpotUpdate, db: Session = Depe
     db.add(spot)
     db.commit()
     db.refresh(spot)
+    ObservationAnalytics.refresh_if_completed(db, spot.run_id)
 
     # Return normalized shape (ensures 'values' exists on the wire)
     return spot
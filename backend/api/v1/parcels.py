@@ -17,8 +17,9 @@ from db.models.company import Company
 from db.models.parcel_sync_log import ParcelSyncLog
 from services.linz_parcels_service import LINZParcelsService
 from services.parcel_sync_service import ParcelSyncService
-from sqlalchemy import func, text
+from sqlalchemy import Float, cast, exists, false, func, literal, select, text, true
 from geoalchemy2.shape import to_shape
+from utils.geojson import bbox_filter, feature_collection_query, geojson_response, parse_bbox
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +33,20 @@ if not LINZ_API_KEY:
 
 linz_service = LINZParcelsService(LINZ_API_KEY)
 
+# GeoJSON feature properties, labelled with their JSON names
+PARCEL_PROPERTY_COLUMNS = (
+    PrimaryParcel.id,
+    PrimaryParcel.linz_id,
+    PrimaryParcel.appellation,
+    PrimaryParcel.parcel_intent,
+    PrimaryParcel.land_district,
+    cast(PrimaryParcel.survey_area, Float).label("survey_area"),
+    cast(PrimaryParcel.calc_area, Float).label("calc_area"),
+    (cast(PrimaryParcel.calc_area, Float) / 10000).label("area_hectares"),
+    PrimaryParcel.last_synced_at.label("last_synced"),
+    PrimaryParcel.topology_type,
+)
+
 @router.get("/test-connection")
 async def test_linz_connection(
     current_user: User = Depends(get_current_user)
@@ -178,197 +193,135 @@ def get_sync_history(
 @router.get("/geojson")
 def get_parcels_geojson(
     bbox: Optional[str] = Query(None, description="Bounding box: west,south,east,north"),
+    zoom: Optional[int] = Query(None, ge=0, le=24, description="Map zoom level - simplifies geometry to the pixel size"),
     limit: int = Query(1000, ge=1, le=10000, description="Maximum features to return"),
     company_owned_only: bool = Query(False, description="Only return parcels owned by user's company"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get parcels as GeoJSON for map display"""
-    
-    query = db.query(PrimaryParcel).filter(PrimaryParcel.is_active == True)
-    
-    # Apply company filter if requested
-    if company_owned_only and current_user.company_id:
-        query = query.join(CompanyLandOwnership).filter(
+    """Get parcels as GeoJSON for map display (assembled by PostGIS)"""
+    try:
+        bbox_values = parse_bbox(bbox)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid bbox format. Use: west,south,east,north"
+        )
+
+    # First verified ownership of each parcel, with the company name
+    assignment = select(
+        CompanyLandOwnership.land_parcel_id,
+        CompanyLandOwnership.company_id,
+        Company.name.label("company_name")
+    ).outerjoin(
+        Company, Company.id == CompanyLandOwnership.company_id
+    ).where(
+        CompanyLandOwnership.verified == True
+    ).distinct(
+        CompanyLandOwnership.land_parcel_id
+    ).order_by(
+        CompanyLandOwnership.land_parcel_id, CompanyLandOwnership.id
+    ).subquery()
+
+    if current_user.company_id:
+        is_owned = exists().where(
+            CompanyLandOwnership.land_parcel_id == PrimaryParcel.id,
             CompanyLandOwnership.company_id == current_user.company_id,
             CompanyLandOwnership.verified == True
         )
-    
-    # Apply bounding box filter if provided
-    if bbox:
-        try:
-            west, south, east, north = map(float, bbox.split(','))
-            bbox_geom = func.ST_MakeEnvelope(west, south, east, north, 4326)
-            query = query.filter(
-                func.ST_Intersects(PrimaryParcel.geometry_wgs84, bbox_geom)
-            )
-        except ValueError:
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid bbox format. Use: west,south,east,north"
-            )
-    
-    # Apply limit
-    parcels = query.limit(limit).all()
-    
-    features = []
-    for parcel in parcels:
-        if parcel.geometry_wgs84:
-            try:
-                shape_obj = to_shape(parcel.geometry_wgs84)
-                
-                # Check if parcel is owned by user's company
-                is_owned = False
-                if current_user.company_id:
-                    # Remove this duplicate import line too
-                    ownership = db.query(CompanyLandOwnership).filter(
-                        CompanyLandOwnership.land_parcel_id == parcel.id,
-                        CompanyLandOwnership.company_id == current_user.company_id,
-                        CompanyLandOwnership.verified == True
-                    ).first()
-                    is_owned = ownership is not None
-                
-                feature = {
-                    "type": "Feature",
-                    "geometry": shape_obj.__geo_interface__,
-                    "properties": {
-                        "id": parcel.id,
-                        "linz_id": parcel.linz_id,
-                        "appellation": parcel.appellation,
-                        "parcel_intent": parcel.parcel_intent,
-                        "land_district": parcel.land_district,
-                        "survey_area": float(parcel.survey_area) if parcel.survey_area else None,
-                        "calc_area": float(parcel.calc_area) if parcel.calc_area else None,
-                        "area_hectares": parcel.area_hectares,
-                        "last_synced": parcel.last_synced_at.isoformat() if parcel.last_synced_at else None,
-                        "is_owned_by_user_company": is_owned,
-                        "topology_type": parcel.topology_type,
-                        "assigned_company_id": None,
-                        "assigned_company_name": None,
-                        "has_assignment": False
-                    }
-                }
-                
-                # Add company assignment info to properties
-                ownership = db.query(CompanyLandOwnership).filter(
-                    CompanyLandOwnership.land_parcel_id == parcel.id,
-                    CompanyLandOwnership.verified == True
-                ).first()
-                
-                if ownership:
-                    company = db.query(Company).filter(Company.id == ownership.company_id).first()
-                    feature["properties"]["assigned_company_id"] = ownership.company_id
-                    feature["properties"]["assigned_company_name"] = company.name if company else None
-                    feature["properties"]["has_assignment"] = True
-                
-                features.append(feature)
+    else:
+        is_owned = false()
 
-            except Exception as e:
-                logger.error(f"Error processing parcel {parcel.id} geometry: {e}")
-                continue
-    
-    return {
-        "type": "FeatureCollection",
-        "features": features,
+    query = select(
+        *PARCEL_PROPERTY_COLUMNS,
+        is_owned.label("is_owned_by_user_company"),
+        assignment.c.company_id.label("assigned_company_id"),
+        assignment.c.company_name.label("assigned_company_name"),
+        (assignment.c.company_id != None).label("has_assignment"),
+        PrimaryParcel.geometry_wgs84.label("geometry")
+    ).outerjoin(
+        assignment, assignment.c.land_parcel_id == PrimaryParcel.id
+    ).where(
+        PrimaryParcel.is_active == True,
+        PrimaryParcel.geometry_wgs84 != None
+    )
+
+    # Apply company filter if requested
+    if company_owned_only and current_user.company_id:
+        query = query.where(is_owned)
+
+    if bbox_values:
+        query = query.where(bbox_filter(PrimaryParcel.geometry_wgs84, bbox_values))
+
+    rows = query.limit(limit).subquery()
+    collection = feature_collection_query(rows, zoom=zoom, members={
         "metadata": {
-            "count": len(features),
+            "count": func.count(),
             "limit": limit,
             "bbox": bbox,
             "company_owned_only": company_owned_only
         }
-    }
+    })
+    return geojson_response(db.execute(collection).scalar())
     
 @router.get("/company/{company_id}/geojson")
 def get_company_parcels_geojson(
     company_id: int,
     bbox: Optional[str] = Query(None, description="Bounding box: west,south,east,north"),
+    zoom: Optional[int] = Query(None, ge=0, le=24, description="Map zoom level - simplifies geometry to the pixel size"),
     limit: int = Query(1000, ge=1, le=10000, description="Maximum features to return"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get parcels assigned to a specific company as GeoJSON
+    Get parcels assigned to a specific company as GeoJSON (assembled by PostGIS)
     """
     # Verify company exists
     company = db.query(Company).filter(Company.id == company_id).first()
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
-    
+
+    try:
+        bbox_values = parse_bbox(bbox)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid bbox format. Use: west,south,east,north"
+        )
+
     # Build query for company's parcels
-    query = db.query(PrimaryParcel).join(CompanyLandOwnership).filter(
+    query = select(
+        *PARCEL_PROPERTY_COLUMNS,
+        literal(company_id).label("assigned_company_id"),
+        literal(company.name).label("assigned_company_name"),
+        true().label("has_assignment"),
+        true().label("is_owned_by_user_company"),
+        func.coalesce(CompanyLandOwnership.ownership_type, "full").label("ownership_type"),
+        cast(func.coalesce(CompanyLandOwnership.ownership_percentage, 100), Float).label("ownership_percentage"),
+        PrimaryParcel.geometry_wgs84.label("geometry")
+    ).join(
+        CompanyLandOwnership, CompanyLandOwnership.land_parcel_id == PrimaryParcel.id
+    ).where(
         CompanyLandOwnership.company_id == company_id,
         CompanyLandOwnership.verified == True,
-        PrimaryParcel.is_active == True
+        PrimaryParcel.is_active == True,
+        PrimaryParcel.geometry_wgs84 != None
     )
-    
-    # Apply bounding box filter if provided
-    if bbox:
-        try:
-            west, south, east, north = map(float, bbox.split(','))
-            bbox_geom = func.ST_MakeEnvelope(west, south, east, north, 4326)
-            query = query.filter(
-                func.ST_Intersects(PrimaryParcel.geometry_wgs84, bbox_geom)
-            )
-        except ValueError:
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid bbox format. Use: west,south,east,north"
-            )
-    
-    # Apply limit
-    parcels = query.limit(limit).all()
-    
-    features = []
-    for parcel in parcels:
-        if parcel.geometry_wgs84:
-            try:
-                shape_obj = to_shape(parcel.geometry_wgs84)
-                
-                # Get ownership details
-                ownership = db.query(CompanyLandOwnership).filter(
-                    CompanyLandOwnership.land_parcel_id == parcel.id,
-                    CompanyLandOwnership.company_id == company_id
-                ).first()
-                
-                feature = {
-                    "type": "Feature",
-                    "geometry": shape_obj.__geo_interface__,
-                    "properties": {
-                        "id": parcel.id,
-                        "linz_id": parcel.linz_id,
-                        "appellation": parcel.appellation,
-                        "parcel_intent": parcel.parcel_intent,
-                        "land_district": parcel.land_district,
-                        "survey_area": float(parcel.survey_area) if parcel.survey_area else None,
-                        "calc_area": float(parcel.calc_area) if parcel.calc_area else None,
-                        "area_hectares": parcel.area_hectares,
-                        "last_synced": parcel.last_synced_at.isoformat() if parcel.last_synced_at else None,
-                        "topology_type": parcel.topology_type,
-                        "assigned_company_id": company_id,
-                        "assigned_company_name": company.name,
-                        "has_assignment": True,
-                        "is_owned_by_user_company": True,
-                        "ownership_type": ownership.ownership_type if ownership else "full",
-                        "ownership_percentage": float(ownership.ownership_percentage) if ownership else 100.0
-                    }
-                }
-                features.append(feature)
 
-            except Exception as e:
-                logger.error(f"Error processing parcel {parcel.id} geometry: {e}")
-                continue
-    
-    return {
-        "type": "FeatureCollection",
-        "features": features,
+    if bbox_values:
+        query = query.where(bbox_filter(PrimaryParcel.geometry_wgs84, bbox_values))
+
+    rows = query.limit(limit).subquery()
+    collection = feature_collection_query(rows, zoom=zoom, members={
         "metadata": {
-            "count": len(features),
+            "count": func.count(),
             "limit": limit,
             "bbox": bbox,
             "company_id": company_id,
             "company_name": company.name
         }
-    }
+    })
+    return geojson_response(db.execute(collection).scalar())
 
 @router.get("/stats")
 def get_parcel_statistics(
@@ -39,7 +39,7 @@ router = APIRouter(prefix="/public/auth", tags=["Public Authentication"])
 # ============================================
 
 @router.post("/signup", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
-async def signup(
+def signup(
     user_data: PublicUserSignup,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
@@ -111,7 +111,7 @@ async def signup(
 # ============================================
 
 @router.post("/login", response_model=PublicUserToken)
-async def login(
+def login(
     credentials: PublicUserLogin,
     db: Session = Depends(get_db)
 ):
@@ -195,7 +195,7 @@ async def get_current_user_info(
 # ============================================
 
 @router.patch("/me", response_model=PublicUserResponse)
-async def update_profile(
+def update_profile(
     update_data: PublicUserUpdate,
     current_user: PublicUser = Depends(get_current_public_user),
     db: Session = Depends(get_db)
@@ -246,7 +246,7 @@ async def update_profile(
 # ============================================
 
 @router.patch("/me/marketing-preferences", response_model=MessageResponse)
-async def update_marketing_preferences(
+def update_marketing_preferences(
     preferences: MarketingPreferencesUpdate,
     current_user: PublicUser = Depends(get_current_public_user),
     db: Session = Depends(get_db)
@@ -275,7 +275,7 @@ async def update_marketing_preferences(
 # ============================================
 
 @router.post("/verify-email", response_model=MessageResponse)
-async def verify_email(
+def verify_email(
     verification: EmailVerificationRequest,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
@@ -324,7 +324,7 @@ async def verify_email(
 # ============================================
 
 @router.post("/resend-verification", response_model=MessageResponse)
-async def resend_verification(
+def resend_verification(
     email_request: PasswordResetRequest,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
@@ -372,7 +372,7 @@ async def resend_verification(
 # ============================================
 
 @router.post("/forgot-password", response_model=MessageResponse)
-async def request_password_reset(
+def request_password_reset(
     reset_request: PasswordResetRequest,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
@@ -418,7 +418,7 @@ async def request_password_reset(
 # ============================================
 
 @router.post("/reset-password", response_model=MessageResponse)
-async def reset_password(
+def reset_password(
     reset_data: PasswordResetConfirm,
     db: Session = Depends(get_db)
 ):
@@ -32,6 +32,7 @@ from db.models.realtime_climate import (
     PhenologyThreshold,
     DiseasePressure,
 )
+from services.zone_season_gdd import ZoneSeasonGdd
 from schemas.realtime_climate import (
     ClimateZoneBrief,
     BaselineComparison,
@@ -169,74 +170,6 @@ def calc_baseline_comparison(current: Decimal, baseline: Decimal) -> BaselineCom
     )
 
 
-def get_baseline_gdd_for_day(db: Session, zone_id: int, day_of_vintage: int) -> Optional[Decimal]:
-    """
-    Get cumulative GDD baseline for a specific day of vintage, calculated from October 1.
-    
-    The baseline table stores GDD cumulative from July 1, but phenology thresholds
-    are calibrated from October 1 (Southern Hemisphere growing season start).
-    This function adjusts by subtracting the GDD accumulated July 1 - September 30.
-    
-    Day of vintage: July 1 = day 1, September 30 = day 92, October 1 = day 93
-    """
-    # Get GDD at requested day
-    baseline = db.query(ClimateZoneDailyBaseline).filter(
-        ClimateZoneDailyBaseline.zone_id == zone_id,
-        ClimateZoneDailyBaseline.day_of_vintage == day_of_vintage
-    ).first()
-    
-    if not baseline or not baseline.gdd_base0_cumulative_avg:
-        return None
-    
-    # Get GDD at September 30 (day 92) to subtract winter accumulation
-    # Only adjust if we're past October 1 (day 93)
-    if day_of_vintage >= 93:
-        sept30_baseline = db.query(ClimateZoneDailyBaseline).filter(
-            ClimateZoneDailyBaseline.zone_id == zone_id,
-            ClimateZoneDailyBaseline.day_of_vintage == 92
-        ).first()
-        
-        if sept30_baseline and sept30_baseline.gdd_base0_cumulative_avg:
-            gdd_from_oct1 = Decimal(str(baseline.gdd_base0_cumulative_avg)) - Decimal(str(sept30_baseline.gdd_base0_cumulative_avg))
-            return gdd_from_oct1
-    
-    # Before October 1, return 0 (growing season hasn't started)
-    if day_of_vintage < 93:
-        return Decimal('0')
-    
-    return Decimal(str(baseline.gdd_base0_cumulative_avg))
-
-
-def get_sept30_gdd_offset(db: Session, zone_id: int) -> Decimal:
-    """
-    Get the GDD accumulated from July 1 to September 30 for a zone.
-    
-    This offset is subtracted from current season gdd_cumulative (which starts July 1)
-    to get GDD from October 1 for phenology comparisons.
-    """
-    sept30_baseline = db.query(ClimateZoneDailyBaseline).filter(
-        ClimateZoneDailyBaseline.zone_id == zone_id,
-        ClimateZoneDailyBaseline.day_of_vintage == 92  # September 30
-    ).first()
-    
-    if sept30_baseline and sept30_baseline.gdd_base0_cumulative_avg:
-        return Decimal(str(sept30_baseline.gdd_base0_cumulative_avg))
-    return Decimal('0')
-
-
-def adjust_gdd_to_oct1(gdd_from_july1: Decimal, sept30_offset: Decimal, day_of_vintage: int) -> Decimal:
-    """
-    Adjust GDD cumulative from July 1 start to October 1 start.
-    
-    Returns 0 if before October 1 (day 93).
-    """
-    if gdd_from_july1 is None:
-        return None
-    if day_of_vintage < 93:
-        return Decimal('0')
-    return max(Decimal('0'), Decimal(str(gdd_from_july1)) - sept30_offset)
-
-
 # =============================================================================
 # ENDPOINTS: ZONES
 # =============================================================================
@@ -298,50 +231,44 @@ def get_current_season_climate(
     zone = get_zone_or_404(db, zone_slug)
     vintage_year = get_current_vintage_year()
     
-    # Get all data for current season
-    season_data = db.query(ClimateZoneDaily).filter(
+    season_filter = (
         ClimateZoneDaily.zone_id == zone.id,
         ClimateZoneDaily.vintage_year == vintage_year
-    ).order_by(ClimateZoneDaily.date.desc()).all()
+    )
     
-    if not season_data:
+    # Recent days, newest first
+    recent = db.query(ClimateZoneDaily).filter(*season_filter).order_by(
+        ClimateZoneDaily.date.desc()
+    ).limit(recent_days).all()
+    
+    if not recent:
         raise HTTPException(
             status_code=404, 
             detail=f"No current season data for zone '{zone_slug}'"
         )
     
+    # Season totals and averages
+    totals = db.query(
+        func.sum(ClimateZoneDaily.rainfall_mm).label('rainfall'),
+        func.avg(ClimateZoneDaily.temp_mean).label('temp_mean'),
+        func.avg(ClimateZoneDaily.temp_max).label('temp_max'),
+        func.avg(ClimateZoneDaily.temp_min).label('temp_min'),
+    ).filter(*season_filter).one()
+    
     # Latest date with data
-    latest_date = season_data[0].date
+    latest = recent[0]
+    latest_date = latest.date
     season_start = get_season_start(vintage_year)
     days_into_season = (latest_date - season_start).days + 1
     doy = date_to_day_of_vintage(latest_date)
     
-    # Get September 30 offset from ACTUAL current season data (for adjusting actual GDD)
-    # Find the actual GDD cumulative on or near September 30 (day 92)
-    actual_sept30_offset = Decimal('0')
-    for d in season_data:
-        d_doy = date_to_day_of_vintage(d.date)
-        if d_doy <= 92 and d.gdd_cumulative:
-            actual_sept30_offset = Decimal(str(d.gdd_cumulative))
-            break  # season_data is desc ordered, so first match <= 92 is closest to Sept 30
-    
-    # Calculate season totals (GDD adjusted to October 1 start using ACTUAL offset)
-    gdd_raw = Decimal(str(season_data[0].gdd_cumulative)) if season_data[0].gdd_cumulative else Decimal('0')
-    gdd_total = to_decimal(max(Decimal('0'), gdd_raw - actual_sept30_offset)) if doy >= 93 else to_decimal(Decimal('0'))
-    rainfall_total = to_decimal(sum(float(d.rainfall_mm or 0) for d in season_data))
-    
-    # Calculate averages
-    temps = [float(d.temp_mean) for d in season_data if d.temp_mean]
-    temp_mean_avg = to_decimal(sum(temps) / len(temps)) if temps else None
-    
-    temps_max = [float(d.temp_max) for d in season_data if d.temp_max]
-    temp_max_avg = to_decimal(sum(temps_max) / len(temps_max)) if temps_max else None
-    
-    temps_min = [float(d.temp_min) for d in season_data if d.temp_min]
-    temp_min_avg = to_decimal(sum(temps_min) / len(temps_min)) if temps_min else None
-    
-    # Get baseline for comparison (already adjusted to October 1 in helper function)
-    baseline_gdd = get_baseline_gdd_for_day(db, zone.id, doy)
+    # GDD from October 1, actual and baseline, precomputed by zone aggregation
+    gdd_total = to_decimal(latest.gdd_cumulative_oct1 or Decimal('0'))
+    baseline_gdd = latest.gdd_baseline_oct1
+    rainfall_total = to_decimal(totals.rainfall or Decimal('0'))
+    temp_mean_avg = to_decimal(totals.temp_mean)
+    temp_max_avg = to_decimal(totals.temp_max)
+    temp_min_avg = to_decimal(totals.temp_min)
     
     # Calculate baseline rainfall total
     baseline_rain = db.query(
@@ -367,8 +294,6 @@ def get_current_season_climate(
         rainfall_vs_baseline=calc_baseline_comparison(rainfall_total, to_decimal(baseline_rain)) if baseline_rain else None,
     )
     
-    # Get recent days data
-    recent = season_data[:recent_days]
     recent_daily = [
         DailyClimateData(
             date=d.date,
@@ -426,8 +351,12 @@ def get_gdd_progress(
     if vintage_year is None:
         vintage_year = get_current_vintage_year()
     
-    # Get season data
-    season_data = db.query(ClimateZoneDaily).filter(
+    # October 1 adjusted series, precomputed by zone aggregation (services/zone_season_gdd.py)
+    season_data = db.query(
+        ClimateZoneDaily.date,
+        ClimateZoneDaily.gdd_cumulative_oct1,
+        ClimateZoneDaily.gdd_baseline_oct1,
+    ).filter(
         ClimateZoneDaily.zone_id == zone.id,
         ClimateZoneDaily.vintage_year == vintage_year
     ).order_by(ClimateZoneDaily.date).all()
@@ -438,74 +367,31 @@ def get_gdd_progress(
             detail=f"No data for vintage {vintage_year} in zone '{zone_slug}'"
         )
     
-    # Get baseline data
-    baseline_data = db.query(ClimateZoneDailyBaseline).filter(
-        ClimateZoneDailyBaseline.zone_id == zone.id
-    ).order_by(ClimateZoneDailyBaseline.day_of_vintage).all()
-    baseline_by_doy = {b.day_of_vintage: b for b in baseline_data}
-    
-    # Get September 30 offset from BASELINE (for adjusting baseline values)
-    baseline_sept30_offset = get_sept30_gdd_offset(db, zone.id)
-    
-    # Get September 30 offset from ACTUAL current season data (for adjusting actual values)
-    # Find the actual GDD cumulative on or near September 30 (day 92)
-    actual_sept30_offset = Decimal('0')
-    season_data_by_doy = {date_to_day_of_vintage(d.date): d for d in season_data}
-    
-    # Look for Sept 30 (day 92) or closest day before Oct 1
-    for check_doy in [92, 91, 90, 89]:
-        if check_doy in season_data_by_doy:
-            sept30_data = season_data_by_doy[check_doy]
-            if sept30_data.gdd_cumulative:
-                actual_sept30_offset = Decimal(str(sept30_data.gdd_cumulative))
-            break
-    
-    # Build time series with October 1 adjusted GDD
-    daily_data = []
-    latest = season_data[-1]
-    
-    for d in season_data:
-        doy = date_to_day_of_vintage(d.date)
-        baseline = baseline_by_doy.get(doy)
-        
-        # Adjust ACTUAL GDD using ACTUAL September 30 offset
-        gdd_actual_raw = float(d.gdd_cumulative) if d.gdd_cumulative else 0
-        gdd_actual = max(0, gdd_actual_raw - float(actual_sept30_offset)) if doy >= 93 else 0
-        
-        # Adjust BASELINE GDD using BASELINE September 30 offset
-        gdd_baseline = None
-        if baseline and baseline.gdd_base0_cumulative_avg:
-            gdd_baseline_raw = float(baseline.gdd_base0_cumulative_avg)
-            gdd_baseline = max(0, gdd_baseline_raw - float(baseline_sept30_offset)) if doy >= 93 else 0
-        
-        daily_data.append({
+    oct1 = date(vintage_year - 1, 10, 1)
+    daily_data = [
+        {
             "date": str(d.date),
-            "day_of_vintage": doy,
-            "gdd_actual": gdd_actual if doy >= 93 else None,
-            "gdd_baseline": gdd_baseline,
-        })
+            "day_of_vintage": date_to_day_of_vintage(d.date),
+            "gdd_actual": float(d.gdd_cumulative_oct1 or 0) if d.date >= oct1 else None,
+            "gdd_baseline": float(d.gdd_baseline_oct1) if d.gdd_baseline_oct1 is not None else None,
+        }
+        for d in season_data
+    ]
     
-    # Calculate current position vs baseline (October 1 adjusted)
+    # Current position vs baseline (October 1 adjusted)
+    latest = season_data[-1]
     current_doy = date_to_day_of_vintage(latest.date)
-    current_gdd_raw = Decimal(str(latest.gdd_cumulative)) if latest.gdd_cumulative else Decimal('0')
-    current_gdd = max(Decimal('0'), current_gdd_raw - actual_sept30_offset) if current_doy >= 93 else Decimal('0')
-    
-    baseline_current = baseline_by_doy.get(current_doy)
-    baseline_gdd = None
-    if baseline_current and baseline_current.gdd_base0_cumulative_avg:
-        baseline_gdd_raw = Decimal(str(baseline_current.gdd_base0_cumulative_avg))
-        baseline_gdd = max(Decimal('0'), baseline_gdd_raw - baseline_sept30_offset) if current_doy >= 93 else Decimal('0')
+    current_gdd = latest.gdd_cumulative_oct1 or Decimal('0')
+    baseline_gdd = latest.gdd_baseline_oct1
     
     # Estimate days ahead/behind by finding where baseline equals current GDD
-    # (using October 1 adjusted values)
     days_vs_baseline = None
     if baseline_gdd and current_gdd:
-        for doy, b in sorted(baseline_by_doy.items()):
-            if doy >= 93 and b.gdd_base0_cumulative_avg:
-                adjusted_baseline = float(b.gdd_base0_cumulative_avg) - float(baseline_sept30_offset)
-                if adjusted_baseline >= float(current_gdd):
-                    days_vs_baseline = current_doy - doy
-                    break
+        offsets = ZoneSeasonGdd.get_offsets(db, zone.id, vintage_year)
+        baseline_offset = offsets.baseline_gdd_offset if offsets else Decimal('0')
+        baseline_doy = ZoneSeasonGdd.baseline_day_reaching(db, zone.id, current_gdd, baseline_offset)
+        if baseline_doy is not None:
+            days_vs_baseline = current_doy - baseline_doy
     
     # Get phenology milestones (default to Pinot Noir)
     # Thresholds are calibrated from October 1, so use adjusted current_gdd
@@ -845,25 +731,10 @@ def get_regional_overview(
         if latest_date is None or latest.date > latest_date:
             latest_date = latest.date
         
-        # Get actual September 30 GDD offset for this zone
+        # GDD from October 1, actual and baseline
         doy = date_to_day_of_vintage(latest.date)
-        
-        # Query for Sept 30 actual GDD for this zone
-        sept30_actual = db.query(ClimateZoneDaily).filter(
-            ClimateZoneDaily.zone_id == zone.id,
-            ClimateZoneDaily.vintage_year == vintage_year,
-            ClimateZoneDaily.date <= date(vintage_year - 1, 9, 30)
-        ).order_by(ClimateZoneDaily.date.desc()).first()
-        
-        actual_sept30_offset = Decimal(str(sept30_actual.gdd_cumulative)) if sept30_actual and sept30_actual.gdd_cumulative else Decimal('0')
-        
-        # Adjust actual GDD to October 1 start
-        actual_gdd_adjusted = None
-        if latest.gdd_cumulative and doy >= 93:
-            actual_gdd_adjusted = max(Decimal('0'), Decimal(str(latest.gdd_cumulative)) - actual_sept30_offset)
-        
-        # Get baseline for comparison (already adjusted to Oct 1)
-        baseline_gdd = get_baseline_gdd_for_day(db, zone.id, doy)
+        actual_gdd_adjusted = latest.gdd_cumulative_oct1 if doy >= 93 else None
+        baseline_gdd = latest.gdd_baseline_oct1
         
         gdd_vs_baseline_pct = None
         if baseline_gdd and actual_gdd_adjusted:
@@ -10,12 +10,12 @@ payload size and prevent worker timeouts on complex region boundaries.
 
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, text
-import json
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
-from db.session import get_db
+from core.responses import ORJSONResponse, raw_json
+from db.session import get_async_db
 from db.models.wine_region import WineRegion
 from api.v1.public_auth import get_current_public_user, PublicUser
 
@@ -64,6 +64,14 @@ class RegionDetail(BaseModel):
         from_attributes = True
 
 
+# Attribute columns only - the boundary geometry is never needed outside /geojson
+LIST_COLUMNS = (
+    WineRegion.id, WineRegion.name, WineRegion.slug, WineRegion.summary, WineRegion.stats,
+    WineRegion.bounds, WineRegion.color, WineRegion.display_order
+)
+DETAIL_COLUMNS = LIST_COLUMNS + (WineRegion.description, WineRegion.climate_summary, WineRegion.created_at)
+
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
@@ -71,16 +79,18 @@ class RegionDetail(BaseModel):
 @router.get("", response_model=List[RegionListItem])
 async def list_regions(
     current_user: PublicUser = Depends(get_current_public_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get list of all wine regions for sidebar/navigation.
     Returns basic info with bounds for fly-to functionality.
     """
     try:
-        regions = db.query(WineRegion).filter(
-            WineRegion.is_active == True
-        ).order_by(WineRegion.display_order).all()
+        regions = (await db.execute(
+            select(*LIST_COLUMNS).where(
+                WineRegion.is_active == True
+            ).order_by(WineRegion.display_order)
+        )).all()
         
         result = []
         for region in regions:
@@ -119,7 +129,7 @@ async def get_regions_geojson(
         description="Geometry simplification tolerance in degrees. 0.002 ≈ ~200m. Use 0 for full detail."
     ),
     current_user: PublicUser = Depends(get_current_public_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all wine regions as GeoJSON FeatureCollection for map layer.
@@ -160,20 +170,12 @@ async def get_regions_geojson(
             ORDER BY display_order
         """)
         
-        results = db.execute(query, {"tolerance": simplify}).fetchall()
+        results = (await db.execute(query, {"tolerance": simplify})).fetchall()
         
         features = []
         for row in results:
-            # Parse the geometry JSON from PostGIS (already simplified)
-            geometry = None
-            if row.geometry_json:
-                try:
-                    geometry = json.loads(row.geometry_json)
-                except json.JSONDecodeError:
-                    logger.warning(f"Invalid geometry JSON for region {row.slug}")
-                    continue
-            
-            if not geometry:
+            # Geometry JSON from PostGIS (already simplified) is embedded as-is
+            if not row.geometry_json:
                 continue
             
             # Extract stats for properties
@@ -189,7 +191,7 @@ async def get_regions_geojson(
             feature = {
                 "type": "Feature",
                 "id": row.id,
-                "geometry": geometry,
+                "geometry": raw_json(row.geometry_json),
                 "properties": {
                     "id": row.id,
                     "name": row.name,
@@ -205,10 +207,10 @@ async def get_regions_geojson(
         
         logger.info(f"Returned {len(features)} regions with simplify={simplify}")
         
-        return {
+        return ORJSONResponse({
             "type": "FeatureCollection",
             "features": features
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error fetching regions GeoJSON: {e}")
@@ -222,17 +224,19 @@ async def get_regions_geojson(
 async def get_region_detail(
     slug: str,
     current_user: PublicUser = Depends(get_current_public_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get detailed information for a single wine region.
     Includes full stats with variety breakdown.
     """
     try:
-        region = db.query(WineRegion).filter(
-            WineRegion.slug == slug,
-            WineRegion.is_active == True
-        ).first()
+        region = (await db.execute(
+            select(*DETAIL_COLUMNS).where(
+                WineRegion.slug == slug,
+                WineRegion.is_active == True
+            )
+        )).first()
         
         if not region:
             raise HTTPException(
@@ -268,17 +272,19 @@ async def get_region_detail(
 async def get_region_bounds(
     slug: str,
     current_user: PublicUser = Depends(get_current_public_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get bounding box for a region (for map fly-to).
     Returns: {min_lng, min_lat, max_lng, max_lat}
     """
     try:
-        region = db.query(WineRegion).filter(
-            WineRegion.slug == slug,
-            WineRegion.is_active == True
-        ).first()
+        region = (await db.execute(
+            select(WineRegion.bounds).where(
+                WineRegion.slug == slug,
+                WineRegion.is_active == True
+            )
+        )).first()
         
         if not region:
             raise HTTPException(
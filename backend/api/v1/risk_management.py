@@ -37,6 +37,8 @@ from schemas.incident import (
 from services.risk_action_service import RiskActionService
 from services.risk_logic import RiskBusinessLogic
 from services.integrated_risk_service import IntegratedRiskService
+from services.due_items import ITEM_TYPES, DueItemService
+from services.risk_schedule import RiskRecurrenceService
 from utils.risk_permissions import RiskPermissions
 from utils.geometry import point_to_wkt, polygon_to_wkt
 from utils.geometry_helpers import geojson_to_geometry
@@ -398,24 +400,14 @@ def get_risk_actions(
         query = query.filter(RiskAction.assigned_to == current_user.id)
     
     # Handle status filtering including overdue
-    if status:
-        if status == 'overdue':
-            # Filter for overdue actions
-            from datetime import datetime, timezone
-            query = query.filter(
-                RiskAction.target_completion_date < datetime.now(timezone.utc),
-                RiskAction.status.notin_(["completed", "cancelled"])
-            )
-        else:
-            # Regular status filtering
-            query = query.filter(RiskAction.status == status)
-    
-    if overdue_only:
-        from datetime import datetime, timezone
-        query = query.filter(
-            RiskAction.target_completion_date < datetime.now(timezone.utc),
-            RiskAction.status.notin_(["completed", "cancelled"])
-        )
+    if status and status != 'overdue':
+        query = query.filter(RiskAction.status == status)
+    
+    if overdue_only or status == 'overdue':
+        # Overdue actions come from the due_items index
+        query = query.filter(RiskAction.id.in_(
+            DueItemService.overdue_ids(current_user.company_id, "risk_action")
+        ))
     
     actions = query.order_by(RiskAction.priority.desc(), RiskAction.created_at.desc()).all()
     return actions
@@ -440,14 +432,17 @@ def get_action_history(
     # Find the root parent action
     parent_id = action.parent_action_id or action.id
     
-    # Get all actions in the series
+    # Get all actions in the series (root + instances, via the parent_action_id index)
     history = db.query(RiskAction).filter(
         or_(
             RiskAction.id == parent_id,
             RiskAction.parent_action_id == parent_id
         ),
         RiskAction.company_id == current_user.company_id
-    ).order_by(RiskAction.created_at.desc()).all()
+    ).order_by(
+        func.coalesce(RiskAction.occurrence_date, RiskAction.target_start_date, RiskAction.created_at).desc(),
+        RiskAction.id.desc()
+    ).all()
     
     return history
 
@@ -485,16 +480,18 @@ def create_next_recurring_instance(
     if not parent_action.is_recurring:
         raise HTTPException(status_code=400, detail="Action is not recurring")
     
-    # Create new instance
-    new_action = parent_action.create_recurring_action()
-    if new_action:
-        new_action.company_id = current_user.company_id
-        db.add(new_action)
-        db.commit()
-        db.refresh(new_action)
-        return new_action
-    else:
-        raise HTTPException(status_code=400, detail="Failed to create recurring instance")
+    # Instances belong to their series root
+    if parent_action.parent_action_id:
+        parent_action = parent_action.parent_action
+    
+    try:
+        new_action = RiskRecurrenceService.create_next(db, parent_action)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if not new_action:
+        raise HTTPException(status_code=400, detail="Recurrence has no further occurrences")
+    return new_action
 
 
 @router.post("/risk-management/actions/", response_model=RiskActionResponse)
@@ -825,6 +822,26 @@ def get_overdue_items(
     overdue_data = service.get_overdue_items(current_user.company_id)
     return overdue_data
 
+@router.get("/risk-management/schedule")
+def get_due_schedule(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    days_ahead: int = Query(30, ge=0, le=365),
+    item_type: Optional[List[str]] = Query(None),
+    assigned_to_me: bool = Query(False)
+):
+    """Overdue and upcoming risk actions, risk reviews, calibrations and maintenance"""
+    if item_type and not set(item_type) <= set(ITEM_TYPES):
+        raise HTTPException(status_code=400, detail=f"item_type must be one of: {', '.join(ITEM_TYPES)}")
+    
+    return DueItemService.get_schedule(
+        db,
+        current_user.company_id,
+        days_ahead=days_ahead,
+        item_types=item_type,
+        assigned_to=current_user.id if assigned_to_me else None
+    )
+
 @router.get("/risk-management/my-assignments")
 def get_my_assignments(
     db: Session = Depends(get_db),
@@ -1,12 +1,14 @@
 # api/v1/spatial_areas.py (NEW FILE)
 from typing import List, Optional, Dict
 from fastapi import APIRouter, Depends, HTTPException, Body, Query
+from sqlalchemy import Float, cast, select
 from sqlalchemy.orm import Session
 from geoalchemy2.shape import to_shape, from_shape
 from shapely.geometry import mapping, shape, Polygon
 from api.deps import get_db, get_current_user
 from db.models.user import User
 from db.models.spatial_area import SpatialArea
+from utils.geojson import bbox_filter, feature_collection_query, geojson_response, parse_bbox
 from schemas.spatial_area import (
     SpatialAreaResponse, SpatialAreaCreate, SpatialAreaUpdate, 
     SpatialAreaWithChildren, SpatialAreaFilter
@@ -23,56 +25,50 @@ def get_all_spatial_areas_geojson(
     current_user: User = Depends(get_current_user),
     area_type: Optional[str] = None,
     limit: int = 1000,
-    scope: Optional[str] = Query(None)
+    scope: Optional[str] = Query(None),
+    bbox: Optional[str] = Query(None, description="Bounding box: west,south,east,north"),
+    zoom: Optional[int] = Query(None, ge=0, le=24, description="Map zoom level - simplifies geometry to the pixel size")
 ):
     """
-    Get all spatial areas as GeoJSON FeatureCollection for map display
+    Get all spatial areas as GeoJSON FeatureCollection for map display (assembled by PostGIS)
     """
-    query = db.query(SpatialArea).filter(SpatialArea.is_active == True)
+    query = select(
+        SpatialArea.id,
+        SpatialArea.area_type,
+        SpatialArea.name,
+        SpatialArea.description,
+        cast(SpatialArea.area_hectares, Float).label("area_hectares"),
+        SpatialArea.company_id,
+        SpatialArea.parent_area_id,
+        SpatialArea.is_active,
+        SpatialArea.area_metadata.label("metadata"),
+        SpatialArea.created_at,
+        SpatialArea.geometry
+    ).where(
+        SpatialArea.is_active == True,
+        SpatialArea.geometry != None
+    )
     
     # Filter by company
     is_auxein_admin = (current_user.email or "").lower() == "pete.taylor@auxein.co.nz"
     wants_all = (scope or "").lower() == "all"
 
     if current_user.company_id and not (is_auxein_admin and wants_all):
-        query = query.filter(SpatialArea.company_id == current_user.company_id)
+        query = query.where(SpatialArea.company_id == current_user.company_id)
     
     # Filter by area type if specified
     if area_type:
-        query = query.filter(SpatialArea.area_type == area_type)
-    
-    spatial_areas = query.limit(limit).all()
-    
-    features = []
-    for area in spatial_areas:
-        if area.geometry:
-            try:
-                shape_obj = to_shape(area.geometry)
-                feature = {
-                    "type": "Feature",
-                    "geometry": mapping(shape_obj),
-                    "properties": {
-                        "id": area.id,
-                        "area_type": area.area_type,
-                        "name": area.name,
-                        "description": area.description,
-                        "area_hectares": float(area.area_hectares) if area.area_hectares else None,
-                        "company_id": area.company_id,
-                        "parent_area_id": area.parent_area_id,
-                        "is_active": area.is_active,
-                        "metadata": area.area_metadata,
-                        "created_at": area.created_at.isoformat() if area.created_at else None
-                    }
-                }
-                features.append(feature)
-            except Exception as e:
-                logger.error(f"Error processing spatial area {area.id} geometry: {e}")
-                continue
-    
-    return {
-        "type": "FeatureCollection",
-        "features": features
-    }
+        query = query.where(SpatialArea.area_type == area_type)
+
+    try:
+        bbox_values = parse_bbox(bbox)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid bbox format. Use: west,south,east,north")
+    if bbox_values:
+        query = query.where(bbox_filter(SpatialArea.geometry, bbox_values))
+    
+    rows = query.limit(limit).subquery()
+    return geojson_response(db.execute(feature_collection_query(rows, zoom=zoom)).scalar())
 
 @router.get("/company")
 def get_company_spatial_areas(
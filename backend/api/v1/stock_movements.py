@@ -13,6 +13,8 @@ from db.models.user import User
 from db.models.contractor import Contractor
 from api.deps import get_current_user, get_current_contractor, get_current_user_or_contractor
 from schemas import asset as schemas
+from services.asset_analytics_service import AssetAnalyticsService
+from utils.bulk import bulk_insert
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -190,28 +192,7 @@ def get_stock_summary(
             detail="Asset not found"
         )
     
-    cutoff_date = date.today() - timedelta(days=days)
-    
-    movements = db.query(StockMovement).filter(
-        StockMovement.asset_id == asset_id,
-        StockMovement.company_id == current_user.company_id,
-        StockMovement.movement_date >= cutoff_date
-    ).all()
-    
-    # Calculate summary statistics
-    total_purchased = sum(m.quantity for m in movements if m.quantity > 0)
-    total_used = abs(sum(m.quantity for m in movements if m.quantity < 0))
-    total_adjustments = sum(
-        m.quantity for m in movements if m.movement_type == 'adjustment'
-    )
-    
-    purchase_count = len([m for m in movements if m.movement_type == 'purchase'])
-    usage_count = len([m for m in movements if m.movement_type == 'usage'])
-    
-    total_cost = sum(
-        m.total_cost for m in movements 
-        if m.total_cost and m.movement_type == 'purchase'
-    ) or Decimal('0.0')
+    summary = AssetAnalyticsService.get_stock_summary(db, current_user.company_id, asset_id, days)
     
     return {
         "asset_id": asset_id,
@@ -219,13 +200,7 @@ def get_stock_summary(
         "current_stock": asset.current_stock,
         "unit_of_measure": asset.unit_of_measure,
         "period_days": days,
-        "total_purchased": total_purchased,
-        "total_used": total_used,
-        "total_adjustments": total_adjustments,
-        "purchase_count": purchase_count,
-        "usage_count": usage_count,
-        "total_cost": total_cost,
-        "movement_count": len(movements)
+        **summary
     }
 
 @router.get("/{movement_id}", response_model=schemas.StockMovementResponse)
@@ -368,15 +343,18 @@ def create_bulk_stock_movements(
             detail="Maximum 100 movements per bulk operation"
         )
     
-    created_movements = []
+    # Validate the whole batch before writing anything
+    assets = {
+        asset.id: asset for asset in db.query(Asset).filter(
+            Asset.id.in_([m.asset_id for m in movements_in]),
+            Asset.company_id == current_user.company_id
+        )
+    }
     
     try:
+        movement_rows = []
         for movement_in in movements_in:
-            # Get the asset
-            asset = db.query(Asset).filter(
-                Asset.id == movement_in.asset_id,
-                Asset.company_id == current_user.company_id
-            ).first()
+            asset = assets.get(movement_in.asset_id)
             
             if not asset:
                 raise HTTPException(
@@ -390,7 +368,7 @@ def create_bulk_stock_movements(
                     detail=f"Asset {asset.id} is not a consumable"
                 )
             
-            # Record stock before
+            # Record stock before (includes earlier movements in this batch)
             stock_before = asset.current_stock or Decimal('0.0')
             
             # Calculate total cost
@@ -398,15 +376,6 @@ def create_bulk_stock_movements(
             if movement_in.unit_cost:
                 total_cost = abs(movement_in.quantity) * movement_in.unit_cost
             
-            # Create movement
-            movement = StockMovement(
-                **movement_in.dict(),
-                company_id=current_user.company_id,
-                stock_before=stock_before,
-                total_cost=total_cost,
-                created_by=current_user.id
-            )
-            
             # Update stock
             new_stock = stock_before + movement_in.quantity
             
@@ -416,7 +385,14 @@ def create_bulk_stock_movements(
                     detail=f"Insufficient stock for asset {asset.id}"
                 )
             
-            movement.stock_after = new_stock
+            movement_rows.append({
+                **movement_in.dict(),
+                "company_id": current_user.company_id,
+                "stock_before": stock_before,
+                "stock_after": new_stock,
+                "total_cost": total_cost,
+                "created_by": current_user.id
+            })
             asset.current_stock = new_stock
             
             # Update status
@@ -424,15 +400,10 @@ def create_bulk_stock_movements(
                 asset.status = "out_of_stock"
             elif asset.status == "out_of_stock" and new_stock > 0:
                 asset.status = "active"
-            
-            db.add(movement)
-            created_movements.append(movement)
         
+        created_movements = bulk_insert(db, StockMovement, movement_rows)
         db.commit()
         
-        for movement in created_movements:
-            db.refresh(movement)
-        
         logger.info(f"Created {len(created_movements)} stock movements in bulk")
         return created_movements
         
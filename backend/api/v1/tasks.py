@@ -3,7 +3,7 @@ import logging
 from typing import List, Optional, Literal
 from datetime import datetime, date, timedelta
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, and_, or_, desc, asc
 from pydantic import BaseModel, Field, validator
@@ -51,6 +51,8 @@ from schemas.task_gps_track import (
 )
 
 from api.deps import get_current_user
+from services.task_query_service import TaskQueryService
+from utils.bulk import bulk_insert
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -62,15 +64,7 @@ router = APIRouter()
 
 def generate_task_number(db: Session, company_id: int) -> str:
     """Generate unique task number: TASK-2025-001"""
-    year = datetime.now().year
-    
-    # Get count of tasks for this company this year
-    count = db.query(func.count(Task.id)).filter(
-        Task.company_id == company_id,
-        func.extract('year', Task.created_at) == year
-    ).scalar() or 0
-    
-    return f"TASK-{year}-{count + 1:03d}"
+    return TaskQueryService.next_task_number(db, company_id)
 
 
 def check_task_access(db: Session, task_id: int, user: User) -> Task:
@@ -376,6 +370,7 @@ def quick_create_task(
 
 @router.get("/tasks", response_model=List[TaskResponse])
 def list_tasks(
+    response: Response,
     status: Optional[TaskStatus] = None,
     task_category: Optional[TaskCategory] = None,
     priority: Optional[str] = None,
@@ -388,59 +383,41 @@ def list_tasks(
     search: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """List tasks with comprehensive filtering"""
-    query = db.query(Task).filter(
-        Task.company_id == current_user.company_id
-    )
-    
-    # Apply filters
-    if status:
-        query = query.filter(Task.status == status)
-    if task_category:
-        query = query.filter(Task.task_category == task_category)
-    if priority:
-        query = query.filter(Task.priority == priority)
-    if block_id:
-        query = query.filter(Task.block_id == block_id)
-    if spatial_area_id:
-        query = query.filter(Task.spatial_area_id == spatial_area_id)
-    if created_by:
-        query = query.filter(Task.created_by == created_by)
-    
-    # Date filters
-    if scheduled_start_from:
-        query = query.filter(Task.scheduled_start_date >= scheduled_start_from)
-    if scheduled_start_to:
-        query = query.filter(Task.scheduled_start_date <= scheduled_start_to)
-    
-    # Assignment filter
-    if assigned_to_user_id:
-        query = query.join(TaskAssignment).filter(
-            TaskAssignment.user_id == assigned_to_user_id
-        )
+    """
+    List tasks with comprehensive filtering.
     
-    # Search
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Task.title.ilike(search_term),
-                Task.task_number.ilike(search_term),
-                Task.description.ilike(search_term)
-            )
+    Ordered by scheduled date, then priority, then created date. When more results
+    exist the response carries an X-Next-Cursor header; pass it back as `cursor`
+    to fetch the next page.
+    """
+    try:
+        tasks, next_cursor = TaskQueryService.list_tasks(
+            db,
+            current_user.company_id,
+            status=status,
+            task_category=task_category,
+            priority=priority,
+            block_id=block_id,
+            spatial_area_id=spatial_area_id,
+            assigned_to_user_id=assigned_to_user_id,
+            created_by=created_by,
+            scheduled_start_from=scheduled_start_from,
+            scheduled_start_to=scheduled_start_to,
+            search=search,
+            limit=limit,
+            cursor=cursor,
+            skip=skip
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Order by scheduled date, then priority, then created date
-    query = query.order_by(
-        Task.scheduled_start_date.asc().nullsfirst(),
-        desc(Task.priority),
-        desc(Task.created_at)
-    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
-    tasks = query.offset(skip).limit(limit).all()
     return tasks
 
 
@@ -822,31 +799,27 @@ def create_bulk_assignments(
             detail="One or more users not found"
         )
     
-    assignments = []
-    for idx, user_id in enumerate(bulk_data.user_ids):
-        # Check if already assigned
-        existing = db.query(TaskAssignment).filter(
+    # Skip users already assigned
+    already_assigned = {
+        user_id for (user_id,) in db.query(TaskAssignment.user_id).filter(
             TaskAssignment.task_id == task_id,
-            TaskAssignment.user_id == user_id
-        ).first()
-        
-        if existing:
-            continue  # Skip if already assigned
-        
-        assignment = TaskAssignment(
-            task_id=task_id,
-            user_id=user_id,
-            assigned_by=current_user.id,
-            role=bulk_data.role,
-            is_primary=(idx == 0 and bulk_data.set_first_as_primary),
-            estimated_hours=bulk_data.estimated_hours
+            TaskAssignment.user_id.in_(bulk_data.user_ids)
         )
-        db.add(assignment)
-        assignments.append(assignment)
+    }
     
+    assignments = bulk_insert(db, TaskAssignment, [
+        {
+            "task_id": task_id,
+            "user_id": user_id,
+            "assigned_by": current_user.id,
+            "role": bulk_data.role,
+            "is_primary": (idx == 0 and bulk_data.set_first_as_primary),
+            "estimated_hours": bulk_data.estimated_hours
+        }
+        for idx, user_id in enumerate(bulk_data.user_ids)
+        if user_id not in already_assigned
+    ])
     db.commit()
-    for assignment in assignments:
-        db.refresh(assignment)
     
     logger.info(f"{len(assignments)} users assigned to task {task_id}")
     return assignments
@@ -1084,26 +1057,24 @@ def create_bulk_task_rows(
             detail="No rows found for this block"
         )
     
-    # Create task rows
-    task_rows = []
-    for row in rows:
-        # Check if already added
-        existing = db.query(TaskRow).filter(
+    # Skip rows already on the task
+    already_added = {
+        vineyard_row_id for (vineyard_row_id,) in db.query(TaskRow.vineyard_row_id).filter(
             TaskRow.task_id == task_id,
-            TaskRow.vineyard_row_id == row.id
-        ).first()
-        
-        if existing:
-            continue  # Skip if already added
-        
-        task_row = TaskRow(
-            task_id=task_id,
-            vineyard_row_id=row.id,
-            block_id=bulk_data.block_id,
-            row_number=row.row_number
+            TaskRow.vineyard_row_id.in_([row.id for row in rows])
         )
-        db.add(task_row)
-        task_rows.append(task_row)
+    }
+    
+    task_rows = bulk_insert(db, TaskRow, [
+        {
+            "task_id": task_id,
+            "vineyard_row_id": row.id,
+            "block_id": bulk_data.block_id,
+            "row_number": row.row_number
+        }
+        for row in rows
+        if row.id not in already_added
+    ])
     
     # Update task rows_total
     task.rows_total = db.query(func.count(TaskRow.id)).filter(
@@ -1111,8 +1082,6 @@ def create_bulk_task_rows(
     ).scalar()
     
     db.commit()
-    for task_row in task_rows:
-        db.refresh(task_row)
     
     logger.info(f"{len(task_rows)} rows added to task {task_id}")
     return task_rows
@@ -1423,20 +1392,16 @@ def add_bulk_gps_points(
     base_segment_id = last_point.segment_id if last_point else 1
     
     # Create GPS points
-    gps_points = []
-    for point_data in bulk_data.points:
-        gps_point = TaskGPSTrack(
-            task_id=task_id,
-            user_id=current_user.id,
-            segment_id=point_data.segment_id or base_segment_id,
-            **point_data.model_dump()
-        )
-        db.add(gps_point)
-        gps_points.append(gps_point)
-    
+    gps_points = bulk_insert(db, TaskGPSTrack, [
+        {
+            **point_data.model_dump(),
+            "task_id": task_id,
+            "user_id": current_user.id,
+            "segment_id": point_data.segment_id or base_segment_id
+        }
+        for point_data in bulk_data.points
+    ])
     db.commit()
-    for point in gps_points:
-        db.refresh(point)
     
     logger.info(f"{len(gps_points)} GPS points added to task {task_id}")
     return gps_points
@@ -1663,20 +1628,14 @@ def get_my_tasks(
     current_user: User = Depends(get_current_user)
 ):
     """Get tasks assigned to current user"""
-    query = db.query(Task).join(TaskAssignment).filter(
-        TaskAssignment.user_id == current_user.id,
-        Task.company_id == current_user.company_id
+    tasks = TaskQueryService.get_user_tasks(
+        db,
+        current_user.id,
+        current_user.company_id,
+        assignment_status=status,
+        include_completed=include_completed
     )
     
-    # Filter by status
-    if status:
-        query = query.filter(TaskAssignment.status == status)
-    
-    if not include_completed:
-        query = query.filter(Task.status != TaskStatus.completed)
-    
-    tasks = query.order_by(desc(Task.priority), Task.scheduled_start_date).all()
-    
     # Add computed fields
     for task in tasks:
         task.assignment_count = len(task.assignments)
@@ -1,5 +1,6 @@
 # api/v1/training.py - Training Module API Endpoints (CLEANED UP)
 from typing import List, Optional, Dict, Any
+from datetime import date, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, and_, or_
@@ -14,6 +15,7 @@ from db.models.training_record import TrainingRecord
 from db.models.training_attempt import TrainingAttempt
 from db.models.training_response import TrainingResponse
 
+from services.company_counters import CompanyCounterService
 from schemas.user import UserSummary
 from schemas.training import (
     TrainingModule as TrainingModuleSchema,
@@ -686,31 +688,32 @@ def get_training_stats(
             detail="Insufficient permissions to view training reports"
         )
     
-    # Use the company method we created
-    stats = current_user.company.get_training_stats(db, days)
+    # Module and assignment totals come from the company's counters row
+    counters = CompanyCounterService.get(db, current_user.company_id)
     
-    # Calculate additional metrics
-    total_assignments = db.query(func.count(TrainingRecord.id)).filter(
-        TrainingRecord.module.has(TrainingModule.company_id == current_user.company_id)
+    # Completions in the period still need a count over the window
+    start_date = date.today() - timedelta(days=days)
+    completions = db.query(func.count(TrainingRecord.id)).filter(
+        TrainingRecord.module.has(TrainingModule.company_id == current_user.company_id),
+        TrainingRecord.status == "completed",
+        TrainingRecord.completed_at >= start_date
     ).scalar() or 0
     
     completion_rate = 0
-    if total_assignments > 0:
-        completion_rate = (stats["completions_this_period"] / total_assignments) * 100
+    if counters.training_record_count > 0:
+        completion_rate = (completions / counters.training_record_count) * 100
     
-    # Calculate average score
-    avg_score = db.query(func.avg(TrainingRecord.best_score)).filter(
-        TrainingRecord.module.has(TrainingModule.company_id == current_user.company_id),
-        TrainingRecord.status == "completed"
-    ).scalar() or 0
+    avg_score = 0
+    if counters.training_scored_count > 0:
+        avg_score = counters.training_score_total / counters.training_scored_count
     
     return TrainingStats(
-        total_modules=stats["total_modules"],
-        published_modules=stats["published_modules"],
-        completions_this_period=stats["completions_this_period"],
-        active_assignments=stats["active_assignments"],
+        total_modules=counters.training_module_count,
+        published_modules=counters.published_training_module_count,
+        completions_this_period=completions,
+        active_assignments=counters.active_training_record_count,
         completion_rate=completion_rate,
-        average_score=float(avg_score) if avg_score else 0,
+        average_score=float(avg_score),
         period_days=days
     )
 
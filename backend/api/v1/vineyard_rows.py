@@ -15,8 +15,12 @@ from schemas.vineyard_row import (
     VineyardRowFilter,
     BulkRowCreationRequest,
     BulkRowCreationResponse,
+    RowLayoutRequest,
+    RowLayoutResponse,
     ClonalSection
 )
+from services.row_layout_service import RowLayoutService, RowsInUseError
+from utils.bulk import bulk_insert
 from utils.geometry_helpers import geojson_to_geometry
 import logging
 
@@ -71,26 +75,16 @@ def bulk_create_rows(
         raise HTTPException(status_code=400, detail=str(e))
     
     # Create rows
-    created_rows = []
-    for row_number in row_numbers:
-        row_data = {
-            "block_id": request.block_id,
-            "row_number": row_number,
-            "variety": request.variety or block.variety,
-            "clone": request.clone or block.clone,
-            "rootstock": request.rootstock or block.rootstock,
-            "vine_spacing": request.vine_spacing or block.vine_spacing
-        }
-        
-        db_row = VineyardRow(**row_data)
-        db.add(db_row)
-        created_rows.append(db_row)
-    
-    db.commit()
-    
-    # Refresh all rows to get IDs
-    for row in created_rows:
-        db.refresh(row)
+    row_defaults = {
+        "variety": request.variety or block.variety,
+        "clone": request.clone or block.clone,
+        "rootstock": request.rootstock or block.rootstock,
+        "vine_spacing": request.vine_spacing or block.vine_spacing
+    }
+    created_rows = bulk_insert(db, VineyardRow, [
+        {"block_id": request.block_id, "row_number": row_number, **row_defaults}
+        for row_number in row_numbers
+    ])
     
     block.row_start = str(request.row_start)
     block.row_end = str(request.row_end)
@@ -115,6 +109,44 @@ def bulk_create_rows(
         message=f"Successfully created {len(created_rows)} rows"
     )
 
+@router.post("/generate-layout", response_model=RowLayoutResponse)
+def generate_row_layout(
+    request: RowLayoutRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Generate row geometry for a whole block from a row bearing and spacing.
+    Rows are clipped to the block boundary and split around holes, then inserted in one statement.
+    """
+    try:
+        created_rows = RowLayoutService.create_layout(
+            db,
+            request.block_id,
+            bearing=request.row_bearing,
+            spacing=request.row_spacing,
+            row_start=request.row_start,
+            first_row_offset=request.first_row_offset,
+            min_row_length=request.min_row_length,
+            replace_existing=request.replace_existing
+        )
+    except RowsInUseError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        status_code = 404 if "not found" in str(e) else 400
+        raise HTTPException(status_code=status_code, detail=str(e))
+    
+    block = db.query(VineyardBlock).filter(VineyardBlock.id == request.block_id).first()
+    
+    return RowLayoutResponse(
+        created_rows=len(created_rows),
+        row_count=block.row_count,
+        row_bearing=block.row_orientation,
+        row_spacing=block.row_spacing,
+        total_row_length=round(sum(row.row_length or 0 for row in created_rows), 2),
+        rows=[VineyardRowSchema.model_validate(row) for row in created_rows],
+        message=f"Successfully generated {block.row_count} rows"
+    )
+
 # NEW: Update row with clonal sections
 @router.put("/{row_id}/clonal-sections", response_model=VineyardRowSchema)
 def update_row_clonal_sections(
@@ -1,7 +1,7 @@
 # api/v1/visitors.py - Visitor API endpoints
 from typing import List, Optional, Dict, Any
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 
 from api.deps import get_db, get_current_user
@@ -45,14 +45,21 @@ def create_visitor(
 
 @router.get("/visitors", response_model=List[VisitorWithStats])
 def get_visitors(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     search: Optional[str] = Query(None),
     active_only: bool = Query(True),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get list of visitors"""
+    """
+    Get list of visitors with visit stats.
+    
+    Ordered by last name, first name. When more results exist the response carries
+    an X-Next-Cursor header; pass it back as `cursor` to fetch the next page.
+    """
     if not VisitorPermissions.can_view_visitor(current_user):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -60,23 +67,29 @@ def get_visitors(
         )
     
     service = VisitorService(db)
-    visitors = service.get_visitors(
-        current_user.company_id, skip=skip, limit=limit, 
-        search=search, active_only=active_only
-    )
-    
-    # Add stats to each visitor
-    visitors_with_stats = []
-    for visitor in visitors:
-        visitor_stats = VisitorWithStats(
-            **visitor.__dict__,
-            total_visits=len(visitor.visits),
-            last_visit_date=max([v.visit_date for v in visitor.visits]) if visitor.visits else None,
-            is_frequent_visitor=len(visitor.visits) >= 3
+    try:
+        rows, next_cursor = service.get_visitors_with_stats(
+            current_user.company_id, limit=limit, skip=skip, cursor=cursor,
+            search=search, active_only=active_only
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
-        visitors_with_stats.append(visitor_stats)
     
-    return visitors_with_stats
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    
+    return [
+        VisitorWithStats(
+            **row["visitor"].__dict__,
+            total_visits=row["total_visits"],
+            last_visit_date=row["last_visit_date"],
+            is_frequent_visitor=row["is_frequent_visitor"]
+        )
+        for row in rows
+    ]
 
 @router.get("/visitors/{visitor_id}", response_model=VisitorWithStats)
 def get_visitor(
@@ -86,14 +99,15 @@ def get_visitor(
 ):
     """Get visitor by ID"""
     service = VisitorService(db)
-    visitor = service.get_visitor(visitor_id, current_user.company_id)
+    result = service.get_visitor_with_stats(visitor_id, current_user.company_id)
     
-    if not visitor:
+    if not result:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Visitor not found"
         )
     
+    visitor = result["visitor"]
     if not VisitorPermissions.can_view_visitor(current_user, visitor):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -102,9 +116,9 @@ def get_visitor(
     
     return VisitorWithStats(
         **visitor.__dict__,
-        total_visits=len(visitor.visits),
-        last_visit_date=max([v.visit_date for v in visitor.visits]) if visitor.visits else None,
-        is_frequent_visitor=len(visitor.visits) >= 3
+        total_visits=result["total_visits"],
+        last_visit_date=result["last_visit_date"],
+        is_frequent_visitor=result["is_frequent_visitor"]
     )
 
 @router.put("/visitors/{visitor_id}", response_model=Visitor)
@@ -468,17 +482,13 @@ def get_visitor_dashboard(
     # Get active visits
     active_visits = service.get_active_visits(current_user.company_id)
     
-    # Get today's visits
-    today_visits = service.get_visits(
-        current_user.company_id, 
-        visit_date=date.today(),
-        limit=50
-    )
+    # Count today's visits
+    today_visits = service.count_visits(current_user.company_id, visit_date=date.today())
     
-    # Get recent visitors (last 7 days)
+    # Get recent activity (visitor eager-loaded by get_visits)
     recent_visitors = service.get_visits(
         current_user.company_id,
-        limit=20
+        limit=10
     )
     
     # Get stats
@@ -486,7 +496,7 @@ def get_visitor_dashboard(
     
     return {
         "active_visits": len(active_visits),
-        "today_visits": len(today_visits),
+        "today_visits": today_visits,
         "recent_activity": [
             {
                 "id": visit.id,
@@ -526,19 +536,19 @@ def search_visitors(
         )
     
     service = VisitorService(db)
-    visitors = service.get_visitors(current_user.company_id, search=q, limit=20)
+    results = service.search_visitors(current_user.company_id, q, limit=20)
     
     return [
         {
-            "id": visitor.id,
-            "name": visitor.full_name,
-            "email": visitor.email,
-            "company": visitor.company_representing,
-            "phone": visitor.phone,
-            "total_visits": len(visitor.visits),
-            "last_visit": max([v.visit_date for v in visitor.visits]) if visitor.visits else None
+            "id": row["visitor"].id,
+            "name": row["visitor"].full_name,
+            "email": row["visitor"].email,
+            "company": row["visitor"].company_representing,
+            "phone": row["visitor"].phone,
+            "total_visits": row["total_visits"],
+            "last_visit": row["last_visit_date"]
         }
-        for visitor in visitors
+        for row in results
     ]
 
 @router.get("/export")
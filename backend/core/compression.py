@@ -0,0 +1,126 @@
+# core/compression.py
+"""
+Response compression negotiated from Accept-Encoding.
+
+Brotli (when the brotli package is installed) is preferred over gzip when the
+client accepts both; q=0 refuses an encoding. Bodies smaller than
+minimum_size, responses that already have a Content-Encoding, event streams,
+already-compressed media (images, video, archives), partial content (206 /
+Content-Range) and file downloads (Content-Disposition) are sent unchanged.
+Streaming responses are compressed chunk by chunk. A compressed response's
+strong ETag is made weak, since its bytes differ from the identity body's.
+
+Built on Starlette's GZipMiddleware responders, which handle Content-Length,
+Vary and streaming.
+"""
+from typing import Dict
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipResponder as StarletteGZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+UNCOMPRESSED_CONTENT_TYPES = (
+    "text/event-stream",
+    "image/",
+    "video/",
+    "audio/",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/pdf",
+)
+
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """{encoding: q} from an Accept-Encoding header"""
+    encodings = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[name.strip()] = q
+    return encodings
+
+
+class _SkipCompressedMixin:
+    """
+    Leaves already-compressed media, ranges and downloads alone (Starlette only
+    skips event streams) and weakens the ETag of what it does compress.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def send_weak_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and not self.content_encoding_set:
+                headers = MutableHeaders(raw=message["headers"])
+                etag = headers.get("etag")
+                if headers.get("content-encoding") == self.content_encoding and etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+            await send(message)
+
+        await super().__call__(scope, receive, send_weak_etag)
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            await super().send_with_compression(message)
+            self.content_type_is_excluded |= (
+                message["status"] == 206
+                or "content-range" in headers
+                or "content-disposition" in headers
+                or headers.get("content-type", "").startswith(UNCOMPRESSED_CONTENT_TYPES)
+            )
+            return
+        await super().send_with_compression(message)
+
+
+class GZipResponder(_SkipCompressedMixin, StarletteGZipResponder):
+    pass
+
+
+class BrotliResponder(_SkipCompressedMixin, IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        compressed = self.compressor.process(body)
+        if more_body:
+            return compressed + self.compressor.flush()
+        return compressed + self.compressor.finish()
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        responder: ASGIApp
+        if brotli is not None and accepted.get("br", 0) > 0:
+            responder = BrotliResponder(self.app, self.minimum_size, self.brotli_quality)
+        elif accepted.get("gzip", 0) > 0:
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.gzip_level)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
@@ -115,6 +115,17 @@ class Settings(BaseSettings):
     DATABASE_URL: str = Field(default_factory=get_database_url)
     LOCAL_DATABASE_URL: Optional[str] = os.getenv("LOCAL_DATABASE_URL")
     
+    # Connection pool (db.session) - statement timeouts of 0 are disabled (scripts share the sync engine)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "300"))
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    # asyncpg engine for the read-only public routers
+    ASYNC_DB_POOL_SIZE: int = int(os.getenv("ASYNC_DB_POOL_SIZE", "10"))
+    ASYNC_DB_MAX_OVERFLOW: int = int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "10"))
+    ASYNC_DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("ASYNC_DB_STATEMENT_TIMEOUT_MS", "10000"))
+    
     # AWS RDS Settings
     AWS_REGION: str = os.getenv("AWS_REGION", "ap-southeast-2")
     RDS_SECRET_NAME: Optional[str] = os.getenv("RDS_SECRET_NAME")
@@ -140,9 +151,63 @@ class Settings(BaseSettings):
     
     # Email feature flags
     SEND_EMAILS: bool = os.getenv("SEND_EMAILS", "false").lower() == "true"
+    # Set false for a plain local relay / debugging server (no STARTTLS, login optional)
+    SMTP_USE_TLS: bool = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
+    
+    # Outbound mail queue - send_email stores messages in outbound_emails and a
+    # background worker delivers them in batches over one SMTP session
+    MAIL_QUEUE_ENABLED: bool = os.getenv("MAIL_QUEUE_ENABLED", "true").lower() == "true"
+    MAIL_QUEUE_BATCH_SIZE: int = int(os.getenv("MAIL_QUEUE_BATCH_SIZE", "50"))
+    MAIL_QUEUE_POLL_SECONDS: float = float(os.getenv("MAIL_QUEUE_POLL_SECONDS", "5"))
+    MAIL_MAX_ATTEMPTS: int = int(os.getenv("MAIL_MAX_ATTEMPTS", "6"))
+    MAIL_RETRY_BASE_SECONDS: int = int(os.getenv("MAIL_RETRY_BASE_SECONDS", "60"))
     
     UPLOAD_DIR: str = get_upload_dir()
+    MAX_UPLOAD_SIZE_MB: int = int(os.getenv("MAX_UPLOAD_SIZE_MB", "50"))
+    
+    # Resized WebP/JPEG image variants (services.image_derivatives) - LRU-evicted past the size limit
+    IMAGE_CACHE_DIR: str = os.getenv("IMAGE_CACHE_DIR") or os.path.join(get_upload_dir(), "_derivatives")
+    IMAGE_CACHE_MAX_MB: int = int(os.getenv("IMAGE_CACHE_MAX_MB", "2048"))
+    
+    # Read asset dashboard status from the asset_status_summary materialized view, refreshed in the background
+    ASSET_STATUS_MATVIEW: bool = os.getenv("ASSET_STATUS_MATVIEW", "false").lower() == "true"
+    ASSET_STATUS_REFRESH_DELAY_SECONDS: float = float(os.getenv("ASSET_STATUS_REFRESH_DELAY_SECONDS", "5"))
+    
+    # In-process STRtree for /public/blocks/query, reloaded when table_versions.vineyard_blocks changes
+    BLOCK_INDEX_ENABLED: bool = os.getenv("BLOCK_INDEX_ENABLED", "true").lower() == "true"
+    BLOCK_INDEX_POLL_SECONDS: float = float(os.getenv("BLOCK_INDEX_POLL_SECONDS", "30"))
+    
+    # Recurring risk actions and the due_items index (services.risk_schedule, services.due_items)
+    RISK_SCHEDULE_ENABLED: bool = os.getenv("RISK_SCHEDULE_ENABLED", "true").lower() == "true"
+    RISK_SCHEDULE_INTERVAL_SECONDS: float = float(os.getenv("RISK_SCHEDULE_INTERVAL_SECONDS", "3600"))
+    RISK_RECURRENCE_HORIZON_DAYS: int = int(os.getenv("RISK_RECURRENCE_HORIZON_DAYS", "90"))
+    DUE_ITEMS_SYNC_ON_COMMIT: bool = os.getenv("DUE_ITEMS_SYNC_ON_COMMIT", "true").lower() == "true"
     
+    # Per-company dashboard counts in company_counters, recounted as each writing transaction commits
+    COMPANY_COUNTERS_ENABLED: bool = os.getenv("COMPANY_COUNTERS_ENABLED", "true").lower() == "true"
+    
+    # Provenance chain verification - signed checkpoint every N nodes (key defaults to SECRET_KEY)
+    BLOCKCHAIN_CHECKPOINT_INTERVAL: int = int(os.getenv("BLOCKCHAIN_CHECKPOINT_INTERVAL", "500"))
+    BLOCKCHAIN_CHECKPOINT_KEY: Optional[str] = os.getenv("BLOCKCHAIN_CHECKPOINT_KEY")
+    BLOCKCHAIN_VERIFY_WORKERS: int = int(os.getenv("BLOCKCHAIN_VERIFY_WORKERS", "4"))
+    
+    # Request / SQL instrumentation (core.metrics) - /metrics is served only when METRICS_TOKEN is set, as a bearer token
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_TOKEN: Optional[str] = os.getenv("METRICS_TOKEN")
+    SLOW_QUERY_MS: int = int(os.getenv("SLOW_QUERY_MS", "200"))
+    SLOW_QUERY_LOG_CHARS: int = int(os.getenv("SLOW_QUERY_LOG_CHARS", "1000"))
+    # Honour the X-Profile request header (samples stacks, logs a summary) - keep off in production
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+
+    # Response compression (core.compression) - brotli preferred when installed, else gzip
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_BYTES: int = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+    GZIP_LEVEL: int = int(os.getenv("GZIP_LEVEL", "6"))
+    BROTLI_QUALITY: int = int(os.getenv("BROTLI_QUALITY", "4"))
+
+    # Router groups main.py mounts: comma-separated app, public, admin - or all / none
+    API_ROUTER_GROUPS: str = os.getenv("API_ROUTER_GROUPS", "all")
+
     # VITE API
     VITE_API_URL: str = Field(None, description="Frontend API URL, not used by backend")
 
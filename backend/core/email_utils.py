@@ -2,8 +2,10 @@
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from functools import lru_cache
 from typing import List, Optional
 import logging
+from jinja2 import Template
 from core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -14,42 +16,106 @@ class EmailService:
         self.smtp_port = getattr(settings, 'SMTP_PORT', 587)
         self.smtp_username = getattr(settings, 'SMTP_USERNAME', None)
         self.smtp_password = getattr(settings, 'SMTP_PASSWORD', None)
+        self.smtp_use_tls = getattr(settings, 'SMTP_USE_TLS', True)
         self.from_email = getattr(settings, 'FROM_EMAIL', self.smtp_username)
         self.from_name = getattr(settings, 'FROM_NAME', 'Auxein Insights')
         self.frontend_url = getattr(settings, 'FRONTEND_URL', None)
+    
+    @property
+    def is_configured(self) -> bool:
+        """Credentials are required unless SMTP_USE_TLS is off (local relay / debugging server)"""
+        if not self.smtp_server:
+            return False
+        return bool(self.smtp_username and self.smtp_password) or not self.smtp_use_tls
+    
+    def build_message(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+        reply_to: Optional[str] = None
+    ) -> MIMEMultipart:
+        """Build a multipart/alternative message"""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = f"{self.from_name} <{self.from_email}>"
+        msg['To'] = to_email
+        if reply_to:
+            msg['Reply-To'] = reply_to
+        
+        # Add text and HTML content
+        if text_content:
+            text_part = MIMEText(text_content, 'plain')
+            msg.attach(text_part)
+        
+        html_part = MIMEText(html_content, 'html')
+        msg.attach(html_part)
+        return msg
+    
+    def connect(self) -> smtplib.SMTP:
+        """Open an SMTP session (STARTTLS + login when configured). Caller must quit() it."""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30)
+        try:
+            if self.smtp_use_tls:
+                server.starttls()
+            if self.smtp_username and self.smtp_password:
+                server.login(self.smtp_username, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
     def send_email(
         self,
         to_email: str,
         subject: str,
         html_content: str,
-        text_content: Optional[str] = None
+        text_content: Optional[str] = None,
+        reply_to: Optional[str] = None,
+        template: Optional[str] = None
     ) -> bool:
-        """Send an email"""
+        """
+        Send an email.
         
-        if not self.smtp_username or not self.smtp_password:
+        With MAIL_QUEUE_ENABLED the message is stored in the outbound_emails queue
+        and delivered by the background worker, so callers never wait on SMTP.
+        Returns True once the message is queued (or sent, when the queue is off).
+        """
+        if not self.is_configured:
             logger.warning("SMTP credentials not configured, skipping email send")
             return False
         
+        if getattr(settings, 'MAIL_QUEUE_ENABLED', False):
+            from services.mail_queue import enqueue_email
+            return enqueue_email(
+                to_email=to_email,
+                subject=subject,
+                html_content=html_content,
+                text_content=text_content,
+                reply_to=reply_to,
+                template=template
+            )
+        
+        return self.send_email_now(to_email, subject, html_content, text_content, reply_to)
+    
+    def send_email_now(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+        reply_to: Optional[str] = None
+    ) -> bool:
+        """Send one email synchronously over its own SMTP session"""
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{self.from_name} <{self.from_email}>"
-            msg['To'] = to_email
-            
-            # Add text and HTML content
-            if text_content:
-                text_part = MIMEText(text_content, 'plain')
-                msg.attach(text_part)
+            msg = self.build_message(to_email, subject, html_content, text_content, reply_to)
             
-            html_part = MIMEText(html_content, 'html')
-            msg.attach(html_part)
-            
-            # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_username, self.smtp_password)
+            server = self.connect()
+            try:
                 server.send_message(msg)
+            finally:
+                server.quit()
             
             logger.info(f"Email sent successfully to {to_email}")
             return True
@@ -61,6 +127,19 @@ class EmailService:
 # Initialize email service
 email_service = EmailService()
 
+
+@lru_cache(maxsize=64)
+def _compile_email_template(source: str, autoescape: bool) -> Template:
+    return Template(source, autoescape=autoescape)
+
+
+def render_email_template(source: str, autoescape: bool = True, **context) -> str:
+    """
+    Render a Jinja2 email template, compiling each distinct template source only once.
+    Pass autoescape=False for plain-text bodies.
+    """
+    return _compile_email_template(source, autoescape).render(**context)
+
 def get_base_email_styles():
     """Get base CSS styles for all emails"""
     return """
@@ -0,0 +1,281 @@
+# core/metrics.py
+"""
+Request and database instrumentation.
+
+- Per-route latency histograms, SQL statement counts and DB time, collected by
+  the instrument_requests middleware in main.py and SQLAlchemy cursor events
+  (instrument_engine). Routes are labelled by their path template so label
+  cardinality stays bounded.
+- Statements slower than SLOW_QUERY_MS are logged with the route that ran them.
+- render_metrics() returns everything in Prometheus text format for /metrics.
+- With PROFILING_ENABLED, a request sent with "X-Profile: 1" is sampled by
+  StackSampler and a summary of the hottest functions is logged.
+
+Per-request state lives in a ContextVar; anyio copies the context into the
+threadpool that runs sync handlers, so cursor events fired there update the
+right request.
+"""
+import logging
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_INTERVAL = 0.001
+PROFILE_TOP_N = 25
+# Idle pool threads park in these modules' waits; their samples are skipped
+IDLE_MODULES = ("threading.py", "queue.py", "selectors.py")
+
+UNMATCHED_ROUTE = "unmatched"
+BACKGROUND_ROUTE = "background"
+
+
+@dataclass
+class RequestStats:
+    method: str
+    scope: dict = field(repr=False)
+    statements: int = 0
+    db_seconds: float = 0.0
+
+    @property
+    def route(self) -> str:
+        """Path template of the matched route (set on the scope by the router)"""
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class MetricsRegistry:
+    """Process-wide counters and histograms, guarded by one lock"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: Dict[Tuple[str, str, int], _Histogram] = {}
+        self.statements: Dict[Tuple[str, str], _Histogram] = {}
+        self.db_seconds: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.slow_statements: Dict[str, int] = defaultdict(int)
+        self.background_statements = 0
+        self.background_db_seconds = 0.0
+
+    def observe_request(self, stats: RequestStats, status: int, seconds: float):
+        key = (stats.method, stats.route)
+        with self._lock:
+            latency = self.latency.get((stats.method, stats.route, status))
+            if latency is None:
+                latency = self.latency[(stats.method, stats.route, status)] = _Histogram(LATENCY_BUCKETS)
+            latency.observe(seconds)
+
+            statements = self.statements.get(key)
+            if statements is None:
+                statements = self.statements[key] = _Histogram(STATEMENT_BUCKETS)
+            statements.observe(stats.statements)
+            self.db_seconds[key] += stats.db_seconds
+
+    def observe_background_statement(self, seconds: float):
+        with self._lock:
+            self.background_statements += 1
+            self.background_db_seconds += seconds
+
+    def observe_slow_statement(self, route: str):
+        with self._lock:
+            self.slow_statements[route] += 1
+
+    def render(self) -> str:
+        lines = []
+
+        def histogram(name: str, help_text: str, series):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in series:
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+                lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {hist.count}")
+                lines.append(f"{name}_sum{_labels(**labels)} {hist.sum}")
+                lines.append(f"{name}_count{_labels(**labels)} {hist.count}")
+
+        with self._lock:
+            histogram(
+                "http_request_duration_seconds", "Request latency by route and status",
+                (({"method": m, "route": r, "status": s}, h) for (m, r, s), h in sorted(self.latency.items()))
+            )
+            histogram(
+                "http_request_db_statements", "SQL statements executed per request",
+                (({"method": m, "route": r}, h) for (m, r), h in sorted(self.statements.items()))
+            )
+
+            lines.append("# HELP http_request_db_seconds_total Time spent executing SQL per route")
+            lines.append("# TYPE http_request_db_seconds_total counter")
+            for (method, route), seconds in sorted(self.db_seconds.items()):
+                lines.append(f"http_request_db_seconds_total{_labels(method=method, route=route)} {seconds}")
+
+            lines.append(f"# HELP db_slow_statements_total Statements slower than {settings.SLOW_QUERY_MS} ms")
+            lines.append("# TYPE db_slow_statements_total counter")
+            for route, count in sorted(self.slow_statements.items()):
+                lines.append(f"db_slow_statements_total{_labels(route=route)} {count}")
+
+            lines.append("# HELP db_background_statements_total SQL statements executed outside requests")
+            lines.append("# TYPE db_background_statements_total counter")
+            lines.append(f"db_background_statements_total {self.background_statements}")
+            lines.append("# HELP db_background_seconds_total Time spent executing SQL outside requests")
+            lines.append("# TYPE db_background_seconds_total counter")
+            lines.append(f"db_background_seconds_total {self.background_db_seconds}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+
+def render_metrics() -> str:
+    return metrics_registry.render()
+
+
+# =============================================================================
+# SQLALCHEMY
+# =============================================================================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+
+    stats = current_request.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += elapsed
+        route = f"{stats.method} {stats.route}"
+    else:
+        metrics_registry.observe_background_statement(elapsed)
+        route = BACKGROUND_ROUTE
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        metrics_registry.observe_slow_statement(stats.route if stats else BACKGROUND_ROUTE)
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.0f} ms) in {route}: "
+            f"{' '.join(statement.split())[:settings.SLOW_QUERY_LOG_CHARS]}"
+        )
+
+
+def _handle_error(exception_context):
+    # Failed statements never reach after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def instrument_engine(engine: Engine):
+    """Count and time every statement run on an engine (idempotent)"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+# =============================================================================
+# PROFILING
+# =============================================================================
+
+class StackSampler:
+    """
+    Statistical profiler for one request.
+
+    Sync handlers run in the threadpool, where cProfile and pyinstrument (which
+    only see the thread that started them) miss the work entirely, so this
+    samples every thread's stack except the event loop's and its own. Concurrent
+    requests therefore show up too; use it on a quiet instance.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.samples = 0
+        self.inclusive: Counter = Counter()
+        self.own: Counter = Counter()
+        self._ignore = {threading.get_ident()}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def _run(self):
+        self._ignore.add(threading.get_ident())
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id in self._ignore or frame.f_code.co_filename.endswith(IDLE_MODULES):
+                    continue
+                seen = set()
+                leaf = True
+                while frame is not None:
+                    code = frame.f_code
+                    key = f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+                    if leaf:
+                        self.own[key] += 1
+                        leaf = False
+                    if key not in seen:
+                        seen.add(key)
+                        self.inclusive[key] += 1
+                    frame = frame.f_back
+                self.samples += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def summary(self, top_n: int = PROFILE_TOP_N) -> str:
+        rows = [f"{'total ms':>9} {'self ms':>8}  function"]
+        for key, count in self.inclusive.most_common(top_n):
+            rows.append(f"{count * self.interval * 1000:9.0f} {self.own[key] * self.interval * 1000:8.0f}  {key}")
+        return "\n".join(rows)
+
+
+def profiling_requested(headers) -> bool:
+    return settings.PROFILING_ENABLED and headers.get(PROFILE_HEADER, "").lower() in ("1", "true", "yes")
@@ -98,7 +98,7 @@ def generate_reset_token() -> str:
     """Generate a secure random token for password reset"""
     return secrets.token_urlsafe(32)
 
-async def get_current_public_user(
+def get_current_public_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
@@ -152,7 +152,7 @@ async def get_current_public_user(
     
     return user
 
-async def get_optional_public_user(
+def get_optional_public_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: Session = Depends(get_db)
 ):
@@ -166,6 +166,6 @@ async def get_optional_public_user(
         return None
     
     try:
-        return await get_current_public_user(credentials, db)
+        return get_current_public_user(credentials, db)
     except HTTPException:
         return None
\ No newline at end of file
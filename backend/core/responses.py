@@ -0,0 +1,57 @@
+# core/responses.py
+"""
+orjson-backed JSON responses.
+
+ORJSONResponse is the app's default response class. Handlers that build large
+payloads return it directly, which skips FastAPI's jsonable_encoder pass, and
+wrap JSON text the database has already rendered (ST_AsGeoJSON,
+json_build_object, json_agg) in raw_json() so it is written into the output
+as-is instead of being parsed and re-serialized.
+
+    return ORJSONResponse({
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": raw_json(row.geometry_json), "properties": {...}}
+            for row in rows
+        ],
+    })
+
+orjson serializes datetime, date, UUID, enums and dataclasses natively;
+_default covers Decimal, sets and pydantic models.
+"""
+from decimal import Decimal
+from typing import Any, Optional, Union
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def raw_json(value: Optional[Union[str, bytes]]) -> Optional[orjson.Fragment]:
+    """Pre-rendered JSON text to embed without re-parsing (None stays null)"""
+    if value is None:
+        return None
+    return orjson.Fragment(value)
+
+
+def _default(obj: Any):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=DUMPS_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -2,6 +2,7 @@
 # app/db/models/__init__.py
 from db.models.subscription import Subscription
 from db.models.company import Company
+from db.models.company_counters import CompanyCounters
 from db.models.user import User
 from db.models.block import VineyardBlock
 from db.models.vineyard_row import VineyardRow
@@ -14,6 +15,7 @@ from db.models.spatial_area import SpatialArea
 from db.models.visitor import Visitor, VisitorVisit
 from db.models.site_risk import SiteRisk
 from db.models.risk_action import RiskAction
+from db.models.due_item import DueItem
 from db.models.incident import Incident
 from db.models.timesheet import TimesheetDay, TimeEntry
 from .training_module import TrainingModule
@@ -30,12 +32,13 @@ from .contractor_movement import ContractorMovement
 from .contractor_assignment import ContractorAssignment
 from .contractor_training import ContractorTraining
 from db.models.asset import Asset, AssetMaintenance, AssetCalibration, StockMovement, TaskAsset
-from db.models.file import File
+from db.models.file import File, FileBlob
 from db.models.reference_item import ReferenceItem
 from db.models.observation_link import ObservationTaskLink
 from db.models.observation_run import ObservationRun, ObservationSpot
 from db.models.observation_plan import ObservationPlan, ObservationPlanTarget, ObservationPlanAssignee
 from db.models.observation_template import ObservationTemplate
+from db.models.observation_metric import ObservationSpotMetric
 from db.models.reference_item_file import ReferenceItemFile
 from db.models.task_template import TaskTemplate
 from db.models.task import Task
@@ -44,9 +47,10 @@ from db.models.task_row import TaskRow
 from db.models.task_gps_track import TaskGPSTrack
 from db.models.wine_region import WineRegion
 from db.models.geographical_indication import GeographicalIndication
-from db.models.weather import WeatherStation, WeatherData, IngestionLog
+from db.models.weather import WeatherStation, WeatherData, WeatherDataIssue, IngestionLog
 from db.models.public_user import PublicUser
 from db.models.climate import ClimateZone, ClimateHistoryMonthly, ClimateBaselineMonthly, ClimateProjection
-from db.models.realtime_climate import WeatherDataDaily, ClimateZoneDaily, ClimateZoneDailyBaseline, PhenologyThreshold, PhenologyEstimate, DiseasePressure, ClimateZoneHourly
+from db.models.realtime_climate import WeatherDataDaily, ClimateZoneDaily, ClimateZoneDailyBaseline, ClimateZoneSeasonGdd, PhenologyThreshold, PhenologyEstimate, DiseasePressure, ClimateZoneHourly
 
-from db.models.blockchain import BlockchainChain, BlockchainNode, BlockchainEvent, FruitReceived
\ No newline at end of file
+from db.models.blockchain import BlockchainChain, BlockchainNode, BlockchainCheckpoint, BlockchainEvent, FruitReceived
+from db.models.table_version import TableVersion
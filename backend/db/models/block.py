@@ -18,6 +18,7 @@ class VineyardBlock(Base):
     clone = Column(String, nullable=True) 
     rootstock = Column(String, nullable=True)
     row_spacing = Column(Float, nullable=True)
+    row_orientation = Column(Float, nullable=True)  # Row bearing, degrees clockwise from north
     vine_spacing = Column(Float, nullable=True)
     area = Column(Float, nullable=True)
     region = Column(String, nullable=True)
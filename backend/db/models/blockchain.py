@@ -3,7 +3,7 @@ Blockchain DAG Models for Vineyard Traceability
 
 @author: Peter Taylor
 """
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, JSON, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, JSON, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from db.base_class import Base
@@ -102,6 +102,32 @@ class BlockchainNode(Base):
         Index('idx_node_type_chain', 'node_type', 'chain_id'),
     )
 
+class BlockchainCheckpoint(Base):
+    """
+    Signed verification checkpoint every N nodes of a chain.
+    Records the node hash and a rolling digest of all node hashes up to
+    sequence_number, so later verifications resume from here instead of genesis.
+    """
+    __tablename__ = "blockchain_checkpoints"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    chain_id = Column(Integer, ForeignKey("blockchain_chains.id", ondelete="CASCADE"), nullable=False)
+    
+    sequence_number = Column(Integer, nullable=False)  # Last node covered
+    node_hash = Column(String, nullable=False)  # Hash of that node
+    rolling_digest = Column(String, nullable=False)  # sha256 chain over node hashes 0..sequence_number
+    node_count = Column(Integer, nullable=False)
+    signature = Column(String, nullable=False)  # HMAC-SHA256 over the fields above
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    chain = relationship("BlockchainChain")
+    
+    __table_args__ = (
+        UniqueConstraint('chain_id', 'sequence_number', name='uq_blockchain_checkpoint_chain_sequence'),
+    )
+
 class BlockchainEvent(Base):
     """
     Links blockchain nodes to specific events (tasks/observations)
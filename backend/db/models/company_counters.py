@@ -0,0 +1,45 @@
+# db/models/company_counters.py
+from sqlalchemy import Column, Integer, BigInteger, Numeric, DateTime, ForeignKey, func
+from db.base_class import Base
+
+
+class CompanyCounters(Base):
+    """
+    Dashboard counts for one company, kept current inside each writing
+    transaction by services.company_counters and reconciled nightly
+    (scripts/reconcile_company_counters.py). Stats endpoints read this row
+    instead of counting the source tables.
+    """
+    __tablename__ = "company_counters"
+
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+
+    block_count = Column(Integer, nullable=False, default=0, server_default="0")
+    observation_run_count = Column(Integer, nullable=False, default=0, server_default="0")
+    open_task_count = Column(Integer, nullable=False, default=0, server_default="0")  # Not completed or cancelled
+    user_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Active assets
+    asset_count = Column(Integer, nullable=False, default=0, server_default="0")
+    physical_asset_count = Column(Integer, nullable=False, default=0, server_default="0")
+    consumable_asset_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Training - modules are active ones; records are every assignment of the company's modules
+    training_module_count = Column(Integer, nullable=False, default=0, server_default="0")
+    published_training_module_count = Column(Integer, nullable=False, default=0, server_default="0")
+    training_record_count = Column(Integer, nullable=False, default=0, server_default="0")
+    active_training_record_count = Column(Integer, nullable=False, default=0, server_default="0")  # assigned / in_progress
+    completed_training_record_count = Column(Integer, nullable=False, default=0, server_default="0")
+    training_score_total = Column(Numeric(14, 2), nullable=False, default=0, server_default="0")  # Sum of best_score over scored completions
+    training_scored_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    visitor_count = Column(Integer, nullable=False, default=0, server_default="0")  # Active visitors
+
+    # Bytes on disk: file blobs plus active files stored before deduplication
+    storage_bytes = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    reconciled_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<CompanyCounters(company_id={self.company_id}, updated_at={self.updated_at})>"
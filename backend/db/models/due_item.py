@@ -0,0 +1,32 @@
+# db/models/due_item.py
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Index, UniqueConstraint, func
+from db.base_class import Base
+
+
+class DueItem(Base):
+    """
+    One row per open item with a due date - risk actions, risk reviews, asset
+    calibrations and asset maintenance - kept in step with the source tables by
+    services.due_items. Overdue and upcoming lists are a range scan on
+    (company_id, due_at) instead of a query per source table.
+    """
+    __tablename__ = "due_items"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
+    item_type = Column(String(30), nullable=False)  # risk_action, risk_review, asset_calibration, asset_maintenance
+    item_id = Column(Integer, nullable=False)  # risk_actions.id, site_risks.id or assets.id
+    title = Column(String(255), nullable=True)
+    due_at = Column(DateTime(timezone=True), nullable=False)
+    assigned_to = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    priority = Column(String(20), nullable=True)  # Action priority or risk level
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("item_type", "item_id", name="uq_due_items_item"),
+        Index("ix_due_items_company_due", "company_id", "due_at"),
+        Index("ix_due_items_assigned_due", "assigned_to", "due_at"),
+    )
+
+    def __repr__(self):
+        return f"<DueItem({self.item_type} {self.item_id}, due_at={self.due_at})>"
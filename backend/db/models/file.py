@@ -1,5 +1,5 @@
 # db/models/file.py - Centralized File Management (Updated)
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Boolean, ForeignKey, JSON, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from db.base_class import Base
@@ -23,6 +23,10 @@ class File(Base):
     file_size = Column(Integer)  # Size in bytes
     mime_type = Column(String(100))
     
+    # Content-addressed storage - set for uploads stored through services.file_storage
+    blob_id = Column(Integer, ForeignKey("file_blobs.id"), nullable=True, index=True)
+    content_sha256 = Column(String(64), nullable=True, index=True)
+    
     # File organization and metadata
     file_category = Column(String(50))  # photo, document, certificate, invoice, manual, etc.
     description = Column(Text)
@@ -46,6 +50,7 @@ class File(Base):
     company = relationship("Company")
     uploader = relationship("User", foreign_keys=[uploaded_by])
     deleter = relationship("User", foreign_keys=[deleted_by])
+    blob = relationship("FileBlob")
     
     def __repr__(self):
         return f"<File(id='{self.id}', entity='{self.entity_type}:{self.entity_id}', filename='{self.original_filename}')>"
@@ -69,6 +74,29 @@ class File(Base):
         stored_name = f"{entity_type}_{entity_id}_{upload_date.strftime('%Y%m%d')}_{file_uuid}{file_ext}"
         return stored_name
 
+class FileBlob(Base):
+    """
+    One stored copy of a company's file content, shared by every File row with
+    the same SHA-256. ref_count tracks those rows; the blob is removed from disk
+    when the last one is permanently deleted.
+    """
+    __tablename__ = "file_blobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    sha256 = Column(String(64), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    storage_path = Column(String(500), nullable=False)
+    ref_count = Column(Integer, nullable=False, default=1, server_default="1")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("company_id", "sha256", name="uq_file_blobs_company_sha256"),
+    )
+
+    def __repr__(self):
+        return f"<FileBlob(id={self.id}, sha256='{self.sha256[:12]}', refs={self.ref_count})>"
+
 # Entity type constants for file management
 class FileEntityTypes:
     """Constants for entity types that can have files"""
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, BigInteger, Integer, String, Float, DateTime, ForeignKey, Index
+from db.base_class import Base
+
+class ObservationSpotMetric(Base):
+    """
+    One typed value per spot per template field, extracted from
+    observation_spots.data_json when a run is completed. Written and read by
+    services.observation_analytics.
+    """
+    __tablename__ = "observation_spot_metrics"
+
+    id = Column(BigInteger, primary_key=True)
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
+    run_id = Column(Integer, ForeignKey("observation_runs.id", ondelete="CASCADE"), nullable=False)
+    spot_id = Column(Integer, ForeignKey("observation_spots.id", ondelete="CASCADE"), nullable=False)
+    template_id = Column(Integer, ForeignKey("observation_templates.id"), nullable=False)
+    block_id = Column(Integer, ForeignKey("vineyard_blocks.id", ondelete="CASCADE"), nullable=True)
+    observed_at = Column(DateTime(timezone=True), nullable=False)
+
+    metric = Column(String(100), nullable=False)  # Template field name
+    kind = Column(String(20), nullable=False)  # numeric, flag, categorical
+    value_num = Column(Float, nullable=True)  # numeric value; 1/0 for flags
+    value_text = Column(String(255), nullable=True)  # categorical value
+
+    __table_args__ = (
+        Index("ix_observation_spot_metrics_company_metric_time", "company_id", "template_id", "metric", "observed_at"),
+        Index("ix_observation_spot_metrics_block_metric_time", "block_id", "metric", "observed_at"),
+        Index("ix_observation_spot_metrics_run", "run_id"),
+    )
+
+    def __repr__(self):
+        return f"<ObservationSpotMetric(spot_id={self.spot_id}, metric='{self.metric}', value={self.value_num if self.value_num is not None else self.value_text})>"
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy.sql import func
+from db.base_class import Base
+
+class OutboundEmail(Base):
+    """Durable outbound mail queue, drained by services.mail_queue.MailQueueWorker"""
+    __tablename__ = "outbound_emails"
+
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String(255), nullable=False)
+    reply_to = Column(String(255), nullable=True)
+    subject = Column(String(500), nullable=False)
+    html_content = Column(Text, nullable=False)
+    text_content = Column(Text, nullable=True)
+    template = Column(String(100), nullable=True)  # Which send_* helper queued it, for diagnostics
+
+    status = Column(String(20), nullable=False, default="pending", server_default="pending")  # pending, sending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_outbound_emails_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    def __repr__(self):
+        return f"<OutboundEmail(id={self.id}, to='{self.to_email}', status='{self.status}', attempts={self.attempts})>"
@@ -7,6 +7,7 @@ Tables:
 - ClimateZoneDaily: Zone-level daily climate with GDD accumulation
 - ClimateZoneHourly: Zone-level hourly climate for disease models
 - ClimateZoneDailyBaseline: 1986-2005 daily climatology per zone
+- ClimateZoneSeasonGdd: Per zone and vintage September 30 GDD offsets
 - PhenologyThreshold: GDD thresholds by variety
 - PhenologyEstimate: Current season phenology estimates
 - DiseasePressure: Daily disease risk indicators with model outputs
@@ -95,6 +96,10 @@ class ClimateZoneDaily(Base):
     gdd_daily = Column(Numeric(6, 2))
     gdd_cumulative = Column(Numeric(8, 2))
     
+    # GDD from October 1 (0 before), actual and baseline; see services/zone_season_gdd.py
+    gdd_cumulative_oct1 = Column(Numeric(8, 2))
+    gdd_baseline_oct1 = Column(Numeric(8, 2))
+    
     # Station coverage
     station_count = Column(Integer)
     stations_with_temp = Column(Integer)
@@ -113,7 +118,7 @@ class ClimateZoneDaily(Base):
     __table_args__ = (
         UniqueConstraint('zone_id', 'date', name='uq_climate_zone_daily_zone_date'),
         Index('idx_climate_zone_daily_zone_date', 'zone_id', date.desc()),
-        Index('idx_climate_zone_daily_vintage', 'zone_id', 'vintage_year'),
+        Index('idx_climate_zone_daily_vintage', 'zone_id', 'vintage_year', 'date'),
     )
     
     @staticmethod
@@ -234,6 +239,34 @@ class ClimateZoneDailyBaseline(Base):
         return (date - july_1).days + 1
 
 
+class ClimateZoneSeasonGdd(Base):
+    """
+    GDD accumulated July 1 - September 30 per zone and vintage.
+    
+    Subtracted from July 1 cumulative GDD to get GDD from October 1, the start
+    the phenology thresholds are calibrated to.
+    """
+    __tablename__ = 'climate_zone_season_gdd'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    zone_id = Column(Integer, ForeignKey('climate_zones.id'), nullable=False)  # PLURAL
+    vintage_year = Column(Integer, nullable=False)
+    
+    # Latest actual day on or before September 30 (None if the season started later)
+    offset_date = Column(Date)
+    actual_gdd_offset = Column(Numeric(8, 2), nullable=False, default=0)
+    # Baseline cumulative GDD at day of vintage 92 (September 30)
+    baseline_gdd_offset = Column(Numeric(8, 2), nullable=False, default=0)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    zone = relationship("ClimateZone", backref="season_gdd")
+    
+    __table_args__ = (
+        UniqueConstraint('zone_id', 'vintage_year', name='uq_climate_zone_season_gdd'),
+    )
+
+
 class PhenologyThreshold(Base):
     """GDD thresholds for phenological stages by grape variety."""
     __tablename__ = 'phenology_thresholds'
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Numeric, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Numeric, JSON, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from db.base_class import Base
@@ -67,8 +67,11 @@ class RiskAction(Base):
     # Recurring action management
     is_recurring = Column(Boolean, default=False, nullable=False)
     recurrence_frequency_days = Column(Integer, nullable=True)  # How often to repeat
+    recurrence_rule = Column(Text, nullable=True)  # RFC5545-style RRULE, e.g. "FREQ=WEEKLY;BYDAY=MO" (overrides frequency_days)
+    recurrence_generated_until = Column(DateTime(timezone=True), nullable=True)  # Series root: occurrences exist up to here
     next_due_date = Column(DateTime(timezone=True), nullable=True)
     parent_action_id = Column(Integer, ForeignKey("risk_actions.id"), nullable=True)  # For recurring actions
+    occurrence_date = Column(DateTime(timezone=True), nullable=True)  # Generated instance: which occurrence of the parent's rule
     
     # Additional metadata
     custom_fields = Column(JSON, default=dict, nullable=False)
@@ -78,6 +81,19 @@ class RiskAction(Base):
     created_at = Column(DateTime(timezone=True), default=func.now())
     updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
     archived_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_risk_actions_parent_action_id", "parent_action_id"),
+        # One instance per occurrence, so generation can be re-run safely
+        Index(
+            "uq_risk_actions_parent_occurrence", "parent_action_id", "occurrence_date",
+            unique=True, postgresql_where=text("occurrence_date IS NOT NULL")
+        ),
+        Index(
+            "ix_risk_actions_recurring_roots", "id",
+            postgresql_where=text("is_recurring AND parent_action_id IS NULL")
+        ),
+    )
     
     # Relationships
     risk = relationship("SiteRisk", back_populates="risk_actions")
@@ -187,42 +203,3 @@ class RiskAction(Base):
         # This would need the original risk values to calculate properly
         # Implementation depends on how you want to measure effectiveness
         pass
-    
-    def schedule_next_occurrence(self):
-        """Schedule next occurrence for recurring actions"""
-        if self.is_recurring and self.recurrence_frequency_days and self.is_completed:
-            from datetime import datetime, timezone, timedelta
-            self.next_due_date = datetime.now(timezone.utc) + timedelta(days=self.recurrence_frequency_days)
-    
-    def create_recurring_action(self):
-        """Create the next occurrence of a recurring action"""
-        if not (self.is_recurring and self.next_due_date):
-            return None
-        
-        from datetime import datetime, timezone, timedelta
-        
-        # Create new action based on this one
-        new_action = RiskAction(
-            risk_id=self.risk_id,
-            company_id=self.company_id,
-            action_title=f"{self.action_title} (Recurring)",
-            action_description=self.action_description,
-            action_type=self.action_type,
-            control_type=self.control_type,
-            priority=self.priority,
-            urgency=self.urgency,
-            assigned_to=self.assigned_to,
-            responsible_person=self.responsible_person,
-            created_by=self.created_by,
-            target_start_date=self.next_due_date,
-            target_completion_date=self.next_due_date + timedelta(days=7),  # Default 1 week to complete
-            auto_create_task=self.auto_create_task,
-            requires_verification=self.requires_verification,
-            is_recurring=True,
-            recurrence_frequency_days=self.recurrence_frequency_days,
-            parent_action_id=self.id,
-            custom_fields=self.custom_fields,
-            tags=self.tags
-        )
-        
-        return new_action
\ No newline at end of file
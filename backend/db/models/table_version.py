@@ -0,0 +1,16 @@
+# db/models/table_version.py
+from sqlalchemy import Column, String, BigInteger, DateTime, func
+from db.base_class import Base
+
+
+class TableVersion(Base):
+    """
+    Change counter per table, bumped by a statement-level trigger on every
+    INSERT / UPDATE / DELETE / TRUNCATE. In-process caches (services.block_index)
+    poll it to know when to reload.
+    """
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(63), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
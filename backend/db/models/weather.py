@@ -1,5 +1,5 @@
 # db/models/models/weather.py
-from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, Index, ForeignKey, text
+from sqlalchemy import BigInteger, Column, Integer, String, Numeric, Boolean, DateTime, Index, ForeignKey, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from geoalchemy2 import Geography
@@ -37,6 +37,28 @@ class WeatherData(Base):
     quality = Column(String(20), default='GOOD')
     created_at = Column(DateTime(timezone=True), server_default=text('NOW()'))
 
+class WeatherDataIssue(Base):
+    """Run of consecutive weather_data readings flagged by ingestion QC (services.weather_qc)"""
+    __tablename__ = 'weather_data_issues'
+    
+    issue_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    station_id = Column(Integer, nullable=False)
+    variable = Column(String(50), nullable=False)
+    issue_type = Column(String(30), nullable=False)  # impossible_value, outlier, spike, rate_of_change, flatline
+    quality = Column(String(20), nullable=False)  # quality given to the readings: BAD or SUSPECT
+    start_time = Column(DateTime(timezone=True), nullable=False)
+    end_time = Column(DateTime(timezone=True), nullable=False)
+    points = Column(Integer, nullable=False, default=1)
+    value = Column(Numeric(10, 4))  # most extreme value in the run
+    details = Column(String)
+    detected_at = Column(DateTime(timezone=True), server_default=text('NOW()'))
+    
+    __table_args__ = (
+        Index('idx_weather_data_issues_start', 'start_time'),
+        Index('idx_weather_data_issues_station_start', 'station_id', 'start_time'),
+        Index('idx_weather_data_issues_series', 'station_id', 'variable', 'start_time'),
+    )
+
 class IngestionLog(Base):
     __tablename__ = 'ingestion_log'
     
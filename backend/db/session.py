@@ -1,37 +1,138 @@
 
+import threading
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from core.config import settings
 
+def _is_local(url: str) -> bool:
+    return "localhost" in url
+
 # Create SQLAlchemy engine using the dynamically determined DATABASE_URL
 def get_engine():
     """Create engine lazily so it picks up current settings"""
     from core.config import settings  # Import here, not at module level
-    
+
+    connect_args = {
+        "sslmode": "disable" if _is_local(settings.DATABASE_URL) else "require",
+        "connect_timeout": 30,
+        "application_name": "vineyard-app"
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
     return create_engine(
         settings.DATABASE_URL,
-        connect_args={
-            "sslmode": "disable" if "localhost" in settings.DATABASE_URL else "require",
-            "connect_timeout": 30,
-            "application_name": "vineyard-app"
-        },
+        connect_args=connect_args,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
         pool_pre_ping=True,
-        pool_recycle=300,
+        pool_recycle=settings.DB_POOL_RECYCLE,
         echo=False
     )
 
-# Create engine
-engine = get_engine()
+# The engine is created on first use (db.session.engine, or opening a session),
+# so importing this module for models or get_db costs no driver or pool setup.
+_engine = None
+_engine_lock = threading.Lock()
+_engine_callbacks = []
+
+def on_engine_created(callback):
+    """Call callback(engine) when the shared engine is created (now, if it already exists)"""
+    with _engine_lock:
+        if _engine is None:
+            _engine_callbacks.append(callback)
+            return
+    callback(_engine)
+
+def get_sync_engine():
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = get_engine()
+                for callback in _engine_callbacks:
+                    callback(engine)
+                _engine = engine
+    return _engine
+
+
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker bound to the shared engine the first time it's called"""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_sync_engine())
+        return super().__call__(**local_kw)
+
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
 Base = declarative_base()
 
+
+def __getattr__(name):
+    # `from db.session import engine` keeps working, creating the engine then
+    if name == "engine":
+        return get_sync_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Async engine (asyncpg) for the read-only public routers. Created on first use
+# so scripts and workers that never touch it don't need asyncpg installed.
+_async_engine = None
+_AsyncSessionLocal = None
+
+def get_async_engine():
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        url = make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg")
+        url = url.difference_update_query(["sslmode"])  # asyncpg takes ssl in connect_args
+
+        server_settings = {"application_name": "vineyard-app"}
+        if settings.ASYNC_DB_STATEMENT_TIMEOUT_MS > 0:
+            server_settings["statement_timeout"] = str(settings.ASYNC_DB_STATEMENT_TIMEOUT_MS)
+
+        _async_engine = create_async_engine(
+            url,
+            connect_args={
+                "ssl": "disable" if _is_local(settings.DATABASE_URL) else "require",
+                "timeout": 30,
+                "server_settings": server_settings
+            },
+            pool_size=settings.ASYNC_DB_POOL_SIZE,
+            max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_pre_ping=True,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            echo=False
+        )
+        if settings.METRICS_ENABLED:
+            from core.metrics import instrument_engine
+            instrument_engine(_async_engine.sync_engine)
+
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+# Dependency to get an AsyncSession
+async def get_async_db():
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+async def dispose_async_engine():
+    if _async_engine is not None:
+        await _async_engine.dispose()
@@ -3,19 +3,23 @@ from fastapi import FastAPI
 from fastapi import Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
-from api.v1 import auth, blocks, observations, companies, admin, invitations, subscriptions, parcels, vineyard_rows, spatial_areas, risk_management, visitors, training, climate, timesheets, files, assets, maintenance, calibrations, observation_runs_complete, stock_movements, tasks, public_auth, blocks_query, regions, gis, public_climate, admin_users, admin_weather, admin_data, realtime_climate   
+from core.compression import CompressionMiddleware
 from core.config import settings
+from core.metrics import (
+    RequestStats, StackSampler, current_request, instrument_engine, metrics_registry,
+    profiling_requested, render_metrics
+)
+from core.responses import ORJSONResponse
+from db.session import dispose_async_engine
+import hmac
+import importlib
 import logging
 import traceback
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
+import time
 import os
 
-try:
-    from api.v1 import blockchain
-except ImportError:
-    pass  # Skip blockchain import if services not ready
-
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -60,6 +64,7 @@ if os.getenv("ENV") == "production":
         description="""...""",  # your description
         version="0.1.0",
         openapi_tags=tags_metadata,
+        default_response_class=ORJSONResponse,
         docs_url=None,  # or "/docs-secret-xyz123"
         redoc_url=None,
         openapi_url=None,  # or "/openapi-secret-xyz123.json"
@@ -71,11 +76,81 @@ else:
         description="""...""",  # your description
         version="0.1.0",
         openapi_tags=tags_metadata,
+        default_response_class=ORJSONResponse,
         docs_url="/docs",
         redoc_url="/redoc",
         swagger_ui_parameters={"persistAuthorization": True}
     )
 
+# Added before the @app.middleware functions so it runs innermost and sees each
+# response as one body (they re-stream responses, which would defeat the size threshold)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_BYTES,
+        gzip_level=settings.GZIP_LEVEL,
+        brotli_quality=settings.BROTLI_QUALITY,
+    )
+
+@app.on_event("startup")
+def start_mail_queue():
+    if settings.MAIL_QUEUE_ENABLED:
+        from services.mail_queue import mail_queue_worker
+        mail_queue_worker.start()
+
+@app.on_event("shutdown")
+def stop_mail_queue():
+    if settings.MAIL_QUEUE_ENABLED:
+        from services.mail_queue import mail_queue_worker
+        mail_queue_worker.stop()
+
+@app.on_event("startup")
+def start_block_index():
+    if settings.BLOCK_INDEX_ENABLED:
+        from services.block_index import block_index_worker
+        block_index_worker.start()
+
+@app.on_event("shutdown")
+def stop_block_index():
+    if settings.BLOCK_INDEX_ENABLED:
+        from services.block_index import block_index_worker
+        block_index_worker.stop()
+
+@app.on_event("startup")
+def register_company_counters():
+    if settings.COMPANY_COUNTERS_ENABLED:
+        # Importing the module registers the session hooks that keep company_counters current
+        import services.company_counters  # noqa: F401
+
+@app.on_event("startup")
+def start_risk_schedule():
+    # Importing the module registers the due_items session hooks
+    from services.risk_schedule import risk_schedule_worker
+    if settings.RISK_SCHEDULE_ENABLED:
+        risk_schedule_worker.start()
+
+@app.on_event("shutdown")
+def stop_risk_schedule():
+    if settings.RISK_SCHEDULE_ENABLED:
+        from services.risk_schedule import risk_schedule_worker
+        risk_schedule_worker.stop()
+
+@app.on_event("shutdown")
+def stop_due_item_syncer():
+    if settings.DUE_ITEMS_SYNC_ON_COMMIT:
+        from services.due_items import due_item_syncer
+        due_item_syncer.stop()
+
+@app.on_event("shutdown")
+def stop_asset_status_refresher():
+    if settings.ASSET_STATUS_MATVIEW:
+        from services.asset_analytics_service import asset_status_refresher
+        asset_status_refresher.stop()
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await dispose_async_engine()
+
 @app.middleware("http")
 async def log_errors(request: Request, call_next):
     try:
@@ -95,6 +170,35 @@ async def log_errors(request: Request, call_next):
             print(f"Error occurred but couldn't display traceback due to encoding issues")
         return JSONResponse(status_code=500, content={"detail": str(e)})
 
+if settings.METRICS_ENABLED:
+    from db.session import on_engine_created
+    on_engine_created(instrument_engine)
+
+    @app.middleware("http")
+    async def instrument_requests(request: Request, call_next):
+        stats = RequestStats(method=request.method, scope=request.scope)
+        token = current_request.set(stats)
+        sampler = StackSampler() if profiling_requested(request.headers) else None
+        started = time.perf_counter()
+        status_code = 500
+        try:
+            if sampler:
+                with sampler:
+                    response = await call_next(request)
+            else:
+                response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request.reset(token)
+            metrics_registry.observe_request(stats, status_code, elapsed)
+            if sampler:
+                logger.info(
+                    f"Profile {request.method} {request.url.path}: {elapsed * 1000:.0f} ms, "
+                    f"{stats.statements} statements, {stats.db_seconds * 1000:.0f} ms in DB\n{sampler.summary()}"
+                )
+
 # Set up CORS
 origins = [
     "http://localhost",
@@ -110,201 +214,75 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination cursor on list endpoints
 )
 
 # Include API routers first
-app.include_router(
-    auth.router, 
-    prefix="/api/auth", 
-    tags=["auth"]
-)
-
-app.include_router(
-    blocks.router, 
-    prefix="/api/blocks", 
-    tags=["blocks"]
-)
-
-app.include_router(
-    companies.router, 
-    prefix="/api/companies", 
-    tags=["companies"]
-)
-
-app.include_router(
-    admin.router, 
-    prefix='/api/admin',
-    tags=["admin"]
-)
-
-app.include_router(
-    invitations.router, 
-    prefix="/api/invitations", 
-    tags=["invitations"]
-)
-
-app.include_router(
-    subscriptions.router,
-    prefix="/api/subscriptions",
-    tags=["subscriptions"]
-)
-
-app.include_router(
-    parcels.router, 
-    prefix="/api/parcels", 
-    tags=["parcels"]
-)
-
-app.include_router(
-    vineyard_rows.router, 
-    prefix="/api/vineyard_rows", 
-    tags=["vineyard_rows"]
-)
-
-app.include_router(
-    blockchain.router, 
-    prefix="/api/blockchain", 
-    tags=["blockchain"]
-)
-
-app.include_router(
-    spatial_areas.router, 
-    prefix="/api/spatial_areas", 
-    tags=["spatial_areas"]
-)
-
-app.include_router(
-    risk_management.router,
-    prefix="/api",  
-    tags=["risk-management", "site-risks", "risk-actions", "incidents"]
-)
-
-app.include_router(
-    visitors.router, 
-    prefix="/api/visitors", 
-    tags=["visitors"]
-)
-
-app.include_router(
-    training.router, 
-    prefix="/api/training",
-    tags=["training"]
-)
-
-app.include_router(
-    climate.router, 
-    prefix="/api/climate",
-    tags=["climate"]
-)
-
-app.include_router(
-    timesheets.router, 
-    prefix="/api",
-    tags=["timesheets"]
-)
-
-app.include_router(
-    files.router, 
-    prefix="/api/files",
-    tags=["files"]
-)
-
-app.include_router(
-    assets.router, 
-    prefix="/api/assets",
-    tags=["assets"]
-)
-
-app.include_router(
-    maintenance.router, 
-    prefix="/api/maintenance",
-    tags=["maintenance"]
-)
-
-app.include_router(
-    calibrations.router, 
-    prefix="/api/calibrations",
-    tags=["calibrations"]
-)
-
-app.include_router(
-    stock_movements.router, 
-    prefix="/api/stock-movements",
-    tags=["stock-movements "]
-)
-
-app.include_router(
-    observations.router, 
-    prefix="/api/observations",
-    tags=["observations"]
-)
-
-app.include_router(
-    observation_runs_complete.router, 
-    prefix="/api/observation_runs_complete ",
-    tags=["observation_runs_complete "]
-)
-
-app.include_router(
-    tasks.router, 
-    prefix="/api/tasks",
-    tags=["tasks"]
-)
-
+# (module in api.v1, prefix, tags, group) - in mount order. API_ROUTER_GROUPS
+# selects groups so a process can skip importing routers it doesn't serve:
+#   app    - vineyard management app (/api/...)
+#   public - public API (/api/v1, /api/v1/public/...)
+#   admin  - public API administration (/api/v1/admin)
+ROUTERS = [
+    ("auth", "/api/auth", ["auth"], "app"),
+    ("blocks", "/api/blocks", ["blocks"], "app"),
+    ("companies", "/api/companies", ["companies"], "app"),
+    ("admin", "/api/admin", ["admin"], "app"),
+    ("invitations", "/api/invitations", ["invitations"], "app"),
+    ("subscriptions", "/api/subscriptions", ["subscriptions"], "app"),
+    ("parcels", "/api/parcels", ["parcels"], "app"),
+    ("vineyard_rows", "/api/vineyard_rows", ["vineyard_rows"], "app"),
+    ("blockchain", "/api/blockchain", ["blockchain"], "app"),
+    ("spatial_areas", "/api/spatial_areas", ["spatial_areas"], "app"),
+    ("risk_management", "/api", ["risk-management", "site-risks", "risk-actions", "incidents"], "app"),
+    ("visitors", "/api/visitors", ["visitors"], "app"),
+    ("training", "/api/training", ["training"], "app"),
+    ("climate", "/api/climate", ["climate"], "app"),
+    ("timesheets", "/api", ["timesheets"], "app"),
+    ("files", "/api/files", ["files"], "app"),
+    ("assets", "/api/assets", ["assets"], "app"),
+    ("maintenance", "/api/maintenance", ["maintenance"], "app"),
+    ("calibrations", "/api/calibrations", ["calibrations"], "app"),
+    ("stock_movements", "/api/stock-movements", ["stock-movements "], "app"),
+    ("observations", "/api/observations", ["observations"], "app"),
+    ("observation_runs_complete", "/api/observation_runs_complete ", ["observation_runs_complete "], "app"),
+    ("observation_analytics", "/api/observation-analytics", ["observation-analytics"], "app"),
+    ("tasks", "/api/tasks", ["tasks"], "app"),
+    ("public_auth", "/api/v1", ["Public Authentication"], "public"),
+    ("blocks_query", "/api/v1/public/blocks", ["public-blocks"], "public"),
+    ("regions", "/api/v1/public/regions", ["regions"], "public"),
+    ("gis", "/api/v1/public/gis", ["geographical-indications"], "public"),
+    ("public_climate", "/api/v1/public/public_climate", ["public_climate"], "public"),
+    ("admin_users", "/api/v1/admin", ["Admin - Users"], "admin"),
+    ("admin_weather", "/api/v1/admin", ["Admin - Weather"], "admin"),
+    ("admin_data", "/api/v1/admin", ["Admin - Data Quality"], "admin"),
+    ("realtime_climate", "/api/v1/public/realtime", ["realtime-climate"], "public"),
+]
+OPTIONAL_ROUTERS = {"blockchain"}  # Skipped if its services can't be imported
 
-app.include_router(
-    public_auth.router, 
-    prefix="/api/v1",
-    tags=["Public Authentication"]
-)
 
-app.include_router(
-    blocks_query.router, 
-    prefix="/api/v1/public/blocks",
-    tags=["public-blocks"]
-)
+def selected_router_groups() -> set:
+    groups = {g.strip().lower() for g in settings.API_ROUTER_GROUPS.split(",") if g.strip()}
+    if "all" in groups:
+        return {group for *_, group in ROUTERS}
+    return groups - {"none"}
 
-app.include_router(
-    regions.router,
-    prefix="/api/v1/public/regions",
-    tags=["regions"]
-)
 
-app.include_router(
-    gis.router,
-    prefix="/api/v1/public/gis",
-    tags=["geographical-indications"]
-)
-
-app.include_router(
-    public_climate.router,
-    prefix="/api/v1/public/public_climate",
-    tags=["public_climate"]
-)
-
-app.include_router(
-    admin_users.router,
-    prefix="/api/v1/admin",
-    tags=["Admin - Users"]
-)
-
-app.include_router(
-    admin_weather.router,
-    prefix="/api/v1/admin",
-    tags=["Admin - Weather"]
-)
+def include_routers(app: FastAPI, groups: set):
+    for module_name, prefix, tags, group in ROUTERS:
+        if group not in groups:
+            continue
+        try:
+            module = importlib.import_module(f"api.v1.{module_name}")
+        except ImportError:
+            if module_name not in OPTIONAL_ROUTERS:
+                raise
+            logger.warning(f"Router {module_name} not loaded", exc_info=True)
+            continue
+        app.include_router(module.router, prefix=prefix, tags=tags)
 
-app.include_router(
-    admin_data.router,
-    prefix="/api/v1/admin",
-    tags=["Admin - Data Quality"]
-)
 
-app.include_router(
-    realtime_climate.router,
-    prefix="/api/v1/public/realtime",
-    tags=["realtime-climate"]
-)
+include_routers(app, selected_router_groups())
 
 # API endpoints
 @app.get("/api", tags=["root"])
@@ -330,6 +308,18 @@ def health_check():
         "version": "0.1.0"
     }
 
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    """
+    Prometheus metrics: per-route latency, SQL statements and DB time.
+    Only served when METRICS_TOKEN is set, to requests bearing it.
+    """
+    if not settings.METRICS_ENABLED or not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {settings.METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 @app.get("/api/debug/auth", tags=["debug"])
 async def debug_auth(request: Request):
     """
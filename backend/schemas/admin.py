@@ -343,10 +343,13 @@ class DataQualityIssue(BaseModel):
     """Data quality issue/anomaly."""
     station_id: int
     station_code: str
-    timestamp: datetime
+    timestamp: datetime  # first flagged reading
+    end_timestamp: Optional[datetime] = None  # last flagged reading of the run
+    points: int = 1
     variable: str
-    value: Decimal
-    issue_type: str  # outlier, impossible_value, suspicious_pattern
+    value: Optional[Decimal] = None  # most extreme value in the run
+    quality: Optional[str] = None  # BAD or SUSPECT
+    issue_type: str  # impossible_value, outlier, spike, rate_of_change, flatline
     details: str
 
 
@@ -423,6 +423,25 @@ class AssetStats(BaseModel):
     low_stock_consumables: int
     compliance_alerts: int
 
+class AssetStatus(BaseModel):
+    """Per-asset next-due dates and stock status"""
+    asset_id: int
+    name: str
+    category: str
+    asset_type: str
+    requires_calibration: bool
+    last_calibration_date: Optional[date] = None
+    calibration_due_date: Optional[date] = None
+    last_maintenance_date: Optional[date] = None
+    next_scheduled_maintenance: Optional[date] = None
+    maintenance_due_date: Optional[date] = None
+    open_maintenance_count: int = 0
+    compliance_due_date: Optional[date] = None
+    current_stock: Optional[Decimal] = None
+    minimum_stock: Optional[Decimal] = None
+    unit_of_measure: Optional[str] = None
+    stock_status: str  # not_applicable, out_of_stock, low_stock, overstocked, adequate
+
 class MaintenanceDue(BaseModel):
     """Maintenance due items"""
     asset_id: int
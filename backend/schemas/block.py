@@ -12,6 +12,7 @@ class BlockBase(BaseModel):
     planted_date: Optional[date] = None
     removed_date: Optional[date] = None
     row_spacing: Optional[float] = None
+    row_orientation: Optional[float] = None
     vine_spacing: Optional[float] = None
     area: Optional[float] = None
     region: Optional[str] = None
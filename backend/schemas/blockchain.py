@@ -98,10 +98,13 @@ class FruitReceived(FruitReceivedBase):
 class ChainIntegrityResult(BaseModel):
     valid: bool
     error: Optional[str] = None
+    chain_id: Optional[int] = None
     node_count: Optional[int] = None
     genesis_hash: Optional[str] = None
     head_hash: Optional[str] = None
     node_sequence: Optional[int] = None
+    verified_from_sequence: Optional[int] = None  # > 0 when resumed from a checkpoint
+    nodes_rehashed: Optional[int] = None
 
 class ChainSummary(BaseModel):
     chain_id: int
@@ -55,6 +55,7 @@ class FileResponse(FileBase):
     file_path: str
     file_size: Optional[int] = None
     mime_type: Optional[str] = None
+    content_sha256: Optional[str] = None
     upload_status: UploadStatus
     is_active: bool
     uploaded_at: datetime
@@ -71,6 +72,13 @@ class FileResponse(FileBase):
     def download_url(self) -> str:
         return f"/api/v1/files/{self.id}/download"
     
+    @computed_field
+    @property
+    def thumbnail_url(self) -> Optional[str]:
+        if self.mime_type and self.mime_type.startswith("image/"):
+            return f"/api/v1/files/{self.id}/image?w=256"
+        return None
+    
     class Config:
         from_attributes = True
 
@@ -94,6 +102,13 @@ class FileSummary(BaseModel):
     @property
     def download_url(self) -> str:
         return f"/api/v1/files/{self.id}/download"
+    
+    @computed_field
+    @property
+    def thumbnail_url(self) -> Optional[str]:
+        if self.mime_type and self.mime_type.startswith("image/"):
+            return f"/api/v1/files/{self.id}/image?w=256"
+        return None
             
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -186,6 +186,26 @@ class ObservationRunOut(ObservationRunBase):
     class Config:
         from_attributes = True
 
+class RunGroupStats(BaseModel):
+    run_count: int = 0
+    active_count: int = 0
+    completed_count: int = 0
+    latest_started_at: Optional[datetime] = None
+    latest_completed_at: Optional[datetime] = None
+    latest_created_at: Optional[datetime] = None
+
+class BlockRunStats(RunGroupStats):
+    block_id: Optional[int] = None  # None groups runs not tied to a block
+    block_name: Optional[str] = None
+
+class TemplateRunStats(RunGroupStats):
+    template_id: int
+    template_name: Optional[str] = None
+
+class ObservationRunStatsOut(BaseModel):
+    by_block: List[BlockRunStats] = Field(default_factory=list)
+    by_template: List[TemplateRunStats] = Field(default_factory=list)
+
 class ObservationSpotBase(BaseModel):
     company_id: int
     run_id: int
@@ -264,4 +284,56 @@ class PlanTargetOut(BaseModel):
         model_config = ConfigDict(**_CFG)
     else:
         class Config:
-            orm_mode = True
\ No newline at end of file
+            orm_mode = True
+# ----- Spot metric analytics -----
+
+class ObservationMetricOut(BaseModel):
+    template_id: int
+    template_name: Optional[str] = None
+    metric: str
+    kind: Literal["numeric", "flag", "categorical"]
+    n: int
+    run_count: int
+    first_observed_at: Optional[datetime] = None
+    last_observed_at: Optional[datetime] = None
+
+class CategoryShare(BaseModel):
+    value: str
+    count: int
+    share: float
+
+class MetricTrendPoint(BaseModel):
+    bucket_start: datetime
+    n: int
+    # numeric and flag metrics
+    run_count: Optional[int] = None
+    mean: Optional[float] = None
+    stdev: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    p25: Optional[float] = None
+    median: Optional[float] = None
+    p75: Optional[float] = None
+    p90: Optional[float] = None
+    incidence: Optional[float] = None  # share of observations above zero
+    # categorical metrics
+    categories: Optional[List[CategoryShare]] = None
+
+class MetricTrendSeries(BaseModel):
+    block_id: Optional[int] = None
+    block_name: Optional[str] = None
+    template_id: int
+    points: List[MetricTrendPoint] = Field(default_factory=list)
+
+class MetricTrendOut(BaseModel):
+    metric: str
+    kind: Literal["numeric", "flag", "categorical"]
+    season: str
+    bucket: str
+    date_from: datetime
+    date_to: datetime
+    series: List[MetricTrendSeries] = Field(default_factory=list)
+
+class MetricBackfillOut(BaseModel):
+    runs: int
+    rows: int
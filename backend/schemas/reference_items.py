@@ -1,7 +1,7 @@
 # app/schemas/reference_items.py
 from typing import Optional, List
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 try:
     # Pydantic v2
     from pydantic import ConfigDict
@@ -48,6 +48,17 @@ class ReferenceItemImageOut(BaseModel):
     sort_order: int = 0
     is_primary: bool = False
 
+    # Resized variants - use these instead of the full-size download in lists
+    @computed_field
+    @property
+    def thumbnail_url(self) -> str:
+        return f"/api/v1/files/{self.file_id}/image?w=256"
+
+    @computed_field
+    @property
+    def image_url(self) -> str:
+        return f"/api/v1/files/{self.file_id}/image?w=1024"
+
     if ConfigDict:
         model_config = ConfigDict(**_CFG)
     else:
@@ -4,6 +4,8 @@ from decimal import Decimal
 from pydantic import BaseModel, validator
 from enum import Enum
 
+from utils.recurrence import validate_rule
+
 class ActionType(str, Enum):
     preventive = "preventive"   
     detective = "detective"  
@@ -68,6 +70,7 @@ class RiskActionBase(BaseModel):
     
     # Recurring settings
     is_recurring: bool = False
+    recurrence_rule: Optional[str] = None  # RRULE, e.g. "FREQ=WEEKLY;BYDAY=MO" - first occurrence is target_start_date
     recurrence_frequency_days: Optional[int] = None
     
     # Metadata
@@ -80,10 +83,14 @@ class RiskActionBase(BaseModel):
             raise ValueError("Risk reduction values must be between 0 and 5")
         return v
     
+    @validator("recurrence_rule")
+    def validate_recurrence_rule(cls, v):
+        return validate_rule(v)
+    
     @validator("recurrence_frequency_days")
     def validate_recurrence(cls, v, values):
-        if values.get("is_recurring") and (v is None or v < 1):
-            raise ValueError("Recurring actions must have a frequency of at least 1 day")
+        if values.get("is_recurring") and not values.get("recurrence_rule") and (v is None or v < 1):
+            raise ValueError("Recurring actions need a recurrence rule or a frequency of at least 1 day")
         return v
 
 class RiskActionCreate(RiskActionBase):
@@ -137,12 +144,17 @@ class RiskActionUpdate(BaseModel):
     
     # Recurring updates
     is_recurring: Optional[bool] = None
+    recurrence_rule: Optional[str] = None
     recurrence_frequency_days: Optional[int] = None
     
     # Metadata updates
     custom_fields: Optional[Dict[str, Any]] = None
     tags: Optional[List[str]] = None
     
+    @validator("recurrence_rule")
+    def validate_recurrence_rule(cls, v):
+        return validate_rule(v)
+    
     @validator("progress_percentage")
     def validate_progress(cls, v):
         if v is not None and not 0 <= v <= 100:
@@ -234,9 +246,11 @@ class RiskActionResponse(BaseModel):
     
     # Recurring
     is_recurring: bool
+    recurrence_rule: Optional[str] = None
     recurrence_frequency_days: Optional[int] = None
     next_due_date: Optional[datetime] = None
     parent_action_id: Optional[int] = None
+    occurrence_date: Optional[datetime] = None
     
     # Notes and metadata
     completion_notes: Optional[str] = None
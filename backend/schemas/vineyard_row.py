@@ -104,4 +104,31 @@ class BulkRowCreationResponse(BaseModel):
     """Response schema for bulk row creation"""
     created_rows: int
     rows: List[VineyardRow]
-    message: str
\ No newline at end of file
+    message: str
+
+# Generated row layout schemas
+class RowLayoutRequest(BaseModel):
+    """Request schema for generating row geometry across a block"""
+    block_id: int
+    row_bearing: Optional[float] = None  # Degrees clockwise from north, defaults to block row_orientation
+    row_spacing: Optional[float] = None  # Meters, defaults to block row_spacing
+    row_start: int = 1
+    first_row_offset: Optional[float] = None  # Meters from block edge, defaults to half the spacing
+    min_row_length: float = 1.0
+    replace_existing: bool = False
+    
+    @field_validator('row_spacing')
+    def row_spacing_positive(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError('Row spacing must be positive')
+        return v
+
+class RowLayoutResponse(BaseModel):
+    """Response schema for generated row layout"""
+    created_rows: int
+    row_count: int
+    row_bearing: float
+    row_spacing: float
+    total_row_length: float
+    rows: List[VineyardRow]
+    message: str
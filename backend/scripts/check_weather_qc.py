@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+scripts/check_weather_qc.py
+
+Check ingestion QC (services.weather_qc) against the database: a batch with
+naive timestamps, as the sources parse them, is applied on top of stored
+zone-aware readings of the same flat line. QC must flag one flat-line run
+spanning both and downgrade the stored readings. Everything runs in one
+transaction that is rolled back, in a window long before any real data.
+
+Usage:
+    python scripts/check_weather_qc.py
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from db.session import SessionLocal
+from services.weather_qc import NZ_TZ, QC_SUSPECT, WeatherQC
+
+STEP = timedelta(minutes=30)
+STORED_READINGS = 10  # 5 hours: one short of the temperature flat-line window
+BATCH_READINGS = 4
+
+
+def run_check() -> list:
+    problems = []
+    db = SessionLocal()
+    try:
+        station_id = db.scalar(text("SELECT station_id FROM weather_stations ORDER BY station_id LIMIT 1"))
+        if station_id is None:
+            return ["No weather stations to check against"]
+
+        start = datetime(2000, 1, 1, tzinfo=NZ_TZ)
+        stored = [
+            {"station_id": station_id, "timestamp": start + i * STEP, "variable": "temp", "value": 12.5, "quality": "GOOD"}
+            for i in range(STORED_READINGS)
+        ]
+        db.execute(text("""
+            INSERT INTO weather_data (station_id, timestamp, variable, value, quality)
+            VALUES (:station_id, :timestamp, :variable, :value, :quality)
+        """), stored)
+
+        batch = [
+            {"station_id": station_id, "timestamp": (start + i * STEP).replace(tzinfo=None),
+             "variable": "temp", "value": 12.5, "quality": "GOOD"}
+            for i in range(STORED_READINGS, STORED_READINGS + BATCH_READINGS)
+        ]
+        issues = WeatherQC.apply(db, batch)
+
+        flatlines = [i for i in issues if i["issue_type"] == "flatline"]
+        if len(flatlines) != 1:
+            problems.append(f"Expected one flatline run, got {len(flatlines)}")
+        elif flatlines[0]["start_time"] != start or flatlines[0]["points"] != STORED_READINGS + BATCH_READINGS:
+            problems.append(f"Flatline run should start at {start} with {STORED_READINGS + BATCH_READINGS} points: {flatlines[0]}")
+        if any(r["timestamp"].tzinfo is None for r in batch):
+            problems.append("Batch timestamps were left naive")
+        if any(r["quality"] != QC_SUSPECT for r in batch):
+            problems.append("Batch readings were not flagged SUSPECT")
+
+        downgraded = db.scalar(text("""
+            SELECT COUNT(*) FROM weather_data
+            WHERE station_id = :station_id AND variable = 'temp'
+              AND timestamp >= :start AND timestamp < :end AND quality = :quality
+        """), {"station_id": station_id, "start": start, "end": start + STORED_READINGS * STEP, "quality": QC_SUSPECT})
+        if downgraded != STORED_READINGS:
+            problems.append(f"Expected {STORED_READINGS} stored readings downgraded, got {downgraded}")
+    finally:
+        db.rollback()
+        db.close()
+    return problems
+
+
+if __name__ == '__main__':
+    problems = run_check()
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print("✅ Weather QC handles naive batches against stored readings")
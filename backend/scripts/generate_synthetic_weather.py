@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+scripts/generate_synthetic_weather.py
+
+Generate synthetic climate zones, weather stations and raw weather_data for
+benchmarking the daily processing pipeline at a chosen scale.
+
+- temp: seasonal cycle (warmest late January) plus a diurnal cycle peaking
+  mid-afternoon, per-station offset and autocorrelated noise
+- humidity: falls as the day warms, rises during rain
+- rainfall: rain events (more frequent in winter) of a few hours, reported
+  as 0.2 mm tipping-bucket totals per interval
+
+Everything generated is tagged so it can be removed again: zones have slugs
+starting 'synthetic-', stations have data_source 'SYNTHETIC'. Readings are
+written with COPY. Use a dedicated database; phenology and disease stages
+also need the seeded reference data (phenology thresholds, baselines).
+
+Usage:
+    python scripts/generate_synthetic_weather.py --stations 20 --zones 5 --years 1
+    python scripts/generate_synthetic_weather.py --stations 200 --zones 20 --days 30 --interval 10
+    python scripts/generate_synthetic_weather.py --purge      # Remove all synthetic data
+"""
+
+import argparse
+import io
+import logging
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pytz
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from db.session import SessionLocal, engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+NZ_TZ = pytz.timezone('Pacific/Auckland')
+
+SYNTHETIC_SOURCE = 'SYNTHETIC'
+SYNTHETIC_ZONE_PREFIX = 'synthetic-'
+
+# Rough NZ wine-country climate
+ANNUAL_MEAN_C = 12.5
+SEASONAL_AMPLITUDE_C = 5.5
+DIURNAL_AMPLITUDE_C = 6.0
+WARMEST_DAY_OF_YEAR = 25
+RAIN_DAYS_PER_YEAR = 90
+TIP_MM = 0.2
+
+
+def synthetic_zone_ids(db) -> List[int]:
+    return [row[0] for row in db.execute(text(
+        "SELECT id FROM climate_zones WHERE slug LIKE :prefix ORDER BY id"
+    ), {'prefix': f"{SYNTHETIC_ZONE_PREFIX}%"})]
+
+
+def synthetic_station_ids(db) -> List[int]:
+    return [row[0] for row in db.execute(text(
+        "SELECT station_id FROM weather_stations WHERE data_source = :source ORDER BY station_id"
+    ), {'source': SYNTHETIC_SOURCE})]
+
+
+def create_zones(db, count: int) -> List[int]:
+    """Synthetic climate zones 1..count, reusing any that already exist"""
+    for i in range(1, count + 1):
+        db.execute(text("""
+            INSERT INTO climate_zones (name, slug, description, display_order, is_active)
+            VALUES (:name, :slug, 'Synthetic zone for pipeline benchmarks', :order, true)
+            ON CONFLICT (slug) DO NOTHING
+        """), {'name': f"Synthetic {i:02d}", 'slug': f"{SYNTHETIC_ZONE_PREFIX}{i:02d}", 'order': 1000 + i})
+    return synthetic_zone_ids(db)[:count]
+
+
+def create_stations(db, count: int, zone_ids: List[int], rng: np.random.Generator) -> List[dict]:
+    """Synthetic stations spread round-robin over zone_ids, reusing existing codes"""
+    stations = []
+    for i in range(count):
+        zone_id = zone_ids[i % len(zone_ids)]
+        lat = -41.5 - 0.1 * (zone_id % 20) + rng.uniform(-0.05, 0.05)
+        lon = 173.9 + rng.uniform(-0.05, 0.05)
+        elevation = int(rng.uniform(10, 300))
+        station_id = db.execute(text("""
+            INSERT INTO weather_stations
+                (station_code, station_name, data_source, source_id, latitude, longitude,
+                 elevation, region, zone_id, is_active)
+            VALUES (:code, :name, :source, :code, :lat, :lon, :elevation, 'Synthetic', :zone_id, true)
+            ON CONFLICT (station_code) DO UPDATE SET zone_id = EXCLUDED.zone_id, is_active = true
+            RETURNING station_id
+        """), {
+            'code': f"SYN_{i + 1:05d}", 'name': f"Synthetic station {i + 1}", 'source': SYNTHETIC_SOURCE,
+            'lat': round(lat, 6), 'lon': round(lon, 6), 'elevation': elevation, 'zone_id': zone_id,
+        }).scalar()
+        stations.append({'station_id': station_id, 'zone_id': zone_id, 'elevation': elevation})
+    return stations
+
+
+def simulate_station(
+    start: datetime,
+    periods: int,
+    interval_minutes: int,
+    elevation: int,
+    rng: np.random.Generator,
+) -> Dict[str, np.ndarray]:
+    """temp (°C), humidity (%) and rainfall (mm per interval) for one station"""
+    minutes = np.arange(periods) * interval_minutes + start.hour * 60 + start.minute
+    day_of_year = start.timetuple().tm_yday + minutes / 1440.0
+    hour = (minutes / 60.0) % 24
+
+    # Temperature: season + diurnal cycle (min ~5am, max ~3pm) + lapse rate + AR(1) noise
+    seasonal = ANNUAL_MEAN_C + SEASONAL_AMPLITUDE_C * np.cos(2 * np.pi * (day_of_year - WARMEST_DAY_OF_YEAR) / 365.25)
+    diurnal = DIURNAL_AMPLITUDE_C * np.cos(2 * np.pi * (hour - 15) / 24)
+    noise = np.empty(periods)
+    noise[0] = 0.0
+    shocks = rng.normal(0, 0.35, periods)
+    for i in range(1, periods):
+        noise[i] = 0.97 * noise[i - 1] + shocks[i]
+    station_offset = rng.normal(0, 0.8) - 0.0065 * elevation
+    temp = seasonal + diurnal + station_offset + noise
+
+    # Rain events: start times from a seasonal Poisson process, a few hours each
+    steps_per_day = 1440 // interval_minutes
+    rain = np.zeros(periods)
+    winter = 1 + 0.4 * np.cos(2 * np.pi * (day_of_year - 196) / 365.25)
+    event_prob = (RAIN_DAYS_PER_YEAR / 365.25) * winter / steps_per_day
+    for start_idx in np.flatnonzero(rng.random(periods) < event_prob):
+        length = int(rng.uniform(2, 12) * 60 / interval_minutes)
+        rate = rng.exponential(1.2) * interval_minutes / 60  # mm per interval
+        rain[start_idx:start_idx + length] += rng.exponential(rate, len(rain[start_idx:start_idx + length]))
+    rain = np.floor(rain / TIP_MM) * TIP_MM
+
+    # Humidity: high at night, low in the afternoon, saturated-ish in rain
+    humidity = 72 - 3.0 * (temp - seasonal - station_offset) + rng.normal(0, 3, periods)
+    wet = np.convolve(rain > 0, np.ones(max(1, 120 // interval_minutes)), mode='same') > 0
+    humidity = np.where(wet, np.maximum(humidity, 92 + rng.normal(0, 2, periods)), humidity)
+    humidity = np.clip(humidity, 15, 100)
+
+    return {'temp': temp, 'humidity': humidity, 'rainfall': rain}
+
+
+def copy_readings(station_id: int, timestamps: List[str], series: Dict[str, np.ndarray]) -> int:
+    units = {'temp': 'C', 'humidity': 'percent', 'rainfall': 'mm'}
+    buffer = io.StringIO()
+    for variable, values in series.items():
+        unit = units[variable]
+        for ts, value in zip(timestamps, values):
+            buffer.write(f"{station_id},{ts},{variable},{value:.2f},{unit},GOOD\n")
+    buffer.seek(0)
+
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cursor:
+            cursor.copy_expert(
+                "COPY weather_data (station_id, timestamp, variable, value, unit, quality) FROM STDIN WITH CSV",
+                buffer,
+            )
+        raw.commit()
+    finally:
+        raw.close()
+    return sum(len(values) for values in series.values())
+
+
+def generate(
+    stations: int,
+    zones: int,
+    days: int,
+    end_date: date,
+    interval_minutes: int = 15,
+    seed: int = 42,
+) -> dict:
+    """Create zones, stations and readings for the `days` days up to and including end_date"""
+    rng = np.random.default_rng(seed)
+    start = NZ_TZ.localize(datetime.combine(end_date - timedelta(days=days - 1), datetime.min.time()))
+    periods = days * 1440 // interval_minutes
+
+    db = SessionLocal()
+    try:
+        zone_ids = create_zones(db, zones)
+        station_rows = create_stations(db, stations, zone_ids, rng)
+        ids = [s['station_id'] for s in station_rows]
+        # Regenerating replaces the window
+        db.execute(text("""
+            DELETE FROM weather_data
+            WHERE station_id = ANY(:ids) AND timestamp >= :start AND timestamp < :end
+        """), {'ids': ids, 'start': start, 'end': start + timedelta(days=days)})
+        db.commit()
+    finally:
+        db.close()
+
+    timestamps = [(start + timedelta(minutes=i * interval_minutes)).isoformat() for i in range(periods)]
+    readings = 0
+    for n, station in enumerate(station_rows, 1):
+        series = simulate_station(start, periods, interval_minutes, station['elevation'], rng)
+        readings += copy_readings(station['station_id'], timestamps, series)
+        if n % 10 == 0 or n == len(station_rows):
+            logger.info(f"  {n}/{len(station_rows)} stations, {readings:,} readings")
+
+    return {
+        'zones': len(zone_ids),
+        'stations': len(station_rows),
+        'days': days,
+        'start_date': start.date().isoformat(),
+        'end_date': end_date.isoformat(),
+        'interval_minutes': interval_minutes,
+        'readings': readings,
+    }
+
+
+def purge():
+    """Delete every synthetic zone and station and everything derived from them"""
+    db = SessionLocal()
+    try:
+        station_ids = synthetic_station_ids(db)
+        zone_ids = synthetic_zone_ids(db)
+        for table in ('weather_data', 'weather_data_issues', 'weather_data_daily'):
+            db.execute(text(f"DELETE FROM {table} WHERE station_id = ANY(:ids)"), {'ids': station_ids})
+        for table in ('climate_zone_hourly', 'climate_zone_daily', 'climate_zone_season_gdd',
+                      'phenology_estimates', 'disease_pressure'):
+            db.execute(text(f"DELETE FROM {table} WHERE zone_id = ANY(:ids)"), {'ids': zone_ids})
+        db.execute(text("DELETE FROM weather_stations WHERE station_id = ANY(:ids)"), {'ids': station_ids})
+        db.execute(text("DELETE FROM climate_zones WHERE id = ANY(:ids)"), {'ids': zone_ids})
+        db.commit()
+        logger.info(f"Removed {len(station_ids)} synthetic stations and {len(zone_ids)} synthetic zones")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic weather stations and readings')
+    parser.add_argument('--stations', type=int, default=20, help='Number of stations (default 20)')
+    parser.add_argument('--zones', type=int, default=5, help='Number of climate zones (default 5)')
+    parser.add_argument('--years', type=float, help='Years of data, overrides --days')
+    parser.add_argument('--days', type=int, default=30, help='Days of data (default 30)')
+    parser.add_argument('--end', type=str, help='Last day (YYYY-MM-DD), defaults to yesterday')
+    parser.add_argument('--interval', type=int, default=15, help='Minutes between readings (default 15)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--purge', action='store_true', help='Remove all synthetic data and exit')
+
+    args = parser.parse_args()
+
+    if args.purge:
+        purge()
+        return
+
+    end_date = (datetime.strptime(args.end, '%Y-%m-%d').date() if args.end
+                else (datetime.now(NZ_TZ) - timedelta(days=1)).date())
+    days = int(round(args.years * 365)) if args.years else args.days
+
+    summary = generate(args.stations, args.zones, days, end_date, args.interval, args.seed)
+    logger.info(
+        f"✅ {summary['readings']:,} readings for {summary['stations']} stations in {summary['zones']} zones, "
+        f"{summary['start_date']} to {summary['end_date']}"
+    )
+
+
+if __name__ == '__main__':
+    main()
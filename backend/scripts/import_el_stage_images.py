@@ -4,6 +4,7 @@ Core-based importer to avoid ORM registry issues.
 - Scans --src-dir for el_*.jpg|jpeg|png|webp
 - Copies to UPLOAD_DIR/<company_id>/reference_item/YYYY/MM/<uuid>.<ext>
 - INSERTs into files and reference_item_files (primary image)
+- Pre-renders the list-view WebP/JPEG variants (services.image_derivatives)
 
 Usage:
   python -m scripts.import_el_stage_images_core \
@@ -33,6 +34,7 @@ if not DB_URL:
 
 # Import only settings (safe; no ORM)
 from core.config import settings  # type: ignore
+from services.image_derivatives import ImageDerivatives  # type: ignore  (settings + Pillow only)
 
 
 def ensure_dir(p: Path) -> None:
@@ -161,6 +163,8 @@ def main():
                     {"rid": ref["id"], "fid": file_id, "caption": f"{el_key} · {ref['label']}"},
                 )
 
+                ImageDerivatives.pregenerate(file_id, str(dest))
+
             created += 1
             linked += 1
 
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+scripts/import_profile.py
+
+Startup import profile with a budget: imports a module in a fresh interpreter
+under `python -X importtime`, prints the slowest imports and exits 1 if the
+total is over --budget-ms or a --forbid module was imported. Use it in CI to
+keep heavy libraries (pandas, pyproj, ...) out of API and script startup.
+
+Timings vary between machines - set the budget with some headroom.
+
+Usage:
+    python scripts/import_profile.py                               # import main
+    python scripts/import_profile.py --budget-ms 3000 --forbid pandas,pyproj
+    python scripts/import_profile.py --module db.session --budget-ms 800
+    python scripts/import_profile.py --groups public --top 30      # API_ROUTER_GROUPS=public
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def profile_imports(module: str, env: dict) -> List[Tuple[str, int, int, int]]:
+    """(module, self_us, cumulative_us, depth) for every module imported by `import module`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr[-3000:])
+        raise SystemExit(f"import {module} failed")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile and budget module import time')
+    parser.add_argument('--module', default='main', help='Module to import (default main)')
+    parser.add_argument('--budget-ms', type=float, help='Fail if the import takes longer than this')
+    parser.add_argument('--forbid', type=str, default='', help='Comma-separated modules that must not be imported')
+    parser.add_argument('--groups', type=str, help='API_ROUTER_GROUPS for the profiled process')
+    parser.add_argument('--top', type=int, default=20, help='Slowest imports to list (default 20)')
+
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.groups is not None:
+        env['API_ROUTER_GROUPS'] = args.groups
+
+    rows = profile_imports(args.module, env)
+    total_ms = sum(self_us for _, self_us, _, _ in rows) / 1000
+    imported = {name for name, *_ in rows}
+
+    print(f"\nimport {args.module}: {total_ms:.0f} ms, {len(rows)} modules")
+    print(f"{'self ms':>9} {'cumulative ms':>14}  module")
+    for name, self_us, cumulative_us, depth in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"{self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}  {'  ' * depth}{name}")
+
+    failures = []
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        failures.append(f"import took {total_ms:.0f} ms, budget {args.budget_ms:.0f} ms")
+    for module in filter(None, (m.strip() for m in args.forbid.split(','))):
+        if module in imported:
+            failures.append(f"{module} is imported at startup")
+
+    if failures:
+        for failure in failures:
+            print(f"✗ {failure}")
+        sys.exit(1)
+    print("✓ Within budget" if args.budget_ms is not None or args.forbid else "")
+
+
+if __name__ == '__main__':
+    main()
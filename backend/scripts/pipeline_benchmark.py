@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+scripts/pipeline_benchmark.py
+
+Time each stage of the daily processing pipeline (run_daily_processing.py)
+and the realtime climate read API at a chosen scale, and write a JSON report
+that can be compared between runs.
+
+Stages run in-process in pipeline order over --days days ending at --date:
+daily, hourly, zone, phenology, disease. Each reports wall time, the raw
+readings in the window and the rows its output table holds for the window
+afterwards. The API part calls the public realtime endpoints in-process
+(FastAPI TestClient) --api-repeat times each and reports latency percentiles.
+
+Writes to the database from DATABASE_URL - use a dedicated one. With
+--generate the synthetic data is created first (see
+generate_synthetic_weather.py); --purge removes it afterwards.
+
+Usage:
+    python scripts/pipeline_benchmark.py --generate --stations 50 --zones 10 --years 1 --json report.json
+    python scripts/pipeline_benchmark.py --date 2026-01-15 --days 7
+    python scripts/pipeline_benchmark.py --stages daily,hourly --skip-api
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pytz
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from db.session import SessionLocal
+
+from scripts import generate_synthetic_weather
+from scripts.daily_aggregation import run_daily_aggregation
+from scripts.hourly_aggregation import run_hourly_aggregation_range
+from scripts.zone_aggregation import run_zone_aggregation
+from scripts.phenology_service import run_phenology_service
+from scripts.disease_service_v2 import run_disease_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+NZ_TZ = pytz.timezone('Pacific/Auckland')
+
+# stage -> (runner(start, end), output table, date expression in that table)
+STAGES: Dict[str, tuple] = {
+    'daily': (lambda s, e: run_daily_aggregation(start_date=s, end_date=e), 'weather_data_daily', 'date'),
+    'hourly': (lambda s, e: run_hourly_aggregation_range(s, e), 'climate_zone_hourly', 'timestamp_local::date'),
+    'zone': (lambda s, e: run_zone_aggregation(start_date=s, end_date=e), 'climate_zone_daily', 'date'),
+    'phenology': (lambda s, e: run_phenology_service(start_date=s, end_date=e), 'phenology_estimates', 'estimate_date'),
+    'disease': (lambda s, e: run_disease_service(start_date=s, end_date=e), 'disease_pressure', 'date'),
+}
+
+API_BASE = '/api/v1/public/realtime'
+ZONE_ENDPOINTS = ['current-season', 'gdd-progress', 'phenology', 'disease-pressure']
+GLOBAL_ENDPOINTS = ['zones', 'regional-overview', 'varieties']
+
+
+def count_rows(table: str, date_expr: str, start: date, end: date) -> int:
+    db = SessionLocal()
+    try:
+        return db.execute(text(
+            f"SELECT COUNT(*) FROM {table} WHERE {date_expr} BETWEEN :start AND :end"
+        ), {'start': start, 'end': end}).scalar()
+    finally:
+        db.close()
+
+
+def count_readings(start: date, end: date) -> int:
+    start_dt = NZ_TZ.localize(datetime.combine(start, datetime.min.time()))
+    end_dt = NZ_TZ.localize(datetime.combine(end + timedelta(days=1), datetime.min.time()))
+    db = SessionLocal()
+    try:
+        return db.execute(text(
+            "SELECT COUNT(*) FROM weather_data WHERE timestamp >= :start AND timestamp < :end"
+        ), {'start': start_dt, 'end': end_dt}).scalar()
+    finally:
+        db.close()
+
+
+def time_stage(name: str, runner: Callable, table: str, date_expr: str, start: date, end: date) -> dict:
+    logger.info(f"\n[{name}] {start} to {end}")
+    started = time.perf_counter()
+    error = None
+    try:
+        runner(start.isoformat(), end.isoformat())
+    except Exception as e:
+        error = str(e)
+        logger.error(f"  ✗ {name} failed: {e}")
+    seconds = time.perf_counter() - started
+    result = {
+        'seconds': round(seconds, 3),
+        'output_table': table,
+        'output_rows': count_rows(table, date_expr, start, end),
+    }
+    if error:
+        result['error'] = error
+    return result
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index], 2)
+
+
+def benchmark_api(zone_slug: Optional[str], repeat: int) -> Dict[str, dict]:
+    from fastapi.testclient import TestClient
+    from main import app
+
+    # Not used as a context manager, so startup hooks (workers, caches) are not run
+    client = TestClient(app)
+    paths = [f"{API_BASE}/{endpoint}" for endpoint in GLOBAL_ENDPOINTS]
+    if zone_slug:
+        paths += [f"{API_BASE}/{endpoint}/{zone_slug}" for endpoint in ZONE_ENDPOINTS]
+
+    results = {}
+    for path in paths:
+        timings = []
+        statuses = set()
+        for _ in range(repeat):
+            started = time.perf_counter()
+            response = client.get(path)
+            timings.append((time.perf_counter() - started) * 1000)
+            statuses.add(response.status_code)
+        results[path] = {
+            'status': sorted(statuses),
+            'requests': repeat,
+            'bytes': len(response.content),
+            'mean_ms': round(statistics.fmean(timings), 2),
+            'p50_ms': _percentile(timings, 50),
+            'p95_ms': _percentile(timings, 95),
+            'max_ms': round(max(timings), 2),
+        }
+        logger.info(f"  {path}: p50 {results[path]['p50_ms']}ms p95 {results[path]['p95_ms']}ms {sorted(statuses)}")
+    return results
+
+
+def first_zone_slug() -> Optional[str]:
+    db = SessionLocal()
+    try:
+        return db.execute(text("""
+            SELECT cz.slug FROM climate_zones cz
+            JOIN weather_stations ws ON ws.zone_id = cz.id AND ws.is_active = true
+            WHERE cz.is_active = true
+            ORDER BY (cz.slug LIKE :prefix) DESC, cz.id
+            LIMIT 1
+        """), {'prefix': f"{generate_synthetic_weather.SYNTHETIC_ZONE_PREFIX}%"}).scalar()
+    finally:
+        db.close()
+
+
+def print_report(report: dict):
+    print(f"\n{'='*60}")
+    print(f"PIPELINE BENCHMARK  {report['start_date']} to {report['end_date']}  ({report['readings']:,} readings)")
+    print(f"{'='*60}")
+    for name, stage in report['stages'].items():
+        status = '✗' if 'error' in stage else '✓'
+        print(f"  {status} {name:<10} {stage['seconds']:>9.2f}s  {stage['output_rows']:>8} {stage['output_table']}")
+    print(f"    {'total':<10} {report['pipeline_seconds']:>9.2f}s")
+    for path, api in report.get('api', {}).items():
+        print(f"  {path:<50} p50 {api['p50_ms']:>8}ms  p95 {api['p95_ms']:>8}ms")
+    print(f"{'='*60}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the daily processing pipeline and read API')
+    parser.add_argument('--date', type=str, help='Last day to process (YYYY-MM-DD), defaults to yesterday')
+    parser.add_argument('--days', type=int, default=1, help='Days to process, ending at --date (default 1, a nightly run)')
+    parser.add_argument('--stages', type=str, default=','.join(STAGES), help=f"Comma-separated stages (default {','.join(STAGES)})")
+    parser.add_argument('--skip-api', action='store_true', help='Skip the read API benchmark')
+    parser.add_argument('--api-repeat', type=int, default=20, help='Requests per endpoint (default 20)')
+    parser.add_argument('--zone', type=str, help='Zone slug for the per-zone endpoints (default: first zone with stations)')
+    parser.add_argument('--generate', action='store_true', help='Generate synthetic data first')
+    parser.add_argument('--stations', type=int, default=20, help='Synthetic stations (with --generate)')
+    parser.add_argument('--zones', type=int, default=5, help='Synthetic zones (with --generate)')
+    parser.add_argument('--years', type=float, default=1.0, help='Years of synthetic history up to --date (with --generate)')
+    parser.add_argument('--interval', type=int, default=15, help='Minutes between synthetic readings (with --generate)')
+    parser.add_argument('--purge', action='store_true', help='Remove synthetic data afterwards')
+    parser.add_argument('--json', type=Path, help='Write the report to this file')
+
+    args = parser.parse_args()
+
+    end = (datetime.strptime(args.date, '%Y-%m-%d').date() if args.date
+           else (datetime.now(NZ_TZ) - timedelta(days=1)).date())
+    start = end - timedelta(days=args.days - 1)
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(unknown)}")
+
+    report = {
+        'started_at': datetime.now(NZ_TZ).isoformat(),
+        'python': platform.python_version(),
+        'start_date': start.isoformat(),
+        'end_date': end.isoformat(),
+        'days': args.days,
+    }
+
+    if args.generate:
+        started = time.perf_counter()
+        report['generated'] = generate_synthetic_weather.generate(
+            args.stations, args.zones, max(int(round(args.years * 365)), args.days), end, args.interval
+        )
+        report['generated']['seconds'] = round(time.perf_counter() - started, 3)
+
+    report['readings'] = count_readings(start, end)
+    report['stages'] = {}
+    for name in stages:
+        runner, table, date_expr = STAGES[name]
+        report['stages'][name] = time_stage(name, runner, table, date_expr, start, end)
+    report['pipeline_seconds'] = round(sum(s['seconds'] for s in report['stages'].values()), 3)
+
+    if not args.skip_api:
+        report['api'] = benchmark_api(args.zone or first_zone_slug(), args.api_repeat)
+
+    if args.purge:
+        generate_synthetic_weather.purge()
+
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, default=str))
+        logger.info(f"Report written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
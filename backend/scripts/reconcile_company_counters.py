@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+scripts/reconcile_company_counters.py
+
+Recount every company's dashboard counters (services.company_counters) from
+the source tables and log any that had drifted. Run it once after deploying
+the company_counters migration, then nightly from cron to correct bulk
+updates, scripts and raw SQL that the session hooks don't see.
+
+Usage:
+    python scripts/reconcile_company_counters.py
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db.session import SessionLocal
+from services.company_counters import CompanyCounterService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    db = SessionLocal()
+    try:
+        drift = CompanyCounterService.reconcile(db)
+    finally:
+        db.close()
+
+    for company_id, changed in drift.items():
+        logger.warning(f"Company {company_id} counters drifted: {changed}")
+    logger.info(f"Company counters reconciled; {len(drift)} companies corrected")
+
+
+if __name__ == '__main__':
+    main()
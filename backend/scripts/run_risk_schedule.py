@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+scripts/run_risk_schedule.py
+
+Run the risk schedule job (services.risk_schedule) once: create upcoming
+instances of recurring risk actions and sync due_items for every company.
+Use it after deploying the due_items migration, or from cron when the
+in-process worker is disabled (RISK_SCHEDULE_ENABLED=false).
+
+Usage:
+    python scripts/run_risk_schedule.py
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.risk_schedule import risk_schedule_worker
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    result = risk_schedule_worker.run_once()
+    logger.info(f"Created {result['actions_created']} recurring risk actions; due_items synced")
+
+
+if __name__ == '__main__':
+    main()
@@ -31,6 +31,7 @@ from sqlalchemy import text
 from db.session import SessionLocal
 from db.models.climate import ClimateZone
 from db.models.realtime_climate import ClimateZoneDailyBaseline
+from services.zone_season_gdd import ZoneSeasonGdd
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -213,6 +214,8 @@ def upload_baseline_file(
         
         count += 1
     
+    # Baseline offsets feed the October 1 GDD columns on climate_zone_daily
+    ZoneSeasonGdd.refresh(db, zone_ids=[zone_id])
     db.commit()
     logger.info(f"  ✅ Inserted {count} records")
     
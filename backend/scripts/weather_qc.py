@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+scripts/weather_qc.py
+
+Run the ingestion quality checks (services.weather_qc) over weather_data that
+is already stored: sets quality on each reading and rebuilds
+weather_data_issues for the window. Use it once after deploying QC, or after
+changing a rule.
+
+Each station/variable series is checked and committed on its own. SUSPECT is
+only ever set by QC, so it is cleared before re-checking; BAD from a source
+is kept. Re-run hourly/daily aggregation for the window afterwards so the
+aggregates drop newly flagged readings.
+
+Usage:
+    python scripts/weather_qc.py                      # Last 7 days
+    python scripts/weather_qc.py --days 365           # Last year
+    python scripts/weather_qc.py --start 2025-07-01 --end 2025-12-31
+    python scripts/weather_qc.py --station 12         # One station
+    python scripts/weather_qc.py --dry-run            # Report without writing
+"""
+
+import argparse
+import logging
+import sys
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import bindparam, text
+from db.session import SessionLocal
+from services.weather_qc import QC_GOOD, QC_SUSPECT, VARIABLE_RULES, WeatherQC
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run_weather_qc(start: datetime, end: datetime, station_id: Optional[int] = None, dry_run: bool = False) -> Counter:
+    totals = Counter()
+    db = SessionLocal()
+    try:
+        series_sql = text("""
+            SELECT DISTINCT station_id, variable FROM weather_data
+            WHERE timestamp >= :start AND timestamp < :end
+              AND variable IN :variables
+              AND (CAST(:station_id AS INTEGER) IS NULL OR station_id = :station_id)
+            ORDER BY station_id, variable
+        """).bindparams(bindparam("variables", expanding=True))
+        series = db.execute(series_sql, {
+            "start": start, "end": end, "variables": sorted(VARIABLE_RULES), "station_id": station_id
+        }).fetchall()
+        logger.info(f"Checking {len(series)} station/variable series from {start:%Y-%m-%d} to {end:%Y-%m-%d}")
+
+        for sid, variable in series:
+            rows = db.execute(text("""
+                SELECT timestamp, value, quality FROM weather_data
+                WHERE station_id = :station_id AND variable = :variable
+                  AND timestamp >= :start AND timestamp < :end
+                ORDER BY timestamp
+            """), {"station_id": sid, "variable": variable, "start": start, "end": end}).fetchall()
+
+            records = [
+                {
+                    "station_id": sid,
+                    "timestamp": row.timestamp,
+                    "variable": variable,
+                    "value": row.value,
+                    "quality": QC_GOOD if (row.quality or "").upper() == QC_SUSPECT else row.quality,
+                    "stored_quality": row.quality,
+                }
+                for row in rows
+            ]
+            issues = WeatherQC.check(records)
+            changed = [
+                {"station_id": sid, "variable": variable, "timestamp": r["timestamp"], "quality": r["quality"]}
+                for r in records if r["quality"] != r["stored_quality"]
+            ]
+
+            totals["series"] += 1
+            totals["readings"] += len(records)
+            totals["issues"] += len(issues)
+            totals["quality_changed"] += len(changed)
+            for issue in issues:
+                totals[issue["issue_type"]] += issue["points"]
+
+            if issues or changed:
+                logger.info(f"  Station {sid} {variable}: {len(records)} readings, {len(issues)} issues, {len(changed)} quality changes")
+            if dry_run:
+                continue
+
+            if changed:
+                db.execute(text("""
+                    UPDATE weather_data SET quality = :quality
+                    WHERE station_id = :station_id AND variable = :variable AND timestamp = :timestamp
+                """), changed)
+            WeatherQC.save_issues(db, records, issues)
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Quality-check stored weather data')
+    parser.add_argument('--days', type=int, default=7, help='Check the last N days (default 7)')
+    parser.add_argument('--start', type=str, help='Start date (YYYY-MM-DD), overrides --days')
+    parser.add_argument('--end', type=str, help='End date (YYYY-MM-DD, exclusive), defaults to now')
+    parser.add_argument('--station', type=int, help='Only this station_id')
+    parser.add_argument('--dry-run', action='store_true', help='Report without writing')
+
+    args = parser.parse_args()
+
+    end = datetime.strptime(args.end, '%Y-%m-%d').replace(tzinfo=timezone.utc) if args.end else datetime.now(timezone.utc)
+    if args.start:
+        start = datetime.strptime(args.start, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    else:
+        start = end - timedelta(days=args.days)
+
+    totals = run_weather_qc(start, end, station_id=args.station, dry_run=args.dry_run)
+
+    print(f"\n{'='*60}")
+    print(f"Weather QC {'(dry run) ' if args.dry_run else ''}complete")
+    print(f"  Series checked:   {totals['series']}")
+    print(f"  Readings checked: {totals['readings']}")
+    print(f"  Issue runs:       {totals['issues']}")
+    print(f"  Quality changes:  {totals['quality_changed']}")
+    for issue_type in ('impossible_value', 'outlier', 'spike', 'rate_of_change', 'flatline'):
+        if totals[issue_type]:
+            print(f"    {issue_type}: {totals[issue_type]} readings")
+    print(f"{'='*60}\n")
+
+
+if __name__ == '__main__':
+    main()
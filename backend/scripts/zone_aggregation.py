@@ -3,33 +3,38 @@
 scripts/zone_aggregation.py
 
 Aggregate station-level daily data (weather_data_daily) into zone-level 
-aggregates (climate_zone_daily) using Inverse Distance Weighting (IDW).
+aggregates (climate_zone_daily): outlier-trimmed station means per zone-day.
+
+A whole date range is aggregated for all zones in one INSERT ... SELECT ...
+ON CONFLICT, after which cumulative GDD is recomputed with a running sum per
+zone and vintage, so re-running a vintage after a station correction is a
+single transaction.
 
 Usage:
     python scripts/zone_aggregation.py                           # Process yesterday
     python scripts/zone_aggregation.py --date 2025-10-15         # Process specific date
     python scripts/zone_aggregation.py --start 2025-10-01 --end 2025-10-31  # Date range
+    python scripts/zone_aggregation.py --vintage 2026            # Recompute the whole 2025/26 vintage
     python scripts/zone_aggregation.py --dry-run                 # Show what would be processed
+    python scripts/zone_aggregation.py --refresh-gdd             # Recompute October 1 GDD for all seasons
 """
 
 import argparse
 import logging
 import sys
+from collections import Counter
 from datetime import datetime, date, timedelta
-from decimal import Decimal
 from pathlib import Path
-from statistics import mean, stdev
-from typing import Dict, List, Optional
+from typing import List, Optional
 
 import pytz
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from db.session import SessionLocal
-from db.models.climate import ClimateZone
-from db.models.realtime_climate import ClimateZoneDaily
+from services.zone_season_gdd import ZoneSeasonGdd
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -38,191 +43,174 @@ NZ_TZ = pytz.timezone('Pacific/Auckland')
 MIN_STATIONS_FOR_ZONE = 2
 OUTLIER_SD_THRESHOLD = 1.5  # Exclude stations > 1.5 SD from mean
 
+# Station variables averaged per zone-day with outlier removal
+ROBUST_MEAN_COLUMNS = ('temp_min', 'temp_max', 'temp_mean', 'humidity_mean', 'rainfall_mm', 'solar_radiation')
+
+ZONE_DAILY_COLUMNS = (
+    'zone_id', 'date', 'vintage_year',
+    'temp_min', 'temp_max', 'temp_mean', 'humidity_mean', 'rainfall_mm', 'solar_radiation',
+    'gdd_daily', 'station_count', 'stations_with_temp', 'stations_with_humidity', 'stations_with_rain',
+    'confidence', 'processing_method',
+)
+
 
 def get_vintage_year(target_date: date) -> int:
     """Get the vintage year for a given date (July 1 - June 30)."""
     return target_date.year + 1 if target_date.month >= 7 else target_date.year
 
 
-def mean_with_outlier_removal(values: List[float], sd_threshold: float = OUTLIER_SD_THRESHOLD) -> Optional[float]:
+def get_vintage_dates(vintage_year: int) -> List[date]:
+    """All dates of a vintage (July 1 - June 30) up to yesterday."""
+    start = date(vintage_year - 1, 7, 1)
+    end = min(date(vintage_year, 6, 30), (datetime.now(NZ_TZ) - timedelta(days=1)).date())
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def _zone_day_select() -> str:
     """
-    Calculate mean, excluding outliers > sd_threshold standard deviations from mean.
+    One row per zone-day for every zone with enough active stations.
     
-    Returns None if insufficient valid values.
+    Outliers are dropped in SQL: each variable is AVG(...) FILTER over the
+    station values within OUTLIER_SD_THRESHOLD sample standard deviations of
+    the zone-day mean. When the deviation is NULL (fewer than two values) or
+    below 0.01 (near identical values) every value is kept, and if the filter
+    keeps nothing the plain mean is used. Zone-days with fewer than
+    MIN_STATIONS_FOR_ZONE temperature readings are skipped; no rain reported
+    counts as 0 mm.
+    """
+    stats = ",\n".join(
+        f"AVG({c}) AS {c}_avg, STDDEV_SAMP({c}) AS {c}_sd" for c in ROBUST_MEAN_COLUMNS
+    )
+    robust = ",\n".join(
+        f"AVG(o.{c}) FILTER (WHERE s.{c}_sd IS NULL OR s.{c}_sd < 0.01 "
+        f"OR ABS(o.{c} - s.{c}_avg) <= :sd_threshold * s.{c}_sd) AS {c}"
+        for c in ROBUST_MEAN_COLUMNS
+    )
+    means = {c: f"COALESCE(r.{c}, s.{c}_avg)" for c in ROBUST_MEAN_COLUMNS}
+    return f"""
+        WITH zones AS (
+            SELECT cz.id AS zone_id
+            FROM climate_zones cz
+            JOIN weather_stations ws ON ws.zone_id = cz.id AND ws.is_active = true
+            WHERE cz.is_active = true
+            GROUP BY cz.id
+            HAVING COUNT(DISTINCT ws.station_id) >= :min_stations
+        ),
+        obs AS (
+            SELECT ws.zone_id, wdd.date, wdd.station_id,
+                   {', '.join('wdd.' + c for c in ROBUST_MEAN_COLUMNS)}
+            FROM weather_data_daily wdd
+            JOIN weather_stations ws ON ws.station_id = wdd.station_id AND ws.is_active = true
+            JOIN zones z ON z.zone_id = ws.zone_id
+            WHERE wdd.date BETWEEN :start_date AND :end_date
+        ),
+        s AS (
+            SELECT zone_id, date,
+                   COUNT(*) AS station_count,
+                   COUNT(temp_mean) AS stations_with_temp,
+                   COUNT(humidity_mean) AS stations_with_humidity,
+                   COUNT(rainfall_mm) AS stations_with_rain,
+                   {stats}
+            FROM obs
+            GROUP BY zone_id, date
+            HAVING COUNT(temp_mean) >= :min_stations
+        ),
+        r AS (
+            SELECT o.zone_id, o.date,
+                   {robust}
+            FROM obs o
+            JOIN s ON s.zone_id = o.zone_id AND s.date = o.date
+            GROUP BY o.zone_id, o.date
+        )
+        SELECT
+            s.zone_id,
+            s.date,
+            (EXTRACT(YEAR FROM s.date) + CASE WHEN EXTRACT(MONTH FROM s.date) >= 7 THEN 1 ELSE 0 END)::int AS vintage_year,
+            {means['temp_min']} AS temp_min,
+            {means['temp_max']} AS temp_max,
+            {means['temp_mean']} AS temp_mean,
+            {means['humidity_mean']} AS humidity_mean,
+            COALESCE({means['rainfall_mm']}, 0) AS rainfall_mm,
+            {means['solar_radiation']} AS solar_radiation,
+            GREATEST({means['temp_mean']}, 0) AS gdd_daily,
+            s.station_count,
+            s.stations_with_temp,
+            s.stations_with_humidity,
+            s.stations_with_rain,
+            CASE WHEN s.station_count >= 6 THEN 'high'
+                 WHEN s.station_count >= 4 THEN 'medium'
+                 ELSE 'low' END AS confidence,
+            'mean_outlier_removed' AS processing_method
+        FROM s
+        JOIN r ON r.zone_id = s.zone_id AND r.date = s.date
     """
-    # Filter out None values
-    valid = [v for v in values if v is not None]
-    
-    if len(valid) < 2:
-        return mean(valid) if valid else None
-    
-    # Calculate initial mean and SD
-    initial_mean = mean(valid)
-    initial_sd = stdev(valid)
-    
-    # If SD is very small (all values similar), keep all
-    if initial_sd < 0.01:
-        return initial_mean
-    
-    # Filter outliers
-    filtered = [v for v in valid if abs(v - initial_mean) <= sd_threshold * initial_sd]
-    
-    # Need at least 1 value after filtering
-    if not filtered:
-        return initial_mean  # Fall back to original if all excluded
-    
-    return mean(filtered)
-
-
-def get_zones_with_stations(db) -> List[dict]:
-    """Get climate zones with sufficient station coverage."""
-    result = db.execute(text("""
-        SELECT 
-            cz.id as zone_id,
-            cz.name as zone_name,
-            COUNT(DISTINCT ws.station_id) as station_count
-        FROM climate_zones cz
-        LEFT JOIN weather_stations ws ON ws.zone_id = cz.id AND ws.is_active = true
-        WHERE cz.is_active = true
-        GROUP BY cz.id, cz.name
-        HAVING COUNT(DISTINCT ws.station_id) >= :min_stations
-        ORDER BY cz.name
-    """), {'min_stations': MIN_STATIONS_FOR_ZONE})
-    
-    return [
-        {
-            'zone_id': row[0],
-            'zone_name': row[1],
-            'station_count': row[2],
-        }
-        for row in result
-    ]
-
-
-def get_zone_stations_with_data(db, zone_id: int, target_date: date) -> List[dict]:
-    """Get stations in zone with data for target date."""
-    result = db.execute(text("""
-        SELECT 
-            ws.station_id,
-            wdd.temp_min, wdd.temp_max, wdd.temp_mean,
-            wdd.humidity_mean, wdd.rainfall_mm, wdd.solar_radiation, wdd.gdd_base0
-        FROM weather_stations ws
-        JOIN weather_data_daily wdd ON wdd.station_id = ws.station_id
-        WHERE ws.zone_id = :zone_id AND ws.is_active = true AND wdd.date = :target_date
-    """), {'zone_id': zone_id, 'target_date': target_date})
-    
-    return [
-        {
-            'station_id': row[0],
-            'temp_min': float(row[1]) if row[1] else None,
-            'temp_max': float(row[2]) if row[2] else None,
-            'temp_mean': float(row[3]) if row[3] else None,
-            'humidity_mean': float(row[4]) if row[4] else None,
-            'rainfall_mm': float(row[5]) if row[5] else None,
-            'solar_radiation': float(row[6]) if row[6] else None,
-            'gdd_base0': float(row[7]) if row[7] else None,
-        }
-        for row in result
-    ]
-
-
-def get_previous_cumulative_gdd(db, zone_id: int, target_date: date) -> Decimal:
-    """Get cumulative GDD from previous day."""
-    if target_date.month == 7 and target_date.day == 1:
-        return Decimal('0')
-    
-    previous_date = target_date - timedelta(days=1)
-    existing = db.query(ClimateZoneDaily).filter(
-        ClimateZoneDaily.zone_id == zone_id,
-        ClimateZoneDaily.date == previous_date
-    ).first()
-    
-    return Decimal(str(existing.gdd_cumulative)) if existing and existing.gdd_cumulative else Decimal('0')
 
 
-def aggregate_zone_day(db, zone: dict, target_date: date) -> Optional[dict]:
+def _upsert_sql() -> str:
+    columns = ', '.join(ZONE_DAILY_COLUMNS)
+    updates = ',\n'.join(
+        f"{c} = EXCLUDED.{c}" for c in ZONE_DAILY_COLUMNS if c not in ('zone_id', 'date')
+    )
+    return f"""
+        INSERT INTO climate_zone_daily ({columns})
+        {_zone_day_select()}
+        ON CONFLICT ON CONSTRAINT uq_climate_zone_daily_zone_date DO UPDATE SET
+            {updates}
+        RETURNING zone_id, date
     """
-    Aggregate station data for a zone using simple mean with outlier removal.
-    
-    Outliers (>1.5 SD from mean) are excluded from calculations.
+
+
+# Running GDD sum from July 1 per zone and vintage
+CUMULATIVE_GDD_SQL = text("""
+    UPDATE climate_zone_daily d
+    SET gdd_cumulative = c.gdd_cumulative
+    FROM (
+        SELECT id, SUM(COALESCE(gdd_daily, 0)) OVER (
+            PARTITION BY zone_id, vintage_year ORDER BY date
+        ) AS gdd_cumulative
+        FROM climate_zone_daily
+        WHERE vintage_year IN :vintage_years AND zone_id IN :zone_ids
+    ) c
+    WHERE d.id = c.id AND d.gdd_cumulative IS DISTINCT FROM c.gdd_cumulative
+""").bindparams(bindparam('vintage_years', expanding=True), bindparam('zone_ids', expanding=True))
+
+
+def aggregate_zones(db, start: date, end: date, dry_run: bool = False) -> Counter:
     """
-    stations = get_zone_stations_with_data(db, zone['zone_id'], target_date)
-    
-    stations_with_temp = [s for s in stations if s['temp_mean'] is not None]
-    if len(stations_with_temp) < MIN_STATIONS_FOR_ZONE:
-        return None
-    
-    # Calculate means with outlier removal for each variable
-    temp_min = mean_with_outlier_removal([s['temp_min'] for s in stations])
-    temp_max = mean_with_outlier_removal([s['temp_max'] for s in stations])
-    temp_mean = mean_with_outlier_removal([s['temp_mean'] for s in stations])
-    humidity_mean = mean_with_outlier_removal([s['humidity_mean'] for s in stations])
-    solar_radiation = mean_with_outlier_removal([s['solar_radiation'] for s in stations])
-    
-    # Rainfall: use mean of reported values, but default to 0 if no rain recorded
-    # (no rain = valid 0mm, not missing data)
-    rainfall_values = [s['rainfall_mm'] for s in stations if s['rainfall_mm'] is not None]
-    if rainfall_values:
-        rainfall_mm = mean_with_outlier_removal(rainfall_values)
-        if rainfall_mm is None:
-            rainfall_mm = 0.0
-    else:
-        rainfall_mm = 0.0
-    
-    # GDD from mean temp
-    gdd_daily = max(Decimal('0'), Decimal(str(temp_mean))) if temp_mean else None
-    
-    # Count stations with each variable
-    station_count = len(stations)
-    confidence = 'high' if station_count >= 6 else ('medium' if station_count >= 4 else 'low')
-    
-    return {
-        'zone_id': zone['zone_id'],
-        'date': target_date,
-        'vintage_year': get_vintage_year(target_date),
-        'temp_min': Decimal(str(temp_min)) if temp_min is not None else None,
-        'temp_max': Decimal(str(temp_max)) if temp_max is not None else None,
-        'temp_mean': Decimal(str(temp_mean)) if temp_mean is not None else None,
-        'humidity_mean': Decimal(str(humidity_mean)) if humidity_mean is not None else None,
-        'rainfall_mm': Decimal(str(rainfall_mm)) if rainfall_mm is not None else None,
-        'solar_radiation': Decimal(str(solar_radiation)) if solar_radiation is not None else None,
-        'gdd_daily': gdd_daily,
-        'gdd_cumulative': None,  # Set in upsert
-        'station_count': station_count,
-        'stations_with_temp': len(stations_with_temp),
-        'stations_with_humidity': len([s for s in stations if s['humidity_mean'] is not None]),
-        'stations_with_rain': len([s for s in stations if s['rainfall_mm'] is not None]),
-        'confidence': confidence,
-        'processing_method': 'mean_outlier_removed',
+    Aggregate every zone for start..end in one statement, then recompute the
+    cumulative GDD and October 1 columns of the affected vintages. The caller
+    commits. Returns the number of zone records per date.
+    """
+    params = {
+        'start_date': start,
+        'end_date': end,
+        'min_stations': MIN_STATIONS_FOR_ZONE,
+        'sd_threshold': OUTLIER_SD_THRESHOLD,
     }
+    if dry_run:
+        rows = db.execute(text(_zone_day_select()), params).all()
+        return Counter(row.date for row in rows)
 
+    rows = db.execute(text(_upsert_sql()), params).all()
+    if not rows:
+        return Counter()
 
-def upsert_zone_daily(db, record: dict) -> bool:
-    """Insert or update zone daily record."""
-    previous_gdd = get_previous_cumulative_gdd(db, record['zone_id'], record['date'])
-    record['gdd_cumulative'] = previous_gdd + (record['gdd_daily'] or Decimal('0'))
-    
-    existing = db.query(ClimateZoneDaily).filter(
-        ClimateZoneDaily.zone_id == record['zone_id'],
-        ClimateZoneDaily.date == record['date']
-    ).first()
-    
-    if existing:
-        for key, value in record.items():
-            setattr(existing, key, value)
-    else:
-        db.add(ClimateZoneDaily(**record))
-    
-    return True
+    vintage_years = sorted({get_vintage_year(row.date) for row in rows})
+    zone_ids = sorted({row.zone_id for row in rows})
+    db.execute(CUMULATIVE_GDD_SQL, {'vintage_years': vintage_years, 'zone_ids': zone_ids})
+    ZoneSeasonGdd.refresh(db, vintage_years=vintage_years, zone_ids=zone_ids)
+
+    return Counter(row.date for row in rows)
 
 
 def run_zone_aggregation(
     target_date: Optional[str] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    dry_run: bool = False
+    dry_run: bool = False,
+    vintage_year: Optional[int] = None
 ):
-    """Run zone aggregation for specified date(s)."""
+    """Run zone aggregation for specified date(s) or a whole vintage."""
     
     if target_date:
         dates_to_process = [datetime.strptime(target_date, '%Y-%m-%d').date()]
@@ -230,9 +218,15 @@ def run_zone_aggregation(
         start = datetime.strptime(start_date, '%Y-%m-%d').date()
         end = datetime.strptime(end_date, '%Y-%m-%d').date()
         dates_to_process = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    elif vintage_year:
+        dates_to_process = get_vintage_dates(vintage_year)
     else:
         dates_to_process = [(datetime.now(NZ_TZ) - timedelta(days=1)).date()]
     
+    if not dates_to_process:
+        logger.warning("No dates to process")
+        return
+    
     logger.info(f"Zone Aggregation: weather_data_daily → climate_zone_daily")
     logger.info(f"Dates: {dates_to_process[0]} to {dates_to_process[-1]} ({len(dates_to_process)} days)")
     
@@ -242,33 +236,15 @@ def run_zone_aggregation(
     db = SessionLocal()
     
     try:
-        zones = get_zones_with_stations(db)
-        logger.info(f"Found {len(zones)} zones with >= {MIN_STATIONS_FOR_ZONE} stations")
+        records_by_date = aggregate_zones(db, dates_to_process[0], dates_to_process[-1], dry_run)
         
-        for zone in zones:
-            logger.info(f"  - {zone['zone_name']}: {zone['station_count']} stations")
+        if not dry_run:
+            db.commit()
         
-        if not zones:
-            logger.warning("No zones have sufficient station coverage")
-            return
+        for target in dates_to_process:
+            logger.info(f"  {target}: {records_by_date.get(target, 0)} zone records")
         
-        total_records = 0
-        for target in sorted(dates_to_process):
-            records = 0
-            for zone in zones:
-                record = aggregate_zone_day(db, zone, target)
-                if record:
-                    if not dry_run:
-                        upsert_zone_daily(db, record)
-                    records += 1
-            
-            if not dry_run:
-                db.commit()
-            
-            logger.info(f"  {target}: {records} zone records")
-            total_records += records
-        
-        logger.info(f"\n✅ Zone aggregation complete: {total_records} records")
+        logger.info(f"\n✅ Zone aggregation complete: {sum(records_by_date.values())} records")
         
     except Exception as e:
         logger.error(f"Zone aggregation failed: {e}")
@@ -278,16 +254,37 @@ def run_zone_aggregation(
         db.close()
 
 
+def run_gdd_refresh(vintage_year: Optional[int] = None):
+    """Recompute October 1 adjusted GDD (e.g. after a baseline reload or for existing data)."""
+    db = SessionLocal()
+    try:
+        updated = ZoneSeasonGdd.refresh(db, vintage_years=[vintage_year] if vintage_year else None)
+        db.commit()
+        logger.info(f"✅ October 1 GDD refreshed on {updated} records")
+    except Exception as e:
+        logger.error(f"GDD refresh failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 def main():
     parser = argparse.ArgumentParser(description='Aggregate station data to zone level using IDW')
     parser.add_argument('--date', type=str, help='Process specific date (YYYY-MM-DD)')
     parser.add_argument('--start', type=str, help='Start date for range')
     parser.add_argument('--end', type=str, help='End date for range')
     parser.add_argument('--dry-run', action='store_true', help='Show without inserting')
+    parser.add_argument('--vintage', type=int, help='Recompute a whole vintage (e.g. 2026 = 2025/26)')
+    parser.add_argument('--refresh-gdd', action='store_true', help='Only recompute October 1 GDD columns (for --vintage, default all)')
     
     args = parser.parse_args()
     
-    run_zone_aggregation(args.date, args.start, args.end, args.dry_run)
+    if args.refresh_gdd:
+        run_gdd_refresh(args.vintage)
+        return
+    
+    run_zone_aggregation(args.date, args.start, args.end, args.dry_run, args.vintage)
 
 
 if __name__ == '__main__':
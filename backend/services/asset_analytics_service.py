@@ -0,0 +1,445 @@
+"""
+Asset Analytics Service
+Set-based calibration, maintenance, compliance and stock status for a company's assets.
+
+Every per-asset status is computed in one statement: DISTINCT ON picks the latest
+calibration and completed maintenance per asset, a grouped subquery finds the next
+open maintenance job, and the dashboard counts are FILTERed aggregates over that.
+When ASSET_STATUS_MATVIEW is enabled the same status rows are read from the
+asset_status_summary materialized view. Commits that write asset, calibration,
+maintenance or stock rows, through the unit of work or a Core insert(),
+update() or delete() on the session (e.g. utils.bulk.bulk_insert), only mark
+it stale; AssetStatusRefresher refreshes it in the background at most once per
+ASSET_STATUS_REFRESH_DELAY_SECONDS, so a burst of writes (a stock take, an
+import) costs one refresh and requests never wait for it.
+"""
+import logging
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import chain
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Date, and_, case, cast, column, event, func, literal, or_, select, table, text, union_all
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from db.models.asset import Asset, AssetCalibration, AssetMaintenance, StockMovement
+
+logger = logging.getLogger(__name__)
+
+ASSET_STATUS_VIEW = "asset_status_summary"
+
+STATUS_COLUMNS = (
+    "asset_id", "company_id", "name", "category", "asset_type",
+    "requires_calibration", "last_calibration_date", "calibration_due_date",
+    "last_maintenance_date", "next_scheduled_maintenance", "maintenance_due_date",
+    "open_maintenance_count", "compliance_due_date",
+    "current_stock", "minimum_stock", "unit_of_measure", "stock_status"
+)
+
+_asset_status_view = table(ASSET_STATUS_VIEW, *[column(name) for name in STATUS_COLUMNS])
+
+
+def _asset_status_select(company_id: Optional[int] = None):
+    """
+    One row per active asset with its next-due dates and stock flag.
+    Kept in step with the asset_status_summary view definition in the migration.
+    """
+    latest_calibration = select(
+        AssetCalibration.asset_id,
+        AssetCalibration.calibration_date,
+        AssetCalibration.next_due_date
+    ).distinct(AssetCalibration.asset_id).order_by(
+        AssetCalibration.asset_id,
+        AssetCalibration.calibration_date.desc(),
+        AssetCalibration.id.desc()
+    )
+
+    last_maintenance = select(
+        AssetMaintenance.asset_id,
+        AssetMaintenance.completed_date,
+        AssetMaintenance.next_due_date
+    ).where(
+        AssetMaintenance.status == "completed"
+    ).distinct(AssetMaintenance.asset_id).order_by(
+        AssetMaintenance.asset_id,
+        AssetMaintenance.completed_date.desc().nulls_last(),
+        AssetMaintenance.id.desc()
+    )
+
+    open_maintenance = select(
+        AssetMaintenance.asset_id,
+        func.min(AssetMaintenance.scheduled_date).label("next_scheduled"),
+        func.count().label("open_count")
+    ).where(
+        AssetMaintenance.status.in_(["scheduled", "in_progress"])
+    ).group_by(AssetMaintenance.asset_id)
+
+    assets_filter = [Asset.is_active == True]
+    if company_id is not None:
+        assets_filter.append(Asset.company_id == company_id)
+        latest_calibration = latest_calibration.where(AssetCalibration.company_id == company_id)
+        last_maintenance = last_maintenance.where(AssetMaintenance.company_id == company_id)
+        open_maintenance = open_maintenance.where(AssetMaintenance.company_id == company_id)
+
+    latest_calibration = latest_calibration.subquery("latest_calibration")
+    last_maintenance = last_maintenance.subquery("last_maintenance")
+    open_maintenance = open_maintenance.subquery("open_maintenance")
+
+    calibration_due = case(
+        (func.coalesce(Asset.requires_calibration, False) == False, None),
+        else_=func.coalesce(
+            latest_calibration.c.next_due_date,
+            latest_calibration.c.calibration_date + Asset.calibration_interval_days
+        )
+    )
+
+    # LEAST ignores NULLs, so whichever of the open job / predicted service is sooner wins
+    maintenance_due = func.least(
+        open_maintenance.c.next_scheduled,
+        last_maintenance.c.next_due_date,
+        last_maintenance.c.completed_date + Asset.maintenance_interval_days
+    )
+
+    stock_status = case(
+        (Asset.asset_type != "consumable", "not_applicable"),
+        (func.coalesce(Asset.current_stock, 0) <= 0, "out_of_stock"),
+        (and_(Asset.minimum_stock.isnot(None), Asset.current_stock <= Asset.minimum_stock), "low_stock"),
+        (and_(Asset.maximum_stock.isnot(None), Asset.current_stock >= Asset.maximum_stock), "overstocked"),
+        else_="adequate"
+    )
+
+    return select(
+        Asset.id.label("asset_id"),
+        Asset.company_id,
+        Asset.name,
+        Asset.category,
+        Asset.asset_type,
+        func.coalesce(Asset.requires_calibration, False).label("requires_calibration"),
+        latest_calibration.c.calibration_date.label("last_calibration_date"),
+        cast(calibration_due, Date).label("calibration_due_date"),
+        last_maintenance.c.completed_date.label("last_maintenance_date"),
+        open_maintenance.c.next_scheduled.label("next_scheduled_maintenance"),
+        cast(maintenance_due, Date).label("maintenance_due_date"),
+        func.coalesce(open_maintenance.c.open_count, 0).label("open_maintenance_count"),
+        func.least(Asset.wof_due, Asset.registration_expiry, Asset.insurance_expiry).label("compliance_due_date"),
+        Asset.current_stock,
+        Asset.minimum_stock,
+        Asset.unit_of_measure,
+        stock_status.label("stock_status")
+    ).select_from(Asset).outerjoin(
+        latest_calibration, latest_calibration.c.asset_id == Asset.id
+    ).outerjoin(
+        last_maintenance, last_maintenance.c.asset_id == Asset.id
+    ).outerjoin(
+        open_maintenance, open_maintenance.c.asset_id == Asset.id
+    ).where(*assets_filter)
+
+
+def _effective_calibration_due(status):
+    """Assets that require calibration but have never been calibrated are due today"""
+    return case(
+        (and_(status.c.requires_calibration == True, status.c.last_calibration_date.is_(None)), func.current_date()),
+        else_=status.c.calibration_due_date
+    )
+
+
+class AssetAnalyticsService:
+
+    @staticmethod
+    def status_subquery(company_id: int):
+        """Per-asset status rows for a company, from the materialized view when enabled"""
+        if settings.ASSET_STATUS_MATVIEW:
+            return select(_asset_status_view).where(
+                _asset_status_view.c.company_id == company_id
+            ).subquery("asset_status")
+        return _asset_status_select(company_id).subquery("asset_status")
+
+    @staticmethod
+    def due_dates_select(company_id: Optional[int] = None):
+        """
+        Calibration and maintenance due dates per active asset (every company when
+        company_id is None). Always computed from the tables, never the view, so
+        it is current inside the commit that changed them.
+        """
+        status = _asset_status_select(company_id).subquery("asset_status")
+        return select(
+            status.c.asset_id,
+            status.c.company_id,
+            status.c.name,
+            _effective_calibration_due(status).label("calibration_due_date"),
+            status.c.maintenance_due_date
+        )
+
+    @staticmethod
+    def get_asset_statuses(
+        db: Session,
+        company_id: int,
+        asset_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Next-due calibration/maintenance dates and stock status for every active asset"""
+        status = AssetAnalyticsService.status_subquery(company_id)
+        query = select(
+            status,
+            _effective_calibration_due(status).label("effective_calibration_due")
+        ).order_by(status.c.name)
+        if asset_type:
+            query = query.where(status.c.asset_type == asset_type)
+
+        rows = []
+        for row in db.execute(query).mappings():
+            row = dict(row)
+            row["calibration_due_date"] = row.pop("effective_calibration_due")
+            rows.append(row)
+        return rows
+
+    @staticmethod
+    def get_stats(db: Session, company_id: int, compliance_days: int = 30) -> Dict[str, int]:
+        """
+        Dashboard counts in a single aggregate over the status rows. The counts
+        keep their original meaning: maintenance counts overdue open jobs,
+        calibration counts assets with an interval whose last calibration plus
+        that interval has passed (or that were never calibrated), and low stock
+        counts consumables at or below their minimum.
+        """
+        status = AssetAnalyticsService.status_subquery(company_id)
+        today = date.today()
+        compliance_cutoff = today + timedelta(days=compliance_days)
+
+        calibration_overdue = and_(
+            status.c.requires_calibration == True,
+            Asset.calibration_interval_days.isnot(None),
+            or_(
+                status.c.last_calibration_date.is_(None),
+                status.c.last_calibration_date + Asset.calibration_interval_days <= today
+            )
+        )
+
+        row = db.execute(select(
+            func.count().label("total_assets"),
+            func.count().filter(status.c.asset_type == "physical").label("equipment_count"),
+            func.count().filter(status.c.asset_type == "consumable").label("consumable_count"),
+            func.count().filter(status.c.next_scheduled_maintenance < today).label("assets_needing_maintenance"),
+            func.count().filter(calibration_overdue).label("assets_needing_calibration"),
+            func.count().filter(
+                status.c.asset_type == "consumable",
+                status.c.current_stock <= status.c.minimum_stock
+            ).label("low_stock_consumables"),
+            func.count().filter(status.c.compliance_due_date <= compliance_cutoff).label("compliance_alerts")
+        ).select_from(status.join(Asset, Asset.id == status.c.asset_id))).mappings().one()
+
+        return {key: value or 0 for key, value in row.items()}
+
+    @staticmethod
+    def get_calibrations_due(
+        db: Session,
+        company_id: int,
+        days_ahead: int = 30,
+        include_overdue: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Assets whose next calibration falls inside the window"""
+        status = AssetAnalyticsService.status_subquery(company_id)
+        today = date.today()
+        due = _effective_calibration_due(status)
+
+        query = select(
+            status.c.asset_id,
+            status.c.name.label("asset_name"),
+            status.c.category,
+            status.c.last_calibration_date,
+            due.label("due_date")
+        ).where(
+            status.c.requires_calibration == True,
+            due <= today + timedelta(days=days_ahead)
+        )
+        if not include_overdue:
+            query = query.where(due >= today)
+
+        rows = db.execute(query.order_by(due)).mappings().all()
+        return [
+            {
+                **row,
+                "days_overdue": (today - row["due_date"]).days if row["due_date"] < today else None
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def get_compliance_alerts(db: Session, company_id: int, days_ahead: int = 30) -> List[Dict[str, Any]]:
+        """WOF, registration and insurance dates inside the window, one row per expiring item"""
+        today = date.today()
+        cutoff_date = today + timedelta(days=days_ahead)
+
+        def expiring(alert_type: str, due_column):
+            return select(
+                Asset.id.label("asset_id"),
+                Asset.name.label("asset_name"),
+                literal(alert_type).label("alert_type"),
+                due_column.label("due_date")
+            ).where(
+                Asset.company_id == company_id,
+                Asset.is_active == True,
+                due_column.isnot(None),
+                due_column <= cutoff_date
+            )
+
+        union = union_all(
+            expiring("wof_due", Asset.wof_due),
+            expiring("registration_expiry", Asset.registration_expiry),
+            expiring("insurance_expiry", Asset.insurance_expiry)
+        ).subquery("expiring")
+
+        rows = db.execute(select(union).order_by(union.c.due_date)).mappings().all()
+
+        alerts = []
+        for row in rows:
+            days_until = (row["due_date"] - today).days
+            alerts.append({
+                **row,
+                "days_until_due": days_until,
+                "severity": "critical" if days_until <= 7 else "warning" if days_until <= 14 else "info"
+            })
+        return alerts
+
+    @staticmethod
+    def get_stock_alerts(db: Session, company_id: int) -> List[Dict[str, Any]]:
+        """Consumables that are out of stock or at/below their reorder level"""
+        status = AssetAnalyticsService.status_subquery(company_id)
+        rows = db.execute(select(
+            status.c.asset_id,
+            status.c.name.label("asset_name"),
+            status.c.current_stock,
+            status.c.minimum_stock,
+            status.c.unit_of_measure,
+            status.c.stock_status
+        ).where(
+            status.c.stock_status.in_(["out_of_stock", "low_stock"])
+        ).order_by(status.c.stock_status.desc(), status.c.name)).mappings().all()
+
+        return [
+            {
+                **row,
+                "current_stock": row["current_stock"] or Decimal("0"),
+                "minimum_stock": row["minimum_stock"] or Decimal("0"),
+                "unit_of_measure": row["unit_of_measure"] or "units"
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def get_stock_summary(db: Session, company_id: int, asset_id: int, days: int = 30) -> Dict[str, Any]:
+        """Movement totals for one consumable over a trailing window, aggregated in SQL"""
+        cutoff_date = date.today() - timedelta(days=days)
+        quantity = StockMovement.quantity
+        movement_type = StockMovement.movement_type
+
+        row = db.execute(select(
+            func.coalesce(func.sum(quantity).filter(quantity > 0), 0).label("total_purchased"),
+            func.abs(func.coalesce(func.sum(quantity).filter(quantity < 0), 0)).label("total_used"),
+            func.coalesce(func.sum(quantity).filter(movement_type == "adjustment"), 0).label("total_adjustments"),
+            func.count().filter(movement_type == "purchase").label("purchase_count"),
+            func.count().filter(movement_type == "usage").label("usage_count"),
+            func.coalesce(
+                func.sum(StockMovement.total_cost).filter(movement_type == "purchase"), Decimal("0.0")
+            ).label("total_cost"),
+            func.count().label("movement_count")
+        ).where(
+            StockMovement.asset_id == asset_id,
+            StockMovement.company_id == company_id,
+            StockMovement.movement_date >= cutoff_date
+        )).mappings().one()
+
+        return dict(row)
+
+    @staticmethod
+    def refresh_status_view(bind) -> None:
+        """Refresh asset_status_summary without blocking readers"""
+        with bind.connect() as conn:
+            conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {ASSET_STATUS_VIEW}"))
+            conn.commit()
+
+
+class AssetStatusRefresher:
+    """Background thread that refreshes asset_status_summary a short while after it goes stale"""
+
+    def __init__(self):
+        self._stale = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._bind = None
+
+    def mark_stale(self, bind) -> None:
+        """Schedule a refresh, starting the thread on first use"""
+        self._bind = bind
+        self._stale.set()
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="asset-status-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the thread, running a pending refresh first"""
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _refresh(self) -> None:
+        self._stale.clear()
+        try:
+            AssetAnalyticsService.refresh_status_view(self._bind)
+        except Exception as e:
+            logger.error(f"Failed to refresh {ASSET_STATUS_VIEW}: {str(e)}")
+
+    def _run(self):
+        while not self._stopping.is_set():
+            if not self._stale.wait(1.0):
+                continue
+            # Let the rest of a burst of writes land, then refresh once for all of them
+            self._stopping.wait(settings.ASSET_STATUS_REFRESH_DELAY_SECONDS)
+            self._refresh()
+        if self._stale.is_set():
+            self._refresh()
+
+
+asset_status_refresher = AssetStatusRefresher()
+
+
+_STATUS_SOURCES = (Asset, AssetCalibration, AssetMaintenance, StockMovement)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_asset_status_stale(session, flush_context):
+    if not settings.ASSET_STATUS_MATVIEW:
+        return
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, _STATUS_SOURCES):
+            session.info["asset_status_stale"] = True
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_asset_status_stale_on_dml(orm_execute_state):
+    """Core DML on the session (bulk_insert, bulk UPDATE/DELETE) never reaches after_flush"""
+    if not settings.ASSET_STATUS_MATVIEW:
+        return
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _STATUS_SOURCES):
+        orm_execute_state.session.info["asset_status_stale"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _refresh_asset_status(session):
+    if session.info.pop("asset_status_stale", False):
+        asset_status_refresher.mark_stale(session.get_bind())
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_asset_status_flag(session):
+    session.info.pop("asset_status_stale", None)
@@ -0,0 +1,225 @@
+"""
+Block Index
+In-process point-in-polygon lookup for public vineyard block queries.
+
+Every block geometry is loaded once into a shapely STRtree (geometries are
+prepared, so containment tests after the bounding-box probe are cheap) along
+with the attributes the public query returns. A map click is then answered
+without touching Postgres.
+
+vineyard_blocks carries a statement-level trigger that bumps its row in
+table_versions. BlockIndexWorker polls that counter every
+BLOCK_INDEX_POLL_SECONDS and rebuilds the index when it moves; the new
+snapshot replaces the old one in a single assignment, so lookups never lock.
+Until the first load succeeds (or with BLOCK_INDEX_ENABLED off) callers fall
+back to the PostGIS query.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BLOCK_ATTRIBUTES = (
+    "id", "block_name", "variety", "area", "region", "gi", "planted_date", "removed_date",
+    "elevation", "winery", "organic", "biodynamic", "regenerative", "swnz"
+)
+
+_VERSION_SQL = text("SELECT version FROM table_versions WHERE table_name = 'vineyard_blocks'")
+
+_LOAD_SQL = text(f"""
+    SELECT {", ".join(BLOCK_ATTRIBUTES)}, ST_AsBinary(geometry) AS wkb
+    FROM vineyard_blocks
+    WHERE geometry IS NOT NULL
+    ORDER BY id
+""")
+
+
+def _full_years(start: date, end: date) -> int:
+    return end.year - start.year - ((end.month, end.day) < (start.month, start.day))
+
+
+def age_years(planted_date: Optional[date], removed_date: Optional[date], today: Optional[date] = None) -> Optional[int]:
+    """Same as EXTRACT(YEAR FROM AGE(COALESCE(removed_date, CURRENT_DATE), planted_date))"""
+    if planted_date is None:
+        return None
+    end = removed_date or today or date.today()
+    if end >= planted_date:
+        return _full_years(planted_date, end)
+    return -_full_years(end, planted_date)
+
+
+def block_response(block: Dict) -> Dict:
+    """Attributes as returned by /public/blocks/query (no geometry)"""
+    data = {key: value for key, value in block.items() if key != "removed_date"}
+    data["age_years"] = age_years(block["planted_date"], block["removed_date"])
+    if data["planted_date"]:
+        data["planted_date"] = data["planted_date"].isoformat()
+    for flag in ("organic", "biodynamic", "regenerative", "swnz"):
+        data[flag] = bool(data[flag])
+    return data
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    version: Optional[int]
+    tree: object  # shapely.STRtree
+    geometries: object  # numpy array of prepared geometries, same order as blocks
+    blocks: List[Dict]
+
+
+class BlockIndex:
+    """Immutable snapshots of block geometries; lookups read whichever snapshot is current"""
+
+    def __init__(self):
+        self._snapshot: Optional[_Snapshot] = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def version(self) -> Optional[int]:
+        snapshot = self._snapshot
+        return snapshot.version if snapshot else None
+
+    @property
+    def size(self) -> int:
+        snapshot = self._snapshot
+        return len(snapshot.blocks) if snapshot else 0
+
+    @staticmethod
+    def current_version(conn) -> Optional[int]:
+        return conn.execute(_VERSION_SQL).scalar()
+
+    def load(self) -> int:
+        """Build a new snapshot from the database and swap it in. Returns the number of blocks."""
+        import numpy as np
+        import shapely
+        from db.session import engine
+
+        with self._load_lock:
+            started = time.perf_counter()
+            with engine.connect() as conn:
+                version = self.current_version(conn)
+                rows = conn.execute(_LOAD_SQL).fetchall()
+
+            blocks = []
+            wkbs = []
+            for row in rows:
+                blocks.append({key: getattr(row, key) for key in BLOCK_ATTRIBUTES})
+                wkbs.append(bytes(row.wkb))
+
+            geometries = shapely.from_wkb(np.array(wkbs, dtype=object), on_invalid="warn")
+            missing = shapely.is_missing(geometries)
+            if missing.any():
+                keep = ~missing
+                geometries = geometries[keep]
+                blocks = [block for block, kept in zip(blocks, keep) if kept]
+            shapely.prepare(geometries)
+
+            self._snapshot = _Snapshot(
+                version=version,
+                tree=shapely.STRtree(geometries),
+                geometries=geometries,
+                blocks=blocks
+            )
+            logger.info(
+                f"Block index loaded {len(blocks)} blocks (version {version}) "
+                f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+            return len(blocks)
+
+    def lookup(self, lng: float, lat: float) -> Optional[Dict]:
+        """Block containing the point (lowest id if blocks overlap), or None"""
+        import shapely
+
+        snapshot = self._snapshot
+        if snapshot is None:
+            raise RuntimeError("Block index is not loaded")
+
+        candidates = snapshot.tree.query(shapely.points(lng, lat))
+        if len(candidates) == 0:
+            return None
+        candidates.sort()
+        hits = candidates[shapely.contains_xy(snapshot.geometries[candidates], lng, lat)]
+        return snapshot.blocks[hits[0]] if len(hits) else None
+
+    def lookup_many(self, points: Sequence[Tuple[float, float]]) -> List[Optional[Dict]]:
+        """lookup() for each (lng, lat), in one vectorised tree query"""
+        import numpy as np
+        import shapely
+
+        snapshot = self._snapshot
+        if snapshot is None:
+            raise RuntimeError("Block index is not loaded")
+
+        results: List[Optional[Dict]] = [None] * len(points)
+        if not points:
+            return results
+
+        coords = np.asarray(points, dtype=float)
+        geoms = shapely.points(coords)
+        point_idx, block_idx = snapshot.tree.query(geoms)
+        inside = shapely.contains(snapshot.geometries[block_idx], geoms[point_idx])
+
+        # Lowest block index per point, matching lookup()
+        for p, b in sorted(zip(point_idx[inside].tolist(), block_idx[inside].tolist()), reverse=True):
+            results[p] = snapshot.blocks[b]
+        return results
+
+
+block_index = BlockIndex()
+
+
+class BlockIndexWorker:
+    """Background thread that loads the index and reloads it when vineyard_blocks changes"""
+
+    def __init__(self, index: BlockIndex):
+        self.index = index
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="block-index", daemon=True)
+        self._thread.start()
+        logger.info("Block index worker started")
+
+    def stop(self, timeout: float = 10.0):
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def refresh_if_changed(self) -> bool:
+        """Reload when the table version differs from the loaded snapshot. Returns True if reloaded."""
+        if self.index.ready:
+            from db.session import engine
+            with engine.connect() as conn:
+                version = self.index.current_version(conn)
+            if version == self.index.version:
+                return False
+        self.index.load()
+        return True
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                self.refresh_if_changed()
+            except Exception as e:
+                logger.error(f"Block index refresh failed: {str(e)}")
+            self._stopping.wait(settings.BLOCK_INDEX_POLL_SECONDS)
+
+
+block_index_worker = BlockIndexWorker(block_index)
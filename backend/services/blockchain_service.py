@@ -4,7 +4,7 @@ Handles dessert wines, late harvest, multiple harvest scenarios
 """
 import hashlib
 import json
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Sequence, Tuple
 from datetime import datetime, date
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc
@@ -205,7 +205,7 @@ class BlockchainService:
             "assigned_by": assigned_by_user_id
         }
         
-        genesis_hash = BlockchainService._calculate_hash(genesis_data)
+        genesis_hash = BlockchainService.calculate_node_hash(genesis_data, [])
         
         # Create chain with flexible season tracking
         chain = BlockchainChain(
@@ -330,6 +330,35 @@ class BlockchainService:
         
         return months_active > max_duration
     
+    @staticmethod
+    def verify_chain_integrity(db: Session, chain_id: int, full: bool = False) -> Dict[str, Any]:
+        """
+        Verify a chain's hash links. Resumes from the latest signed checkpoint
+        unless full=True (see services.chain_verification).
+        """
+        from services.chain_verification import ChainVerifier
+        return ChainVerifier.verify_chain(db, chain_id, full)
+    
+    @staticmethod
+    def verify_company_chains(company_id: int, full: bool = False) -> List[Dict[str, Any]]:
+        """Verify every chain for a company in parallel"""
+        from services.chain_verification import ChainVerifier
+        return ChainVerifier.verify_company_chains(company_id, full)
+    
+    @staticmethod
+    def calculate_node_hash(blockchain_data: Dict[str, Any], parent_hashes: Optional[Sequence[str]]) -> str:
+        """
+        Hash of a node, used both when writing nodes and when verifying them.
+        Genesis nodes (no parents) hash their data alone; every other node
+        commits to its ordered parent hashes as well, which links the DAG.
+        """
+        if not parent_hashes:
+            return BlockchainService._calculate_hash(blockchain_data)
+        return BlockchainService._calculate_hash({
+            "parent_hashes": list(parent_hashes),
+            "data": blockchain_data
+        })
+
     @staticmethod
     def _calculate_hash(data: Dict[str, Any]) -> str:
         """Calculate SHA-256 hash of data"""
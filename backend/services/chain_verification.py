@@ -0,0 +1,215 @@
+"""
+Chain Verification
+Streaming, checkpointed integrity verification for provenance chains.
+
+Nodes are read in sequence_number order in batches (never the whole chain at
+once) and each node hash is recomputed from its blockchain_data and
+parent_hashes with BlockchainService.calculate_node_hash, the function that
+hashes nodes when they are written. Every BLOCKCHAIN_CHECKPOINT_INTERVAL
+nodes an HMAC-signed checkpoint records the node hash and a rolling digest
+of all hashes so far; the next verification starts from the latest trusted checkpoint and only
+rehashes nodes appended after it. Pass full=True to rehash from genesis.
+"""
+import hashlib
+import hmac
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from db.models.blockchain import BlockchainChain, BlockchainCheckpoint, BlockchainNode
+from db.session import SessionLocal
+from services.blockchain_service import BlockchainService
+
+logger = logging.getLogger(__name__)
+
+STREAM_BATCH_SIZE = 500
+GENESIS_DIGEST = "0" * 64
+
+
+def _advance_digest(digest: str, node_hash: str) -> str:
+    return hashlib.sha256(f"{digest}{node_hash}".encode()).hexdigest()
+
+
+def sign_checkpoint(chain_id: int, sequence_number: int, node_hash: str, rolling_digest: str, node_count: int) -> str:
+    """HMAC-SHA256 over the checkpoint fields"""
+    key = (settings.BLOCKCHAIN_CHECKPOINT_KEY or settings.SECRET_KEY or "").encode()
+    message = f"{chain_id}:{sequence_number}:{node_hash}:{rolling_digest}:{node_count}"
+    return hmac.new(key, message.encode(), hashlib.sha256).hexdigest()
+
+
+class ChainVerifier:
+
+    @staticmethod
+    def _latest_trusted_checkpoint(db: Session, chain_id: int) -> Optional[BlockchainCheckpoint]:
+        """Latest checkpoint whose signature is valid and whose node still carries the recorded hash"""
+        checkpoint = db.query(BlockchainCheckpoint).filter(
+            BlockchainCheckpoint.chain_id == chain_id
+        ).order_by(BlockchainCheckpoint.sequence_number.desc()).first()
+        if not checkpoint:
+            return None
+
+        expected = sign_checkpoint(
+            chain_id, checkpoint.sequence_number, checkpoint.node_hash,
+            checkpoint.rolling_digest, checkpoint.node_count
+        )
+        if not hmac.compare_digest(expected, checkpoint.signature):
+            logger.warning(f"Checkpoint {checkpoint.id} for chain {chain_id} has an invalid signature, verifying from genesis")
+            return None
+
+        node_hash = db.scalar(
+            select(BlockchainNode.node_hash).where(
+                BlockchainNode.chain_id == chain_id,
+                BlockchainNode.sequence_number == checkpoint.sequence_number
+            )
+        )
+        if node_hash != checkpoint.node_hash:
+            logger.warning(f"Checkpoint {checkpoint.id} for chain {chain_id} no longer matches its node, verifying from genesis")
+            return None
+
+        return checkpoint
+
+    @staticmethod
+    def verify_chain(db: Session, chain_id: int, full: bool = False) -> Dict[str, Any]:
+        """
+        Verify a chain's hash links, resuming from the latest trusted checkpoint.
+        Returns a dict shaped like schemas.blockchain.ChainIntegrityResult.
+        """
+        chain = db.query(BlockchainChain).filter(BlockchainChain.id == chain_id).first()
+        if not chain:
+            return {"valid": False, "chain_id": chain_id, "error": "Chain not found"}
+
+        checkpoint = None if full else ChainVerifier._latest_trusted_checkpoint(db, chain_id)
+        if checkpoint:
+            start_sequence = checkpoint.sequence_number + 1
+            digest = checkpoint.rolling_digest
+            node_count = checkpoint.node_count
+            head_hash = checkpoint.node_hash
+        else:
+            start_sequence = 0
+            digest = GENESIS_DIGEST
+            node_count = 0
+            head_hash = None
+
+        def result(valid: bool, error: Optional[str] = None, node_sequence: Optional[int] = None) -> Dict[str, Any]:
+            return {
+                "valid": valid,
+                "error": error,
+                "chain_id": chain_id,
+                "node_count": node_count,
+                "genesis_hash": chain.genesis_hash,
+                "head_hash": head_hash,
+                "node_sequence": node_sequence,
+                "verified_from_sequence": start_sequence,
+                "nodes_rehashed": node_count - (checkpoint.node_count if checkpoint else 0)
+            }
+
+        interval = settings.BLOCKCHAIN_CHECKPOINT_INTERVAL
+        expected_sequence = start_sequence
+        segment_hashes = set()
+        earlier_parents = set()  # Parents not in this segment - must exist before the checkpoint
+        new_checkpoints = []
+
+        rows = db.execute(
+            select(
+                BlockchainNode.sequence_number,
+                BlockchainNode.node_type,
+                BlockchainNode.parent_hashes,
+                BlockchainNode.node_hash,
+                BlockchainNode.blockchain_data
+            ).where(
+                BlockchainNode.chain_id == chain_id,
+                BlockchainNode.sequence_number >= start_sequence
+            ).order_by(BlockchainNode.sequence_number).execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+
+        for row in rows:
+            if row.sequence_number != expected_sequence:
+                return result(False, f"Sequence gap: expected {expected_sequence}, found {row.sequence_number}", row.sequence_number)
+
+            parents = row.parent_hashes or []
+            if row.sequence_number == 0:
+                if row.node_type != "genesis" or parents:
+                    return result(False, "First node is not a genesis node", 0)
+                if row.node_hash != chain.genesis_hash:
+                    return result(False, "Genesis node hash does not match chain genesis hash", 0)
+            else:
+                if not parents:
+                    return result(False, "Node has no parent hashes", row.sequence_number)
+                earlier_parents.update(p for p in parents if p not in segment_hashes)
+
+            if BlockchainService.calculate_node_hash(row.blockchain_data, parents) != row.node_hash:
+                return result(False, "Node hash does not match its data", row.sequence_number)
+
+            segment_hashes.add(row.node_hash)
+            digest = _advance_digest(digest, row.node_hash)
+            node_count += 1
+            head_hash = row.node_hash
+            expected_sequence += 1
+
+            if interval and node_count % interval == 0:
+                new_checkpoints.append(BlockchainCheckpoint(
+                    chain_id=chain_id,
+                    sequence_number=row.sequence_number,
+                    node_hash=row.node_hash,
+                    rolling_digest=digest,
+                    node_count=node_count,
+                    signature=sign_checkpoint(chain_id, row.sequence_number, row.node_hash, digest, node_count)
+                ))
+
+        if node_count == 0:
+            return result(False, "Chain has no genesis node")
+
+        # A parent must be an earlier node; anything not seen in this segment has
+        # to resolve to a node before the checkpoint we resumed from
+        if earlier_parents:
+            found = set(db.scalars(
+                select(BlockchainNode.node_hash).where(
+                    BlockchainNode.chain_id == chain_id,
+                    BlockchainNode.sequence_number < start_sequence,
+                    BlockchainNode.node_hash.in_(earlier_parents)
+                )
+            ))
+            missing = earlier_parents - found
+            if missing:
+                return result(False, f"{len(missing)} parent hash(es) do not reference an earlier node in this chain")
+
+        if chain.current_head_hash and head_hash != chain.current_head_hash:
+            return result(False, "Chain head hash does not match the last node", expected_sequence - 1)
+
+        if new_checkpoints:
+            # Replace any checkpoint at the same positions (full re-verification after a bad signature)
+            db.query(BlockchainCheckpoint).filter(
+                BlockchainCheckpoint.chain_id == chain_id,
+                BlockchainCheckpoint.sequence_number.in_([c.sequence_number for c in new_checkpoints])
+            ).delete(synchronize_session=False)
+            db.add_all(new_checkpoints)
+            db.commit()
+
+        return result(True, node_sequence=expected_sequence - 1)
+
+    @staticmethod
+    def verify_company_chains(company_id: int, full: bool = False, max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Verify every chain for a company in parallel, one session per worker"""
+        with SessionLocal() as db:
+            chain_ids = db.scalars(
+                select(BlockchainChain.id).where(BlockchainChain.company_id == company_id).order_by(BlockchainChain.id)
+            ).all()
+
+        def verify(chain_id: int) -> Dict[str, Any]:
+            db = SessionLocal()
+            try:
+                return ChainVerifier.verify_chain(db, chain_id, full)
+            except Exception as e:
+                logger.error(f"Verification of chain {chain_id} failed: {str(e)}")
+                db.rollback()
+                return {"valid": False, "chain_id": chain_id, "error": str(e)}
+            finally:
+                db.close()
+
+        workers = max_workers or settings.BLOCKCHAIN_VERIFY_WORKERS
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            return list(pool.map(verify, chain_ids))
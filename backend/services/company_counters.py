@@ -0,0 +1,308 @@
+"""
+Company Counters
+Per-company dashboard counts kept in company_counters, one row per company.
+
+Counters are grouped by the table they count (COUNTER_GROUPS). An after_flush
+hook records which companies and groups a transaction changed: rows inserted
+or deleted, or a counted attribute (company_id, status, is_active, ...)
+updated - other edits, like a login or a task description, touch nothing.
+Just before the transaction commits, each touched company's row is locked
+(SELECT ... FOR UPDATE) and the touched groups are recounted in a new
+statement, so the row commits or rolls back with the data it describes and
+stays exact with concurrent writers - the second writer waits for the lock
+and its recount sees the first writer's rows.
+
+Writes the unit of work doesn't see call CompanyCounterService.touch()
+themselves (file blobs are written with Core statements); bulk UPDATE/DELETE,
+scripts and raw SQL are corrected by reconcile(), run nightly by
+scripts/reconcile_company_counters.py. With COMPANY_COUNTERS_ENABLED off the
+hooks do nothing and get() counts live instead of reading the row.
+"""
+import logging
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Any, Dict, Iterable, Optional, Set
+
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from db.models.asset import Asset
+from db.models.block import VineyardBlock
+from db.models.company import Company
+from db.models.company_counters import CompanyCounters
+from db.models.file import File, FileBlob
+from db.models.observation_run import ObservationRun
+from db.models.task import Task, TaskStatus
+from db.models.training_module import TrainingModule
+from db.models.training_record import TrainingRecord
+from db.models.user import User
+from db.models.visitor import Visitor
+
+logger = logging.getLogger(__name__)
+
+BYTES_PER_GB = 1024 ** 3
+
+COUNTER_GROUPS = (
+    "blocks", "observation_runs", "tasks", "users", "assets",
+    "training_modules", "training_records", "visitors", "storage"
+)
+
+# Models whose rows carry company_id: {attribute a counter depends on: groups it affects}.
+# Inserts and deletes touch every group of the model; updates only those whose
+# attributes changed, so logins and ordinary edits never lock the counters row.
+_COUNTED_ATTRIBUTES = {
+    VineyardBlock: {"company_id": ("blocks",)},
+    ObservationRun: {"company_id": ("observation_runs",)},
+    Task: {"company_id": ("tasks",), "status": ("tasks",)},
+    User: {"company_id": ("users",)},
+    Asset: {"company_id": ("assets",), "is_active": ("assets",), "asset_type": ("assets",)},
+    TrainingModule: {
+        "company_id": ("training_modules", "training_records"),
+        "is_active": ("training_modules",),
+        "published_at": ("training_modules",),
+    },
+    Visitor: {"company_id": ("visitors",), "is_active": ("visitors",)},
+    File: {"company_id": ("storage",), "is_active": ("storage",), "file_size": ("storage",), "blob_id": ("storage",)},
+}
+
+# TrainingRecord has no company_id; these are the attributes its counters read
+_TRAINING_RECORD_ATTRIBUTES = ("training_module_id", "status", "best_score")
+
+_TOUCHED = "company_counters_touched"
+_TRAINING_MODULES = "company_counters_training_modules"
+
+
+def _count(model, *where):
+    return select(func.count()).select_from(model).where(*where).scalar_subquery()
+
+
+def _sum(column, *where):
+    return select(func.coalesce(func.sum(column), 0)).where(*where).scalar_subquery()
+
+
+def _counter_columns(company_id) -> Dict[str, Dict[str, Any]]:
+    """{group: {column: scalar subquery}} recounting each counter for one company"""
+    module_ids = select(TrainingModule.id).where(TrainingModule.company_id == company_id)
+    company_records = TrainingRecord.training_module_id.in_(module_ids)
+    completed = TrainingRecord.status == "completed"
+
+    return {
+        "blocks": {
+            "block_count": _count(VineyardBlock, VineyardBlock.company_id == company_id),
+        },
+        "observation_runs": {
+            "observation_run_count": _count(ObservationRun, ObservationRun.company_id == company_id),
+        },
+        "tasks": {
+            "open_task_count": _count(
+                Task,
+                Task.company_id == company_id,
+                Task.status.notin_([TaskStatus.completed, TaskStatus.cancelled])
+            ),
+        },
+        "users": {
+            "user_count": _count(User, User.company_id == company_id),
+        },
+        "assets": {
+            "asset_count": _count(Asset, Asset.company_id == company_id, Asset.is_active == True),
+            "physical_asset_count": _count(
+                Asset, Asset.company_id == company_id, Asset.is_active == True, Asset.asset_type == "physical"
+            ),
+            "consumable_asset_count": _count(
+                Asset, Asset.company_id == company_id, Asset.is_active == True, Asset.asset_type == "consumable"
+            ),
+        },
+        "training_modules": {
+            "training_module_count": _count(
+                TrainingModule, TrainingModule.company_id == company_id, TrainingModule.is_active == True
+            ),
+            "published_training_module_count": _count(
+                TrainingModule,
+                TrainingModule.company_id == company_id,
+                TrainingModule.is_active == True,
+                TrainingModule.published_at.isnot(None)
+            ),
+        },
+        "training_records": {
+            "training_record_count": _count(TrainingRecord, company_records),
+            "active_training_record_count": _count(
+                TrainingRecord, company_records, TrainingRecord.status.in_(["assigned", "in_progress"])
+            ),
+            "completed_training_record_count": _count(TrainingRecord, company_records, completed),
+            "training_score_total": _sum(TrainingRecord.best_score, company_records, completed),
+            "training_scored_count": _count(
+                TrainingRecord, company_records, completed, TrainingRecord.best_score.isnot(None)
+            ),
+        },
+        "visitors": {
+            "visitor_count": _count(Visitor, Visitor.company_id == company_id, Visitor.is_active == True),
+        },
+        "storage": {
+            "storage_bytes": _sum(FileBlob.size, FileBlob.company_id == company_id) + _sum(
+                File.file_size, File.company_id == company_id, File.blob_id.is_(None), File.is_active == True
+            ),
+        },
+    }
+
+
+class CompanyCounterService:
+
+    @staticmethod
+    def touch(db: Session, company_id: Optional[int], *groups: str) -> None:
+        """Recount `groups` for the company when the current transaction commits"""
+        if company_id is None:
+            return
+        db.info.setdefault(_TOUCHED, {}).setdefault(company_id, set()).update(groups)
+
+    @staticmethod
+    def refresh(db, company_id: int, groups: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Recount some counter groups (default all) for a company, creating its row
+        if needed. Runs in the caller's transaction and holds the row lock until
+        it ends. Returns {column: new value} for the counters that changed.
+        """
+        groups = set(groups or COUNTER_GROUPS)
+        columns = {}
+        for group, group_columns in _counter_columns(company_id).items():
+            if group in groups:
+                columns.update(group_columns)
+
+        # Only for companies that still exist (the write may have been the company's deletion)
+        db.execute(
+            pg_insert(CompanyCounters)
+            .from_select(["company_id"], select(Company.id).where(Company.id == company_id))
+            .on_conflict_do_nothing(index_elements=["company_id"])
+        )
+        current = db.execute(
+            select(*[CompanyCounters.__table__.c[name] for name in columns])
+            .where(CompanyCounters.company_id == company_id)
+            .with_for_update()
+        ).mappings().first()
+        if current is None:
+            return {}
+
+        # A new statement after the lock, so rows committed by whoever held it are counted
+        fresh = db.execute(select(*[expr.label(name) for name, expr in columns.items()])).mappings().one()
+        changed = {name: value for name, value in fresh.items() if value != current[name]}
+        if changed:
+            db.execute(
+                update(CompanyCounters)
+                .where(CompanyCounters.company_id == company_id)
+                .values(**changed, updated_at=func.now())
+            )
+        return changed
+
+    @staticmethod
+    def live_counts(db: Session, company_id: int) -> Dict[str, Any]:
+        """Every counter counted now, in one statement"""
+        columns = {}
+        for group_columns in _counter_columns(company_id).values():
+            columns.update(group_columns)
+        return dict(db.execute(select(*[expr.label(name) for name, expr in columns.items()])).mappings().one())
+
+    @staticmethod
+    def get(db: Session, company_id: int) -> Optional[CompanyCounters]:
+        """
+        The company's counters row, counted on first use in a short session of
+        its own so the caller's transaction is left alone. With
+        COMPANY_COUNTERS_ENABLED off the hooks don't keep rows current, so a
+        transient row of live counts is returned instead. None if the company
+        doesn't exist.
+        """
+        if not settings.COMPANY_COUNTERS_ENABLED:
+            if db.get(Company, company_id) is None:
+                return None
+            return CompanyCounters(company_id=company_id, **CompanyCounterService.live_counts(db, company_id))
+
+        counters = db.get(CompanyCounters, company_id)
+        if counters is None:
+            with Session(db.get_bind()) as counter_db:
+                CompanyCounterService.refresh(counter_db, company_id)
+                counter_db.commit()
+            counters = db.get(CompanyCounters, company_id)
+        return counters
+
+    @staticmethod
+    def reconcile(db: Session) -> Dict[int, Dict[str, Any]]:
+        """
+        Recount every counter for every company, committing per company.
+        Returns {company_id: changed counters} for the rows that had drifted.
+        """
+        drift = {}
+        for company_id in db.scalars(select(Company.id).order_by(Company.id)).all():
+            changed = CompanyCounterService.refresh(db, company_id)
+            db.execute(
+                update(CompanyCounters)
+                .where(CompanyCounters.company_id == company_id)
+                .values(reconciled_at=datetime.now(timezone.utc))
+            )
+            db.commit()
+            if changed:
+                drift[company_id] = changed
+        return drift
+
+
+def _company_ids(obj) -> Set[int]:
+    """Current and (if changed in this flush) previous company_id, without lazy-loading"""
+    state = inspect(obj)
+    ids = set(state.attrs.company_id.history.deleted or ())
+    ids.add(state.dict.get("company_id"))
+    ids.discard(None)
+    return ids
+
+
+def _changed(state, attributes: Iterable[str]) -> Set[str]:
+    return {name for name in attributes if state.attrs[name].history.has_changes()}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_counter_writes(session, flush_context):
+    if not settings.COMPANY_COUNTERS_ENABLED:
+        return
+    inserted_or_deleted = set(chain(session.new, session.deleted))
+    for obj in chain(session.new, session.dirty, session.deleted):
+        state = inspect(obj)
+        counted = _COUNTED_ATTRIBUTES.get(type(obj))
+        if counted:
+            changed = counted if obj in inserted_or_deleted else _changed(state, counted)
+            groups = set(chain.from_iterable(counted[name] for name in changed))
+            if groups:
+                for company_id in _company_ids(obj):
+                    CompanyCounterService.touch(session, company_id, *groups)
+        elif isinstance(obj, TrainingRecord):
+            if obj not in inserted_or_deleted and not _changed(state, _TRAINING_RECORD_ATTRIBUTES):
+                continue
+            # Records belong to a company through their module; resolved at commit
+            module_ids = set(state.attrs.training_module_id.history.deleted or ())
+            module_ids.add(state.dict.get("training_module_id"))
+            module_ids.discard(None)
+            session.info.setdefault(_TRAINING_MODULES, set()).update(module_ids)
+
+
+@event.listens_for(Session, "before_commit")
+def _refresh_counters(session):
+    if not settings.COMPANY_COUNTERS_ENABLED:
+        return
+    # commit() only flushes after this hook; flush now so every write is collected
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+
+    touched = session.info.pop(_TOUCHED, {})
+    module_ids = session.info.pop(_TRAINING_MODULES, None)
+    if module_ids:
+        for company_id in session.scalars(
+            select(TrainingModule.company_id).where(TrainingModule.id.in_(module_ids)).distinct()
+        ):
+            touched.setdefault(company_id, set()).add("training_records")
+
+    # Lock rows in a fixed order so two multi-company transactions can't deadlock
+    for company_id in sorted(touched):
+        CompanyCounterService.refresh(session, company_id, touched[company_id])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_counter_writes(session):
+    session.info.pop(_TOUCHED, None)
+    session.info.pop(_TRAINING_MODULES, None)
@@ -0,0 +1,291 @@
+"""
+Due Items
+Every open, dated item of a company in one indexed table (due_items).
+
+    risk_action        open risk actions, due at target_completion_date
+    risk_review        active site risks, due at next_review_due
+    asset_calibration  assets requiring calibration (never calibrated = due today)
+    asset_maintenance  active assets with an open job or a predicted service
+
+DueItemService.sync() recomputes a company's rows (or everyone's) from the
+source tables in two set-based statements: delete rows whose item is no
+longer open, then INSERT ... SELECT ... ON CONFLICT DO UPDATE the rest,
+touching only rows that changed. After any commit that wrote a source table,
+session hooks hand the companies involved to DueItemSyncer, a background
+thread, so requests never wait for the sync; the risk scheduler
+(services.risk_schedule) also syncs everything periodically, which picks up
+changes driven by the date alone and writes that bypass the ORM.
+
+Overdue and upcoming lists are then a range scan on (company_id, due_at).
+"""
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from sqlalchemy import DateTime, Integer, String, cast, delete, event, exists, func, inspect, literal, null, select, tuple_, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from db.models.asset import Asset, AssetCalibration, AssetMaintenance
+from db.models.due_item import DueItem
+from db.models.risk_action import RiskAction
+from db.models.site_risk import SiteRisk
+from services.asset_analytics_service import AssetAnalyticsService
+
+logger = logging.getLogger(__name__)
+
+ITEM_TYPES = ("risk_action", "risk_review", "asset_calibration", "asset_maintenance")
+CLOSED_ACTION_STATUSES = ("completed", "cancelled")
+
+_SYNC_COLUMNS = ("company_id", "item_type", "item_id", "title", "due_at", "assigned_to", "priority")
+_UPDATE_COLUMNS = ("company_id", "title", "due_at", "assigned_to", "priority")
+
+
+def _source_select(company_id: Optional[int] = None):
+    """The rows due_items should hold, in _SYNC_COLUMNS order"""
+    actions = select(
+        RiskAction.company_id,
+        literal("risk_action", String).label("item_type"),
+        RiskAction.id.label("item_id"),
+        RiskAction.action_title.label("title"),
+        RiskAction.target_completion_date.label("due_at"),
+        RiskAction.assigned_to,
+        RiskAction.priority
+    ).where(
+        RiskAction.target_completion_date.isnot(None),
+        RiskAction.status.notin_(CLOSED_ACTION_STATUSES),
+        RiskAction.archived_at.is_(None)
+    )
+
+    reviews = select(
+        SiteRisk.company_id,
+        literal("risk_review", String),
+        SiteRisk.id,
+        SiteRisk.risk_title,
+        SiteRisk.next_review_due,
+        SiteRisk.owner_id,
+        func.coalesce(SiteRisk.residual_risk_level, SiteRisk.inherent_risk_level)
+    ).where(
+        SiteRisk.status == "active",
+        SiteRisk.next_review_due.isnot(None)
+    )
+
+    if company_id is not None:
+        actions = actions.where(RiskAction.company_id == company_id)
+        reviews = reviews.where(SiteRisk.company_id == company_id)
+
+    assets = AssetAnalyticsService.due_dates_select(company_id).subquery("asset_due")
+
+    def asset_rows(item_type: str, due_date):
+        return select(
+            assets.c.company_id,
+            literal(item_type, String),
+            assets.c.asset_id,
+            assets.c.name,
+            cast(due_date, DateTime(timezone=True)),
+            cast(null(), Integer),
+            cast(null(), String)
+        ).where(due_date.isnot(None))
+
+    return union_all(
+        actions,
+        reviews,
+        asset_rows("asset_calibration", assets.c.calibration_due_date),
+        asset_rows("asset_maintenance", assets.c.maintenance_due_date)
+    ).subquery("due_source")
+
+
+class DueItemService:
+
+    @staticmethod
+    def sync(db, company_id: Optional[int] = None) -> None:
+        """
+        Bring due_items in line with the source tables for one company, or all
+        of them. Runs on a Session or Connection; the caller commits.
+        """
+        source = _source_select(company_id)
+
+        stale = delete(DueItem).where(~exists().where(
+            source.c.item_type == DueItem.item_type,
+            source.c.item_id == DueItem.item_id
+        ))
+        if company_id is not None:
+            stale = stale.where(DueItem.company_id == company_id)
+        db.execute(stale)
+
+        upsert = pg_insert(DueItem).from_select(
+            list(_SYNC_COLUMNS),
+            select(*[source.c[name] for name in _SYNC_COLUMNS])
+        )
+        current = tuple_(*[DueItem.__table__.c[name] for name in _UPDATE_COLUMNS])
+        incoming = tuple_(*[upsert.excluded[name] for name in _UPDATE_COLUMNS])
+        db.execute(upsert.on_conflict_do_update(
+            constraint="uq_due_items_item",
+            set_={**{name: upsert.excluded[name] for name in _UPDATE_COLUMNS}, "updated_at": func.now()},
+            where=current.is_distinct_from(incoming)
+        ))
+
+    @staticmethod
+    def sync_companies(bind, company_ids: Sequence[int]) -> None:
+        """sync() each company on its own connection and commit"""
+        with bind.connect() as conn:
+            for company_id in sorted(company_ids):
+                DueItemService.sync(conn, company_id)
+            conn.commit()
+
+    @staticmethod
+    def due_query(
+        company_id: int,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        item_types: Optional[Sequence[str]] = None,
+        assigned_to: Optional[int] = None
+    ):
+        """SELECT of DueItem rows with since <= due_at <= until, soonest first"""
+        query = select(DueItem).where(DueItem.company_id == company_id)
+        if since is not None:
+            query = query.where(DueItem.due_at >= since)
+        if until is not None:
+            query = query.where(DueItem.due_at <= until)
+        if item_types:
+            query = query.where(DueItem.item_type.in_(item_types))
+        if assigned_to is not None:
+            query = query.where(DueItem.assigned_to == assigned_to)
+        return query.order_by(DueItem.due_at, DueItem.id)
+
+    @staticmethod
+    def get_due(db: Session, company_id: int, **filters) -> List[DueItem]:
+        """Rows from due_query(company_id, **filters)"""
+        return db.scalars(DueItemService.due_query(company_id, **filters)).all()
+
+    @staticmethod
+    def overdue_ids(company_id: int, item_type: str, now: Optional[datetime] = None):
+        """SELECT of the ids of overdue items of one type, for IN (...) filters"""
+        now = now or datetime.now(timezone.utc)
+        return select(DueItem.item_id).where(
+            DueItem.company_id == company_id,
+            DueItem.due_at <= now,
+            DueItem.item_type == item_type
+        )
+
+    @staticmethod
+    def get_schedule(
+        db: Session,
+        company_id: int,
+        days_ahead: int = 30,
+        item_types: Optional[Sequence[str]] = None,
+        assigned_to: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Overdue items and those due in the next days_ahead days, from one range query"""
+        now = datetime.now(timezone.utc)
+        items = DueItemService.get_due(
+            db, company_id,
+            until=now + timedelta(days=days_ahead),
+            item_types=item_types,
+            assigned_to=assigned_to
+        )
+        overdue = [DueItemService.to_dict(item, now) for item in items if item.due_at <= now]
+        upcoming = [DueItemService.to_dict(item, now) for item in items if item.due_at > now]
+        return {
+            "overdue": overdue,
+            "upcoming": upcoming,
+            "overdue_count": len(overdue),
+            "upcoming_count": len(upcoming),
+            "days_ahead": days_ahead
+        }
+
+    @staticmethod
+    def to_dict(item: DueItem, now: Optional[datetime] = None) -> Dict[str, Any]:
+        now = now or datetime.now(timezone.utc)
+        return {
+            "type": item.item_type,
+            "id": item.item_id,
+            "title": item.title,
+            "due_at": item.due_at,
+            "days_overdue": max((now - item.due_at).days, 0),
+            "days_until_due": (item.due_at - now).days,
+            "assigned_to": item.assigned_to,
+            "priority": item.priority
+        }
+
+
+class DueItemSyncer:
+    """Background thread that syncs due_items for companies queued by commits"""
+
+    def __init__(self):
+        self._pending: Set[int] = set()
+        self._queued = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._bind = None
+
+    def enqueue(self, bind, company_ids) -> None:
+        """Queue companies for a sync, starting the thread on first use"""
+        with self._lock:
+            self._bind = bind
+            self._pending.update(company_ids)
+            self._queued.set()
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="due-items-sync", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the thread, syncing any queued companies first"""
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _sync_pending(self) -> None:
+        with self._lock:
+            company_ids, self._pending = self._pending, set()
+            self._queued.clear()
+        if not company_ids:
+            return
+        try:
+            DueItemService.sync_companies(self._bind, company_ids)
+        except Exception as e:
+            logger.error(f"Failed to sync due_items for companies {sorted(company_ids)}: {str(e)}")
+
+    def _run(self):
+        while not self._stopping.is_set():
+            if self._queued.wait(1.0):
+                self._sync_pending()
+        self._sync_pending()
+
+
+due_item_syncer = DueItemSyncer()
+
+
+_DUE_SOURCES = (RiskAction, SiteRisk, Asset, AssetCalibration, AssetMaintenance)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_due_item_companies(session, flush_context):
+    if not settings.DUE_ITEMS_SYNC_ON_COMMIT:
+        return
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, _DUE_SOURCES):
+            continue
+        # Loaded value only - never lazy-load inside a flush
+        company_id = inspect(obj).dict.get("company_id")
+        if company_id is not None:
+            session.info.setdefault("due_item_companies", set()).add(company_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _sync_due_items(session):
+    company_ids = session.info.pop("due_item_companies", None)
+    if company_ids:
+        due_item_syncer.enqueue(session.get_bind(), company_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_due_item_companies(session):
+    session.info.pop("due_item_companies", None)
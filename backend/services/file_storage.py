@@ -0,0 +1,173 @@
+"""
+File Storage
+Streaming, content-addressed storage for uploaded files.
+
+Uploads are copied to a temporary file in fixed-size chunks while their SHA-256
+is computed, so memory use does not depend on file size. Content is stored once
+per company at UPLOAD_DIR/<company_id>/blobs/<aa>/<bb>/<sha256>; every File row
+with the same content points at the same FileBlob, whose ref_count is kept in
+step with those rows.
+
+Blobs are deduplicated within a company only, so an upload never reveals
+whether another tenant holds the same file.
+
+Disk changes follow the caller's transaction: an upload stays in its temporary
+file until the session commits and is then moved into place (removed on
+rollback), and released content is deleted only once the commit has removed
+its FileBlob row.
+"""
+import hashlib
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import BinaryIO, Tuple
+
+from sqlalchemy import delete, event, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from db.models.file import FileBlob
+from services.company_counters import CompanyCounterService
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+# session.info keys for disk changes waiting on the transaction
+_PENDING_BLOBS = "file_storage_pending_blobs"  # (temp path, blob path) to move into place on commit
+_RELEASED_BLOBS = "file_storage_released_blobs"  # blob paths to delete on commit
+
+
+class FileTooLargeError(ValueError):
+    pass
+
+
+def _company_dir(company_id: int) -> Path:
+    return Path(settings.UPLOAD_DIR) / str(company_id)
+
+
+def blob_path(company_id: int, sha256: str) -> Path:
+    return _company_dir(company_id) / "blobs" / sha256[:2] / sha256[2:4] / sha256
+
+
+def stream_to_temp(source: BinaryIO, company_id: int, max_size: int) -> Tuple[Path, str, int]:
+    """
+    Copy an upload to a temporary file chunk by chunk, hashing as it goes.
+    Returns (temp path, sha256 hex digest, size in bytes).
+
+    Raises:
+        FileTooLargeError: once more than max_size bytes have been read (the temp file is removed)
+    """
+    tmp_dir = _company_dir(company_id) / "tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = tmp_dir / f"{uuid.uuid4()}.part"
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as out:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise FileTooLargeError(f"File exceeds maximum allowed size of {max_size} bytes")
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    return tmp_path, digest.hexdigest(), size
+
+
+class FileStorage:
+
+    @staticmethod
+    def store_upload(db: Session, company_id: int, source: BinaryIO, max_size: int) -> FileBlob:
+        """
+        Stream an upload into content-addressed storage and take a reference on its blob.
+        The caller adds the File row and commits; the blob row is locked until then.
+        The content is moved into place when the session commits (see module docstring).
+
+        Raises:
+            FileTooLargeError: if the upload is larger than max_size
+        """
+        tmp_path, sha256, size = stream_to_temp(source, company_id, max_size)
+        try:
+            path = blob_path(company_id, sha256)
+
+            # Insert or take another reference; the row lock serialises this with release_blob
+            blob_id, ref_count = db.execute(
+                insert(FileBlob)
+                .values(company_id=company_id, sha256=sha256, size=size, storage_path=str(path), ref_count=1)
+                .on_conflict_do_update(
+                    constraint="uq_file_blobs_company_sha256",
+                    set_={"ref_count": FileBlob.ref_count + 1}
+                )
+                .returning(FileBlob.id, FileBlob.ref_count)
+            ).one()
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        # A new row always brings its content: a just-released copy may still be on disk, about to go
+        if ref_count > 1 and path.exists():
+            tmp_path.unlink(missing_ok=True)
+            logger.info(f"Deduplicated upload {sha256[:12]} for company {company_id}")
+        else:
+            db.info.setdefault(_PENDING_BLOBS, []).append((tmp_path, path))
+            CompanyCounterService.touch(db, company_id, "storage")
+
+        return db.get(FileBlob, blob_id)
+
+    @staticmethod
+    def release_blob(db: Session, blob_id: int) -> bool:
+        """
+        Drop one reference. The last reference deletes the blob row; its content
+        is deleted once the caller commits.
+        Returns True if the blob was removed.
+        """
+        remaining = db.execute(
+            update(FileBlob)
+            .where(FileBlob.id == blob_id)
+            .values(ref_count=FileBlob.ref_count - 1)
+            .returning(FileBlob.ref_count, FileBlob.company_id, FileBlob.sha256, FileBlob.storage_path)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if remaining is None or remaining.ref_count > 0:
+            return False
+
+        db.execute(delete(FileBlob).where(FileBlob.id == blob_id).execution_options(synchronize_session=False))
+        CompanyCounterService.touch(db, remaining.company_id, "storage")
+        db.info.setdefault(_RELEASED_BLOBS, []).append(Path(remaining.storage_path))
+        logger.info(f"Released blob {remaining.sha256[:12]} for company {remaining.company_id}")
+        return True
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_blob_changes(session):
+    """Move committed uploads into place and delete released content"""
+    for tmp_path, path in session.info.pop(_PENDING_BLOBS, []):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Failed to store {path}: {str(e)}")
+            tmp_path.unlink(missing_ok=True)
+    for path in session.info.pop(_RELEASED_BLOBS, []):
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.error(f"Failed to delete {path}: {str(e)}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_blob_changes(session):
+    """Remove uncommitted uploads; released content stays with its restored row"""
+    for tmp_path, _ in session.info.pop(_PENDING_BLOBS, []):
+        tmp_path.unlink(missing_ok=True)
+    session.info.pop(_RELEASED_BLOBS, None)
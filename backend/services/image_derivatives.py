@@ -0,0 +1,192 @@
+"""
+Image Derivatives
+Resized WebP / JPEG variants of image files in a size-bounded LRU disk cache.
+
+Variants are keyed by file id, width bucket and format and live under
+IMAGE_CACHE_DIR/<id[:2]>/<file_id>_<size>.<ext>. They are rendered on first
+request (or ahead of time after an upload) and are immutable, so they can be
+served with long-lived cache headers. A hit touches the file's mtime; when the
+cache grows past IMAGE_CACHE_MAX_MB the least recently used variants are
+deleted until it is back under IMAGE_CACHE_LOW_WATER of the limit.
+
+Only settings and Pillow are imported here so scripts can pre-render variants
+without the ORM.
+"""
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_SIZES = (128, 256, 512, 1024, 2048)
+DEFAULT_SIZE = 256
+FORMATS = {"webp": ("WEBP", "image/webp"), "jpeg": ("JPEG", "image/jpeg")}
+DERIVABLE_MIME_TYPES = {"image/jpeg", "image/png", "image/gif", "image/bmp", "image/webp", "image/tiff"}
+
+# Rendered after an upload so list views never wait on the original
+PREGENERATE = ((256, "webp"), (256, "jpeg"))
+
+IMAGE_CACHE_LOW_WATER = 0.9
+
+
+def bucket_size(width: int) -> int:
+    """Smallest configured size that covers the requested width (capped at the largest)"""
+    for size in DERIVATIVE_SIZES:
+        if width <= size:
+            return size
+    return DERIVATIVE_SIZES[-1]
+
+
+def negotiate_format(requested: Optional[str], accept: Optional[str]) -> str:
+    """Explicit format wins; otherwise WebP for clients that accept it, JPEG for the rest"""
+    if requested in FORMATS:
+        return requested
+    return "webp" if accept and "image/webp" in accept else "jpeg"
+
+
+class DerivativeCache:
+    """LRU bookkeeping for the derivative directory, shared by all requests in a process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bytes: Optional[int] = None  # Approximate; recounted from disk when evicting
+
+    @property
+    def root(self) -> Path:
+        return Path(settings.IMAGE_CACHE_DIR)
+
+    @property
+    def max_bytes(self) -> int:
+        return settings.IMAGE_CACHE_MAX_MB * 1024 * 1024
+
+    def path_for(self, file_id: str, size: int, fmt: str) -> Path:
+        return self.root / file_id[:2] / f"{file_id}_{size}.{fmt}"
+
+    def _entries(self) -> Iterable[Tuple[Path, os.stat_result]]:
+        if not self.root.exists():
+            return
+        for directory in self.root.iterdir():
+            if not directory.is_dir():
+                continue
+            for path in directory.iterdir():
+                if path.suffix == ".part":
+                    continue
+                try:
+                    yield path, path.stat()
+                except FileNotFoundError:
+                    continue
+
+    def touch(self, path: Path):
+        """Mark a variant as recently used (mtime, since atime is often disabled)"""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def added(self, nbytes: int):
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = sum(stat.st_size for _, stat in self._entries())
+            else:
+                self._bytes += nbytes
+            over = self._bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used variants until under the low-water mark. Returns bytes freed."""
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+            total = sum(stat.st_size for _, stat in entries)
+            target = int(self.max_bytes * IMAGE_CACHE_LOW_WATER)
+            freed = 0
+            for path, stat in entries:
+                if total - freed <= target:
+                    break
+                try:
+                    path.unlink()
+                    freed += stat.st_size
+                except FileNotFoundError:
+                    continue
+            self._bytes = total - freed
+        if freed:
+            logger.info(f"Image derivative cache evicted {freed} bytes, {self._bytes} bytes in use")
+        return freed
+
+    def purge(self, file_id: str):
+        """Remove every variant of a file (on permanent delete)"""
+        for size in DERIVATIVE_SIZES:
+            for fmt in FORMATS:
+                self.path_for(file_id, size, fmt).unlink(missing_ok=True)
+
+
+derivative_cache = DerivativeCache()
+
+
+class ImageDerivatives:
+
+    @staticmethod
+    def render(source_path: Path, target: Path, size: int, fmt: str) -> int:
+        """Resize an image to fit size x size and write it atomically. Returns the bytes written."""
+        from PIL import Image, ImageOps
+
+        pil_format = FORMATS[fmt][0]
+        with Image.open(source_path) as original:
+            original.draft("RGB", (size, size))  # JPEG decodes at reduced scale
+            image = ImageOps.exif_transpose(original)
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            if fmt == "jpeg" and image.mode != "RGB":
+                image = image.convert("RGB")
+            elif fmt == "webp" and image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_name(f"{target.name}.{uuid.uuid4().hex[:8]}.part")
+            try:
+                if pil_format == "WEBP":
+                    image.save(tmp, pil_format, quality=75, method=4)
+                else:
+                    image.save(tmp, pil_format, quality=80, optimize=True, progressive=True)
+                os.replace(tmp, target)
+            finally:
+                tmp.unlink(missing_ok=True)
+        return target.stat().st_size
+
+    @staticmethod
+    def get(file_id: str, source_path: Path, width: int, fmt: str) -> Optional[Path]:
+        """
+        Path of the cached variant, rendering it on a miss.
+        Returns None if the source cannot be decoded (or Pillow is unavailable).
+        """
+        size = bucket_size(width)
+        target = derivative_cache.path_for(file_id, size, fmt)
+        if target.exists():
+            derivative_cache.touch(target)
+            return target
+
+        started = time.perf_counter()
+        try:
+            written = ImageDerivatives.render(source_path, target, size, fmt)
+        except ImportError:
+            logger.warning("Pillow is not installed, image derivatives are disabled")
+            return None
+        except Exception as e:
+            logger.error(f"Rendering {fmt} {size}px for file {file_id} failed: {str(e)}")
+            return None
+
+        logger.debug(f"Rendered {target.name} ({written} bytes) in {(time.perf_counter() - started) * 1000:.0f} ms")
+        derivative_cache.added(written)
+        return target
+
+    @staticmethod
+    def pregenerate(file_id: str, source_path: str):
+        """Background task after an image upload: render the variants list views use"""
+        for size, fmt in PREGENERATE:
+            if ImageDerivatives.get(file_id, Path(source_path), size, fmt) is None:
+                break
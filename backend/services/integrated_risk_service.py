@@ -1,3 +1,4 @@
+from collections import defaultdict
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 from sqlalchemy.orm import Session
@@ -9,6 +10,7 @@ from db.models.incident import Incident
 from db.models.user import User
 from db.models.task import Task
 
+from services.due_items import DueItemService
 from services.risk_action_service import RiskActionService
 from services.risk_logic import RiskBusinessLogic
 
@@ -204,19 +206,10 @@ class IntegratedRiskService:
         
         now = datetime.now(timezone.utc)
         
-        # Overdue risk reviews
-        overdue_reviews = self.db.query(SiteRisk).filter(
-            SiteRisk.company_id == company_id,
-            SiteRisk.next_review_due <= now,
-            SiteRisk.status == "active"
-        ).all()
-        
-        # Overdue actions
-        overdue_actions = self.db.query(RiskAction).filter(
-            RiskAction.company_id == company_id,
-            RiskAction.target_completion_date <= now,
-            RiskAction.status.notin_(["completed", "cancelled"])
-        ).all()
+        # Risk reviews, actions, calibrations and maintenance: one range scan of due_items
+        overdue = defaultdict(list)
+        for item in DueItemService.get_due(self.db, company_id, until=now):
+            overdue[item.item_type].append(DueItemService.to_dict(item, now))
         
         # Overdue investigations
         overdue_investigations = self.db.query(Incident).filter(
@@ -235,25 +228,27 @@ class IntegratedRiskService:
         return {
             "overdue_reviews": [
                 {
-                    "id": r.id,
-                    "title": r.risk_title,
-                    "level": r.residual_risk_level or r.inherent_risk_level,
-                    "days_overdue": (now - r.next_review_due).days if r.next_review_due else 0,
+                    "id": r["id"],
+                    "title": r["title"],
+                    "level": r["priority"],
+                    "days_overdue": r["days_overdue"],
                     "type": "risk_review"
                 }
-                for r in overdue_reviews
+                for r in overdue["risk_review"]
             ],
             "overdue_actions": [
                 {
-                    "id": a.id,
-                    "title": a.action_title,
-                    "priority": a.priority,
-                    "days_overdue": (now - a.target_completion_date).days if a.target_completion_date else 0,
-                    "assigned_to": a.assigned_to,
+                    "id": a["id"],
+                    "title": a["title"],
+                    "priority": a["priority"],
+                    "days_overdue": a["days_overdue"],
+                    "assigned_to": a["assigned_to"],
                     "type": "risk_action"
                 }
-                for a in overdue_actions
+                for a in overdue["risk_action"]
             ],
+            "overdue_calibrations": overdue["asset_calibration"],
+            "overdue_maintenance": overdue["asset_maintenance"],
             "overdue_investigations": [
                 {
                     "id": i.id,
@@ -0,0 +1,236 @@
+"""
+Mail Queue
+Durable outbound email queue with a background batch sender.
+
+EmailService.send_email stores each message in outbound_emails and returns
+immediately. MailQueueWorker claims due messages with FOR UPDATE SKIP LOCKED
+(safe with several API workers), delivers a whole batch over one authenticated
+SMTP session, and reschedules failures with exponential backoff until
+MAIL_MAX_ATTEMPTS is reached.
+
+To try it locally, run a debugging server and point SMTP at it:
+
+    python -m aiosmtpd -n -l localhost:1025
+    SMTP_SERVER=localhost SMTP_PORT=1025 SMTP_USE_TLS=false
+"""
+import logging
+import smtplib
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.email_utils import email_service
+from db.models.outbound_email import OutboundEmail
+from db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# A claimed batch not finished in this time (worker died mid-send) is picked up again
+STALE_CLAIM_AFTER = timedelta(minutes=10)
+MAX_RETRY_DELAY = timedelta(hours=6)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before the next attempt: base, 2x base, 4x base ... capped at MAX_RETRY_DELAY"""
+    delay = timedelta(seconds=settings.MAIL_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0))
+    return min(delay, MAX_RETRY_DELAY)
+
+
+def enqueue_email(
+    to_email: str,
+    subject: str,
+    html_content: str,
+    text_content: Optional[str] = None,
+    reply_to: Optional[str] = None,
+    template: Optional[str] = None,
+    db: Optional[Session] = None
+) -> bool:
+    """
+    Add a message to the outbound queue and wake the sender.
+    Uses its own short-lived session unless one is passed in (the caller then commits).
+    """
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        db.add(OutboundEmail(
+            to_email=to_email,
+            reply_to=reply_to,
+            subject=subject,
+            html_content=html_content,
+            text_content=text_content,
+            template=template
+        ))
+        if own_session:
+            db.commit()
+        else:
+            db.flush()
+    except Exception as e:
+        logger.error(f"Failed to queue email to {to_email}: {str(e)}")
+        if own_session:
+            db.rollback()
+        return False
+    finally:
+        if own_session:
+            db.close()
+
+    mail_queue_worker.notify()
+    return True
+
+
+class MailQueueWorker:
+    """Background thread that drains outbound_emails in batches"""
+
+    def __init__(self):
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="mail-queue", daemon=True)
+        self._thread.start()
+        logger.info("Mail queue worker started")
+
+    def stop(self, timeout: float = 10.0):
+        self._stopping.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def notify(self):
+        """Wake the worker now instead of at the next poll"""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                # Keep draining while full batches come back
+                while not self._stopping.is_set() and self.process_batch() >= settings.MAIL_QUEUE_BATCH_SIZE:
+                    pass
+            except Exception as e:
+                logger.error(f"Mail queue batch failed: {str(e)}")
+
+            self._wake.wait(settings.MAIL_QUEUE_POLL_SECONDS)
+            self._wake.clear()
+
+    def _claim_batch(self, db: Session) -> List[OutboundEmail]:
+        now = datetime.now(timezone.utc)
+        due = or_(
+            and_(OutboundEmail.status == "pending", OutboundEmail.next_attempt_at <= now),
+            and_(OutboundEmail.status == "sending", OutboundEmail.locked_at < now - STALE_CLAIM_AFTER)
+        )
+        ids = db.scalars(
+            select(OutboundEmail.id)
+            .where(due)
+            .order_by(OutboundEmail.next_attempt_at, OutboundEmail.id)
+            .limit(settings.MAIL_QUEUE_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not ids:
+            db.commit()
+            return []
+
+        db.execute(
+            update(OutboundEmail)
+            .where(OutboundEmail.id.in_(ids))
+            .values(status="sending", locked_at=now)
+        )
+        db.commit()
+        return db.query(OutboundEmail).filter(OutboundEmail.id.in_(ids)).order_by(OutboundEmail.id).all()
+
+    def _deliver(self, messages: List[OutboundEmail]) -> Dict[int, Optional[str]]:
+        """Send a batch over one SMTP session. Returns {message id: error or None}."""
+        results: Dict[int, Optional[str]] = {}
+        server = None
+        try:
+            for message in messages:
+                mime = email_service.build_message(
+                    message.to_email, message.subject, message.html_content,
+                    message.text_content, message.reply_to
+                )
+                for attempt in range(2):
+                    try:
+                        if server is None:
+                            server = email_service.connect()
+                        server.send_message(mime)
+                        results[message.id] = None
+                        break
+                    except smtplib.SMTPServerDisconnected as e:
+                        # Server dropped the session (idle timeout, per-session limit) - reconnect once
+                        server = None
+                        results[message.id] = str(e)
+                    except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError, smtplib.SMTPSenderRefused) as e:
+                        # Message-level rejection; the session is still usable
+                        results[message.id] = str(e)
+                        break
+        except Exception as e:
+            # Connection / auth failure - everything not yet sent is retried later
+            for message in messages:
+                results.setdefault(message.id, str(e))
+        finally:
+            if server is not None:
+                try:
+                    server.quit()
+                except Exception:
+                    pass
+        return results
+
+    def process_batch(self) -> int:
+        """Claim and deliver one batch of due messages. Returns the number claimed."""
+        db = SessionLocal()
+        try:
+            messages = self._claim_batch(db)
+            if not messages:
+                return 0
+
+            results = self._deliver(messages)
+            now = datetime.now(timezone.utc)
+
+            sent_ids = [message_id for message_id, error in results.items() if error is None]
+            if sent_ids:
+                db.execute(
+                    update(OutboundEmail)
+                    .where(OutboundEmail.id.in_(sent_ids))
+                    .values(status="sent", sent_at=now, locked_at=None, last_error=None,
+                            attempts=OutboundEmail.attempts + 1)
+                    .execution_options(synchronize_session=False)
+                )
+
+            for message in messages:
+                error = results.get(message.id)
+                if error is None:
+                    continue
+                attempts = message.attempts + 1
+                exhausted = attempts >= settings.MAIL_MAX_ATTEMPTS
+                db.execute(
+                    update(OutboundEmail)
+                    .where(OutboundEmail.id == message.id)
+                    .values(
+                        status="failed" if exhausted else "pending",
+                        attempts=attempts,
+                        next_attempt_at=now + retry_delay(attempts),
+                        locked_at=None,
+                        last_error=error[:2000]
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                if exhausted:
+                    logger.error(f"Giving up on email {message.id} to {message.to_email} after {attempts} attempts: {error}")
+
+            db.commit()
+
+            failed = len(messages) - len(sent_ids)
+            logger.info(f"Mail queue batch: {len(sent_ids)} sent, {failed} deferred")
+            return len(messages)
+        finally:
+            db.close()
+
+
+mail_queue_worker = MailQueueWorker()
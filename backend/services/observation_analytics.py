@@ -0,0 +1,373 @@
+"""
+Observation Analytics
+Cross-run analytics over spot data via the observation_spot_metrics fact table.
+
+When a run is completed its spots' data_json is unpacked into one typed row per
+spot per template field (numeric_fields, count_flags and categorical_fields from
+the template's validations_json) by a single INSERT ... SELECT. Trend queries
+then aggregate those rows by block x template x time bucket in SQL - mean,
+spread, percentiles and incidence - without touching spot JSON again.
+"""
+import logging
+from datetime import date, datetime, time, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy import case, distinct, func, select
+from sqlalchemy.orm import Session
+
+from db.models.block import VineyardBlock
+from db.models.observation_metric import ObservationSpotMetric
+from db.models.observation_run import ObservationRun
+from db.models.observation_template import ObservationTemplate
+
+logger = logging.getLogger(__name__)
+
+BUCKETS = ("day", "week", "month")
+BACKFILL_BATCH_RUNS = 200
+
+# Values counted as "true" for count_flags, as in run_completion._count_boolean_flags
+FLAG_TRUE_VALUES = ("true", "True", "1", "1.0", "yes", "Yes")
+NUMERIC_PATTERN = r"^\s*[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?\s*$"
+
+_EXTRACT_SQL = sa.text("""
+    WITH cfg AS (
+        SELECT r.id AS run_id, r.company_id, r.template_id, r.block_id, r.observed_at_start,
+               ARRAY(SELECT json_array_elements_text(
+                   CASE WHEN json_typeof(t.validations_json -> 'numeric_fields') = 'array'
+                        THEN t.validations_json -> 'numeric_fields' ELSE '[]'::json END)) AS numeric_fields,
+               ARRAY(SELECT json_array_elements_text(
+                   CASE WHEN json_typeof(t.validations_json -> 'count_flags') = 'array'
+                        THEN t.validations_json -> 'count_flags' ELSE '[]'::json END)) AS flag_fields,
+               ARRAY(SELECT json_array_elements_text(
+                   CASE WHEN json_typeof(t.validations_json -> 'categorical_fields') = 'array'
+                        THEN t.validations_json -> 'categorical_fields' ELSE '[]'::json END)) AS categorical_fields
+        FROM observation_runs r
+        JOIN observation_templates t ON t.id = r.template_id
+        WHERE r.id = ANY(:run_ids)
+    ),
+    vals AS (
+        SELECT c.run_id, c.company_id, c.template_id,
+               s.id AS spot_id,
+               COALESCE(s.block_id, c.block_id) AS block_id,
+               COALESCE(s.observed_at, c.observed_at_start, s.created_at) AS observed_at,
+               kv.key AS metric,
+               json_typeof(kv.value) AS json_type,
+               kv.value #>> '{}' AS raw,
+               kv.key = ANY(c.flag_fields) AS is_flag,
+               kv.key = ANY(c.numeric_fields) AS is_numeric
+        FROM cfg c
+        JOIN observation_spots s ON s.run_id = c.run_id
+        CROSS JOIN LATERAL json_each(
+            CASE WHEN json_typeof(s.data_json) = 'object' THEN s.data_json ELSE '{}'::json END
+        ) AS kv
+        WHERE kv.key = ANY(c.numeric_fields || c.flag_fields || c.categorical_fields)
+          AND json_typeof(kv.value) IN ('number', 'string', 'boolean')
+    ),
+    typed AS (
+        SELECT run_id, company_id, template_id, spot_id, block_id, observed_at, metric,
+               CASE WHEN is_flag THEN 'flag' WHEN is_numeric THEN 'numeric' ELSE 'categorical' END AS kind,
+               CASE
+                   WHEN is_flag THEN CASE WHEN raw = ANY(:flag_true) THEN 1.0 ELSE 0.0 END
+                   WHEN NOT is_numeric THEN NULL
+                   WHEN json_type = 'boolean' THEN CASE WHEN raw = 'true' THEN 1.0 ELSE 0.0 END
+                   WHEN json_type = 'number' OR raw ~ :numeric_pattern THEN raw::double precision
+               END AS value_num,
+               CASE WHEN NOT is_flag AND NOT is_numeric AND raw <> '' THEN left(raw, 255) END AS value_text
+        FROM vals
+    )
+    INSERT INTO observation_spot_metrics
+        (company_id, run_id, spot_id, template_id, block_id, observed_at, metric, kind, value_num, value_text)
+    SELECT company_id, run_id, spot_id, template_id, block_id, observed_at, metric, kind, value_num, value_text
+    FROM typed
+    WHERE observed_at IS NOT NULL
+      AND (value_num IS NOT NULL OR value_text IS NOT NULL)
+""")
+
+
+def season_window(season: str) -> Tuple[datetime, datetime]:
+    """
+    UTC bounds of a vintage, July 1 to June 30: '2025/26' -> [2025-07-01, 2026-07-01).
+    Wider than the Oct-Apr growing season so winter bud counts and pruning
+    observations fall in the vintage they belong to.
+
+    Raises:
+        ValueError: if the season string is not 'YYYY/YY' or 'YYYY'
+    """
+    try:
+        start_year = int(season.split("/")[0])
+    except (ValueError, AttributeError):
+        raise ValueError(f"Invalid season '{season}', expected e.g. 2025/26")
+    start = datetime.combine(date(start_year, 7, 1), time.min, tzinfo=timezone.utc)
+    end = datetime.combine(date(start_year + 1, 7, 1), time.min, tzinfo=timezone.utc)
+    return start, end
+
+
+class ObservationAnalytics:
+
+    @staticmethod
+    def extract_run_metrics(db: Session, run_ids: Sequence[int], commit: bool = True) -> int:
+        """
+        (Re)build the fact rows for the given runs from their spots.
+        Returns the number of metric rows written.
+        """
+        run_ids = list(run_ids)
+        if not run_ids:
+            return 0
+
+        db.execute(
+            sa.delete(ObservationSpotMetric).where(ObservationSpotMetric.run_id.in_(run_ids))
+        )
+        result = db.execute(_EXTRACT_SQL, {
+            "run_ids": run_ids,
+            "flag_true": list(FLAG_TRUE_VALUES),
+            "numeric_pattern": NUMERIC_PATTERN,
+        })
+        if commit:
+            db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def refresh_if_completed(db: Session, run_id: int):
+        """Re-extract a completed run after its spots change; a failure is logged, never raised"""
+        try:
+            completed = db.scalar(
+                select(ObservationRun.observed_at_end.isnot(None)).where(ObservationRun.id == run_id)
+            )
+            if completed:
+                ObservationAnalytics.extract_run_metrics(db, [run_id])
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to refresh spot metrics for run {run_id}: {str(e)}")
+
+    @staticmethod
+    def backfill_company(db: Session, company_id: int, rebuild: bool = False) -> Dict[str, int]:
+        """
+        Extract metrics for a company's completed runs, in batches of runs.
+        Only runs without any fact rows are processed unless rebuild is set.
+        """
+        q = select(ObservationRun.id).where(
+            ObservationRun.company_id == company_id,
+            ObservationRun.observed_at_end.isnot(None)
+        )
+        if not rebuild:
+            q = q.where(~sa.exists().where(ObservationSpotMetric.run_id == ObservationRun.id))
+        run_ids = db.scalars(q.order_by(ObservationRun.id)).all()
+
+        rows = 0
+        for i in range(0, len(run_ids), BACKFILL_BATCH_RUNS):
+            rows += ObservationAnalytics.extract_run_metrics(db, run_ids[i:i + BACKFILL_BATCH_RUNS])
+        logger.info(f"Spot metrics backfill for company {company_id}: {len(run_ids)} runs, {rows} rows")
+        return {"runs": len(run_ids), "rows": rows}
+
+    @staticmethod
+    def _metric_filters(
+        company_id: int,
+        metric: Optional[str] = None,
+        template_id: Optional[int] = None,
+        block_ids: Optional[Sequence[int]] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> list:
+        m = ObservationSpotMetric
+        filters = [m.company_id == company_id]
+        if metric:
+            filters.append(m.metric == metric)
+        if template_id:
+            filters.append(m.template_id == template_id)
+        if block_ids:
+            filters.append(m.block_id.in_(list(block_ids)))
+        if date_from:
+            filters.append(m.observed_at >= date_from)
+        if date_to:
+            filters.append(m.observed_at < date_to)
+        return filters
+
+    @staticmethod
+    def list_metrics(
+        db: Session,
+        company_id: int,
+        template_id: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Metrics that have data, per template - what a trend chart can plot"""
+        m = ObservationSpotMetric
+        q = (
+            select(
+                m.template_id,
+                ObservationTemplate.name.label("template_name"),
+                m.metric,
+                m.kind,
+                func.count().label("n"),
+                func.count(distinct(m.run_id)).label("run_count"),
+                func.min(m.observed_at).label("first_observed_at"),
+                func.max(m.observed_at).label("last_observed_at"),
+            )
+            .join(ObservationTemplate, ObservationTemplate.id == m.template_id)
+            .where(*ObservationAnalytics._metric_filters(company_id, template_id=template_id, date_from=date_from, date_to=date_to))
+            .group_by(m.template_id, ObservationTemplate.name, m.metric, m.kind)
+            .order_by(ObservationTemplate.name, m.metric)
+        )
+        return [dict(row) for row in db.execute(q).mappings().all()]
+
+    @staticmethod
+    def metric_aggregates(
+        db: Session,
+        company_id: int,
+        metric: str,
+        template_id: Optional[int] = None,
+        block_ids: Optional[Sequence[int]] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        bucket: str = "week"
+    ) -> List[Dict[str, Any]]:
+        """
+        Numeric / flag aggregates per block x template x time bucket.
+        Incidence is the share of observations with a value above zero
+        (for flags: the share flagged).
+        """
+        if bucket not in BUCKETS:
+            raise ValueError(f"bucket must be one of {', '.join(BUCKETS)}")
+
+        m = ObservationSpotMetric
+        bucket_start = func.date_trunc(bucket, m.observed_at).label("bucket_start")
+        value = m.value_num
+
+        q = (
+            select(
+                m.block_id,
+                VineyardBlock.block_name,
+                m.template_id,
+                bucket_start,
+                func.count(value).label("n"),
+                func.count(distinct(m.run_id)).label("run_count"),
+                func.avg(value).label("mean"),
+                func.stddev_samp(value).label("stdev"),
+                func.min(value).label("min"),
+                func.max(value).label("max"),
+                func.percentile_cont(0.25).within_group(value).label("p25"),
+                func.percentile_cont(0.5).within_group(value).label("median"),
+                func.percentile_cont(0.75).within_group(value).label("p75"),
+                func.percentile_cont(0.9).within_group(value).label("p90"),
+                func.avg(case((value > 0, 1.0), else_=0.0)).label("incidence"),
+            )
+            .outerjoin(VineyardBlock, VineyardBlock.id == m.block_id)
+            .where(
+                *ObservationAnalytics._metric_filters(company_id, metric, template_id, block_ids, date_from, date_to),
+                value.isnot(None)
+            )
+            .group_by(m.block_id, VineyardBlock.block_name, m.template_id, bucket_start)
+            .order_by(m.block_id, m.template_id, bucket_start)
+        )
+        return [dict(row) for row in db.execute(q).mappings().all()]
+
+    @staticmethod
+    def category_distribution(
+        db: Session,
+        company_id: int,
+        metric: str,
+        template_id: Optional[int] = None,
+        block_ids: Optional[Sequence[int]] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        bucket: str = "week"
+    ) -> List[Dict[str, Any]]:
+        """Categorical value counts and shares per block x template x time bucket"""
+        if bucket not in BUCKETS:
+            raise ValueError(f"bucket must be one of {', '.join(BUCKETS)}")
+
+        m = ObservationSpotMetric
+        bucket_start = func.date_trunc(bucket, m.observed_at)
+        counts = (
+            select(
+                m.block_id,
+                m.template_id,
+                bucket_start.label("bucket_start"),
+                m.value_text.label("value"),
+                func.count().label("count"),
+            )
+            .where(
+                *ObservationAnalytics._metric_filters(company_id, metric, template_id, block_ids, date_from, date_to),
+                m.value_text.isnot(None)
+            )
+            .group_by(m.block_id, m.template_id, bucket_start, m.value_text)
+            .subquery("counts")
+        )
+        share = counts.c["count"] * 1.0 / func.sum(counts.c["count"]).over(
+            partition_by=(counts.c.block_id, counts.c.template_id, counts.c.bucket_start)
+        )
+        q = (
+            select(
+                counts.c.block_id,
+                VineyardBlock.block_name,
+                counts.c.template_id,
+                counts.c.bucket_start,
+                counts.c.value,
+                counts.c["count"],
+                share.label("share"),
+            )
+            .outerjoin(VineyardBlock, VineyardBlock.id == counts.c.block_id)
+            .order_by(counts.c.block_id, counts.c.template_id, counts.c.bucket_start, counts.c["count"].desc())
+        )
+        return [dict(row) for row in db.execute(q).mappings().all()]
+
+    @staticmethod
+    def season_trend(
+        db: Session,
+        company_id: int,
+        metric: str,
+        season: str,
+        template_id: Optional[int] = None,
+        block_ids: Optional[Sequence[int]] = None,
+        bucket: str = "week"
+    ) -> Dict[str, Any]:
+        """
+        Season trend chart data: one series per block x template, each a list of
+        bucket points. Categorical metrics get per-bucket value shares instead of
+        numeric stats.
+
+        Raises:
+            ValueError: for a bad season string or bucket
+        """
+        date_from, date_to = season_window(season)
+        kinds = db.scalars(
+            select(distinct(ObservationSpotMetric.kind)).where(
+                *ObservationAnalytics._metric_filters(company_id, metric, template_id, block_ids, date_from, date_to)
+            )
+        ).all()
+        kind = "categorical" if kinds == ["categorical"] else ("flag" if kinds == ["flag"] else "numeric")
+
+        if kind == "categorical":
+            rows = ObservationAnalytics.category_distribution(
+                db, company_id, metric, template_id, block_ids, date_from, date_to, bucket
+            )
+        else:
+            rows = ObservationAnalytics.metric_aggregates(
+                db, company_id, metric, template_id, block_ids, date_from, date_to, bucket
+            )
+
+        series: Dict[Tuple[Optional[int], int], Dict[str, Any]] = {}
+        for row in rows:
+            key = (row.pop("block_id"), row.pop("template_id"))
+            block_name = row.pop("block_name")
+            if key not in series:
+                series[key] = {"block_id": key[0], "block_name": block_name, "template_id": key[1], "points": []}
+            if kind == "categorical":
+                points = series[key]["points"]
+                if not points or points[-1]["bucket_start"] != row["bucket_start"]:
+                    points.append({"bucket_start": row["bucket_start"], "n": 0, "categories": []})
+                points[-1]["n"] += row["count"]
+                points[-1]["categories"].append({"value": row["value"], "count": row["count"], "share": row["share"]})
+            else:
+                series[key]["points"].append(row)
+
+        return {
+            "metric": metric,
+            "kind": kind,
+            "season": season,
+            "bucket": bucket,
+            "date_from": date_from,
+            "date_to": date_to,
+            "series": list(series.values()),
+        }
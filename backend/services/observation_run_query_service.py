@@ -0,0 +1,229 @@
+"""
+Observation Run Query Service
+Projection-based, keyset-paginated run listing and per-block / per-template run stats.
+
+Run lists select only the columns ObservationRunOut serialises, with plan,
+creator and block names joined in the same statement, so no ORM objects or
+relationship loads are involved. Pages are ordered newest first and continue
+from the last row's (created_at, id) - ix_observation_runs_company_created
+matches this order.
+"""
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+from sqlalchemy import Select, and_, func, select, tuple_
+from sqlalchemy.orm import Session
+
+from db.models.block import VineyardBlock
+from db.models.observation_plan import ObservationPlan
+from db.models.observation_run import ObservationRun
+from db.models.observation_template import ObservationTemplate
+from db.models.user import User
+from utils.pagination import decode_cursor, encode_cursor, keyset_condition, keyset_order_by
+
+logger = logging.getLogger(__name__)
+
+# Same spellings as ObservationRunOut.status, plus active (not ended)
+RunStatusFilter = Literal["not started", "in progress", "complete", "active"]
+
+RUN_PAGE_SIZE = 100
+
+RUN_LIST_KEYS = [
+    (ObservationRun.created_at, True),
+    (ObservationRun.id, True),
+]
+
+
+def _run_status_condition(status: str):
+    if status == "not started":
+        return ObservationRun.observed_at_start.is_(None)
+    if status == "in progress":
+        return and_(ObservationRun.observed_at_start.isnot(None), ObservationRun.observed_at_end.is_(None))
+    if status == "complete":
+        return and_(ObservationRun.observed_at_start.isnot(None), ObservationRun.observed_at_end.isnot(None))
+    # active: anything not finished, as used by the conflict check
+    return ObservationRun.observed_at_end.is_(None)
+
+
+class ObservationRunQueryService:
+
+    @staticmethod
+    def run_projection() -> Select:
+        """SELECT of exactly the fields ObservationRunOut needs, names joined in"""
+        creator_name = func.nullif(
+            func.trim(func.concat(User.first_name, " ", User.last_name)), ""
+        )
+        return (
+            select(
+                ObservationRun.id,
+                ObservationRun.company_id,
+                ObservationRun.template_id,
+                ObservationRun.plan_id,
+                ObservationRun.block_id,
+                ObservationRun.created_by,
+                ObservationRun.observed_at_start,
+                ObservationRun.observed_at_end,
+                ObservationRun.created_at,
+                ObservationRun.updated_at,
+                ObservationPlan.name.label("plan_name"),
+                creator_name.label("creator_name"),
+                VineyardBlock.block_name.label("block_name"),
+            )
+            .outerjoin(ObservationPlan, ObservationPlan.id == ObservationRun.plan_id)
+            .outerjoin(User, User.id == ObservationRun.created_by)
+            .outerjoin(VineyardBlock, VineyardBlock.id == ObservationRun.block_id)
+        )
+
+    @staticmethod
+    def list_runs(
+        db: Session,
+        company_id: Optional[int] = None,
+        template_id: Optional[int] = None,
+        plan_id: Optional[int] = None,
+        block_id: Optional[int] = None,
+        status: Optional[RunStatusFilter] = None,
+        observed_from: Optional[datetime] = None,
+        observed_to: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of runs, newest first, or every run when limit is None. The date
+        window applies to observed_at_start, so runs not yet started are excluded
+        when a window is given.
+        Returns the rows and the cursor for the next page (None on the last page).
+
+        Raises:
+            ValueError: if the cursor is malformed
+        """
+        q = ObservationRunQueryService.run_projection()
+
+        if company_id:
+            q = q.where(ObservationRun.company_id == company_id)
+        if template_id:
+            q = q.where(ObservationRun.template_id == template_id)
+        if plan_id:
+            q = q.where(ObservationRun.plan_id == plan_id)
+        if block_id:
+            q = q.where(ObservationRun.block_id == block_id)
+        if status:
+            q = q.where(_run_status_condition(status))
+        if observed_from:
+            q = q.where(ObservationRun.observed_at_start >= observed_from)
+        if observed_to:
+            q = q.where(ObservationRun.observed_at_start < observed_to)
+
+        if cursor:
+            q = q.where(keyset_condition(RUN_LIST_KEYS, decode_cursor(cursor, len(RUN_LIST_KEYS))))
+
+        q = q.order_by(*keyset_order_by(RUN_LIST_KEYS))
+        if limit is None:
+            return [dict(row) for row in db.execute(q).mappings().all()], None
+
+        # Fetch one extra row to know whether another page exists
+        rows = db.execute(q.limit(limit + 1)).mappings().all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1]["created_at"], rows[-1]["id"]])
+        return [dict(row) for row in rows], next_cursor
+
+    @staticmethod
+    def find_active_runs(
+        db: Session,
+        plan_id: Optional[int] = None,
+        block_id: Optional[int] = None,
+        company_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Runs not yet ended for a plan / block - would conflict with starting a new one"""
+        q = ObservationRunQueryService.run_projection().where(_run_status_condition("active"))
+        if company_id:
+            q = q.where(ObservationRun.company_id == company_id)
+        if plan_id:
+            q = q.where(ObservationRun.plan_id == plan_id)
+        if block_id:
+            q = q.where(ObservationRun.block_id == block_id)
+        q = q.order_by(*keyset_order_by(RUN_LIST_KEYS))
+        return [dict(row) for row in db.execute(q).mappings().all()]
+
+    @staticmethod
+    def get_run_stats(
+        db: Session,
+        company_id: int,
+        observed_from: Optional[datetime] = None,
+        observed_to: Optional[datetime] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Run counts and latest-run timestamps per block and per template.
+
+        Both breakdowns come from a single GROUPING SETS aggregate; GROUPING()
+        tells the block rows from the template rows.
+        """
+        status_active = _run_status_condition("active")
+        status_complete = _run_status_condition("complete")
+
+        runs = (
+            select(
+                ObservationRun.block_id,
+                VineyardBlock.block_name,
+                ObservationRun.template_id,
+                ObservationTemplate.name.label("template_name"),
+                ObservationRun.observed_at_start,
+                ObservationRun.observed_at_end,
+                ObservationRun.created_at,
+                status_active.label("is_active"),
+                status_complete.label("is_complete"),
+            )
+            .outerjoin(VineyardBlock, VineyardBlock.id == ObservationRun.block_id)
+            .outerjoin(ObservationTemplate, ObservationTemplate.id == ObservationRun.template_id)
+            .where(ObservationRun.company_id == company_id)
+        )
+        if observed_from:
+            runs = runs.where(ObservationRun.observed_at_start >= observed_from)
+        if observed_to:
+            runs = runs.where(ObservationRun.observed_at_start < observed_to)
+        runs = runs.subquery("runs")
+
+        q = (
+            select(
+                func.grouping(runs.c.block_id).label("block_grouped"),
+                runs.c.block_id,
+                runs.c.block_name,
+                runs.c.template_id,
+                runs.c.template_name,
+                func.count().label("run_count"),
+                func.count().filter(runs.c.is_active).label("active_count"),
+                func.count().filter(runs.c.is_complete).label("completed_count"),
+                func.max(runs.c.observed_at_start).label("latest_started_at"),
+                func.max(runs.c.observed_at_end).label("latest_completed_at"),
+                func.max(runs.c.created_at).label("latest_created_at"),
+            )
+            .group_by(func.grouping_sets(
+                tuple_(runs.c.block_id, runs.c.block_name),
+                tuple_(runs.c.template_id, runs.c.template_name),
+            ))
+        )
+        rows = db.execute(q).all()
+
+        def counts(r) -> Dict[str, Any]:
+            return {
+                "run_count": r.run_count,
+                "active_count": r.active_count,
+                "completed_count": r.completed_count,
+                "latest_started_at": r.latest_started_at,
+                "latest_completed_at": r.latest_completed_at,
+                "latest_created_at": r.latest_created_at,
+            }
+
+        by_block, by_template = [], []
+        for r in rows:
+            if r.block_grouped == 0:
+                by_block.append({"block_id": r.block_id, "block_name": r.block_name, **counts(r)})
+            else:
+                by_template.append({"template_id": r.template_id, "template_name": r.template_name, **counts(r)})
+
+        by_block.sort(key=lambda b: (b["block_name"] is None, b["block_name"] or "", b["block_id"] or 0))
+        by_template.sort(key=lambda t: (t["template_name"] or "", t["template_id"]))
+        return {"by_block": by_block, "by_template": by_template}
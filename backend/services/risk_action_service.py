@@ -3,8 +3,11 @@ from datetime import datetime, timezone, timedelta
 from sqlalchemy.orm import Session
 from db.models.risk_action import RiskAction
 from db.models.site_risk import SiteRisk
-from db.models.task import Task
+from db.models.task import Task, TaskStatus
+from db.models.task_assignment import TaskAssignment
+from db.models.task_template import TaskCategory
 from db.models.user import User
+from services.task_query_service import TaskQueryService
 from utils.risk_permissions import RiskPermissions
 
 class RiskActionService:
@@ -45,7 +48,7 @@ class RiskActionService:
         """
         # Create associated task if requested and assigned
         if auto_create_task and risk_action.assigned_to:
-            task = self._create_task_for_action(risk_action)
+            task = self.create_task_for_action(risk_action)
             if task:
                 risk_action.task_id = task.id
         """
@@ -80,7 +83,7 @@ class RiskActionService:
         if "assigned_to" in update_data and action.auto_create_task:
             if action.assigned_to and not action.task_id:
                 # Create task if assigned and none exists
-                task = self._create_task_for_action(action)
+                task = self.create_task_for_action(action)
                 if task:
                     action.task_id = task.id
             elif action.task_id and action.assigned_to:
@@ -134,11 +137,6 @@ class RiskActionService:
                 task.status = "completed"
                 task.completion_date = action.actual_completion_date
         
-        # Schedule next occurrence if recurring
-        if action.is_recurring:
-            action.schedule_next_occurrence()
-            # Could auto-create next occurrence here
-        
         self.db.commit()
         self.db.refresh(action)
         
@@ -281,41 +279,20 @@ class RiskActionService:
         }
     
     def create_recurring_actions(self, company_id: int) -> List[RiskAction]:
-        """Create new instances of recurring actions that are due"""
-        
-        now = datetime.now(timezone.utc)
+        """Create upcoming instances of the company's recurring actions (see services.risk_schedule)"""
+        from services.risk_schedule import RiskRecurrenceService
         
-        # Find recurring actions that are due
-        due_recurring_actions = self.db.query(RiskAction).filter(
-            RiskAction.company_id == company_id,
-            RiskAction.is_recurring == True,
-            RiskAction.next_due_date <= now,
-            RiskAction.status == "completed"
-        ).all()
+        new_ids = RiskRecurrenceService.generate(self.db, company_id=company_id)
+        self.db.commit()
+        if not new_ids:
+            return []
         
-        new_actions = []
-        for action in due_recurring_actions:
-            new_action = action.create_recurring_action()
-            if new_action:
-                new_action.company_id = company_id
-                self.db.add(new_action)
-                new_actions.append(new_action)
-                
-                # Create task if needed
-                if new_action.auto_create_task and new_action.assigned_to:
-                    task = self._create_task_for_action(new_action)
-                    if task:
-                        new_action.task_id = task.id
-        
-        if new_actions:
-            self.db.commit()
-            for action in new_actions:
-                self.db.refresh(action)
-        
-        return new_actions
+        return self.db.query(RiskAction).filter(
+            RiskAction.id.in_(new_ids)
+        ).order_by(RiskAction.target_start_date).all()
     
-    def _create_task_for_action(self, action: RiskAction) -> Optional[Task]:
-        """Create a task for a risk action"""
+    def create_task_for_action(self, action: RiskAction) -> Optional[Task]:
+        """Create a compliance task for a risk action, assigned to the action's assignee"""
         
         if not action.assigned_to:
             return None
@@ -324,21 +301,29 @@ class RiskActionService:
         risk = self.db.query(SiteRisk).filter(SiteRisk.id == action.risk_id).first()
         risk_title = risk.risk_title if risk else "Unknown Risk"
         
-        task_data = {
-            "title": f"Risk Action: {action.action_title}",
-            "description": f"Risk: {risk_title}\n\nAction: {action.action_description}",
-            "priority": self._map_action_priority_to_task(action.priority),
-            "status": "planned",
-            "due_date": action.target_completion_date.date() if action.target_completion_date else None,
-            "created_by": action.created_by,
-            "assigned_to": action.assigned_to,
-            "block_id": None  # Risk actions are company-wide
-        }
-        
-        task = Task(**task_data)
+        task = Task(
+            company_id=action.company_id,
+            task_number=TaskQueryService.next_task_number(self.db, action.company_id),
+            title=f"Risk Action: {action.action_title}",
+            description=f"Risk: {risk_title}\n\nAction: {action.action_description}",
+            task_category=TaskCategory.compliance.value,
+            priority=self._map_action_priority_to_task(action.priority),
+            status=TaskStatus.scheduled,
+            scheduled_start_date=action.target_start_date.date() if action.target_start_date else None,
+            scheduled_end_date=action.target_completion_date.date() if action.target_completion_date else None,
+            created_by=action.created_by
+            # No block_id - risk actions are company-wide
+        )
         self.db.add(task)
         self.db.flush()  # Get the ID
         
+        self.db.add(TaskAssignment(
+            task_id=task.id,
+            user_id=action.assigned_to,
+            assigned_by=action.created_by,
+            is_primary=True
+        ))
+        
         return task
     
     def _update_task_for_action(self, action: RiskAction):
@@ -2,6 +2,7 @@ from typing import Tuple, List, Optional
 from sqlalchemy.orm import Session
 from db.models.site_risk import SiteRisk
 from db.models.risk_action import RiskAction
+from db.models.due_item import DueItem
 
 class RiskBusinessLogic:
     """Business logic for risk management rules and validation"""
@@ -198,21 +199,23 @@ class RiskBusinessLogic:
         from datetime import datetime, timezone
         now = datetime.now(timezone.utc)
         
-        overdue_risks = self.db.query(SiteRisk).filter(
-            SiteRisk.company_id == company_id,
-            SiteRisk.next_review_due <= now,
-            SiteRisk.status == "active"
+        overdue_reviews = self.db.query(DueItem, SiteRisk.last_reviewed).join(
+            SiteRisk, SiteRisk.id == DueItem.item_id
+        ).filter(
+            DueItem.company_id == company_id,
+            DueItem.item_type == "risk_review",
+            DueItem.due_at <= now
         ).all()
         
         review_schedule = []
-        for risk in overdue_risks:
-            days_overdue = (now - risk.next_review_due).days if risk.next_review_due else 0
+        for item, last_reviewed in overdue_reviews:
+            days_overdue = (now - item.due_at).days
             
             review_schedule.append({
-                "risk_id": risk.id,
-                "risk_title": risk.risk_title,
-                "risk_level": risk.residual_risk_level or risk.inherent_risk_level,
-                "last_reviewed": risk.last_reviewed,
+                "risk_id": item.item_id,
+                "risk_title": item.title,
+                "risk_level": item.priority,
+                "last_reviewed": last_reviewed,
                 "days_overdue": days_overdue,
                 "review_priority": "urgent" if days_overdue > 30 else "high" if days_overdue > 7 else "medium"
             })
@@ -0,0 +1,249 @@
+"""
+Risk Schedule
+Recurring risk actions generated in bulk, plus the periodic due_items sync.
+
+A recurring series is a root action (is_recurring, no parent) whose schedule
+is the RRULE in recurrence_rule - or, for actions created before rules,
+recurrence_frequency_days read as FREQ=DAILY;INTERVAL=N - with the root's
+target_start_date as the first occurrence. Each run of RiskScheduleWorker:
+
+  1. claims the roots whose generated window ends before now +
+     RISK_RECURRENCE_HORIZON_DAYS (FOR UPDATE SKIP LOCKED, so several API
+     workers share the work), expands their rules and inserts every new
+     instance in one INSERT ... ON CONFLICT DO NOTHING - the unique
+     (parent_action_id, occurrence_date) index makes re-runs harmless;
+  2. syncs due_items for every company (services.due_items).
+
+A new series starts generating from now: past occurrences are not
+back-filled. Each instance copies the root, starts on its occurrence and is
+due after the root's planned duration (7 days when the root has none); when
+the root has auto_create_task and an assignee, each instance gets its task.
+
+Run once by hand with `python scripts/run_risk_schedule.py`.
+"""
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from dateutil.rrule import rrule
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from db.models.risk_action import RiskAction
+from db.session import SessionLocal
+from services.due_items import DueItemService
+from services.risk_action_service import RiskActionService
+from utils.recurrence import MAX_OCCURRENCES, frequency_rule, occurrences_between, parse_rule
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DURATION = timedelta(days=7)
+
+# Copied from the series root onto every generated instance
+INSTANCE_FIELDS = (
+    "risk_id", "company_id", "action_description", "action_type", "control_type",
+    "priority", "urgency", "assigned_to", "responsible_person", "created_by",
+    "estimated_cost", "currency", "expected_likelihood_reduction", "expected_severity_reduction",
+    "auto_create_task", "requires_verification", "recurrence_frequency_days", "custom_fields", "tags"
+)
+
+
+class RiskRecurrenceService:
+
+    @staticmethod
+    def series_start(root: RiskAction) -> datetime:
+        return root.target_start_date or root.created_at or datetime.now(timezone.utc)
+
+    @staticmethod
+    def series_rule(root: RiskAction) -> Optional[rrule]:
+        """
+        The root's schedule as a dateutil rrule, None when it has none.
+
+        Raises:
+            ValueError: if recurrence_rule is invalid
+        """
+        rule = root.recurrence_rule
+        if not rule and root.recurrence_frequency_days:
+            rule = frequency_rule(root.recurrence_frequency_days)
+        if not rule:
+            return None
+        return parse_rule(rule, RiskRecurrenceService.series_start(root))
+
+    @staticmethod
+    def instance_values(root: RiskAction, occurrence: datetime) -> Dict[str, Any]:
+        """Column values for the instance of `root` at `occurrence`"""
+        duration = DEFAULT_DURATION
+        if root.target_start_date and root.target_completion_date and root.target_completion_date > root.target_start_date:
+            duration = root.target_completion_date - root.target_start_date
+
+        values = {field: getattr(root, field) for field in INSTANCE_FIELDS}
+        values.update(
+            action_title=f"{root.action_title} (Recurring)",
+            status="planned",
+            progress_percentage=0,
+            target_start_date=occurrence,
+            target_completion_date=occurrence + duration,
+            is_recurring=True,
+            parent_action_id=root.id,
+            occurrence_date=occurrence,
+            custom_fields=root.custom_fields or {},
+            tags=root.tags or []
+        )
+        return values
+
+    @staticmethod
+    def generate(db: Session, company_id: Optional[int] = None, now: Optional[datetime] = None) -> List[int]:
+        """
+        Insert every occurrence up to the horizon that doesn't exist yet and
+        advance each series' window. Returns the new action ids; the caller commits.
+        """
+        now = now or datetime.now(timezone.utc)
+        horizon = now + timedelta(days=settings.RISK_RECURRENCE_HORIZON_DAYS)
+
+        query = select(RiskAction).where(
+            RiskAction.is_recurring == True,
+            RiskAction.parent_action_id.is_(None),
+            RiskAction.archived_at.is_(None),
+            RiskAction.status != "cancelled",
+            or_(RiskAction.recurrence_rule.isnot(None), RiskAction.recurrence_frequency_days > 0),
+            or_(RiskAction.recurrence_generated_until.is_(None), RiskAction.recurrence_generated_until < horizon)
+        ).order_by(RiskAction.id).with_for_update(skip_locked=True)
+        if company_id is not None:
+            query = query.where(RiskAction.company_id == company_id)
+
+        rows = []
+        for root in db.scalars(query):
+            try:
+                rule = RiskRecurrenceService.series_rule(root)
+            except ValueError as e:
+                logger.warning(f"Skipping recurring risk action {root.id}: {str(e)}")
+                continue
+
+            after = max(root.recurrence_generated_until or now, RiskRecurrenceService.series_start(root))
+            occurrences = occurrences_between(rule, after, horizon)
+            rows.extend(RiskRecurrenceService.instance_values(root, occurrence) for occurrence in occurrences)
+
+            # A capped run resumes from its last occurrence next time
+            root.recurrence_generated_until = occurrences[-1] if len(occurrences) >= MAX_OCCURRENCES else horizon
+            root.next_due_date = rule.after(now)
+
+        if not rows:
+            db.flush()
+            return []
+
+        inserted = db.execute(
+            pg_insert(RiskAction)
+            .on_conflict_do_nothing(
+                index_elements=["parent_action_id", "occurrence_date"],
+                index_where=RiskAction.occurrence_date.isnot(None)
+            )
+            .returning(RiskAction.id),
+            rows
+        ).scalars().all()
+        RiskRecurrenceService.create_tasks(db, inserted)
+        return inserted
+
+    @staticmethod
+    def create_tasks(db: Session, action_ids: List[int]) -> int:
+        """Create the task of each new instance whose series has auto_create_task and an assignee"""
+        if not action_ids:
+            db.flush()
+            return 0
+        actions = db.scalars(
+            select(RiskAction).where(
+                RiskAction.id.in_(action_ids),
+                RiskAction.auto_create_task == True,
+                RiskAction.assigned_to.isnot(None),
+                RiskAction.task_id.is_(None)
+            ).order_by(RiskAction.id)
+        ).all()
+        service = RiskActionService(db)
+        for action in actions:
+            action.task_id = service.create_task_for_action(action).id
+        db.flush()
+        return len(actions)
+
+    @staticmethod
+    def create_next(db: Session, root: RiskAction, now: Optional[datetime] = None) -> Optional[RiskAction]:
+        """
+        Materialise the occurrence after the series' latest instance, whatever
+        the horizon. Returns None when the rule has no further occurrences.
+
+        Raises:
+            ValueError: if the root has no valid schedule
+        """
+        now = now or datetime.now(timezone.utc)
+        rule = RiskRecurrenceService.series_rule(root)
+        if rule is None:
+            raise ValueError("Action has no recurrence schedule")
+
+        latest = db.scalar(
+            select(func.max(RiskAction.occurrence_date)).where(RiskAction.parent_action_id == root.id)
+        )
+        occurrence = rule.after(max(latest or now, RiskRecurrenceService.series_start(root)))
+        if occurrence is None:
+            return None
+
+        action = RiskAction(**RiskRecurrenceService.instance_values(root, occurrence))
+        db.add(action)
+        db.flush()
+        RiskRecurrenceService.create_tasks(db, [action.id])
+        if root.recurrence_generated_until is None or root.recurrence_generated_until < occurrence:
+            root.recurrence_generated_until = occurrence
+        root.next_due_date = rule.after(now)
+        db.commit()
+        db.refresh(action)
+        return action
+
+
+class RiskScheduleWorker:
+    """Background thread that generates recurring actions and syncs due_items every interval"""
+
+    def __init__(self):
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="risk-schedule", daemon=True)
+        self._thread.start()
+        logger.info("Risk schedule worker started")
+
+    def stop(self, timeout: float = 10.0):
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self) -> Dict[str, int]:
+        """Generate due occurrences, then sync due_items for every company"""
+        db = SessionLocal()
+        try:
+            created = RiskRecurrenceService.generate(db)
+            db.commit()
+            DueItemService.sync(db)
+            db.commit()
+            return {"actions_created": len(created)}
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                result = self.run_once()
+                if result["actions_created"]:
+                    logger.info(f"Risk schedule created {result['actions_created']} recurring actions")
+            except Exception as e:
+                logger.error(f"Risk schedule run failed: {str(e)}")
+            self._stopping.wait(settings.RISK_SCHEDULE_INTERVAL_SECONDS)
+
+
+risk_schedule_worker = RiskScheduleWorker()
@@ -0,0 +1,151 @@
+"""
+Row Layout Service
+Generates vineyard row geometries for a block and bulk-inserts them
+"""
+import logging
+from typing import List, Optional, Tuple
+
+from geoalchemy2.shape import from_shape, to_shape
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from db.models.block import VineyardBlock
+from db.models.observation_run import ObservationSpot
+from db.models.vineyard_row import VineyardRow
+from utils.bulk import bulk_insert
+from utils.geometry_helpers import generate_row_geometries
+
+logger = logging.getLogger(__name__)
+
+
+class RowsInUseError(ValueError):
+    """The block's rows can't be replaced: observation spots reference them"""
+    pass
+
+
+def _segment_suffix(segment: int) -> str:
+    """0 -> 'a', 25 -> 'z', 26 -> 'aa'"""
+    suffix = ""
+    segment += 1
+    while segment > 0:
+        segment, remainder = divmod(segment - 1, 26)
+        suffix = chr(ord('a') + remainder) + suffix
+    return suffix
+
+
+class RowLayoutService:
+
+    @staticmethod
+    def build_layout(
+        block: VineyardBlock,
+        bearing: float,
+        spacing: float,
+        row_start: int = 1,
+        first_row_offset: Optional[float] = None,
+        min_row_length: float = 1.0
+    ) -> Tuple[List[dict], int]:
+        """
+        Compute row insert parameters for a block without touching the database.
+        Rows split by holes in the block share a row number with a letter suffix (12a, 12b).
+        Returns the insert parameters and the number of distinct rows.
+        """
+        if block.geometry is None:
+            raise ValueError(f"Block {block.id} has no geometry")
+
+        layout = generate_row_geometries(
+            to_shape(block.geometry),
+            bearing,
+            spacing=spacing,
+            first_row_offset=first_row_offset,
+            min_row_length=min_row_length
+        )
+
+        rows = []
+        row_count = 0
+        for row in layout:
+            row_count = max(row_count, row["row_index"] + 1)
+            row_number = str(row_start + row["row_index"])
+            if row["segment_count"] > 1:
+                row_number += _segment_suffix(row["segment"])
+
+            rows.append({
+                "block_id": block.id,
+                "row_number": row_number,
+                "row_length": row["row_length"],
+                "vine_spacing": block.vine_spacing,
+                "variety": block.variety,
+                "clone": block.clone,
+                "rootstock": block.rootstock,
+                "geometry": from_shape(row["geometry"], srid=4326)
+            })
+        return rows, row_count
+
+    @staticmethod
+    def create_layout(
+        db: Session,
+        block_id: int,
+        bearing: Optional[float] = None,
+        spacing: Optional[float] = None,
+        row_start: int = 1,
+        first_row_offset: Optional[float] = None,
+        min_row_length: float = 1.0,
+        replace_existing: bool = False
+    ) -> List[VineyardRow]:
+        """
+        Generate and insert every row for a block in one INSERT ... RETURNING.
+        Bearing and spacing default to the block's stored row_orientation and row_spacing.
+
+        Raises:
+            RowsInUseError: if replace_existing and observation spots reference the current rows
+            ValueError: if the block is missing or no layout can be generated
+        """
+        block = db.query(VineyardBlock).filter(VineyardBlock.id == block_id).first()
+        if not block:
+            raise ValueError(f"Vineyard block {block_id} not found")
+
+        bearing = bearing if bearing is not None else block.row_orientation
+        spacing = spacing if spacing is not None else block.row_spacing
+        if bearing is None:
+            raise ValueError("Row bearing is required (block has no row_orientation)")
+        if not spacing:
+            raise ValueError("Row spacing is required (block has no row_spacing)")
+
+        existing_rows = db.query(VineyardRow).filter(VineyardRow.block_id == block_id).count()
+        if existing_rows and not replace_existing:
+            raise ValueError(
+                f"Block already has {existing_rows} rows. Delete existing rows first or set replace_existing."
+            )
+        if existing_rows:
+            # Task rows are unlinked by their FK (SET NULL); observation spots would fail the delete
+            spot_count = db.query(func.count(ObservationSpot.id)).join(
+                VineyardRow, ObservationSpot.row_id == VineyardRow.id
+            ).filter(VineyardRow.block_id == block_id).scalar()
+            if spot_count:
+                raise RowsInUseError(
+                    f"{spot_count} observation spots reference this block's rows, so they can't be replaced"
+                )
+
+        rows, row_count = RowLayoutService.build_layout(
+            block, bearing, spacing, row_start, first_row_offset, min_row_length
+        )
+        if not rows:
+            raise ValueError("No rows fit inside the block at this bearing and spacing")
+
+        if existing_rows:
+            db.query(VineyardRow).filter(VineyardRow.block_id == block_id).delete()
+
+        created_rows = bulk_insert(db, VineyardRow, rows)
+
+        block.row_orientation = bearing % 180
+        block.row_spacing = spacing
+        block.row_start = str(row_start)
+        block.row_end = str(row_start + row_count - 1)
+        block.row_count = row_count
+
+        db.commit()
+
+        logger.info(
+            f"Generated {len(created_rows)} row segments ({row_count} rows) for block {block_id} "
+            f"at bearing {bearing}° / {spacing}m"
+        )
+        return created_rows
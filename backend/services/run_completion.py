@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Any, Dict, List, Optional
 from datetime import datetime, timezone
 import json
+import logging
 
 import sqlalchemy as sa
 from sqlalchemy.orm import Session
@@ -11,6 +12,9 @@ from utils.observation_helpers import mean, stdev, ci95
 from utils.observation_helpers import yield_t_per_ha, vines_per_ha, adjust_for_missing
 from utils.observation_helpers import flowers_per_shoot, fruit_set_percent
 from utils.observation_helpers import confidence_score
+from services.observation_analytics import ObservationAnalytics
+
+logger = logging.getLogger(__name__)
 
 # ---- configurable table/column names ----
 T_RUNS = "observation_runs"
@@ -227,6 +231,13 @@ def complete_run(db: Session, run_id: int) -> Dict[str, Any]:
     
     # Store and mark complete
     _store_summary(db, run_id, summary)
+
+    # Typed spot values for cross-run analytics; completion stands even if this fails
+    try:
+        ObservationAnalytics.extract_run_metrics(db, [run_id])
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to extract spot metrics for run {run_id}: {str(e)}")
     
     return summary
 
@@ -0,0 +1,168 @@
+"""
+Task Query Service
+Filtered, keyset-paginated task listing with eager-loaded relations.
+
+Tasks are ordered by scheduled start (unscheduled first), priority, then newest
+first. Pages continue from the last row's sort key instead of OFFSET, so deep
+pages cost the same as the first one; ix_tasks_company_list_order matches this
+order exactly.
+"""
+import logging
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Date, func, literal_column, or_
+from sqlalchemy.orm import Query, Session, joinedload, selectinload
+
+from db.models.task import Task, TaskStatus
+from db.models.task_assignment import TaskAssignment
+from utils.pagination import decode_cursor, encode_cursor, keyset_condition, keyset_order_by
+
+logger = logging.getLogger(__name__)
+
+# Unscheduled tasks sort first, as with ORDER BY scheduled_start_date NULLS FIRST.
+# Must stay in step with the expression in ix_tasks_company_list_order.
+UNSCHEDULED_SORT_DATE = date.min
+
+TASK_LIST_KEYS = [
+    (func.coalesce(Task.scheduled_start_date, literal_column("DATE '0001-01-01'", Date)), False),
+    (Task.priority, True),
+    (Task.created_at, True),
+    (Task.id, True),
+]
+
+
+def _task_sort_values(task: Task) -> list:
+    return [
+        task.scheduled_start_date or UNSCHEDULED_SORT_DATE,
+        task.priority,
+        task.created_at,
+        task.id,
+    ]
+
+
+class TaskQueryService:
+
+    @staticmethod
+    def next_task_number(db: Session, company_id: int) -> str:
+        """Next task number for the company this year: TASK-2025-001"""
+        year = datetime.now().year
+        count = db.query(func.count(Task.id)).filter(
+            Task.company_id == company_id,
+            func.extract('year', Task.created_at) == year
+        ).scalar() or 0
+        return f"TASK-{year}-{count + 1:03d}"
+
+    @staticmethod
+    def search_filter(search: str):
+        """ILIKE on title, number and description - served by the pg_trgm GIN indexes"""
+        search_term = f"%{search}%"
+        return or_(
+            Task.title.ilike(search_term),
+            Task.task_number.ilike(search_term),
+            Task.description.ilike(search_term)
+        )
+
+    @staticmethod
+    def paginate(query: Query, limit: int, cursor: Optional[str] = None, skip: int = 0) -> Tuple[List[Task], Optional[str]]:
+        """
+        Apply list ordering and keyset pagination to a Task query.
+        Returns the page and the cursor for the next page (None on the last page).
+
+        Raises:
+            ValueError: if the cursor is malformed
+        """
+        if cursor:
+            query = query.filter(keyset_condition(TASK_LIST_KEYS, decode_cursor(cursor, len(TASK_LIST_KEYS))))
+        elif skip:
+            query = query.offset(skip)
+
+        # Fetch one extra row to know whether another page exists
+        tasks = query.order_by(*keyset_order_by(TASK_LIST_KEYS)).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_cursor(_task_sort_values(tasks[-1]))
+        return tasks, next_cursor
+
+    @staticmethod
+    def list_tasks(
+        db: Session,
+        company_id: int,
+        status: Optional[TaskStatus] = None,
+        task_category=None,
+        priority: Optional[str] = None,
+        block_id: Optional[int] = None,
+        spatial_area_id: Optional[int] = None,
+        assigned_to_user_id: Optional[int] = None,
+        created_by: Optional[int] = None,
+        scheduled_start_from: Optional[date] = None,
+        scheduled_start_to: Optional[date] = None,
+        search: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0
+    ) -> Tuple[List[Task], Optional[str]]:
+        """List a company's tasks with filters, one keyset page at a time"""
+        query = db.query(Task).filter(Task.company_id == company_id)
+
+        if status:
+            query = query.filter(Task.status == status)
+        if task_category:
+            query = query.filter(Task.task_category == task_category)
+        if priority:
+            query = query.filter(Task.priority == priority)
+        if block_id:
+            query = query.filter(Task.block_id == block_id)
+        if spatial_area_id:
+            query = query.filter(Task.spatial_area_id == spatial_area_id)
+        if created_by:
+            query = query.filter(Task.created_by == created_by)
+
+        if scheduled_start_from:
+            query = query.filter(Task.scheduled_start_date >= scheduled_start_from)
+        if scheduled_start_to:
+            query = query.filter(Task.scheduled_start_date <= scheduled_start_to)
+
+        # EXISTS rather than a join so a task never appears twice on a page
+        if assigned_to_user_id:
+            query = query.filter(Task.assignments.any(TaskAssignment.user_id == assigned_to_user_id))
+
+        if search:
+            query = query.filter(TaskQueryService.search_filter(search))
+
+        return TaskQueryService.paginate(query, limit, cursor, skip)
+
+    @staticmethod
+    def get_user_tasks(
+        db: Session,
+        user_id: int,
+        company_id: int,
+        assignment_status: Optional[str] = None,
+        include_completed: bool = False
+    ) -> List[Task]:
+        """
+        Tasks assigned to a user with everything TaskWithRelations serialises
+        loaded up front: many-to-one relations joined, assignments and their
+        users fetched in one IN query each.
+        """
+        assignment_filter = TaskAssignment.user_id == user_id
+        if assignment_status:
+            assignment_filter = assignment_filter & (TaskAssignment.status == assignment_status)
+
+        query = db.query(Task).options(
+            joinedload(Task.block),
+            joinedload(Task.spatial_area),
+            joinedload(Task.creator),
+            joinedload(Task.completer),
+            selectinload(Task.assignments).joinedload(TaskAssignment.user)
+        ).filter(
+            Task.company_id == company_id,
+            Task.assignments.any(assignment_filter)
+        )
+
+        if not include_completed:
+            query = query.filter(Task.status != TaskStatus.completed)
+
+        return query.order_by(Task.priority.desc(), Task.scheduled_start_date, Task.id).all()
@@ -1,5 +1,5 @@
 # services/visitor_service.py - Visitor business logic
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, date, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, or_
@@ -13,6 +13,8 @@ from schemas.visitor import (
     VisitorStats, VisitorReport
 )
 from permissions.visitor_permissions import VisitorPermissions
+from services.company_counters import CompanyCounterService
+from utils.pagination import encode_cursor, decode_cursor, keyset_condition, keyset_order_by
 
 class VisitorService:
     """Service class for visitor management operations"""
@@ -75,6 +77,26 @@ class VisitorService:
             Visitor.company_id == company_id
         ).first()
     
+    def _visitor_search_filter(self, search: str):
+        """ILIKE across name/email/company - served by the pg_trgm GIN indexes on each column"""
+        pattern = f"%{search}%"
+        return or_(
+            Visitor.first_name.ilike(pattern),
+            Visitor.last_name.ilike(pattern),
+            Visitor.email.ilike(pattern),
+            Visitor.company_representing.ilike(pattern)
+        )
+    
+    def _visit_stats_subquery(self, company_id: int):
+        """Visit count and last visit date per visitor, aggregated once"""
+        return self.db.query(
+            VisitorVisit.visitor_id.label("visitor_id"),
+            func.count(VisitorVisit.id).label("total_visits"),
+            func.max(VisitorVisit.visit_date).label("last_visit_date")
+        ).filter(
+            VisitorVisit.company_id == company_id
+        ).group_by(VisitorVisit.visitor_id).subquery("visit_stats")
+    
     def get_visitors(self, company_id: int, skip: int = 0, limit: int = 100, 
                     search: Optional[str] = None, active_only: bool = True) -> List[Visitor]:
         """Get list of visitors with optional search"""
@@ -84,16 +106,117 @@ class VisitorService:
             query = query.filter(Visitor.is_active == True)
         
         if search:
-            search_filter = or_(
-                Visitor.first_name.ilike(f"%{search}%"),
-                Visitor.last_name.ilike(f"%{search}%"),
-                Visitor.email.ilike(f"%{search}%"),
-                Visitor.company_representing.ilike(f"%{search}%")
-            )
-            query = query.filter(search_filter)
+            query = query.filter(self._visitor_search_filter(search))
         
         return query.offset(skip).limit(limit).all()
     
+    def get_visitors_with_stats(self, company_id: int, limit: int = 100, skip: int = 0,
+                                cursor: Optional[str] = None, search: Optional[str] = None,
+                                active_only: bool = True) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get a page of visitors with visit counts and last visit date in one grouped query.
+        
+        Pages are ordered by (last_name, first_name, id); pass the returned cursor back
+        to fetch the next page without OFFSET. Returns (rows, next_cursor).
+        """
+        stats = self._visit_stats_subquery(company_id)
+        total_visits = func.coalesce(stats.c.total_visits, 0)
+        keys = [(Visitor.last_name, False), (Visitor.first_name, False), (Visitor.id, False)]
+        
+        query = self.db.query(
+            Visitor,
+            total_visits.label("total_visits"),
+            stats.c.last_visit_date
+        ).outerjoin(
+            stats, stats.c.visitor_id == Visitor.id
+        ).filter(Visitor.company_id == company_id)
+        
+        if active_only:
+            query = query.filter(Visitor.is_active == True)
+        
+        if search:
+            query = query.filter(self._visitor_search_filter(search))
+        
+        if cursor:
+            query = query.filter(keyset_condition(keys, decode_cursor(cursor, len(keys))))
+        elif skip:
+            query = query.offset(skip)
+        
+        # Fetch one extra row to know whether another page exists
+        results = query.order_by(*keyset_order_by(keys)).limit(limit + 1).all()
+        
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            last = results[-1][0]
+            next_cursor = encode_cursor([last.last_name, last.first_name, last.id])
+        
+        rows = [
+            {
+                "visitor": visitor,
+                "total_visits": visits,
+                "last_visit_date": last_visit_date,
+                "is_frequent_visitor": visits >= 3
+            }
+            for visitor, visits, last_visit_date in results
+        ]
+        return rows, next_cursor
+    
+    def get_visitor_with_stats(self, visitor_id: int, company_id: int) -> Optional[Dict[str, Any]]:
+        """Get one visitor with aggregated visit stats"""
+        result = self.db.query(
+            Visitor,
+            func.count(VisitorVisit.id),
+            func.max(VisitorVisit.visit_date)
+        ).outerjoin(
+            VisitorVisit, VisitorVisit.visitor_id == Visitor.id
+        ).filter(
+            Visitor.id == visitor_id,
+            Visitor.company_id == company_id
+        ).group_by(Visitor.id).first()
+        
+        if not result:
+            return None
+        
+        visitor, visits, last_visit_date = result
+        return {
+            "visitor": visitor,
+            "total_visits": visits,
+            "last_visit_date": last_visit_date,
+            "is_frequent_visitor": visits >= 3
+        }
+    
+    def search_visitors(self, company_id: int, search: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Trigram search ranked by best similarity across name, email and company"""
+        stats = self._visit_stats_subquery(company_id)
+        full_name = Visitor.first_name + " " + Visitor.last_name
+        similarity = func.greatest(
+            func.similarity(full_name, search),
+            func.similarity(func.coalesce(Visitor.email, ""), search),
+            func.similarity(func.coalesce(Visitor.company_representing, ""), search)
+        )
+        
+        results = self.db.query(
+            Visitor,
+            func.coalesce(stats.c.total_visits, 0),
+            stats.c.last_visit_date
+        ).outerjoin(
+            stats, stats.c.visitor_id == Visitor.id
+        ).filter(
+            Visitor.company_id == company_id,
+            Visitor.is_active == True,
+            self._visitor_search_filter(search)
+        ).order_by(similarity.desc(), Visitor.id).limit(limit).all()
+        
+        return [
+            {
+                "visitor": visitor,
+                "total_visits": visits,
+                "last_visit_date": last_visit_date
+            }
+            for visitor, visits, last_visit_date in results
+        ]
+    
     def update_visitor(self, visitor_id: int, visitor_data: VisitorUpdate, 
                       current_user: User) -> Optional[Visitor]:
         """Update visitor details"""
@@ -171,7 +294,12 @@ class VisitorService:
                   visitor_id: Optional[int] = None, visit_date: Optional[date] = None,
                   status: Optional[str] = None) -> List[VisitorVisit]:
         """Get list of visits with optional filters"""
-        query = self.db.query(VisitorVisit).filter(VisitorVisit.company_id == company_id)
+        from sqlalchemy.orm import joinedload
+        
+        query = self.db.query(VisitorVisit).options(
+            joinedload(VisitorVisit.visitor),
+            joinedload(VisitorVisit.host)
+        ).filter(VisitorVisit.company_id == company_id)
         
         if visitor_id:
             query = query.filter(VisitorVisit.visitor_id == visitor_id)
@@ -184,6 +312,15 @@ class VisitorService:
         
         return query.order_by(VisitorVisit.visit_date.desc()).offset(skip).limit(limit).all()
     
+    def count_visits(self, company_id: int, visit_date: Optional[date] = None) -> int:
+        """Count visits, optionally for a single date"""
+        query = self.db.query(func.count(VisitorVisit.id)).filter(VisitorVisit.company_id == company_id)
+        
+        if visit_date:
+            query = query.filter(VisitorVisit.visit_date == visit_date)
+        
+        return query.scalar() or 0
+    
     def get_active_visits(self, company_id: int) -> List[VisitorVisit]:
         """Get all currently active visits (signed in but not out) with related data"""
         from sqlalchemy.orm import joinedload
@@ -329,55 +466,46 @@ class VisitorService:
     # ===== STATISTICS & REPORTING =====
     
     def get_visitor_stats(self, company_id: int, days: int = 30) -> VisitorStats:
-        """Get visitor statistics for a company"""
+        """Get visitor statistics for a company in a single aggregate pass over visits"""
         start_date = date.today() - timedelta(days=days)
-        
-        # Total visitors
-        total_visitors = self.db.query(func.count(Visitor.id)).filter(
-            Visitor.company_id == company_id,
-            Visitor.is_active == True
-        ).scalar() or 0
-        
-        # Total visits in period
-        total_visits = self.db.query(func.count(VisitorVisit.id)).filter(
-            VisitorVisit.company_id == company_id,
-            VisitorVisit.visit_date >= start_date
-        ).scalar() or 0
-        
-        # Active visits today
-        active_visits_today = len(self.get_active_visits(company_id))
-        
-        # Frequent visitors (3+ visits)
-        frequent_visitors = self.db.query(func.count(Visitor.id)).filter(
-            Visitor.company_id == company_id,
-            Visitor.id.in_(
-                self.db.query(VisitorVisit.visitor_id)
-                .filter(VisitorVisit.company_id == company_id)
-                .group_by(VisitorVisit.visitor_id)
-                .having(func.count(VisitorVisit.id) >= 3)
-            )
-        ).scalar() or 0
-        
-        # Visits this month
         month_start = date.today().replace(day=1)
-        visits_this_month = self.db.query(func.count(VisitorVisit.id)).filter(
-            VisitorVisit.company_id == company_id,
-            VisitorVisit.visit_date >= month_start
-        ).scalar() or 0
+        window_start = min(start_date, month_start)
+        
+        frequent_visitors_sq = self.db.query(func.count()).select_from(
+            self.db.query(VisitorVisit.visitor_id)
+            .filter(VisitorVisit.company_id == company_id)
+            .group_by(VisitorVisit.visitor_id)
+            .having(func.count(VisitorVisit.id) >= 3)
+            .subquery()
+        ).scalar_subquery()
+        
+        in_period = VisitorVisit.visit_date >= start_date
+        in_month = VisitorVisit.visit_date >= month_start
+        completed = and_(
+            VisitorVisit.signed_in_at.isnot(None),
+            VisitorVisit.signed_out_at.isnot(None)
+        )
         
-        # Average visit duration (for completed visits)
-        avg_duration_query = self.db.query(
+        stats = self.db.query(
+            frequent_visitors_sq.label("frequent_visitors"),
+            func.count(VisitorVisit.id).filter(in_period).label("total_visits"),
+            func.count(VisitorVisit.id).filter(in_month).label("visits_this_month"),
+            func.count(func.distinct(VisitorVisit.visitor_id)).filter(in_month).label("visitors_this_month"),
             func.avg(
                 func.extract('epoch', VisitorVisit.signed_out_at - VisitorVisit.signed_in_at) / 60
-            )
+            ).filter(and_(in_period, completed)).label("avg_duration")
         ).filter(
             VisitorVisit.company_id == company_id,
-            VisitorVisit.signed_in_at.isnot(None),
-            VisitorVisit.signed_out_at.isnot(None),
-            VisitorVisit.visit_date >= start_date
-        ).scalar()
+            VisitorVisit.visit_date >= window_start
+        ).one()
         
-        avg_duration = float(avg_duration_query) if avg_duration_query else 0.0
+        # Active visits right now (not limited to the period)
+        active_visits_today = self.db.query(func.count(VisitorVisit.id)).filter(
+            VisitorVisit.company_id == company_id,
+            VisitorVisit.signed_in_at.isnot(None),
+            VisitorVisit.signed_out_at.is_(None),
+            VisitorVisit.status == "in_progress"
+        ).scalar() or 0
         
         # Most common purposes
         purpose_stats = self.db.query(
@@ -385,7 +513,7 @@ class VisitorService:
             func.count(VisitorVisit.id).label('count')
         ).filter(
             VisitorVisit.company_id == company_id,
-            VisitorVisit.visit_date >= start_date
+            in_period
         ).group_by(VisitorVisit.purpose).order_by(func.count(VisitorVisit.id).desc()).limit(5).all()
         
         most_common_purposes = [
@@ -394,17 +522,12 @@ class VisitorService:
         ]
         
         return VisitorStats(
-            total_visitors=total_visitors,
-            total_visits=total_visits,
+            total_visitors=CompanyCounterService.get(self.db, company_id).visitor_count,
+            total_visits=stats.total_visits or 0,
             active_visits_today=active_visits_today,
-            frequent_visitors=frequent_visitors,
-            visitors_this_month=len(set([
-                v.visitor_id for v in self.db.query(VisitorVisit.visitor_id).filter(
-                    VisitorVisit.company_id == company_id,
-                    VisitorVisit.visit_date >= month_start
-                ).all()
-            ])),
-            visits_this_month=visits_this_month,
-            average_visit_duration_minutes=avg_duration,
+            frequent_visitors=stats.frequent_visitors or 0,
+            visitors_this_month=stats.visitors_this_month or 0,
+            visits_this_month=stats.visits_this_month or 0,
+            average_visit_duration_minutes=float(stats.avg_duration) if stats.avg_duration else 0.0,
             most_common_purposes=most_common_purposes
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,333 @@
+"""
+Weather QC
+Write-time quality control for weather_data.
+
+Ingestion groups each batch by station and variable and runs vectorised checks
+over the value arrays before the rows are inserted:
+
+- range: physically impossible values (BAD) and implausible ones (SUSPECT)
+- spike: a reading that jumps away from both neighbours by more than the
+  variable's max_step in opposite directions (SUSPECT)
+- rate_of_change: a single step larger than max_step (SUSPECT)
+- flatline: an unchanged value for at least flatline_hours, e.g. a stuck
+  sensor (SUSPECT)
+
+Step and flat-line checks only compare readings at most MAX_STEP_GAP_HOURS
+apart and skip values already marked BAD. Quality is only ever lowered, so a
+BAD flag from the source is kept. Aggregation reads quality = 'GOOD' only.
+
+Flagged readings are summarised as runs (consecutive readings with the same
+issue) in weather_data_issues; re-checking a window replaces its runs.
+
+Timestamps without a zone are taken as Pacific/Auckland local time (what the
+sources report) so batches compare cleanly with stored, zone-aware readings.
+
+Incremental batches are short, so apply() seeds each series with the stored
+readings before it (the longest look-back a check needs, stretched back to
+the start of any issue run still open there). Flat lines and spikes that
+straddle the start of a batch are then seen, stored readings they newly flag
+are downgraded in place, and the runs are rebuilt whole.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from db.models.weather import WeatherData, WeatherDataIssue
+
+logger = logging.getLogger(__name__)
+
+QC_GOOD = "GOOD"
+QC_SUSPECT = "SUSPECT"
+QC_BAD = "BAD"
+QUALITY_RANK = {QC_GOOD: 0, QC_SUSPECT: 1, QC_BAD: 2}
+
+MAX_STEP_GAP_HOURS = 3.0
+FLATLINE_TOLERANCE = 1e-6
+NZ_TZ = ZoneInfo("Pacific/Auckland")
+MAX_CONTEXT = timedelta(days=7)  # Longest stretch of stored readings re-checked with a batch
+
+
+@dataclass(frozen=True)
+class VariableRule:
+    label: str
+    unit: str
+    min_valid: Optional[float] = None  # below: impossible_value (BAD)
+    max_valid: Optional[float] = None  # above: impossible_value (BAD)
+    max_plausible: Optional[float] = None  # above: outlier (SUSPECT)
+    max_step: Optional[float] = None  # between consecutive readings: spike / rate_of_change
+    flatline_hours: Optional[float] = None
+
+
+TEMPERATURE = VariableRule("Temperature", "°C", min_valid=-20.0, max_valid=50.0, max_step=8.0, flatline_hours=6.0)
+RAINFALL = VariableRule("Rainfall", "mm", min_valid=0.0, max_plausible=200.0)
+HUMIDITY = VariableRule("Humidity", "%", min_valid=0.0, max_valid=100.0, max_step=40.0, flatline_hours=24.0)
+
+VARIABLE_RULES: Dict[str, VariableRule] = {
+    **{name: TEMPERATURE for name in ("temp", "temperature", "temp_mean", "temp_min", "temp_max", "tmean", "tmin", "tmax")},
+    **{name: RAINFALL for name in ("rain", "rainfall", "precipitation")},
+    **{name: HUMIDITY for name in ("humidity", "rh", "relative_humidity")},
+}
+
+
+def _aware(ts: datetime) -> datetime:
+    """ts with naive values taken as NZ local time"""
+    return ts.replace(tzinfo=NZ_TZ) if ts.tzinfo is None else ts
+
+
+def _runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """(start, end) index pairs, inclusive, of consecutive True values"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def check_series(rule: VariableRule, seconds: np.ndarray, values: np.ndarray, valid: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Run every check for one station/variable series sorted by time.
+    valid marks readings the step and flat-line checks may use.
+    Returns {issue_type: boolean mask}.
+    """
+    n = len(values)
+    flags: Dict[str, np.ndarray] = {}
+
+    finite = np.isfinite(values)
+    impossible = ~finite
+    if rule.min_valid is not None:
+        impossible |= finite & (values < rule.min_valid)
+    if rule.max_valid is not None:
+        impossible |= finite & (values > rule.max_valid)
+    flags["impossible_value"] = impossible
+    if rule.max_plausible is not None:
+        flags["outlier"] = finite & ~impossible & (values > rule.max_plausible)
+
+    # Step and flat-line checks run over the usable readings only
+    usable = np.flatnonzero(valid & ~impossible)
+    if len(usable) < 2 or (rule.max_step is None and rule.flatline_hours is None):
+        return flags
+
+    v = values[usable]
+    t = seconds[usable]
+    step = np.diff(v)
+    close = np.diff(t) <= MAX_STEP_GAP_HOURS * 3600
+
+    if rule.max_step is not None:
+        jump = close & (np.abs(step) > rule.max_step)
+        # Reading i is a spike when the steps into and out of it both jump, in opposite directions
+        spike_mid = jump[:-1] & jump[1:] & (np.sign(step[:-1]) != np.sign(step[1:]))
+        spike = np.zeros(len(usable), dtype=bool)
+        spike[1:-1] = spike_mid
+
+        # Remaining jumps flag the later reading, unless it or the one before is a spike
+        rate = np.zeros(len(usable), dtype=bool)
+        rate[1:] = jump & ~spike[1:] & ~spike[:-1]
+
+        flags["spike"] = np.zeros(n, dtype=bool)
+        flags["spike"][usable] = spike
+        flags["rate_of_change"] = np.zeros(n, dtype=bool)
+        flags["rate_of_change"][usable] = rate
+
+    if rule.flatline_hours is not None:
+        same = close & (np.abs(step) <= FLATLINE_TOLERANCE)
+        flat = np.zeros(len(usable), dtype=bool)
+        for start, end in _runs(same):
+            # same[start..end] links readings start..end+1
+            if t[end + 1] - t[start] >= rule.flatline_hours * 3600:
+                flat[start:end + 2] = True
+        flags["flatline"] = np.zeros(n, dtype=bool)
+        flags["flatline"][usable] = flat
+
+    return flags
+
+
+ISSUE_QUALITY = {
+    "impossible_value": QC_BAD,
+    "outlier": QC_SUSPECT,
+    "spike": QC_SUSPECT,
+    "rate_of_change": QC_SUSPECT,
+    "flatline": QC_SUSPECT,
+}
+
+
+def _details(rule: VariableRule, issue_type: str, values: np.ndarray) -> str:
+    finite = values[np.isfinite(values)]
+    low = float(finite.min()) if len(finite) else None
+    high = float(finite.max()) if len(finite) else None
+    if issue_type == "impossible_value":
+        if low is None:
+            return f"{rule.label} value is not a number"
+        if rule.min_valid is not None and low < rule.min_valid:
+            return f"{rule.label} {low}{rule.unit} below minimum valid ({rule.min_valid}{rule.unit})"
+        return f"{rule.label} {high}{rule.unit} above maximum valid ({rule.max_valid}{rule.unit})"
+    if issue_type == "outlier":
+        return f"{rule.label} {high}{rule.unit} unusually high (>{rule.max_plausible}{rule.unit})"
+    if issue_type == "spike":
+        return f"{rule.label} spike of more than {rule.max_step}{rule.unit} against both neighbouring readings"
+    if issue_type == "rate_of_change":
+        return f"{rule.label} changed by more than {rule.max_step}{rule.unit} between consecutive readings"
+    return f"{rule.label} unchanged at {low}{rule.unit} for {len(values)} readings"
+
+
+class WeatherQC:
+
+    @staticmethod
+    def check(records: List[Dict], context: Optional[Dict[Tuple[int, str], List[Dict]]] = None) -> List[Dict]:
+        """
+        Set 'quality' on ingestion records (dicts with station_id, timestamp,
+        variable, value, quality), making naive timestamps NZ-aware, and return
+        issue runs for weather_data_issues.
+        context holds, per (station_id, variable), earlier readings in time order
+        (see load_context()); they are checked along with the batch and their
+        quality may be lowered too. Variables without rules are left as they are.
+        """
+        groups: Dict[Tuple[int, str], List[Dict]] = {}
+        for record in records:
+            record["timestamp"] = _aware(record["timestamp"])
+            record["quality"] = (record.get("quality") or QC_GOOD).upper()
+            if record["variable"] in VARIABLE_RULES:
+                groups.setdefault((record["station_id"], record["variable"]), []).append(record)
+
+        issues = []
+        for (station_id, variable), group in groups.items():
+            rule = VARIABLE_RULES[variable]
+            group.sort(key=lambda r: r["timestamp"])
+            if context:
+                group = context.get((station_id, variable), []) + group
+            seconds = np.array([r["timestamp"].timestamp() for r in group], dtype=float)
+            values = np.array([np.nan if r["value"] is None else float(r["value"]) for r in group], dtype=float)
+            valid = np.array([r["quality"] != QC_BAD for r in group], dtype=bool)
+
+            for issue_type, mask in check_series(rule, seconds, values, valid).items():
+                if not mask.any():
+                    continue
+                quality = ISSUE_QUALITY[issue_type]
+                for i in np.flatnonzero(mask):
+                    if QUALITY_RANK[quality] > QUALITY_RANK.get(group[i]["quality"], 0):
+                        group[i]["quality"] = quality
+                for start, end in _runs(mask):
+                    run_values = values[start:end + 1]
+                    extreme = run_values[np.nanargmax(np.abs(run_values))] if np.isfinite(run_values).any() else None
+                    issues.append({
+                        "station_id": station_id,
+                        "variable": variable,
+                        "issue_type": issue_type,
+                        "quality": quality,
+                        "start_time": group[start]["timestamp"],
+                        "end_time": group[end]["timestamp"],
+                        "points": end - start + 1,
+                        "value": None if extreme is None else round(float(extreme), 4),
+                        "details": _details(rule, issue_type, run_values),
+                    })
+
+        return issues
+
+    @staticmethod
+    def load_context(db: Session, records: Iterable[Dict]) -> Dict[Tuple[int, str], List[Dict]]:
+        """
+        Stored readings just before each series in records, for check(): the
+        rule's flat-line window (or MAX_STEP_GAP_HOURS for step checks), taken
+        back to the start of any issue run still open at its start, up to
+        MAX_CONTEXT. Each reading keeps its stored quality as 'stored_quality'.
+        """
+        firsts: Dict[Tuple[int, str], datetime] = {}
+        for record in records:
+            if record["variable"] not in VARIABLE_RULES:
+                continue
+            key = (record["station_id"], record["variable"])
+            ts = _aware(record["timestamp"])
+            firsts[key] = min(firsts.get(key, ts), ts)
+
+        context = {}
+        for (station_id, variable), first in firsts.items():
+            rule = VARIABLE_RULES[variable]
+            if rule.max_step is None and rule.flatline_hours is None:
+                continue
+            since = first - timedelta(hours=max(rule.flatline_hours or 0, MAX_STEP_GAP_HOURS))
+            open_run_start = db.scalar(
+                select(func.min(WeatherDataIssue.start_time)).where(
+                    WeatherDataIssue.station_id == station_id,
+                    WeatherDataIssue.variable == variable,
+                    WeatherDataIssue.start_time < since,
+                    WeatherDataIssue.end_time >= since
+                )
+            )
+            if open_run_start is not None:
+                since = max(open_run_start, first - MAX_CONTEXT)
+
+            rows = db.execute(
+                select(WeatherData.timestamp, WeatherData.value, WeatherData.quality).where(
+                    WeatherData.station_id == station_id,
+                    WeatherData.variable == variable,
+                    WeatherData.timestamp >= since,
+                    WeatherData.timestamp < first
+                ).order_by(WeatherData.timestamp)
+            ).all()
+            context[(station_id, variable)] = [
+                {
+                    "station_id": station_id,
+                    "timestamp": row.timestamp,
+                    "variable": variable,
+                    "value": row.value,
+                    "quality": (row.quality or QC_GOOD).upper(),
+                    "stored_quality": row.quality,
+                }
+                for row in rows
+            ]
+        return context
+
+    @staticmethod
+    def save_issues(db: Session, records: Iterable[Dict], issues: List[Dict]):
+        """
+        Replace the issue runs starting inside each checked station/variable
+        window with the new ones. The caller commits.
+        """
+        windows: Dict[Tuple[int, str], Tuple[datetime, datetime]] = {}
+        for record in records:
+            if record["variable"] not in VARIABLE_RULES:
+                continue
+            key = (record["station_id"], record["variable"])
+            ts = _aware(record["timestamp"])
+            first, last = windows.get(key, (ts, ts))
+            windows[key] = (min(first, ts), max(last, ts))
+
+        for (station_id, variable), (first, last) in windows.items():
+            db.execute(
+                delete(WeatherDataIssue).where(
+                    WeatherDataIssue.station_id == station_id,
+                    WeatherDataIssue.variable == variable,
+                    WeatherDataIssue.start_time >= first,
+                    WeatherDataIssue.start_time <= last
+                ).execution_options(synchronize_session=False)
+            )
+        if issues:
+            db.execute(insert(WeatherDataIssue), issues)
+
+    @staticmethod
+    def apply(db: Session, records: List[Dict]) -> List[Dict]:
+        """
+        check() the records together with the stored readings before them,
+        lower the quality of stored readings that are newly flagged, then
+        save_issues() - all in the caller's transaction. Returns the issues.
+        """
+        context = WeatherQC.load_context(db, records)
+        issues = WeatherQC.check(records, context)
+
+        stored = list(chain.from_iterable(context.values()))
+        changed = [
+            {"station_id": r["station_id"], "timestamp": r["timestamp"], "variable": r["variable"], "quality": r["quality"]}
+            for r in stored if r["quality"] != r["stored_quality"]
+        ]
+        if changed:
+            db.execute(update(WeatherData), changed)  # bulk UPDATE by primary key
+
+        WeatherQC.save_issues(db, chain(stored, records), issues)
+        if issues:
+            logger.info(f"Weather QC flagged {sum(i['points'] for i in issues)} readings in {len(issues)} runs")
+        return issues
@@ -0,0 +1,145 @@
+"""
+Zone Season GDD
+October 1 adjusted cumulative GDD for climate_zone_daily.
+
+climate_zone_daily.gdd_cumulative accumulates from July 1, but phenology
+thresholds are calibrated from October 1. refresh() stores, per zone and
+vintage, the GDD accumulated up to September 30 (actual: the latest day on or
+before Sept 30; baseline: day of vintage 92) in climate_zone_season_gdd, then
+rewrites gdd_cumulative_oct1 / gdd_baseline_oct1 on every daily row of those
+seasons. Both are 0 before October 1 (day of vintage 93).
+
+The zone aggregation job calls this after writing daily rows, so the
+realtime climate endpoints read ready-to-plot values with one ordered scan
+of (zone_id, vintage_year, date).
+"""
+import logging
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from sqlalchemy import bindparam, func, text
+from sqlalchemy.orm import Session
+
+from db.models.realtime_climate import ClimateZoneDailyBaseline, ClimateZoneSeasonGdd
+
+logger = logging.getLogger(__name__)
+
+OCT1_DAY_OF_VINTAGE = 93
+
+_OFFSETS_SQL = """
+    INSERT INTO climate_zone_season_gdd
+        (zone_id, vintage_year, offset_date, actual_gdd_offset, baseline_gdd_offset, updated_at)
+    SELECT s.zone_id, s.vintage_year, sept30.date,
+           COALESCE(sept30.gdd_cumulative, 0), COALESCE(b.gdd_base0_cumulative_avg, 0), now()
+    FROM (
+        SELECT DISTINCT zone_id, vintage_year FROM climate_zone_daily
+        WHERE TRUE {filters}
+    ) s
+    LEFT JOIN LATERAL (
+        SELECT d.date, d.gdd_cumulative FROM climate_zone_daily d
+        WHERE d.zone_id = s.zone_id AND d.vintage_year = s.vintage_year
+          AND d.date <= make_date(s.vintage_year - 1, 9, 30)
+          AND d.gdd_cumulative IS NOT NULL
+        ORDER BY d.date DESC
+        LIMIT 1
+    ) sept30 ON TRUE
+    LEFT JOIN climate_zone_daily_baseline b
+        ON b.zone_id = s.zone_id AND b.day_of_vintage = 92
+    ON CONFLICT ON CONSTRAINT uq_climate_zone_season_gdd DO UPDATE SET
+        offset_date = EXCLUDED.offset_date,
+        actual_gdd_offset = EXCLUDED.actual_gdd_offset,
+        baseline_gdd_offset = EXCLUDED.baseline_gdd_offset,
+        updated_at = EXCLUDED.updated_at
+"""
+
+_ADJUST_SQL = """
+    UPDATE climate_zone_daily d SET
+        gdd_cumulative_oct1 = CASE
+            WHEN d.date < make_date(d.vintage_year - 1, 10, 1) THEN 0
+            ELSE GREATEST(COALESCE(d.gdd_cumulative, 0) - o.actual_gdd_offset, 0)
+        END,
+        gdd_baseline_oct1 = (
+            SELECT CASE
+                WHEN b.gdd_base0_cumulative_avg IS NULL THEN NULL
+                WHEN d.date < make_date(d.vintage_year - 1, 10, 1) THEN 0
+                ELSE GREATEST(b.gdd_base0_cumulative_avg - o.baseline_gdd_offset, 0)
+            END
+            FROM climate_zone_daily_baseline b
+            WHERE b.zone_id = d.zone_id
+              AND b.day_of_vintage = (d.date - make_date(d.vintage_year - 1, 7, 1)) + 1
+        )
+    FROM climate_zone_season_gdd o
+    WHERE o.zone_id = d.zone_id AND o.vintage_year = d.vintage_year
+      {filters}
+"""
+
+
+def _scope(
+    sql: str,
+    alias: str,
+    vintage_years: Optional[Iterable[int]],
+    zone_ids: Optional[Iterable[int]]
+):
+    filters = []
+    params = {}
+    if vintage_years is not None:
+        filters.append(f"AND {alias}vintage_year IN :vintage_years")
+        params["vintage_years"] = list(vintage_years)
+    if zone_ids is not None:
+        filters.append(f"AND {alias}zone_id IN :zone_ids")
+        params["zone_ids"] = list(zone_ids)
+
+    statement = text(sql.format(filters=" ".join(filters)))
+    for name in params:
+        statement = statement.bindparams(bindparam(name, expanding=True))
+    return statement, params
+
+
+class ZoneSeasonGdd:
+
+    @staticmethod
+    def refresh(
+        db: Session,
+        vintage_years: Optional[Iterable[int]] = None,
+        zone_ids: Optional[Iterable[int]] = None
+    ) -> int:
+        """
+        Recompute September 30 offsets and the October 1 adjusted columns for the
+        given vintages / zones (all when None). The caller commits.
+        Returns the number of daily rows updated.
+        """
+        vintage_years = sorted(set(vintage_years)) if vintage_years is not None else None
+        zone_ids = sorted(set(zone_ids)) if zone_ids is not None else None
+        if vintage_years == [] or zone_ids == []:
+            return 0
+
+        statement, params = _scope(_OFFSETS_SQL, "", vintage_years, zone_ids)
+        db.execute(statement, params)
+
+        statement, params = _scope(_ADJUST_SQL, "d.", vintage_years, zone_ids)
+        updated = db.execute(statement, params).rowcount
+
+        logger.info(f"Refreshed October 1 GDD on {updated} zone daily rows")
+        return updated
+
+    @staticmethod
+    def get_offsets(db: Session, zone_id: int, vintage_year: int) -> Optional[ClimateZoneSeasonGdd]:
+        return db.query(ClimateZoneSeasonGdd).filter(
+            ClimateZoneSeasonGdd.zone_id == zone_id,
+            ClimateZoneSeasonGdd.vintage_year == vintage_year
+        ).first()
+
+    @staticmethod
+    def baseline_day_reaching(
+        db: Session,
+        zone_id: int,
+        gdd_oct1: Decimal,
+        baseline_offset: Decimal
+    ) -> Optional[int]:
+        """First day of vintage (from October 1) on which baseline GDD from October 1 reaches gdd_oct1"""
+        return db.query(func.min(ClimateZoneDailyBaseline.day_of_vintage)).filter(
+            ClimateZoneDailyBaseline.zone_id == zone_id,
+            ClimateZoneDailyBaseline.day_of_vintage >= OCT1_DAY_OF_VINTAGE,
+            ClimateZoneDailyBaseline.gdd_base0_cumulative_avg - baseline_offset >= gdd_oct1
+        ).scalar()
+
@@ -0,0 +1,44 @@
+# utils/bulk.py
+"""
+Bulk INSERT ... RETURNING for ORM models.
+
+bulk_insert() sends every row through one insert(model).returning(model)
+executemany. SQLAlchemy's insertmanyvalues turns that into multi-row
+INSERT ... VALUES ... RETURNING statements (insertmanyvalues_page_size rows
+each, 1000 by default), and the objects it returns are fully loaded, server
+defaults included, so no db.refresh() is needed. They come back in the
+order of `rows` and are detached, so the commit that follows doesn't expire
+them and serialising the response doesn't SELECT each one again.
+
+The insert is meant to be the last step before commit: check the whole
+batch first (one query per check, not one per item) so a bad item fails the
+request before anything is written.
+"""
+from typing import Any, Dict, List, Sequence, Type, TypeVar
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+
+def bulk_insert(db: Session, model: Type[T], rows: Sequence[Dict[str, Any]]) -> List[T]:
+    """
+    Insert `rows` (column name -> value dicts) and return the created objects.
+
+    Rows should share the same keys so they batch into the same statements.
+    None is written as NULL (render_nulls) rather than dropping the key, so
+    a None in some rows doesn't split the batch; leave a column out of every
+    row to get its Python or server default. Relationships on the returned
+    objects are not loaded.
+    """
+    if not rows:
+        return []
+    created = db.scalars(
+        insert(model).returning(model, sort_by_parameter_order=True),
+        list(rows),
+        execution_options={"render_nulls": True}
+    ).all()
+    for obj in created:
+        db.expunge(obj)
+    return created
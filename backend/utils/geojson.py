@@ -0,0 +1,153 @@
+# utils/geojson.py
+"""
+FeatureCollections assembled by the database.
+
+feature_collection_query() wraps a filtered, limited subquery (one row per
+feature: a geometry column plus property columns labelled with their JSON
+names) in a single json_build_object/json_agg aggregate, so PostGIS returns
+the whole FeatureCollection as one JSON text value and Python never touches
+individual features. geojson_response() sends that text as the response body.
+
+    rows = select(SpatialArea.id, SpatialArea.name, SpatialArea.geometry)...limit(limit).subquery()
+    return geojson_response(db.execute(feature_collection_query(rows, zoom=zoom)).scalar())
+
+With a map zoom level the geometry is simplified to about half a screen pixel
+(ST_SimplifyPreserveTopology) and coordinates are rounded to the decimals
+that pixel size needs; without one, full detail is returned with
+DEFAULT_PRECISION decimals (~1 cm).
+"""
+import json
+import math
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from fastapi.responses import Response
+from sqlalchemy import JSON, Text, cast, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.sql.elements import ClauseElement
+
+DEFAULT_PRECISION = 7
+SIMPLIFY_PIXELS = 0.5
+TILE_SIZE = 256
+
+BBox = Tuple[float, float, float, float]
+
+
+def parse_bbox(bbox: Optional[str]) -> Optional[BBox]:
+    """
+    Parse a "west,south,east,north" bbox query parameter.
+
+    Raises:
+        ValueError: if the value is not four comma-separated numbers
+    """
+    if not bbox:
+        return None
+    west, south, east, north = map(float, bbox.split(','))
+    return west, south, east, north
+
+
+def bbox_filter(geometry, bbox: BBox, srid: int = 4326):
+    """ST_Intersects with the bbox envelope - uses the geometry's GiST index"""
+    return func.ST_Intersects(geometry, func.ST_MakeEnvelope(*bbox, srid))
+
+
+def zoom_tolerance(zoom: Optional[int]) -> Optional[float]:
+    """Simplification tolerance in degrees for a web map zoom level (None = no simplification)"""
+    if zoom is None:
+        return None
+    return SIMPLIFY_PIXELS * 360 / (TILE_SIZE * 2 ** zoom)
+
+
+def zoom_precision(zoom: Optional[int]) -> int:
+    """Coordinate decimals that resolve a screen pixel at a zoom level"""
+    if zoom is None:
+        return DEFAULT_PRECISION
+    degrees_per_pixel = 360 / (TILE_SIZE * 2 ** zoom)
+    return max(0, min(DEFAULT_PRECISION, math.ceil(-math.log10(degrees_per_pixel)) + 1))
+
+
+def _key(name: str):
+    return literal_column("'" + name.replace("'", "''") + "'")
+
+
+def _json_value(value: Any):
+    """SQL expressions pass through, dicts become json_build_object, anything else a JSON literal"""
+    if isinstance(value, ClauseElement):
+        return value
+    if isinstance(value, dict):
+        return _json_object(value)
+    return cast(literal(json.dumps(value, default=str), Text), JSON)
+
+
+def _json_object(members: Dict[str, Any]):
+    args = []
+    for name, value in members.items():
+        args += [_key(name), _json_value(value)]
+    return func.json_build_object(*args)
+
+
+def feature_collection_query(
+    rows,
+    *,
+    geometry: str = "geometry",
+    properties: Optional[Sequence[str]] = None,
+    id_column: Optional[str] = None,
+    zoom: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    precision: Optional[int] = None,
+    order_by: Sequence[str] = (),
+    members: Optional[Dict[str, Any]] = None,
+):
+    """
+    SELECT returning one text value: the FeatureCollection for `rows`.
+
+    Args:
+        rows: Subquery with one row per feature. Filtering (bbox_filter),
+              ordering and LIMIT belong here; rows with a NULL geometry
+              should be excluded.
+        geometry: Name of the geometry column in `rows` (WGS84)
+        properties: Columns to put in each feature's properties, defaults to
+                    every column except geometry
+        id_column: Column to use as the feature's top-level "id"
+        zoom: Map zoom level - sets tolerance and precision unless given
+        tolerance: ST_SimplifyPreserveTopology tolerance in degrees
+        precision: Coordinate decimals in the output
+        order_by: Columns of `rows` that order the features
+        members: Extra top-level members, e.g. {"metadata": {"count": func.count()}}.
+                 Values may be SQL expressions, dicts or JSON-serializable values.
+    """
+    if tolerance is None:
+        tolerance = zoom_tolerance(zoom)
+    if precision is None:
+        precision = zoom_precision(zoom)
+
+    geom = rows.c[geometry]
+    if tolerance:
+        geom = func.ST_SimplifyPreserveTopology(geom, literal_column(repr(float(tolerance))))
+    geometry_json = cast(func.ST_AsGeoJSON(geom, literal_column(str(int(precision)))), JSON)
+
+    if properties is None:
+        properties = [c.name for c in rows.c if c.name != geometry]
+
+    feature = [_key("type"), _key("Feature")]
+    if id_column:
+        feature += [_key("id"), rows.c[id_column]]
+    feature += [
+        _key("geometry"), geometry_json,
+        _key("properties"), func.json_build_object(*[arg for name in properties for arg in (_key(name), rows.c[name])]),
+    ]
+    feature = func.json_build_object(*feature)
+    if order_by:
+        feature = aggregate_order_by(feature, *[rows.c[name] for name in order_by])
+
+    collection = {
+        "type": "FeatureCollection",
+        "features": func.coalesce(func.json_agg(feature), literal_column("'[]'::json")),
+    }
+    collection.update(members or {})
+    # Cast to text so the driver hands back the JSON string instead of parsing it
+    return select(cast(_json_object(collection), Text).label("geojson")).select_from(rows)
+
+
+def geojson_response(content: Optional[str]) -> Response:
+    """Send FeatureCollection JSON text from feature_collection_query as the body"""
+    return Response(content=(content or "").encode(), media_type="application/json")
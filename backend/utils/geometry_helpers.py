@@ -1,9 +1,15 @@
 # utils/geometry_helpers.py 
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from geoalchemy2.shape import from_shape
-from shapely.geometry import shape, LineString
+from shapely.geometry import shape, LineString, Polygon, MultiPolygon
 from fastapi import HTTPException
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Mean earth radius (m) used for the local equirectangular projection
+EARTH_RADIUS_M = 6371008.8
 
 def geojson_to_geometry(geojson_dict: Optional[Dict[str, Any]]):
     """Convert GeoJSON dict to SQLAlchemy geometry"""
@@ -62,7 +68,6 @@ def calculate_row_length(geometry) -> Optional[float]:
     """
     try:
         from geoalchemy2.shape import to_shape
-        from pyproj import Geod
         
         # Convert to shapely geometry
         line = to_shape(geometry)
@@ -70,26 +75,46 @@ def calculate_row_length(geometry) -> Optional[float]:
         if not isinstance(line, LineString):
             return None
         
-        # Use geodesic calculation for accurate distance
-        geod = Geod(ellps='WGS84')
-        
-        total_length = 0
-        coords = list(line.coords)
-        
-        for i in range(len(coords) - 1):
-            lon1, lat1 = coords[i]
-            lon2, lat2 = coords[i + 1]
-            
-            # Calculate distance between consecutive points
-            _, _, distance = geod.inv(lon1, lat1, lon2, lat2)
-            total_length += distance
-        
-        return round(total_length, 2)
+        return float(calculate_row_lengths([line])[0])
     
     except Exception as e:
         logger.error(f"Error calculating row length: {str(e)}")
         return None
 
+def calculate_row_lengths(lines):
+    """
+    Calculate geodesic lengths for many row LineStrings in one pass.
+    
+    All segment endpoints are gathered into flat arrays, measured with a
+    single vectorized Geod.inv call and summed back per row.
+    
+    Args:
+        lines: Sequence/array of shapely LineStrings in EPSG:4326
+    
+    Returns:
+        numpy array of lengths in meters, rounded to 2 dp
+    """
+    import numpy as np
+    import shapely
+    from pyproj import Geod
+    
+    lines = np.asarray(lines, dtype=object)
+    if lines.size == 0:
+        return np.zeros(0)
+    
+    coords, index = shapely.get_coordinates(lines, return_index=True)
+    
+    # Only pair consecutive vertices that belong to the same line
+    same_line = index[1:] == index[:-1]
+    start = coords[:-1][same_line]
+    end = coords[1:][same_line]
+    
+    geod = Geod(ellps='WGS84')
+    _, _, distances = geod.inv(start[:, 0], start[:, 1], end[:, 0], end[:, 1])
+    
+    totals = np.bincount(index[:-1][same_line], weights=distances, minlength=len(lines))
+    return np.round(totals, 2)
+
 def create_row_geometry_from_endpoints(start_point: Dict[str, float], 
                                      end_point: Dict[str, float]) -> Dict[str, Any]:
     """
@@ -110,54 +135,142 @@ def create_row_geometry_from_endpoints(start_point: Dict[str, float],
         ]
     }
 
-def interpolate_row_positions(block_geometry, row_count: int) -> list:
+def generate_row_geometries(
+    block_polygon,
+    bearing: float,
+    spacing: Optional[float] = None,
+    row_count: Optional[int] = None,
+    first_row_offset: Optional[float] = None,
+    min_row_length: float = 1.0
+) -> List[Dict[str, Any]]:
+    """
+    Lay out parallel vineyard rows across a block polygon.
+    
+    The polygon is projected into a local metric plane centred on the block
+    and rotated so the row bearing runs along the x axis. Every row line is
+    then built and clipped against the block in a single vectorized shapely
+    call, so holes (sheds, ponds, trees) split rows into separate segments.
+    
+    Args:
+        block_polygon: Shapely Polygon/MultiPolygon in EPSG:4326
+        bearing: Row direction in degrees clockwise from true north
+        spacing: Distance between rows in meters
+        row_count: Number of rows, used to derive spacing when spacing is not given
+        first_row_offset: Distance in meters from the block edge to the first row
+                          (defaults to half the spacing)
+        min_row_length: Segments shorter than this (meters) are discarded
+    
+    Returns:
+        List of dicts ordered across the block, each with 'row_index' (0-based),
+        'segment' (0-based within the row), 'segment_count', 'geometry'
+        (LineString in EPSG:4326) and 'row_length' (meters)
+    """
+    import numpy as np
+    import shapely
+    
+    if not isinstance(block_polygon, (Polygon, MultiPolygon)) or block_polygon.is_empty:
+        raise ValueError("Block geometry must be a Polygon or MultiPolygon")
+    
+    lon0, lat0 = block_polygon.centroid.x, block_polygon.centroid.y
+    theta = np.radians(bearing % 180)
+    sin_b, cos_b = np.sin(theta), np.cos(theta)
+    k_y = np.pi / 180 * EARTH_RADIUS_M
+    k_x = k_y * np.cos(np.radians(lat0))
+    
+    def to_local(coords):
+        # lon/lat -> east/north meters -> (along-row, across-row)
+        x = (coords[:, 0] - lon0) * k_x
+        y = (coords[:, 1] - lat0) * k_y
+        return np.column_stack((x * sin_b + y * cos_b, -x * cos_b + y * sin_b))
+    
+    def to_lonlat(coords):
+        u, v = coords[:, 0], coords[:, 1]
+        x = u * sin_b - v * cos_b
+        y = u * cos_b + v * sin_b
+        return np.column_stack((x / k_x + lon0, y / k_y + lat0))
+    
+    local = shapely.transform(block_polygon, to_local)
+    minx, miny, maxx, maxy = local.bounds
+    
+    if spacing is None:
+        if not row_count:
+            raise ValueError("Either spacing or row_count is required")
+        spacing = (maxy - miny) / row_count
+    if spacing <= 0:
+        raise ValueError("Row spacing must be positive")
+    
+    if first_row_offset is None:
+        first_row_offset = spacing / 2
+    offsets = np.arange(miny + first_row_offset, maxy, spacing)
+    if row_count:
+        offsets = offsets[:row_count]
+    if offsets.size == 0:
+        return []
+    
+    # One full-width line per row offset, clipped against the block in one call
+    line_coords = np.empty((offsets.size, 2, 2))
+    line_coords[:, 0, 0] = minx - 1.0
+    line_coords[:, 1, 0] = maxx + 1.0
+    line_coords[:, :, 1] = offsets[:, None]
+    lines = shapely.linestrings(line_coords)
+    
+    shapely.prepare(local)
+    clipped = shapely.intersection(lines, local)
+    parts, line_index = shapely.get_parts(clipped, return_index=True)
+    
+    # Drop tangent points and slivers
+    keep = shapely.get_type_id(parts) == shapely.GeometryType.LINESTRING
+    parts, line_index = parts[keep], line_index[keep]
+    keep = shapely.length(parts) >= min_row_length
+    parts, line_index = parts[keep], line_index[keep]
+    if parts.size == 0:
+        return []
+    
+    # Order across the block, then along the row
+    start_u = shapely.get_coordinates(shapely.get_point(parts, 0))[:, 0]
+    order = np.lexsort((start_u, line_index))
+    parts, line_index = parts[order], line_index[order]
+    
+    _, row_index = np.unique(line_index, return_inverse=True)
+    first_in_row = np.searchsorted(row_index, row_index, side='left')
+    segment = np.arange(row_index.size) - first_in_row
+    segment_count = np.bincount(row_index)[row_index]
+    
+    geometries = shapely.transform(parts, to_lonlat)
+    lengths = calculate_row_lengths(geometries)
+    
+    return [
+        {
+            "row_index": int(row_index[i]),
+            "segment": int(segment[i]),
+            "segment_count": int(segment_count[i]),
+            "geometry": geometries[i],
+            "row_length": float(lengths[i])
+        }
+        for i in range(geometries.size)
+    ]
+
+def interpolate_row_positions(block_geometry, row_count: int, bearing: float = 90.0) -> list:
     """
     Generate evenly spaced row positions within a block polygon.
     
     Args:
         block_geometry: GeoAlchemy2 geometry object (Polygon)
         row_count: Number of rows to create
+        bearing: Row direction in degrees clockwise from north (90 = west to east)
     
     Returns:
         List of LineString geometries for rows
     """
     try:
         from geoalchemy2.shape import to_shape
-        import numpy as np
         
         # Convert to shapely geometry
         polygon = to_shape(block_geometry)
         
-        if not isinstance(polygon, Polygon):
-            return []
-        
-        # Get the bounding box
-        minx, miny, maxx, maxy = polygon.bounds
-        
-        # Create parallel lines from west to east (or customize based on row orientation)
-        row_geometries = []
-        
-        # Generate evenly spaced Y coordinates
-        y_positions = np.linspace(miny, maxy, row_count)
-        
-        for y in y_positions:
-            # Create a line that crosses the entire bounding box
-            line = LineString([(minx - 0.001, y), (maxx + 0.001, y)])
-            
-            # Intersect with the polygon to get the actual row within the block
-            intersection = line.intersection(polygon)
-            
-            if intersection and not intersection.is_empty:
-                if isinstance(intersection, LineString):
-                    row_geometries.append(intersection)
-                # Handle MultiLineString case (if polygon has holes)
-                elif hasattr(intersection, 'geoms'):
-                    # Take the longest segment
-                    longest = max(intersection.geoms, key=lambda x: x.length)
-                    row_geometries.append(longest)
-        
-        return row_geometries
+        layout = generate_row_geometries(polygon, bearing, row_count=row_count)
+        return [row["geometry"] for row in layout]
     
     except Exception as e:
         logger.error(f"Error interpolating row positions: {str(e)}")
-        return []
\ No newline at end of file
+        return []
@@ -0,0 +1,81 @@
+# utils/pagination.py
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "n" in value:
+            return Decimal(value["n"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor string"""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, expected_length: Optional[int] = None) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: if the cursor is malformed or has the wrong number of keys
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+    if not isinstance(values, list) or (expected_length is not None and len(values) != expected_length):
+        raise ValueError("Invalid pagination cursor")
+
+    return [_decode_value(v) for v in values]
+
+
+def keyset_condition(keys: Sequence[Tuple[Any, bool]], values: Sequence[Any]):
+    """
+    Build the WHERE clause that continues a keyset-paginated query after `values`.
+
+    Args:
+        keys: (sort expression, descending) pairs in ORDER BY order. Expressions
+              must be non-null (wrap nullable columns in coalesce) and the last
+              key should be unique, e.g. the primary key.
+        values: Sort key values of the last row on the previous page
+
+    Returns:
+        SQLAlchemy boolean expression: (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...
+        with > flipped to < for descending keys
+    """
+    clauses = []
+    for i, (expression, descending) in enumerate(keys):
+        equal_prefix = [keys[j][0] == values[j] for j in range(i)]
+        after = expression < values[i] if descending else expression > values[i]
+        clauses.append(and_(*equal_prefix, after))
+    return or_(*clauses)
+
+
+def keyset_order_by(keys: Sequence[Tuple[Any, bool]]) -> list:
+    """ORDER BY clauses matching keyset_condition"""
+    return [expression.desc() if descending else expression.asc() for expression, descending in keys]
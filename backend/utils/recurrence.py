@@ -0,0 +1,67 @@
+# utils/recurrence.py
+"""
+RRULE-style recurrence schedules (RFC 5545), expanded with dateutil.
+
+A schedule is stored as the rule text alone, e.g. "FREQ=WEEKLY;BYDAY=MO" or
+"FREQ=MONTHLY;BYMONTHDAY=1;COUNT=12"; the first occurrence (DTSTART) comes
+from the record it belongs to, so moving a record's start date moves its
+whole series. Rules repeating more often than daily are rejected.
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from dateutil.rrule import rrule, rrulestr
+
+MAX_OCCURRENCES = 500
+ALLOWED_FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+
+
+def frequency_rule(days: int) -> str:
+    """The rule equivalent to a plain "every N days" frequency"""
+    return f"FREQ=DAILY;INTERVAL={int(days)}"
+
+
+def parse_rule(rule: str, dtstart: datetime) -> rrule:
+    """
+    Parse rule text into a dateutil rrule starting at dtstart.
+
+    Raises:
+        ValueError: if the rule is not a single valid RRULE or repeats more than daily
+    """
+    text = rule.strip()
+    if text.upper().startswith("RRULE:"):
+        text = text[6:]
+    try:
+        parsed = rrulestr(text, dtstart=dtstart)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid recurrence rule: {e}")
+    if not isinstance(parsed, rrule):
+        raise ValueError("Recurrence rule must be a single RRULE")
+    parts = dict(part.split("=", 1) for part in text.upper().split(";") if "=" in part)
+    if parts.get("FREQ", "").strip() not in ALLOWED_FREQUENCIES:
+        raise ValueError("Recurrence rules may repeat at most daily")
+    return parsed
+
+
+def validate_rule(rule: Optional[str]) -> Optional[str]:
+    """Normalised rule text (or None), for schema validators"""
+    if rule is None or not rule.strip():
+        return None
+    parse_rule(rule, datetime.now().astimezone())
+    rule = rule.strip()
+    return rule[6:] if rule.upper().startswith("RRULE:") else rule
+
+
+def occurrences_between(
+    rule: rrule,
+    after: datetime,
+    until: datetime,
+    limit: int = MAX_OCCURRENCES
+) -> List[datetime]:
+    """Occurrences strictly after `after` and up to `until`, at most `limit` of them"""
+    found = []
+    for occurrence in rule.xafter(after, inc=False):
+        if occurrence > until or len(found) >= limit:
+            break
+        found.append(occurrence)
+    return found
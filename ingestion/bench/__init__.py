@@ -0,0 +1,8 @@
+"""
+Offline benchmarks for the ingestion sources.
+
+    python -m bench.record --source all             # capture live API responses (needs network / API keys)
+    python -m bench.ingestion_benchmark --json out.json   # replay them and time fetch / parse / insert
+
+Run from the ingestion directory. See http_fixtures for the fixture format.
+"""
@@ -0,0 +1,169 @@
+"""
+Record / replay of HTTP responses for the ingestion sources.
+
+The sources call requests.get directly, so use_adapter() points requests.get
+at a Session with a custom transport adapter for the duration of a block:
+
+- RecordingAdapter performs the real request and saves the response.
+- ReplayAdapter serves saved responses with configurable latency, and fails
+  like a connection error when a request has no fixture.
+
+Fixtures live in <root>/<source>/<key>.json.gz, one per request. The key is a
+hash of the method and the URL with its query parameters sorted, so a request
+matches however the URL was built. Secret query parameters (SECRET_PARAMS)
+are replaced with REDACTED in the key, in the stored URL and anywhere their
+value appears in the body (Harvest's next-page links carry the API key).
+"""
+import base64
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+SECRET_PARAMS = {"api_key", "apikey", "key", "token", "access_token"}
+REDACTED = "REDACTED"
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def canonical_url(url: str) -> str:
+    """URL with secret parameters redacted and query parameters sorted"""
+    parts = urlsplit(url)
+    params = sorted(
+        (name, REDACTED if name.lower() in SECRET_PARAMS else value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+    )
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(params), ""))
+
+
+def secret_values(url: str):
+    return [
+        value for name, value in parse_qsl(urlsplit(url).query, keep_blank_values=True)
+        if name.lower() in SECRET_PARAMS and value
+    ]
+
+
+def fixture_key(method: str, url: str) -> str:
+    return hashlib.sha256(f"{method.upper()} {canonical_url(url)}".encode()).hexdigest()[:32]
+
+
+class FixtureStore:
+    """Compressed response files for one source"""
+
+    def __init__(self, root: Path, source: str):
+        self.dir = Path(root) / source
+        self._lock = threading.Lock()
+
+    def path(self, method: str, url: str) -> Path:
+        return self.dir / f"{fixture_key(method, url)}.json.gz"
+
+    def save(self, method: str, url: str, status: int, headers: Dict[str, str], body: bytes):
+        for secret in secret_values(url):
+            body = body.replace(secret.encode(), REDACTED.encode())
+        payload = {
+            "method": method.upper(),
+            "url": canonical_url(url),
+            "status": status,
+            # Bodies are stored decoded, so only the content type is kept
+            "headers": {k: v for k, v in headers.items() if k.lower() == "content-type"},
+            "body": base64.b64encode(body).decode("ascii"),
+        }
+        with self._lock:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            with gzip.open(self.path(method, url), "wt", encoding="utf-8") as f:
+                json.dump(payload, f)
+
+    def load(self, method: str, url: str) -> Optional[dict]:
+        path = self.path(method, url)
+        if not path.exists():
+            return None
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+        payload["body"] = base64.b64decode(payload["body"])
+        return payload
+
+    def write_manifest(self, calls: list):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        (self.dir / "manifest.json").write_text(json.dumps(calls, indent=2, default=str))
+
+    def read_manifest(self) -> list:
+        path = self.dir / "manifest.json"
+        return json.loads(path.read_text()) if path.exists() else []
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Real HTTP, with every response saved to the store"""
+
+    def __init__(self, store: FixtureStore, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+        self.recorded = 0
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        self.store.save(request.method, request.url, response.status_code, dict(response.headers), response.content)
+        self.recorded += 1
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serves saved responses after latency_ms (+ up to jitter_ms) instead of the network"""
+
+    def __init__(self, store: FixtureStore, latency_ms: float = 0.0, jitter_ms: float = 0.0):
+        super().__init__()
+        self.store = store
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.served = 0
+        self.bytes_served = 0
+        self.missing = 0
+
+    def send(self, request, **kwargs):
+        delay = self.latency_ms + (random.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000)
+
+        payload = self.store.load(request.method, request.url)
+        if payload is None:
+            self.missing += 1
+            raise requests.exceptions.ConnectionError(f"No fixture for {request.method} {canonical_url(request.url)}")
+
+        response = requests.Response()
+        response.status_code = payload["status"]
+        response.headers = CaseInsensitiveDict(payload["headers"])
+        response._content = payload["body"]
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = "OK" if payload["status"] < 400 else "Error"
+        self.served += 1
+        self.bytes_served += len(payload["body"])
+        return response
+
+    def close(self):
+        pass
+
+
+@contextmanager
+def use_adapter(adapter: BaseAdapter):
+    """Route requests.get through adapter (for code that calls requests.get directly)"""
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    original = requests.get
+    requests.get = session.get
+    try:
+        yield adapter
+    finally:
+        requests.get = original
+        session.close()
@@ -0,0 +1,170 @@
+"""
+Offline throughput benchmark for the ingestion sources.
+
+Replays recorded fixtures (see bench.record) and times three stages per
+source, reported as records/second of parsed output:
+
+- fetch:  the source's fetch method against ReplayAdapter, with the
+          configured latency per HTTP request
+- parse:  turning the fetched payloads into weather_data records
+          (best of --repeat runs)
+- insert: insert_data() into the database from DATABASE_URL, including
+          write-time QC, then the rows are deleted again
+
+Inserts use throwaway station ids from BENCH_STATION_BASE up, so nothing
+touches real stations; weather_data has no foreign key to weather_stations.
+Point DATABASE_URL at a local Postgres, not production.
+
+Usage (from the ingestion directory):
+    python -m bench.ingestion_benchmark
+    python -m bench.ingestion_benchmark --source mdc --latency-ms 150 --jitter-ms 50
+    python -m bench.ingestion_benchmark --skip-insert --json bench-report.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Replay never sends the key anywhere, but HarvestIngestion refuses to start without one
+os.environ.setdefault('HARVEST_API_KEY', 'replay')
+
+from sqlalchemy import text
+
+from bench import sources as bench_sources
+from bench.http_fixtures import FIXTURES_DIR, FixtureStore, ReplayAdapter, use_adapter
+
+BENCH_STATION_BASE = 990000
+
+
+def _rate(records: int, seconds: float):
+    return round(records / seconds, 1) if seconds > 0 else None
+
+
+def _stage(records: int, seconds: float) -> dict:
+    return {'records': records, 'seconds': round(seconds, 4), 'records_per_sec': _rate(records, seconds)}
+
+
+def cleanup(ingester, station_ids):
+    with ingester.Session() as session:
+        for table in ('weather_data', 'weather_data_issues'):
+            session.execute(text(f"DELETE FROM {table} WHERE station_id = ANY(:ids)"), {'ids': list(station_ids)})
+        session.commit()
+
+
+def benchmark_source(source: str, fixtures: Path, latency_ms: float, jitter_ms: float,
+                     repeat: int, skip_insert: bool) -> dict:
+    store = FixtureStore(fixtures, source)
+    calls = store.read_manifest()
+    if not calls:
+        return {'error': f"No fixtures in {store.dir} - run bench.record first"}
+
+    ingester = bench_sources.make_ingester(source)
+    station_ids = [BENCH_STATION_BASE + i for i in range(len(calls))]
+
+    # Fetch
+    adapter = ReplayAdapter(store, latency_ms=latency_ms, jitter_ms=jitter_ms)
+    with use_adapter(adapter):
+        started = time.perf_counter()
+        payloads = [bench_sources.fetch(source, ingester, call) for call in calls]
+        fetch_seconds = time.perf_counter() - started
+
+    # Parse
+    parse_seconds = None
+    batches = []
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        batches = [
+            bench_sources.parse(source, ingester, payload, call, station_id)
+            for payload, call, station_id in zip(payloads, calls, station_ids)
+        ]
+        elapsed = time.perf_counter() - started
+        parse_seconds = elapsed if parse_seconds is None else min(parse_seconds, elapsed)
+    record_count = sum(len(batch) for batch in batches)
+
+    result = {
+        'calls': len(calls),
+        'http_requests': adapter.served + adapter.missing,
+        'missing_fixtures': adapter.missing,
+        'bytes': adapter.bytes_served,
+        'records': record_count,
+        'fetch': _stage(record_count, fetch_seconds),
+        'parse': _stage(record_count, parse_seconds),
+    }
+
+    if skip_insert:
+        return result
+
+    # Insert, one insert_data() call per fetch as in a real run
+    cleanup(ingester, station_ids)
+    try:
+        started = time.perf_counter()
+        inserted = sum(ingester.insert_data(batch) for batch in batches if batch)
+        insert_seconds = time.perf_counter() - started
+    finally:
+        cleanup(ingester, station_ids)
+    result['insert'] = _stage(inserted, insert_seconds)
+    if inserted != record_count:
+        result['insert']['failed'] = record_count - inserted
+
+    return result
+
+
+def print_report(report: dict):
+    print(f"\n{'='*72}")
+    print(f"Ingestion benchmark  latency={report['latency_ms']}ms jitter={report['jitter_ms']}ms")
+    print(f"{'='*72}")
+    print(f"{'source':<10}{'records':>10}{'fetch rec/s':>16}{'parse rec/s':>16}{'insert rec/s':>16}")
+    for source, result in report['sources'].items():
+        if 'error' in result:
+            print(f"{source:<10}  {result['error']}")
+            continue
+        row = [result.get(stage, {}).get('records_per_sec') for stage in ('fetch', 'parse', 'insert')]
+        cells = ''.join(f"{'-' if value is None else value:>16}" for value in row)
+        print(f"{source:<10}{result['records']:>10}{cells}")
+        if result['missing_fixtures']:
+            print(f"{'':<10}  ⚠ {result['missing_fixtures']} requests had no fixture")
+    print(f"{'='*72}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ingestion fetch / parse / insert from recorded fixtures')
+    parser.add_argument('--source', choices=[*bench_sources.SOURCES, 'all'], default='all')
+    parser.add_argument('--fixtures', type=Path, default=FIXTURES_DIR, help=f'Fixture directory (default {FIXTURES_DIR})')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Simulated latency per HTTP request')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Extra random latency, up to this much')
+    parser.add_argument('--repeat', type=int, default=5, help='Parse runs; the fastest is reported (default 5)')
+    parser.add_argument('--skip-insert', action='store_true', help='Skip the database stage')
+    parser.add_argument('--json', type=Path, help='Also write the report to this file')
+    args = parser.parse_args()
+
+    selected = bench_sources.SOURCES if args.source == 'all' else (args.source,)
+    report = {
+        'started_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'latency_ms': args.latency_ms,
+        'jitter_ms': args.jitter_ms,
+        'repeat': args.repeat,
+        'sources': {},
+    }
+    for source in selected:
+        try:
+            report['sources'][source] = benchmark_source(
+                source, args.fixtures, args.latency_ms, args.jitter_ms, args.repeat, args.skip_insert
+            )
+        except Exception as e:
+            report['sources'][source] = {'error': str(e)}
+
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Capture live API responses as replay fixtures.
+
+Makes every fetch the benchmark will replay (all configured sites, see
+bench.sources.plan_calls) through RecordingAdapter and writes the call list
+to <out>/<source>/manifest.json. Harvest needs HARVEST_API_KEY; the key is
+redacted from the stored fixtures.
+
+Usage (from the ingestion directory):
+    python -m bench.record --source all
+    python -m bench.record --source mdc --days 30
+    python -m bench.record --source ecan --period 1_Month --out /tmp/fixtures
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench import sources as bench_sources
+from bench.http_fixtures import FIXTURES_DIR, FixtureStore, RecordingAdapter, use_adapter
+
+
+def record_source(source: str, out: Path, days: int, ecan_period: str) -> dict:
+    store = FixtureStore(out, source)
+    ingester = bench_sources.make_ingester(source)
+    calls = bench_sources.plan_calls(source, ingester, days=days, ecan_period=ecan_period)
+
+    recorded_calls = []
+    with use_adapter(RecordingAdapter(store)) as adapter:
+        for call in calls:
+            payload = bench_sources.fetch(source, ingester, call)
+            if payload is None:
+                print(f"  ✗ {source}: {call} failed, not recorded")
+                continue
+            recorded_calls.append(call)
+
+    store.write_manifest(recorded_calls)
+    return {'calls': len(recorded_calls), 'failed': len(calls) - len(recorded_calls), 'responses': adapter.recorded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record ingestion API responses for offline benchmarks')
+    parser.add_argument('--source', choices=[*bench_sources.SOURCES, 'all'], default='all')
+    parser.add_argument('--out', type=Path, default=FIXTURES_DIR, help=f'Fixture directory (default {FIXTURES_DIR})')
+    parser.add_argument('--days', type=int, default=7, help='Days of data to request from MDC / Harvest (default 7)')
+    parser.add_argument('--period', default='7_Days', help='ECAN period to request (default 7_Days)')
+    args = parser.parse_args()
+
+    selected = bench_sources.SOURCES if args.source == 'all' else (args.source,)
+    for source in selected:
+        print(f"Recording {source}...")
+        try:
+            summary = record_source(source, args.out, args.days, args.period)
+        except Exception as e:
+            print(f"  ✗ {source}: {e}\n")
+            continue
+        print(f"  ✓ {summary['calls']} calls, {summary['responses']} responses, {summary['failed']} failed\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+The fetch and parse calls of each ingestion source, described as manifest
+entries so the recorder and the benchmark make exactly the same requests.
+
+Each entry is a JSON-safe dict. fetch() returns whatever the source's fetch
+method returns and parse() turns that into weather_data records.
+"""
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from config.ecan_sites import ECAN_SITES
+from config.harvest_stations import HARVEST_STATIONS
+from config.mdc_sites import MDC_SITES
+
+NZ_TZ = ZoneInfo('Pacific/Auckland')
+
+SOURCES = ('ecan', 'mdc', 'harvest')
+
+
+def make_ingester(source: str):
+    if source == 'ecan':
+        from sources.ecan import ECANIngestion
+        return ECANIngestion()
+    if source == 'mdc':
+        from sources.mdc import MDCIngestion
+        return MDCIngestion()
+    from sources.harvest import HarvestIngestion
+    return HarvestIngestion()
+
+
+def plan_calls(source: str, ingester, days: int = 7, ecan_period: str = '7_Days') -> list:
+    """Manifest entries for every configured site, covering the last `days` days"""
+    end = datetime.now(NZ_TZ).replace(minute=0, second=0, microsecond=0)
+    start = end - timedelta(days=days)
+
+    if source == 'ecan':
+        return [
+            {'site_no': site['site_no'], 'variable': variable, 'period': ecan_period}
+            for site in ECAN_SITES.values()
+            for variable in site['variables']
+        ]
+    if source == 'mdc':
+        return [
+            {'site_name': site['site_name'], 'measurement': measurement,
+             'start': start.isoformat(), 'end': end.isoformat(), 'interval': None}
+            for site in MDC_SITES.values()
+            for measurement in site.get('measurements', [])
+        ]
+    # Harvest data arrives delay_hours late, so the window is shifted back to match a real run
+    delay = timedelta(hours=ingester.delay_hours)
+    return [
+        {'trace_id': station['source_id'],
+         'start': (start - delay).isoformat(), 'end': (end - delay).isoformat()}
+        for station in HARVEST_STATIONS
+    ]
+
+
+def fetch(source: str, ingester, call: dict):
+    if source == 'ecan':
+        return ingester.fetch_site_data(call['site_no'], call['variable'], call['period'])
+    if source == 'mdc':
+        return ingester.fetch_data(call['site_name'], call['measurement'],
+                                   datetime.fromisoformat(call['start']),
+                                   datetime.fromisoformat(call['end']), call['interval'])
+    return ingester.fetch_harvest_data(call['trace_id'],
+                                       datetime.fromisoformat(call['start']),
+                                       datetime.fromisoformat(call['end']))
+
+
+def parse(source: str, ingester, payload, call: dict, station_id: int) -> list:
+    if not payload:
+        return []
+    if source == 'ecan':
+        return ingester.transform_records(payload, station_id)
+    if source == 'mdc':
+        return ingester.parse_response(station_id, payload, call['measurement'])
+    return ingester.parse_response(station_id, payload)
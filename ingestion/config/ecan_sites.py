@@ -2,6 +2,7 @@
 ECAN (Environment Canterbury) weather site configuration
 API Documentation: http://data.ecan.govt.nz/
 """
+from datetime import timedelta
 
 # Viticulture-focused sites in Canterbury
 ECAN_SITES = {
@@ -58,4 +59,26 @@ ECAN_ENDPOINTS = {
 ECAN_PERIODS = {
     'backfill': 'All',      # For initial historical load
     'incremental': '2_Days',  # For daily updates
-}
\ No newline at end of file
+}
+
+# Named periods accepted by the API, smallest first, with the history each
+# covers (None = everything). Incremental runs request the smallest period that
+# reaches back past the stored watermark; a period that errors or comes back
+# empty is retried with the next larger one.
+ECAN_PERIOD_WINDOWS = [
+    ('2_Days', timedelta(days=2)),
+    ('7_Days', timedelta(days=7)),
+    ('1_Month', timedelta(days=28)),
+    ('1_Year', timedelta(days=365)),
+    ('All', None),
+]
+
+# Readings this close to the watermark are re-upserted (late corrections);
+# older ones already stored are skipped
+ECAN_WATERMARK_OVERLAP = timedelta(hours=6)
+
+# Don't call the API for a site/variable whose latest reading is newer than this
+ECAN_MIN_REFRESH = timedelta(minutes=30)
+
+# Concurrent API requests
+ECAN_FETCH_WORKERS = 4
@@ -3,9 +3,10 @@ ECAN (Environment Canterbury) weather data ingestion
 """
 
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 import pytz
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from sqlalchemy import text
 import logging
 import sys
@@ -15,8 +16,12 @@ import os
 # Import our DB connection utility (same as Harvest)
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from db_connection import get_ingestion_session
+from services.weather_qc import WeatherQC
 
-from config.ecan_sites import ECAN_SITES, ECAN_API_BASE, ECAN_ENDPOINTS, ECAN_PERIODS
+from config.ecan_sites import (
+    ECAN_SITES, ECAN_API_BASE, ECAN_ENDPOINTS, ECAN_PERIODS, ECAN_PERIOD_WINDOWS,
+    ECAN_WATERMARK_OVERLAP, ECAN_MIN_REFRESH, ECAN_FETCH_WORKERS
+)
 
 logger = logging.getLogger(__name__)
 
@@ -39,17 +44,67 @@ class ECANIngestion:
             """), {'source': self.data_source})
             return result.fetchall()
     
-    def fetch_site_data(self, site_no: str, variable: str, period: str = '2_Days') -> List[Dict]:
+    def get_watermarks(self, station_ids: List[int]) -> Dict[Tuple[int, str], datetime]:
+        """
+        Latest stored reading per (station_id, variable) for the variables ECAN
+        serves. Each pair is one backward scan of the (station_id, timestamp,
+        variable) primary key that stops at the first row, instead of a
+        MAX() over the station's whole history.
+        """
+        if not station_ids:
+            return {}
+        with self.Session() as session:
+            result = session.execute(text("""
+                SELECT s.station_id, v.variable, latest.timestamp
+                FROM unnest(CAST(:station_ids AS integer[])) AS s(station_id)
+                CROSS JOIN unnest(CAST(:variables AS text[])) AS v(variable)
+                CROSS JOIN LATERAL (
+                    SELECT w.timestamp
+                    FROM weather_data w
+                    WHERE w.station_id = s.station_id AND w.variable = v.variable
+                    ORDER BY w.timestamp DESC
+                    LIMIT 1
+                ) latest
+            """), {'station_ids': list(station_ids), 'variables': list(ECAN_ENDPOINTS)})
+            return {(row[0], row[1]): row[2] for row in result}
+    
+    def periods_for(self, watermark: Optional[datetime], now: datetime) -> List[str]:
+        """
+        API periods to try for a watermark, smallest first: every period whose
+        window reaches back past watermark - overlap, ending with 'All'
+        """
+        if watermark is None:
+            return ['All']
+        since = now - (watermark - ECAN_WATERMARK_OVERLAP)
+        return [
+            name for name, window in ECAN_PERIOD_WINDOWS
+            if window is None or window >= since
+        ]
+    
+    def fetch_since(self, site_no: str, variable: str, watermark: Optional[datetime],
+                    now: datetime) -> Tuple[Optional[str], Optional[List[Dict]]]:
+        """
+        Fetch the smallest period that covers the gap since the watermark,
+        escalating to larger periods when a request fails or returns nothing.
+        Returns (period used, records), or (None, None) if every request failed.
+        """
+        for period in self.periods_for(watermark, now):
+            records = self.fetch_site_data(site_no, variable, period)
+            if records or (records is not None and period == 'All'):
+                return period, records
+        return None, None
+    
+    def fetch_site_data(self, site_no: str, variable: str, period: str = '2_Days') -> Optional[List[Dict]]:
         """
         Fetch data for a single site and variable
         
         Args:
             site_no: ECAN site number (e.g., '237101')
             variable: Variable type ('rainfall', 'temperature', etc.)
-            period: 'All' for backfill, '2_Days' for incremental
+            period: API period name (see ECAN_PERIOD_WINDOWS)
         
         Returns:
-            List of data records
+            List of data records, or None if the request failed
         """
         if variable not in ECAN_ENDPOINTS:
             logger.warning(f"Unknown variable type: {variable}")
@@ -77,10 +132,10 @@ class ECANIngestion:
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching ECAN data for site {site_no}: {e}")
-            return []
+            return None
         except Exception as e:
             logger.error(f"Unexpected error processing ECAN data for site {site_no}: {e}")
-            return []
+            return None
     
     def parse_timestamp(self, dt_string: str) -> datetime:
         """
@@ -134,7 +189,7 @@ class ECANIngestion:
                         'variable': variable,
                         'value': value,
                         'unit': unit,
-                        'quality': 'good'  # ECAN doesn't provide quality flags
+                        'quality': 'GOOD'  # ECAN doesn't provide quality flags; set by QC
                     })
                     
             except (ValueError, KeyError) as e:
@@ -161,6 +216,8 @@ class ECANIngestion:
         
         with self.Session() as session:
             try:
+                # QC sets each record's quality and records flagged runs in this transaction
+                WeatherQC.apply(session, records)
                 session.execute(
                     text("""
                         INSERT INTO weather_data 
@@ -211,14 +268,20 @@ class ECANIngestion:
         """
         Run ECAN ingestion for all active sites
         
+        Incremental runs start from the latest stored reading for each site and
+        variable: fresh series are skipped, the smallest API period covering the
+        gap is requested, and readings older than the watermark (less
+        ECAN_WATERMARK_OVERLAP) are not re-upserted. Requests run concurrently.
+        
         Args:
-            period: 'incremental' (2_Days) or 'backfill' (All)
+            period: 'incremental' (since watermark) or 'backfill' (All, everything re-upserted)
         """
-        api_period = ECAN_PERIODS.get(period, '2_Days')
+        backfill = period == 'backfill'
+        now = datetime.now(timezone.utc)
         
         print(f"\n{'='*60}")
         print(f"Starting ECAN ingestion at {datetime.now()}")
-        print(f"Period: {api_period}")
+        print(f"Period: {ECAN_PERIODS['backfill'] if backfill else 'since watermark'}")
         print(f"{'='*60}\n")
         
         active_sites = self.get_active_sites()
@@ -229,13 +292,12 @@ class ECANIngestion:
         
         print(f"Found {len(active_sites)} active ECAN sites\n")
         
+        watermarks = {} if backfill else self.get_watermarks([site[0] for site in active_sites])
+        
+        # Plan every (site, variable) fetch up front so they can run concurrently
+        plans = []
         for site in active_sites:
-            station_id = site[0]
-            station_code = site[1]
-            source_id = site[2]  # ECAN site_no
-            notes = site[3]
-            
-            print(f"Processing: {station_code}")
+            station_id, station_code, source_id = site[0], site[1], site[2]  # source_id is the ECAN site_no
             
             # Get site config to know which variables to fetch
             site_config = None
@@ -244,52 +306,89 @@ class ECANIngestion:
                     site_config = config
                     break
             
-            if not site_config:
-                print(f"  ✗ Site config not found\n")
-                continue
-            
-            start_time = datetime.now(timezone.utc)
-            total_processed = 0
-            total_inserted = 0
-            
-            # Fetch data for each variable
-            for variable in site_config['variables']:
-                try:
-                    raw_records = self.fetch_site_data(source_id, variable, api_period)
-                    
-                    if not raw_records:
-                        print(f"  - {variable}: No data returned")
+            plans.append((station_id, station_code, source_id, site_config))
+        
+        def fetch(station_id, source_id, variable):
+            if backfill:
+                records = self.fetch_site_data(source_id, variable, ECAN_PERIODS['backfill'])
+                return (ECAN_PERIODS['backfill'] if records is not None else None), records
+            return self.fetch_since(source_id, variable, watermarks.get((station_id, variable)), now)
+        
+        futures = {}
+        with ThreadPoolExecutor(max_workers=ECAN_FETCH_WORKERS) as pool:
+            for station_id, station_code, source_id, site_config in plans:
+                if not site_config:
+                    continue
+                for variable in site_config['variables']:
+                    watermark = watermarks.get((station_id, variable))
+                    if watermark is not None and now - watermark < ECAN_MIN_REFRESH:
                         continue
-                    
-                    transformed_records = self.transform_records(raw_records, station_id)
-                    
-                    if not transformed_records:
-                        print(f"  ✗ {variable}: No valid records")
+                    futures[(station_id, variable)] = pool.submit(fetch, station_id, source_id, variable)
+        
+            for station_id, station_code, source_id, site_config in plans:
+                print(f"Processing: {station_code}")
+                
+                if not site_config:
+                    print(f"  ✗ Site config not found\n")
+                    continue
+                
+                start_time = datetime.now(timezone.utc)
+                total_processed = 0
+                total_inserted = 0
+                
+                # Fetch data for each variable
+                for variable in site_config['variables']:
+                    try:
+                        watermark = watermarks.get((station_id, variable))
+                        future = futures.get((station_id, variable))
+                        if future is None:
+                            print(f"  - {variable}: Up to date (latest {watermark})")
+                            continue
+                        
+                        api_period, raw_records = future.result()
+                        
+                        if raw_records is None:
+                            raise RuntimeError("ECAN API request failed")
+                        
+                        if not raw_records:
+                            print(f"  - {variable}: No data returned")
+                            continue
+                        
+                        transformed_records = self.transform_records(raw_records, station_id)
+                        
+                        # Skip the tail that is already stored
+                        if watermark is not None:
+                            cutoff = watermark - ECAN_WATERMARK_OVERLAP
+                            transformed_records = [r for r in transformed_records if r['timestamp'] > cutoff]
+                        
+                        total_processed += len(raw_records)
+                        
+                        if not transformed_records:
+                            print(f"  - {variable}: No new records ({api_period})")
+                            continue
+                        
+                        records_inserted = self.insert_data(transformed_records)
+                        
+                        total_inserted += records_inserted
+                        
+                        print(f"  ✓ {variable}: Inserted {records_inserted} of {len(raw_records)} records ({api_period})")
+                        
+                    except Exception as e:
+                        print(f"  ✗ Error processing {variable}: {e}")
+                        self.log_ingestion(
+                            station_id, start_time, 0, 0, 'FAILED', str(e)
+                        )
                         continue
-                    
-                    records_inserted = self.insert_data(transformed_records)
-                    
-                    total_processed += len(raw_records)
-                    total_inserted += records_inserted
-                    
-                    print(f"  ✓ {variable}: Inserted {records_inserted} records")
-                    
-                except Exception as e:
-                    print(f"  ✗ Error processing {variable}: {e}")
+                
+                # Log overall result for this station
+                if total_inserted > 0:
                     self.log_ingestion(
-                        station_id, start_time, 0, 0, 'FAILED', str(e)
+                        station_id, start_time, total_processed, total_inserted, 'SUCCESS'
                     )
-                    continue
-            
-            # Log overall result for this station
-            if total_inserted > 0:
-                self.log_ingestion(
-                    station_id, start_time, total_processed, total_inserted, 'SUCCESS'
-                )
-                print(f"  Total: {total_inserted}/{total_processed} records\n")
-            else:
-                print(f"  ✗ No records inserted\n")
+                    print(f"  Total: {total_inserted}/{total_processed} records\n")
+                else:
+                    print(f"  - No new records\n")
         
         print(f"{'='*60}")
         print(f"ECAN ingestion complete at {datetime.now()}")
-        print(f"{'='*60}\n")
\ No newline at end of file
+        print(f"{'='*60}\n")
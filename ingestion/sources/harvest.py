@@ -1,5 +1,6 @@
 import requests
 from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 import os
 from sqlalchemy import text
 import sys
@@ -8,6 +9,7 @@ from pathlib import Path
 # Import our DB connection utility
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from db_connection import get_ingestion_session
+from services.weather_qc import WeatherQC
 
 class HarvestIngestion:
     """Ingestion class for Harvest Electronics weather data"""
@@ -144,10 +146,11 @@ class HarvestIngestion:
         # Parse each reading
         for reading in response_data['data']:
             try:
+                # Harvest reports NZ local time
                 timestamp = datetime.strptime(
                     reading['time_stamp'],
                     '%Y-%m-%d %H:%M:%S.%f'
-                )
+                ).replace(tzinfo=ZoneInfo('Pacific/Auckland'))
                 
                 quality = 'GOOD' if reading.get('data_state', False) else 'BAD'
                 
@@ -172,6 +175,8 @@ class HarvestIngestion:
         
         with self.Session() as session:
             try:
+                # QC sets each record's quality and records flagged runs in this transaction
+                WeatherQC.apply(session, records)
                 # Use executemany for bulk insert
                 session.execute(
                     text("""
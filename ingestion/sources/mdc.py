@@ -13,6 +13,7 @@ from sqlalchemy import text
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from db_connection import get_ingestion_session
+from services.weather_qc import WeatherQC
 from config.mdc_sites import MDC_SITES, MDC_API_BASE
 
 
@@ -183,6 +184,8 @@ class MDCIngestion:
         
         with self.Session() as session:
             try:
+                # QC sets each record's quality and records flagged runs in this transaction
+                WeatherQC.apply(session, records)
                 session.execute(
                     text("""
                         INSERT INTO weather_data 